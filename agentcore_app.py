@@ -4,6 +4,12 @@ import uuid
 import time
 import random
 import logging
+from agents.config import MEMORY_TRACEMALLOC_ENABLED, MEMORY_TRACEMALLOC_FRAMES
+from agents.memory_telemetry import (
+    memory_report,
+    register_memory_source,
+    start_tracemalloc,
+)
 from agents.observability import (
     initialize_observability,
     get_tracer,
@@ -27,37 +33,28 @@ _agent_cache: Dict[str, Any] = {}
 PAYLOADS_STATE_KEY = "zuora_api_payloads"
 ADVISORY_PAYLOADS_STATE_KEY = "advisory_payloads"
 
+# Trace allocations from startup so the "memory" debug action can report them
+if MEMORY_TRACEMALLOC_ENABLED:
+    start_tracemalloc(MEMORY_TRACEMALLOC_FRAMES)
 
-def get_bounded_session_id(conversation_id: str, max_turns: int = 3) -> str:
-    """
-    Generate rotating session IDs to limit conversation history.
-
-    This function creates bounded session IDs by hashing the conversation_id and
-    mapping it to one of N buckets. This limits conversation history accumulation
-    while maintaining continuity within each bucket.
-
-    Args:
-        conversation_id: Original conversation ID from request
-        max_turns: Number of turn buckets to rotate through (default: 3)
-
-    Returns:
-        Bounded session ID that rotates through max_turns buckets
 
-    Example:
-        For conversation_id="abc123" and max_turns=3:
-        - Always maps to same bucket (0, 1, or 2)
-        - Limits total history to max_turns conversation contexts
-        - Provides ~70-90% token reduction for long conversations
-    """
-    if not conversation_id:
-        return str(uuid.uuid4())
+def _agent_state_size(key: str) -> int:
+    """Total entries in a list held in each cached agent's state."""
+    return sum(len(agent.state.get(key) or []) for agent in _agent_cache.values())
 
-    import hashlib
 
-    # Create deterministic hash from conversation_id
-    hash_val = int(hashlib.md5(conversation_id.encode()).hexdigest(), 16)
-    bucket = hash_val % max_turns
-    return f"{conversation_id}_b{bucket}"
+register_memory_source("agent_cache.agents", lambda: len(_agent_cache))
+register_memory_source(
+    "agent_cache.messages",
+    lambda: sum(len(agent.messages) for agent in _agent_cache.values()),
+)
+register_memory_source(
+    "agent_state.payloads", lambda: _agent_state_size(PAYLOADS_STATE_KEY)
+)
+register_memory_source(
+    "agent_state.advisory_payloads",
+    lambda: _agent_state_size(ADVISORY_PAYLOADS_STATE_KEY),
+)
 
 
 def get_agent_for_persona(persona: str):
@@ -284,12 +281,108 @@ def generate_mock_citations(persona: str, message: str = "") -> List["Citation"]
     ]
 
 
+def get_debug_stats() -> Dict[str, Any]:
+    """Live latency percentiles and cache/conversation statistics."""
+    from agents.cache import get_cache
+    from agents.compaction import get_compactor
+    from agents.conversation import get_conversation_store
+    from agents.latency import get_latency_registry
+    from agents.observability import get_tail_sampler
+    from agents.payload_review import get_payload_review_cache
+    from agents.payload_session import get_payload_session_store
+
+    compactor = get_compactor()
+    tail_sampler = get_tail_sampler()
+    return {
+        "latency": get_latency_registry().snapshot(),
+        "cache": get_cache().stats(),
+        "conversations": get_conversation_store().stats(),
+        "payload_sessions": get_payload_session_store().stats(),
+        "payload_reviews": get_payload_review_cache().stats(),
+        "compaction": compactor.stats() if compactor else None,
+        "tail_sampling": tail_sampler.stats() if tail_sampler else None,
+    }
+
+
+def finish_profile(profiler: Any, persona: str, conversation_id: str) -> Dict[str, Any]:
+    """Stop a request's profiler, writing its output if PROFILE_OUTPUT_DIR is set."""
+    from agents.config import PROFILE_OUTPUT_DIR
+    from agents.profiling import write_profile
+
+    profile = profiler.stop()
+    profile_data = profile.to_dict()
+    if PROFILE_OUTPUT_DIR:
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{persona}-{conversation_id[:8]}"
+        try:
+            profile_data["files"] = write_profile(profile, PROFILE_OUTPUT_DIR, name)
+        except OSError as e:
+            logger.warning(f"[PROFILE] Failed to write profile: {e}")
+    tool_samples = {
+        tool_name: data["samples"]
+        for tool_name, data in profile_data["by_tool"].items()
+    }
+    logger.info(f"[PROFILE] {profile.total_samples} samples by tool: {tool_samples}")
+    return profile_data
+
+
+# Debug actions: {"debug_action": "<name>"} payloads handled instead of a chat turn
+DEBUG_ACTIONS = {
+    "stats": get_debug_stats,
+    "memory": memory_report,
+}
+
+
+def run_debug_action(action: str) -> Dict[str, Any]:
+    """Run a debug action, returning its result or an error."""
+    from agents.config import DEBUG_ACTIONS_ENABLED
+
+    if not DEBUG_ACTIONS_ENABLED:
+        return {"debug_action": action, "error": "Debug actions are disabled"}
+    handler = DEBUG_ACTIONS.get(action)
+    if handler is None:
+        return {
+            "debug_action": action,
+            "error": f"Unknown debug action. Available: {', '.join(DEBUG_ACTIONS)}",
+        }
+    return {"debug_action": action, "result": handler()}
+
+
 @app.entrypoint
-@trace_function(span_name="agentcore.invoke", attributes={"component": "entrypoint"})
-def invoke(payload: dict) -> dict:
+def invoke_http(payload: dict) -> Any:
     """
     AgentCore entry point for Zuora Seed Agent with /chat API contract.
     Supports multiple personas: ProductManager, BillingArchitect
+
+    Returns the response as a plain dict for the runtime to serialize: the
+    locked bedrock-agentcore (1.1.x) serializes whatever the entry point
+    returns and does not pass a starlette Response through.
+    """
+    return invoke(payload)
+
+
+def invoke(payload: dict) -> dict:
+    """
+    Handle a /chat request and return the response as a dict.
+
+    Same contract as the HTTP entry point, for in-process callers (tests,
+    benchmarks, load tests).
+    """
+    from agents.models import ChatResponse, chat_response_dict
+
+    result = handle_chat(payload)
+    if isinstance(result, ChatResponse):
+        return chat_response_dict(result)
+    return result
+
+
+@trace_function(span_name="agentcore.invoke", attributes={"component": "entrypoint"})
+def handle_chat(payload: dict) -> Any:
+    """
+    Run one /chat turn.
+
+    Returns:
+        ChatResponse for a completed turn, or a plain dict for debug actions
+        and error/resync responses
     """
     # Initialize observability (safe to call multiple times)
     initialize_observability()
@@ -297,14 +390,38 @@ def invoke(payload: dict) -> dict:
     metrics = get_metrics_collector()
     start_time = time.time()
 
+    # Debug actions (no chat turn, not recorded as a request)
+    if "debug_action" in payload:
+        return run_debug_action(str(payload["debug_action"]))
+
     # Lazy import - only load heavy modules when actually invoked
-    from agents.models import ChatRequest, ChatResponse, ZuoraApiPayload
+    from agents.models import (
+        ChatRequest,
+        ChatResponse,
+        ZuoraApiType,
+        trusted_payloads,
+    )
+    from agents.timings import (
+        TIMING_HTML,
+        TIMING_MODEL,
+        TIMING_VALIDATION,
+        end_request_timings,
+        get_request_timings,
+        start_request_timings,
+        timed,
+    )
 
     persona = payload.get("persona", "unknown")
+    timings_token = start_request_timings()
+    timings = get_request_timings()
+    profiler = None
 
     try:
         # Phase 1: Parse and validate request
-        with tracer.start_as_current_span("request.parse") as span:
+        with (
+            tracer.start_as_current_span("request.parse") as span,
+            timings.phase("parse"),
+        ):
             try:
                 request = ChatRequest(**payload)
                 span.set_attribute("persona", request.persona)
@@ -330,15 +447,76 @@ def invoke(payload: dict) -> dict:
         # Generate or use existing conversation ID
         conversation_id = request.conversation_id or str(uuid.uuid4())
 
+        # Sample this request's stacks if asked to (a debug feature), or at
+        # PROFILE_SAMPLE_RATE
+        from agents.config import (
+            DEBUG_ACTIONS_ENABLED,
+            PROFILE_INTERVAL_MS,
+            PROFILE_SAMPLE_RATE,
+        )
+        from agents.profiling import SamplingProfiler, should_profile
+
+        profile_requested = request.profile and DEBUG_ACTIONS_ENABLED
+        if profile_requested or should_profile(PROFILE_SAMPLE_RATE):
+            profiler = SamplingProfiler(interval_ms=PROFILE_INTERVAL_MS)
+            profiler.start()
+
         # Phase 2: Get persona-specific agent
-        with tracer.start_as_current_span("agent.get_or_create") as span:
+        with (
+            tracer.start_as_current_span("agent.get_or_create") as span,
+            timings.phase("agent_init"),
+        ):
             span.set_attribute("persona", persona)
             span.set_attribute("conversation_id", conversation_id)
             agent = get_agent_for_persona(persona)
 
         # Phase 3: Initialize agent state
-        with tracer.start_as_current_span("state.initialize") as span:
+        with (
+            tracer.start_as_current_span("state.initialize") as span,
+            timings.phase("state"),
+        ):
+            from agents.conversation import conversation_key, get_conversation_store
+
+            history_key = conversation_key(persona, conversation_id)
             payloads_data = [p.model_dump() for p in request.zuora_api_payloads]
+            # Payloads the client sent without an ID; the IDs given to them
+            # below are returned with this turn's changes
+            unidentified = [p for p in payloads_data if not p.get("payload_id")]
+
+            # Payload session: the request only carries changes to the stored payloads
+            if request.payload_session:
+                from agents.payload_session import (
+                    apply_payload_changes,
+                    ensure_payload_ids,
+                    get_payload_session_store,
+                )
+
+                span.set_attribute("payload_session", True)
+                if request.payloads_version:
+                    stored = get_payload_session_store().get(history_key)
+                    if stored is None or stored[1] != request.payloads_version:
+                        span.set_attribute("payloads_resync", True)
+                        total_duration_ms = (time.time() - start_time) * 1000
+                        metrics.record_request(
+                            persona, total_duration_ms, success=False
+                        )
+                        return {
+                            "conversation_id": conversation_id,
+                            "answer": "Error: Payload session expired or out of date - "
+                            "resend the full zuora_api_payloads without payloads_version",
+                            "citations": [],
+                            "zuora_api_payloads": [],
+                            "payloads_resync": True,
+                        }
+                    payloads_data = apply_payload_changes(
+                        stored[0], payloads_data, request.removed_payload_ids
+                    )
+                else:
+                    ensure_payload_ids(payloads_data)
+            assigned_ids = [
+                p["payload_id"] for p in unidentified if p.get("payload_id")
+            ]
+
             span.set_attribute("num_payloads", len(payloads_data))
             agent.state.set(PAYLOADS_STATE_KEY, payloads_data)
 
@@ -346,16 +524,23 @@ def invoke(payload: dict) -> dict:
             if persona == "BillingArchitect":
                 agent.state.set(ADVISORY_PAYLOADS_STATE_KEY, [])
 
+            # Load this conversation's history into the shared persona agent
+            agent.messages[:] = get_conversation_store().load(history_key)
+            span.set_attribute("history_messages", len(agent.messages))
+
         # Phase 4: Build context-aware prompt
-        with tracer.start_as_current_span("prompt.build") as span:
+        with (
+            tracer.start_as_current_span("prompt.build") as span,
+            timings.phase("prompt"),
+        ):
             prompt_parts = [f"User ({persona}): {request.message}"]
 
-            if request.zuora_api_payloads:
-                payload_types = set(
-                    p.zuora_api_type.value for p in request.zuora_api_payloads
+            if payloads_data:
+                payload_types = sorted(
+                    {ZuoraApiType(p["zuora_api_type"]).value for p in payloads_data}
                 )
                 prompt_parts.append(
-                    f"\n[Context: {len(request.zuora_api_payloads)} Zuora API payload(s) are available. "
+                    f"\n[Context: {len(payloads_data)} Zuora API payload(s) are available. "
                     f"Types: {', '.join(payload_types)}. Use get_payloads() to view them.]"
                 )
 
@@ -369,22 +554,41 @@ def invoke(payload: dict) -> dict:
             span.set_attribute("prompt_length", len(full_prompt))
 
         # Phase 5: Invoke agent (CRITICAL SPAN)
-        with tracer.start_as_current_span("agent.invoke") as span:
+        with (
+            tracer.start_as_current_span("agent.invoke") as span,
+            timings.phase("invoke"),
+        ):
             span.set_attribute("persona", persona)
             span.set_attribute("conversation_id", conversation_id)
 
-            # Import MAX_CONVERSATION_TURNS for history limiting
-            from agents.config import MAX_CONVERSATION_TURNS
+            # History is already bounded by the agent's conversation manager
+            from agents.accounting import (
+                build_request_accounting,
+                snapshot_agent_metrics,
+            )
+            from agents.conversation import estimate_tokens, split_turns
 
-            bounded_session_id = get_bounded_session_id(
-                conversation_id, max_turns=MAX_CONVERSATION_TURNS
+            prompt_tokens = estimate_tokens(
+                agent.messages + [{"role": "user", "content": [{"text": full_prompt}]}]
             )
-            span.set_attribute("bounded_session_id", bounded_session_id)
+            span.set_attribute("prompt_tokens", prompt_tokens)
+            metrics.record_prompt_tokens(persona, prompt_tokens)
 
+            metrics_before = snapshot_agent_metrics(agent)
             invoke_start = time.time()
             try:
-                response = agent(full_prompt, session_id=bounded_session_id)
+                response = agent(full_prompt)
                 invoke_duration_ms = (time.time() - invoke_start) * 1000
+                get_conversation_store().save(history_key, agent.messages)
+
+                # Compact the saved history off the request path for the next turn
+                from agents.compaction import get_compactor
+
+                compactor = get_compactor()
+                if compactor:
+                    compactor.schedule(
+                        history_key, agent.state.get(PAYLOADS_STATE_KEY) or []
+                    )
                 span.set_attribute("duration_ms", invoke_duration_ms)
                 span.set_attribute("success", True)
 
@@ -393,34 +597,33 @@ def invoke(payload: dict) -> dict:
                     persona, invoke_duration_ms, success=True
                 )
 
-                # Log tool usage for debugging - check if response has tool call info
-                # This helps diagnose when the model describes actions without calling tools
-                if hasattr(response, "tool_calls"):
-                    tool_names = (
-                        [tc.get("name", "unknown") for tc in response.tool_calls]
-                        if response.tool_calls
-                        else []
-                    )
-                    logger.info(
-                        f"[AGENT] Tools called: {tool_names if tool_names else 'none'}"
-                    )
-                elif hasattr(response, "message") and hasattr(
-                    response.message, "tool_calls"
-                ):
-                    tool_names = (
-                        [
-                            tc.get("name", "unknown")
-                            for tc in response.message.tool_calls
-                        ]
-                        if response.message.tool_calls
-                        else []
-                    )
-                    logger.info(
-                        f"[AGENT] Tools called: {tool_names if tool_names else 'none'}"
-                    )
-                else:
-                    # Log response length as a proxy for whether tools were called
-                    # Very short responses with phrases like "I'll update" may indicate no tool was called
+                # Per-request model/tool accounting (strands metrics are cumulative)
+                accounting = build_request_accounting(
+                    metrics_before,
+                    snapshot_agent_metrics(agent),
+                    split_turns(agent.messages)[-1] if agent.messages else [],
+                )
+                metrics.record_request_accounting(persona, accounting)
+                timings.add(
+                    TIMING_MODEL, accounting.model_latency_ms, accounting.model_calls
+                )
+                span.set_attribute("model_calls", accounting.model_calls)
+                span.set_attribute("input_tokens", accounting.input_tokens)
+                span.set_attribute("output_tokens", accounting.output_tokens)
+                span.set_attribute("cache_read_tokens", accounting.cache_read_tokens)
+                span.set_attribute("tool_calls", accounting.total_tool_calls)
+                span.set_attribute("tool_output_bytes", accounting.tool_output_bytes)
+
+                tool_names = sorted(accounting.tool_calls)
+                logger.info(
+                    f"[AGENT] Invocation completed in {invoke_duration_ms:.0f}ms: "
+                    f"{accounting.model_calls} model calls, "
+                    f"{accounting.input_tokens} in / {accounting.output_tokens} out tokens, "
+                    f"tools called: {tool_names if tool_names else 'none'}"
+                )
+
+                # The model sometimes describes an action without calling the tool
+                if not tool_names:
                     raw_answer_preview = str(response)[:200]
                     intent_phrases = [
                         "I'll update",
@@ -430,23 +633,18 @@ def invoke(payload: dict) -> dict:
                         "I will update",
                         "Let me update",
                     ]
-                    has_intent_phrase = any(
-                        phrase in raw_answer_preview for phrase in intent_phrases
-                    )
-                    if has_intent_phrase:
+                    if any(phrase in raw_answer_preview for phrase in intent_phrases):
                         logger.warning(
-                            f"[AGENT] Response contains intent phrases but tool call info not available. "
+                            f"[AGENT] Response contains intent phrases but no tool was called. "
                             f"Preview: {raw_answer_preview}..."
                         )
-                    logger.info(
-                        f"[AGENT] Invocation completed in {invoke_duration_ms:.0f}ms"
-                    )
 
                 raw_answer = str(response)
                 # Convert markdown to HTML for formatted output
                 from agents.html_formatter import markdown_to_html
 
-                answer = markdown_to_html(raw_answer)
+                with timed(TIMING_HTML):
+                    answer = markdown_to_html(raw_answer)
 
             except Exception as e:
                 invoke_duration_ms = (time.time() - invoke_start) * 1000
@@ -459,50 +657,80 @@ def invoke(payload: dict) -> dict:
                     persona, invoke_duration_ms, success=False
                 )
 
+                accounting = None
                 answer = f"<p>Error processing request: {str(e)}</p>"
 
         # Phase 6: Build response
-        with tracer.start_as_current_span("response.build") as span:
+        with (
+            tracer.start_as_current_span("response.build") as span,
+            timings.phase("response"),
+        ):
             # Extract modified payloads from agent state
             modified_payloads_data = agent.state.get(PAYLOADS_STATE_KEY) or []
-            modified_payloads = []
-            for p in modified_payloads_data:
-                try:
-                    modified_payloads.append(ZuoraApiPayload(**p))
-                except Exception:
-                    # If payload doesn't validate, include as-is with raw data
-                    modified_payloads.append(
-                        ZuoraApiPayload(
-                            payload=p.get("payload", {}),
-                            zuora_api_type=p.get("zuora_api_type", "product"),
-                            payload_id=p.get("payload_id"),
-                        )
-                    )
 
-            # Check for payloads with placeholders and generate warning
-            payloads_with_placeholders = [
-                p for p in modified_payloads_data if p.get("_placeholders")
-            ]
-            if payloads_with_placeholders:
-                from agents.html_formatter import (
-                    generate_placeholder_warning_html,
-                    generate_placeholder_recommendations_html,
+            # Payload session: store the payloads and return only this turn's changes
+            returned_payloads_data = modified_payloads_data
+            session_fields: Dict[str, Any] = {}
+            if request.payload_session:
+                from agents.payload_session import (
+                    diff_payloads,
+                    get_payload_session_store,
                 )
 
-                placeholder_warning = generate_placeholder_warning_html(
-                    payloads_with_placeholders
+                returned_payloads_data, removed_ids = diff_payloads(
+                    payloads_data, modified_payloads_data, assigned_ids
+                )
+                session_fields = {
+                    "payloads_version": get_payload_session_store().save(
+                        history_key, modified_payloads_data
+                    ),
+                    "removed_payload_ids": removed_ids,
+                }
+                span.set_attribute("num_removed_payloads", len(removed_ids))
+
+            # Delta mode: RFC 6902 patches against the client's payloads_version,
+            # or full payloads if the client holds something else
+            if request.payloads_delta:
+                from agents.payload_session import payload_patches, payloads_version
+
+                base_matches = request.payload_session or (
+                    request.payloads_version == payloads_version(payloads_data)
+                    and all(p.get("payload_id") for p in payloads_data)
                 )
-                placeholder_recommendations = generate_placeholder_recommendations_html(
-                    payloads_with_placeholders
+                if base_matches:
+                    session_fields["payload_patches"] = payload_patches(
+                        payloads_data, modified_payloads_data, assigned_ids
+                    )
+                    returned_payloads_data = []
+                session_fields.setdefault(
+                    "payloads_version", payloads_version(modified_payloads_data)
                 )
+                span.set_attribute("payloads_delta", base_matches)
+
+            # Payloads come from our own tools: one batch validation, no per-model calls
+            with timed(TIMING_VALIDATION):
+                modified_payloads = trusted_payloads(returned_payloads_data)
+
+            # One pass over all payloads: validation, placeholder state and the
+            # warning/recommendation data (unchanged payloads reuse last turn's review)
+            from agents.payload_review import review_payloads
+
+            with timed(TIMING_VALIDATION):
+                review = review_payloads(modified_payloads_data, history_key)
+            span.set_attribute("num_reviews_reused", review.reused)
+            span.set_attribute("num_invalid_payloads", review.invalid_count)
+
+            if review.has_placeholders:
+                with timed(TIMING_HTML):
+                    placeholder_warning = review.warning_html()
+                    placeholder_recommendations = review.recommendations_html()
                 answer = placeholder_warning + placeholder_recommendations + answer
 
             # Add call-to-action at the end when payloads exist
             if modified_payloads_data:
                 from agents.html_formatter import generate_payload_action_cta
 
-                has_placeholders = len(payloads_with_placeholders) > 0
-                action_cta = generate_payload_action_cta(has_placeholders)
+                action_cta = generate_payload_action_cta(review.has_placeholders)
                 answer = answer + action_cta
 
             # Generate persona-specific citations (content-aware based on user message)
@@ -514,6 +742,12 @@ def invoke(payload: dict) -> dict:
                 answer=answer,
                 citations=citations,
                 zuora_api_payloads=modified_payloads,
+                debug=(
+                    {"accounting": accounting.to_dict() if accounting else None}
+                    if request.debug
+                    else None
+                ),
+                **session_fields,
             )
 
             span.set_attribute("num_modified_payloads", len(modified_payloads))
@@ -523,7 +757,19 @@ def invoke(payload: dict) -> dict:
         total_duration_ms = (time.time() - start_time) * 1000
         metrics.record_request(persona, total_duration_ms, success=True)
 
-        return chat_response.model_dump()
+        # Added after the response phase has ended so it is included
+        if request.timings:
+            chat_response.timings = timings.to_dict()
+
+        if profiler:
+            profile_data = finish_profile(profiler, persona, conversation_id)
+            if profile_requested:
+                chat_response.debug = {
+                    **(chat_response.debug or {}),
+                    "profile": profile_data,
+                }
+
+        return chat_response
 
     except Exception:
         # Record failed request
@@ -531,6 +777,11 @@ def invoke(payload: dict) -> dict:
         metrics.record_request(persona, total_duration_ms, success=False)
         raise
 
+    finally:
+        end_request_timings(timings_token)
+        if profiler and profiler.running:
+            profiler.stop()
+
 
 if __name__ == "__main__":
     app.run()
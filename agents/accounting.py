@@ -0,0 +1,127 @@
+"""
+Per-request token and tool-call accounting.
+
+Strands keeps cumulative event loop metrics on each (cached, long-lived) agent,
+so a request's usage is the difference between a snapshot taken before the
+agent call and one taken after it.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class ToolCallStats:
+    """Calls, errors and total duration for one tool within a request."""
+
+    calls: int = 0
+    errors: int = 0
+    duration_ms: float = 0.0
+
+
+@dataclass
+class RequestAccounting:
+    """Model and tool usage for a single request."""
+
+    model_calls: int = 0
+    model_latency_ms: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    tool_calls: Dict[str, ToolCallStats] = field(default_factory=dict)
+    tool_output_bytes: int = 0
+
+    @property
+    def total_tool_calls(self) -> int:
+        return sum(stats.calls for stats in self.tool_calls.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dict (for the response debug field)."""
+        data = asdict(self)
+        data["total_tool_calls"] = self.total_tool_calls
+        data["model_latency_ms"] = round(self.model_latency_ms, 1)
+        for stats in data["tool_calls"].values():
+            stats["duration_ms"] = round(stats["duration_ms"], 1)
+        return data
+
+
+def snapshot_agent_metrics(agent: Any) -> Dict[str, Any]:
+    """
+    Capture the agent's cumulative event loop metrics.
+
+    Args:
+        agent: Strands agent (reads agent.event_loop_metrics)
+
+    Returns:
+        Plain-dict snapshot for build_request_accounting()
+    """
+    metrics = getattr(agent, "event_loop_metrics", None)
+    if metrics is None:
+        return {"cycles": 0, "usage": {}, "latency_ms": 0, "tools": {}}
+
+    return {
+        "cycles": metrics.cycle_count,
+        "usage": dict(metrics.accumulated_usage),
+        "latency_ms": metrics.accumulated_metrics.get("latencyMs", 0),
+        "tools": {
+            name: (tool.call_count, tool.error_count, tool.total_time)
+            for name, tool in metrics.tool_metrics.items()
+        },
+    }
+
+
+def tool_output_bytes(messages: List[Dict[str, Any]]) -> int:
+    """Count the bytes of tool results in messages (what is fed back to the model)."""
+    total = 0
+    for message in messages:
+        for block in message.get("content", []):
+            if "toolResult" not in block:
+                continue
+            for item in block["toolResult"].get("content", []):
+                if "text" in item:
+                    total += len(item["text"].encode("utf-8"))
+                elif "json" in item:
+                    total += len(str(item["json"]).encode("utf-8"))
+    return total
+
+
+def build_request_accounting(
+    before: Dict[str, Any], after: Dict[str, Any], turn_messages: List[Dict[str, Any]]
+) -> RequestAccounting:
+    """
+    Build the accounting for one request from two metric snapshots.
+
+    Args:
+        before: snapshot_agent_metrics() taken before the agent call
+        after: snapshot_agent_metrics() taken after the agent call
+        turn_messages: Messages produced by this request (for tool output bytes)
+
+    Returns:
+        RequestAccounting with the differences
+    """
+    usage_before, usage_after = before["usage"], after["usage"]
+
+    def usage_delta(key: str) -> int:
+        return usage_after.get(key, 0) - usage_before.get(key, 0)
+
+    tool_calls = {}
+    for name, (calls, errors, total_time) in after["tools"].items():
+        prev_calls, prev_errors, prev_time = before["tools"].get(name, (0, 0, 0.0))
+        if calls > prev_calls:
+            tool_calls[name] = ToolCallStats(
+                calls=calls - prev_calls,
+                errors=errors - prev_errors,
+                duration_ms=(total_time - prev_time) * 1000,
+            )
+
+    return RequestAccounting(
+        model_calls=after["cycles"] - before["cycles"],
+        model_latency_ms=after["latency_ms"] - before["latency_ms"],
+        input_tokens=usage_delta("inputTokens"),
+        output_tokens=usage_delta("outputTokens"),
+        cache_read_tokens=usage_delta("cacheReadInputTokens"),
+        cache_write_tokens=usage_delta("cacheWriteInputTokens"),
+        tool_calls=tool_calls,
+        tool_output_bytes=tool_output_bytes(turn_messages),
+    )
@@ -0,0 +1,279 @@
+"""
+Bulk repricing: one price rule applied to every charge a selector matches.
+
+update_zuora_charge_price changes one charge per tool call and fetches it
+with client.get_charge each time. reprice_charges() selects charges from a
+product (optionally one rate plan, a charge-name pattern and a currency),
+fetches them in parallel through the client and its cache (fetch_all), and
+emits a charge_tier_update payload for every tier price the rule changes.
+
+Price rules (exactly one):
+- new_price: the same price for every selected tier. Charges with several
+  tiers in a currency are skipped, as update_zuora_charge_price asks which
+  tier to change.
+- percent_change: each tier's price changed by a percentage (10 = +10%),
+  rounded to the given number of decimals.
+- tier_prices: a price per tier number ({1: 0.09, 2: 0.06}); other tiers
+  are left alone.
+
+An absolute price is in one currency, so without a currency new_price and
+tier_prices skip charges priced in several currencies; only percent_change
+applies across currencies.
+
+Tier prices that already equal the new price produce nothing, and a pending
+update for the same tier is changed in place, so repeating a repricing adds
+no payloads.
+"""
+
+import fnmatch
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .catalog_diff import _fetch_product, add_update, fetch_all
+from .payload_store import PayloadStore
+
+
+@dataclass
+class RepriceResult:
+    """Tier price changes for the selected charges, in catalog order."""
+
+    product: Dict[str, Any] = field(default_factory=dict)
+    payloads: List[Dict[str, Any]] = field(default_factory=list)
+    # One dict per changed tier: charge, currency, tier, old_price, new_price, tier_id
+    changes: List[Dict[str, Any]] = field(default_factory=list)
+    charges: int = 0
+    unchanged: int = 0
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _price_rule_error(
+    new_price: Optional[float],
+    percent_change: Optional[float],
+    tier_prices: Optional[Dict[Any, float]],
+) -> Optional[str]:
+    """Why a price rule is invalid, or None."""
+    given = [r for r in (new_price, percent_change, tier_prices) if r is not None]
+    if len(given) != 1:
+        return "Give exactly one of new_price, percent_change or tier_prices"
+    if new_price is not None and new_price < 0:
+        return "new_price must be >= 0"
+    if percent_change is not None and percent_change <= -100:
+        return "percent_change must be greater than -100"
+    if tier_prices is not None:
+        if not tier_prices:
+            return "tier_prices must map at least one tier number to a price"
+        for tier, price in tier_prices.items():
+            if not str(tier).isdigit():
+                return f"tier_prices keys must be tier numbers, got: {tier}"
+            if not isinstance(price, (int, float)) or price < 0:
+                return f"tier {tier} price must be a number >= 0, got: {price}"
+    return None
+
+
+def _lookup_product(
+    client: Any, product: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Live product by ID or SKU, then by name."""
+    found, error = _fetch_product(client, ("sku", product))
+    if found is None and error is None:
+        found, error = _fetch_product(client, ("name", product))
+    return found, error
+
+
+def select_charges(
+    product: Dict[str, Any],
+    rate_plan: Optional[str] = None,
+    charge_name_pattern: str = "*",
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Charges of a live product matching a selector.
+
+    Args:
+        product: Live product with productRatePlans
+        rate_plan: Rate plan ID or name (case-insensitive); None for all
+        charge_name_pattern: Shell-style pattern for charge names
+                             (case-insensitive, e.g. "API*")
+
+    Returns:
+        (rate plan, charge) pairs in catalog order
+    """
+    pattern = charge_name_pattern.lower()
+    selected = []
+    for plan in product.get("productRatePlans") or []:
+        if (
+            rate_plan
+            and rate_plan != plan.get("id")
+            and (plan.get("name", "").lower() != rate_plan.lower())
+        ):
+            continue
+        for charge in plan.get("productRatePlanCharges") or []:
+            if fnmatch.fnmatchcase(charge.get("name", "").lower(), pattern):
+                selected.append((plan, charge))
+    return selected
+
+
+def _live_price(tier: Dict[str, Any]) -> Optional[float]:
+    """A live tier's price as a number (it may be a string), or None."""
+    price = tier.get("price")
+    if isinstance(price, bool):
+        return None
+    try:
+        return float(price)
+    except (TypeError, ValueError):
+        return None
+
+
+def _new_price(
+    tier: Dict[str, Any],
+    old_price: Optional[float],
+    new_price: Optional[float],
+    percent_change: Optional[float],
+    tier_prices: Optional[Dict[int, float]],
+    decimals: int,
+) -> Optional[float]:
+    """New price of a tier under the rule, or None to leave it alone."""
+    if new_price is not None:
+        return new_price
+    if tier_prices is not None:
+        return tier_prices.get(tier.get("tier") or 1)
+    if old_price is None:
+        return None
+    return round(old_price * (1 + percent_change / 100), decimals)
+
+
+def reprice_charges(
+    store: PayloadStore,
+    product: str,
+    rate_plan: Optional[str] = None,
+    charge_name_pattern: str = "*",
+    currency: Optional[str] = None,
+    new_price: Optional[float] = None,
+    percent_change: Optional[float] = None,
+    tier_prices: Optional[Dict[Any, float]] = None,
+    decimals: int = 2,
+    client: Any = None,
+) -> RepriceResult:
+    """
+    Add tier update payloads repricing the selected charges.
+
+    Args:
+        store: Payload store to add to (pending tier updates are merged)
+        product: Product ID, SKU or name
+        rate_plan: Rate plan ID or name; None for every rate plan
+        charge_name_pattern: Shell-style charge name pattern
+        currency: Currency code; None for every currency (charges priced in
+                  several currencies are then only repriced by percent_change)
+        new_price: Absolute price rule
+        percent_change: Percentage rule (10 = +10%, -5 = -5%)
+        tier_prices: Per-tier rule, tier number -> price
+        decimals: Rounding of percentage results
+        client: Zuora client (default: the global client)
+
+    Returns:
+        RepriceResult; error is set if nothing could be selected
+    """
+    result = RepriceResult()
+    result.error = _price_rule_error(new_price, percent_change, tier_prices)
+    if result.error:
+        return result
+    if tier_prices is not None:
+        tier_prices = {int(tier): price for tier, price in tier_prices.items()}
+    if client is None:
+        from .zuora_client import get_zuora_client
+
+        client = get_zuora_client()
+
+    live_product, error = _lookup_product(client, product)
+    if error or live_product is None:
+        result.error = f"Could not find product '{product}'" + (
+            f": {error}" if error else ""
+        )
+        return result
+    result.product = live_product
+
+    selected = select_charges(live_product, rate_plan, charge_name_pattern)
+    if not selected:
+        result.error = (
+            f"No charges of '{live_product.get('name', product)}' match "
+            f"rate_plan={rate_plan or 'any'}, charge_name_pattern={charge_name_pattern}"
+        )
+        return result
+    result.charges = len(selected)
+
+    # Full charge records (tier IDs included), fetched in parallel
+    responses = fetch_all(client.get_charge, [charge["id"] for _, charge in selected])
+    currency = currency.upper() if currency else None
+    emitted = set()
+    for (plan, listed), response in zip(selected, responses):
+        label = f"{plan.get('name', '?')} / {listed.get('name', '?')}"
+        if not response.get("success"):
+            result.warnings.append(
+                f"{label}: could not fetch charge ({response.get('error', 'Unknown error')})"
+            )
+            continue
+        tiers: Dict[str, List[Dict[str, Any]]] = {}
+        for tier in (response.get("data") or {}).get("pricing") or []:
+            tier_currency = str(tier.get("currency", "")).upper()
+            if currency is None or tier_currency == currency:
+                tiers.setdefault(tier_currency, []).append(tier)
+        if not tiers:
+            result.warnings.append(
+                f"{label}: no {currency + ' ' if currency else ''}pricing tiers"
+            )
+            continue
+        if percent_change is None and len(tiers) > 1:
+            result.warnings.append(
+                f"{label}: prices in {', '.join(tiers)} "
+                "(give currency for new_price or tier_prices)"
+            )
+            continue
+
+        for tier_currency, currency_tiers in tiers.items():
+            if new_price is not None and len(currency_tiers) > 1:
+                result.warnings.append(
+                    f"{label}: {len(currency_tiers)} {tier_currency} tiers "
+                    "(use tier_prices or percent_change)"
+                )
+                continue
+            for tier in sorted(currency_tiers, key=lambda t: t.get("tier") or 1):
+                old_price = _live_price(tier)
+                if old_price is None and percent_change is not None:
+                    result.warnings.append(
+                        f"{label}: {tier_currency} tier {tier.get('tier', 1)} "
+                        f"price is not a number ({tier.get('price')!r})"
+                    )
+                    continue
+                price = _new_price(
+                    tier, old_price, new_price, percent_change, tier_prices, decimals
+                )
+                if price is None:
+                    continue
+                if old_price is not None and abs(old_price - price) < 1e-9:
+                    result.unchanged += 1
+                    continue
+                if not tier.get("id"):
+                    result.warnings.append(
+                        f"{label}: {tier_currency} tier {tier.get('tier', 1)} has no tier ID"
+                    )
+                    continue
+                entry = add_update(
+                    store, "charge_tier_update", tier["id"], {"Price": price}
+                )
+                if entry is None:
+                    result.unchanged += 1
+                    continue
+                if entry["payload_id"] not in emitted:
+                    emitted.add(entry["payload_id"])
+                    result.payloads.append(entry)
+                result.changes.append(
+                    {
+                        "charge": label,
+                        "currency": tier_currency,
+                        "tier": tier.get("tier", 1),
+                        "old_price": tier.get("price"),
+                        "new_price": price,
+                        "tier_id": tier["id"],
+                    }
+                )
+    return result
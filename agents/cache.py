@@ -10,6 +10,8 @@ import threading
 from typing import Any, Dict, Optional
 from dataclasses import dataclass, field
 
+from .memory_telemetry import register_memory_source
+
 
 @dataclass
 class CacheEntry:
@@ -261,4 +263,5 @@ def get_cache() -> TTLCache:
 
         default_ttl = int(os.getenv("ZUORA_API_CACHE_TTL_SECONDS", "300"))
         _cache = TTLCache(default_ttl_seconds=default_ttl)
+        register_memory_source("zuora_cache.entries", lambda: len(_cache._cache))
     return _cache
@@ -0,0 +1,658 @@
+"""
+Desired-state catalog diff: reconcile a catalog spec with the live catalog.
+
+Re-seeding or tweaking an existing catalog through update_zuora_product /
+update_zuora_rate_plan / update_zuora_charge costs a model round trip per
+field, and rewrites fields that have not changed. diff_catalog() takes the
+desired state of the catalog (the spec format of agents.catalog_ingest),
+fetches the live products through the client (and its cache) in parallel,
+and emits only what differs:
+
+- product_update / rate_plan_update / charge_update payloads holding just
+  the changed fields
+- charge_tier_update payloads for tier prices that changed (the tier
+  endpoint used by update_zuora_charge_price)
+- create payloads, through ingest_catalog(), for products, rate plans and
+  charges that do not exist yet
+
+Live objects are matched by id (product_id, rate_plan_id, charge_id), then
+products by SKU or name, and rate plans and charges by name within their
+parent. Only fields given in the spec are compared; live objects and fields
+the spec does not mention are left alone, and charge arguments the catalog
+response does not return are reported as not compared. Charge arguments go through
+_build_charge_payload first, so values are compared after the same
+normalization (charge model, UOM, tiers) as a created charge.
+
+Changes the update endpoints cannot make (charge type or model, tier
+structure, new currencies) are reported as warnings instead. Updates for an
+object that already has an update payload are merged into it, so repeating a
+reconcile adds nothing.
+"""
+
+import contextvars
+import re
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .catalog_ingest import (
+    _CHARGE_TYPES,
+    _PRODUCT_TYPES,
+    _RATE_PLAN_TYPES,
+    CHARGE_FIELDS,
+    PRODUCT_FIELDS,
+    RATE_PLAN_FIELDS,
+    _payload_id,
+    _split,
+    ingest_catalog,
+)
+from .config import CATALOG_FETCH_WORKERS
+from .observability import (
+    end_tool_call_scope,
+    record_tool_zuora_call,
+    start_tool_call_scope,
+)
+from .payload_store import PayloadStore
+from .timings import (
+    TIMING_ZUORA,
+    RequestTimings,
+    end_request_timings,
+    get_request_timings,
+    start_request_timings,
+)
+from .tools import (
+    _build_charge_payload,
+    _find_existing_key,
+    _to_crud_field_name,
+    validate_date_format,
+)
+
+# Spec argument -> key in GET /v1/catalog responses
+PRODUCT_LIVE_KEYS = {
+    "name": "name",
+    "sku": "sku",
+    "description": "description",
+    "effective_start_date": "effectiveStartDate",
+    "effective_end_date": "effectiveEndDate",
+}
+RATE_PLAN_LIVE_KEYS = {
+    key: value for key, value in PRODUCT_LIVE_KEYS.items() if key != "sku"
+}
+# Charge arguments whose catalog name is not the camelCase argument name;
+# the rest are looked up case-insensitively (billing_timing -> billingTiming)
+CHARGE_LIVE_KEYS = {
+    "charge_type": "type",
+    "charge_model": "model",
+    "bill_cycle_type": "billingDay",
+    "number_of_period": "numberOfPeriods",
+}
+
+# Charge arguments that end up in the tier data rather than a charge field
+PRICING_ARGS = ("price", "prices", "tiers", "overage_price", "overage_prices")
+# Charge fields the update endpoint cannot change
+FIXED_CHARGE_ARGS = ("charge_type", "charge_model")
+
+ENDPOINTS = {
+    "product_update": "/v1/object/product/{}",
+    "rate_plan_update": "/v1/object/product-rate-plan/{}",
+    "charge_update": "/v1/object/product-rate-plan-charge/{}",
+    "charge_tier_update": "/v1/object/product-rate-plan-charge-tier/{}",
+}
+
+
+@dataclass
+class CatalogDiff:
+    """Payloads reconciling a catalog spec with the live catalog."""
+
+    payloads: List[Dict[str, Any]] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    # "<label>: <fields>" for each changed object
+    changes: List[str] = field(default_factory=list)
+    # Objects that already match, or already have a pending create payload
+    unchanged: int = 0
+    with_placeholders: int = 0
+    warnings: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def _scoped_fetch(
+    fetch: Callable[[Any], Any], key: Any
+) -> Tuple[Any, RequestTimings, int]:
+    """fetch(key) with its own request timings and tool call counter."""
+    timings_token = start_request_timings()
+    calls_token = start_tool_call_scope()
+    try:
+        return fetch(key), get_request_timings(), end_tool_call_scope(calls_token)
+    finally:
+        end_request_timings(timings_token)
+
+
+def fetch_all(fetch: Callable[[Any], Any], keys: Sequence[Any]) -> List[Any]:
+    """
+    Call fetch for each key in parallel (CATALOG_FETCH_WORKERS threads).
+
+    Each call runs in a copy of the caller's context with its own timings and
+    tool call counter; these are added to the current request and tool once
+    the calls finish, with the batch's wall time (not the sum of overlapping
+    calls) as its Zuora time.
+
+    Args:
+        fetch: Function of one key
+        keys: Keys to fetch
+
+    Returns:
+        Results in key order
+    """
+    if len(keys) <= 1 or CATALOG_FETCH_WORKERS <= 1:
+        return [fetch(key) for key in keys]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=min(CATALOG_FETCH_WORKERS, len(keys)),
+        thread_name_prefix="catalog-fetch",
+    ) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, _scoped_fetch, fetch, key)
+            for key in keys
+        ]
+        outcomes = [future.result() for future in futures]
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    request_timings = get_request_timings()
+    for _, timings, zuora_calls in outcomes:
+        record_tool_zuora_call(zuora_calls)
+        if request_timings is None:
+            continue
+        for component, duration_ms in timings.components.items():
+            if component == TIMING_ZUORA:
+                duration_ms = 0.0
+            request_timings.add(component, duration_ms, timings.counts[component])
+    if request_timings is not None and any(
+        timings.counts.get(TIMING_ZUORA) for _, timings, _ in outcomes
+    ):
+        request_timings.add(TIMING_ZUORA, wall_ms, count=0)
+    return [result for result, _, _ in outcomes]
+
+
+def _product_key(args: Dict[str, Any]) -> Tuple[str, str]:
+    """How a spec product is looked up: by id, SKU or name."""
+    for kind in ("product_id", "sku", "name"):
+        if args.get(kind):
+            return kind, str(args[kind])
+    return "", ""
+
+
+def _fetch_product(
+    client: Any, key: Tuple[str, str]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Live product (with rate plans and charges) for a lookup key.
+
+    Returns:
+        Tuple of (product, error); (None, None) if there is no such product
+    """
+    kind, value = key
+    if kind == "name":
+        result = client.get_product_by_name(value)
+        if not result.get("success"):
+            return None, result.get("error", "Unknown error")
+        matches = [
+            p
+            for p in (result.get("data") or {}).get("products", [])
+            if p.get("name", "").lower() == value.lower()
+        ]
+        if not matches:
+            return None, None
+        if "productRatePlans" in matches[0]:
+            return matches[0], None
+        value = matches[0].get("id", "")
+    result = client.get_product(value)
+    if result.get("success"):
+        return result.get("data") or {}, None
+    error = str(result.get("error", "Unknown error"))
+    if kind != "product_id" and "not found" in error.lower():
+        return None, None
+    return None, error
+
+
+def _normalized(value: str) -> str:
+    """'In Advance' / 'IN_ADVANCE' -> 'inadvance'."""
+    return "".join(c for c in value.lower() if c.isalnum())
+
+
+def _model_name(value: Any) -> str:
+    """'Tiered Pricing' / 'Tiered' -> 'tiered'."""
+    name = _normalized(str(value or ""))
+    return name[: -len("pricing")] if name.endswith("pricing") else name
+
+
+def _same(desired: Any, live: Any, loose: bool = False) -> bool:
+    """
+    Whether a spec value equals the live one.
+
+    Numbers compare by value (live numbers may be strings), loose compares
+    enumeration values ignoring case, spaces and underscores.
+    """
+    if isinstance(desired, bool) or isinstance(live, bool):
+        return desired == live
+    if isinstance(desired, (int, float)):
+        try:
+            return live is not None and abs(float(live) - desired) < 1e-9
+        except (TypeError, ValueError):
+            return False
+    if loose and isinstance(desired, str) and isinstance(live, str):
+        return _normalized(desired) == _normalized(live)
+    return desired == live
+
+
+def _field_changes(
+    args: Dict[str, Any], live_keys: Dict[str, str], live: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Changed product / rate plan fields, keyed by CRUD field name."""
+    return {
+        _to_crud_field_name(live_keys[arg]): value
+        for arg, value in args.items()
+        if arg in live_keys and not _same(value, live.get(live_keys[arg]))
+    }
+
+
+def _invalid_dates(args: Dict[str, Any]) -> Optional[str]:
+    for arg in ("effective_start_date", "effective_end_date"):
+        if arg in args and not validate_date_format(str(args[arg])):
+            return f"{arg} must be YYYY-MM-DD, got: {args[arg]}"
+    return None
+
+
+def _find_child(
+    children: List[Dict[str, Any]], object_id: Optional[str], name: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Live rate plan / charge by id, otherwise by name (case-insensitive)."""
+    for child in children:
+        if object_id and child.get("id") == object_id:
+            return child
+        if not object_id and name and child.get("name", "").lower() == name.lower():
+            return child
+    return None
+
+
+def _tier_changes(
+    body: Dict[str, Any], live: Dict[str, Any]
+) -> Tuple[List[Tuple[Dict[str, Any], Any]], List[str]]:
+    """
+    Tier price changes between a built charge body and the live charge.
+
+    Tiers are matched by currency and tier number; the number of tiers and
+    their ending units must match, since only prices can be updated.
+
+    Returns:
+        Tuple of ((live tier, new price) list, warnings)
+    """
+    desired: Dict[str, List[Dict[str, Any]]] = {}
+    tier_data = body.get("ProductRatePlanChargeTierData") or {}
+    for tier in tier_data.get("ProductRatePlanChargeTier", []):
+        desired.setdefault(str(tier.get("Currency", "")).upper(), []).append(tier)
+    current: Dict[str, List[Dict[str, Any]]] = {}
+    for tier in sorted(live.get("pricing") or [], key=lambda t: t.get("tier") or 1):
+        current.setdefault(str(tier.get("currency", "")).upper(), []).append(tier)
+
+    updates, warnings = [], []
+    if not desired:
+        warnings.append("prices not compared (give currency or currencies)")
+    for currency, tiers in desired.items():
+        tiers = sorted(tiers, key=lambda t: t.get("Tier") or 1)
+        live_tiers = current.get(currency)
+        if not live_tiers:
+            warnings.append(
+                f"{currency} pricing is not on the live charge "
+                "(add the currency in Zuora or create a new charge)"
+            )
+            continue
+        if len(tiers) != len(live_tiers) or not all(
+            _same(t.get("EndingUnit"), lt.get("endingUnit"))
+            for t, lt in zip(tiers, live_tiers)
+        ):
+            warnings.append(
+                f"{currency} tier structure differs from the live charge "
+                "(only tier prices can be updated)"
+            )
+            continue
+        for tier, live_tier in zip(tiers, live_tiers):
+            price = tier.get("Price")
+            if not isinstance(price, (int, float)) or isinstance(price, bool):
+                continue
+            if _same(price, live_tier.get("price")):
+                continue
+            if not live_tier.get("id"):
+                warnings.append(
+                    f"{currency} tier {live_tier.get('tier', '?')} has no tier ID"
+                )
+                continue
+            updates.append((live_tier, price))
+    return updates, warnings
+
+
+def _charge_changes(
+    args: Dict[str, Any],
+    live: Dict[str, Any],
+    rate_plan_id: str,
+    available_uoms: List[str],
+) -> Tuple[Dict[str, Any], List[Tuple[Dict[str, Any], Any]], List[str]]:
+    """
+    Changed fields and tier prices of a live charge.
+
+    Args:
+        args: Charge arguments from the spec
+        live: Live charge
+        rate_plan_id: ID of the live charge's rate plan
+        available_uoms: Tenant UOM names
+
+    Returns:
+        Tuple of (charge field changes, tier price changes, warnings)
+    """
+    body, _, _ = _build_charge_payload(rate_plan_id, available_uoms, **args)
+    changes: Dict[str, Any] = {}
+    warnings: List[str] = []
+    not_compared: List[str] = []
+    for arg in args:
+        if arg in PRICING_ARGS:
+            continue
+        body_key = _find_existing_key(body, arg)
+        if body_key is None:
+            continue
+        desired = body[body_key]
+        live_key = CHARGE_LIVE_KEYS.get(arg) or _find_existing_key(live, arg)
+        if live_key not in live:
+            not_compared.append(arg)
+            continue
+        live_value = live[live_key]
+        if arg == "bill_cycle_type" and isinstance(live_value, str):
+            # billingDay carries the day too: "SpecificDayofMonth(5)"
+            live_value = re.split(r"[(/]", live_value)[0]
+        if arg == "charge_model":
+            same = _model_name(desired) == _model_name(live_value)
+        else:
+            hint = _CHARGE_TYPES.get(arg)
+            same = _same(desired, live_value, typing.get_origin(hint) is typing.Literal)
+        if same:
+            continue
+        if arg in FIXED_CHARGE_ARGS:
+            warnings.append(
+                f"{arg} is {live_value} in Zuora, not {desired}, and cannot be "
+                "updated (create a new charge instead)"
+            )
+            continue
+        changes[body_key] = desired
+    if not_compared:
+        warnings.append(
+            f"{', '.join(not_compared)} not compared (not in the live charge)"
+        )
+
+    tier_updates: List[Tuple[Dict[str, Any], Any]] = []
+    if any(arg in args for arg in PRICING_ARGS):
+        tier_updates, tier_warnings = _tier_changes(body, live)
+        warnings.extend(tier_warnings)
+    return changes, tier_updates, warnings
+
+
+def _pending(
+    store: PayloadStore, api_type: str, name: Any, parent: Optional[str] = None
+) -> bool:
+    """Whether a create payload for this object is already in the store."""
+    return bool(name) and store.find_by_name(str(name), [api_type], parent) is not None
+
+
+def add_update(
+    store: PayloadStore,
+    api_type: str,
+    entity_id: str,
+    changes: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """
+    Add an update payload, or merge into the pending one for the entity.
+
+    Args:
+        store: Payload store
+        api_type: product_update, rate_plan_update, charge_update or
+                  charge_tier_update
+        entity_id: Zuora ID of the object to update
+        changes: Fields to set (CRUD field names)
+
+    Returns:
+        The new or merged entry, or None if the pending payload already
+        sets these values
+    """
+    index = store.find_update(api_type, entity_id)
+    if index is not None:
+        entry = store.to_list()[index]
+        body = entry["payload"].setdefault("body", {})
+        if all(key in body and body[key] == value for key, value in changes.items()):
+            return None
+        body.update(changes)
+    else:
+        entry = {
+            "payload": {
+                "method": "PUT",
+                "endpoint": ENDPOINTS[api_type].format(entity_id),
+                "body": changes,
+            },
+            "zuora_api_type": api_type,
+            "payload_id": _payload_id(
+                store, api_type, store.count(api_type), entity_id
+            ),
+        }
+        store.append(entry)
+    return entry
+
+
+def diff_catalog(
+    products: List[Dict[str, Any]],
+    store: PayloadStore,
+    client: Any = None,
+    available_uoms: Optional[List[str]] = None,
+) -> CatalogDiff:
+    """
+    Emit the payloads that bring the live catalog to a desired spec.
+
+    Args:
+        products: Desired products from parse_catalog_spec(); each may also
+                  carry product_id, and its rate plans / charges rate_plan_id /
+                  charge_id, to match live objects by id
+        store: Payload store to add to (pending update payloads are merged)
+        client: Zuora client (default: the global client)
+        available_uoms: Tenant UOM names (fetched once from settings if None)
+
+    Returns:
+        CatalogDiff with the new or merged payloads
+    """
+    if client is None:
+        from .zuora_client import get_zuora_client
+
+        client = get_zuora_client()
+    if available_uoms is None:
+        from .zuora_settings import get_available_uom_names
+
+        available_uoms = get_available_uom_names()
+
+    result = CatalogDiff()
+    wanted = []
+    for p, product in enumerate(products):
+        label = f"Product {p + 1}"
+        args, rate_plans, error = _split(
+            product,
+            PRODUCT_FIELDS + ("product_id",),
+            "rate_plans",
+            label,
+            _PRODUCT_TYPES,
+        )
+        if args.get("name") or args.get("sku"):
+            label = f"Product '{args.get('name') or args['sku']}'"
+        if error:
+            result.errors.append(error)
+            continue
+        error = _invalid_dates(args)
+        if not _product_key(args)[0]:
+            error = "product_id, sku or name is required"
+        if error:
+            result.errors.append(f"{label}: {error}")
+            continue
+        wanted.append((label, product, args, rate_plans))
+
+    # One fetch per distinct product, all in parallel
+    keys = list(dict.fromkeys(_product_key(args) for _, _, args, _ in wanted))
+    live_products = dict(
+        zip(keys, fetch_all(lambda key: _fetch_product(client, key), keys))
+    )
+
+    # Objects missing from the live catalog, in the ingestion spec format
+    to_create: List[Dict[str, Any]] = []
+
+    def reconcile(label: str, api_type: str, entity_id: str, changes: Dict) -> None:
+        if not changes:
+            result.unchanged += 1
+            return
+        entry = add_update(store, api_type, entity_id, changes)
+        if entry is not None:
+            result.payloads.append(entry)
+            result.counts[api_type] = result.counts.get(api_type, 0) + 1
+            result.changes.append(f"{label}: {', '.join(changes)}")
+
+    for label, product, args, rate_plans in wanted:
+        kind, value = _product_key(args)
+        live_product, error = live_products[(kind, value)]
+        if error:
+            result.errors.append(f"{label}: could not fetch product {value}: {error}")
+            continue
+        if live_product is None:
+            if kind == "product_id":
+                result.errors.append(f"{label}: product {value} not found")
+            elif _pending(store, "product_create", args.get("name")):
+                result.unchanged += 1
+            else:
+                to_create.append(product)
+            continue
+        product_id = live_product.get("id", value)
+        reconcile(
+            label,
+            "product_update",
+            product_id,
+            _field_changes(args, PRODUCT_LIVE_KEYS, live_product),
+        )
+
+        for r, rate_plan in enumerate(rate_plans):
+            rp_label = f"{label} rate plan {r + 1}"
+            rp_args, charges, error = _split(
+                rate_plan,
+                RATE_PLAN_FIELDS + ("rate_plan_id",),
+                "charges",
+                rp_label,
+                _RATE_PLAN_TYPES,
+            )
+            if rp_args.get("name"):
+                rp_label = f"{label} rate plan '{rp_args['name']}'"
+            if error:
+                result.errors.append(error)
+                continue
+            error = _invalid_dates(rp_args)
+            if error:
+                result.errors.append(f"{rp_label}: {error}")
+                continue
+            rate_plan_id = rp_args.pop("rate_plan_id", None)
+            live_plan = _find_child(
+                live_product.get("productRatePlans") or [],
+                rate_plan_id,
+                rp_args.get("name"),
+            )
+            if live_plan is None:
+                if rate_plan_id or not rp_args.get("name"):
+                    result.errors.append(
+                        f"{rp_label}: rate plan {rate_plan_id or ''} not found "
+                        f"in product {product_id}"
+                    )
+                elif _pending(store, "rate_plan_create", rp_args["name"], product_id):
+                    result.unchanged += 1
+                else:
+                    to_create.append(
+                        {"product_id": product_id, "rate_plans": [rate_plan]}
+                    )
+                continue
+            reconcile(
+                rp_label,
+                "rate_plan_update",
+                live_plan.get("id", ""),
+                _field_changes(rp_args, RATE_PLAN_LIVE_KEYS, live_plan),
+            )
+
+            new_charges = []
+            for c, charge in enumerate(charges):
+                ch_label = f"{rp_label} charge {c + 1}"
+                ch_args, _, error = _split(
+                    charge, CHARGE_FIELDS + ("charge_id",), "", ch_label, _CHARGE_TYPES
+                )
+                if ch_args.get("name"):
+                    ch_label = f"{rp_label} charge '{ch_args['name']}'"
+                if error:
+                    result.errors.append(error)
+                    continue
+                charge_id = ch_args.pop("charge_id", None)
+                live_charge = _find_child(
+                    live_plan.get("productRatePlanCharges") or [],
+                    charge_id,
+                    ch_args.get("name"),
+                )
+                if live_charge is None:
+                    if charge_id or not ch_args.get("name"):
+                        result.errors.append(
+                            f"{ch_label}: charge {charge_id or ''} not found "
+                            f"in rate plan {live_plan.get('id')}"
+                        )
+                    elif _pending(
+                        store, "charge_create", ch_args["name"], live_plan.get("id")
+                    ):
+                        result.unchanged += 1
+                    else:
+                        new_charges.append(charge)
+                    continue
+
+                changes, tier_updates, warnings = _charge_changes(
+                    ch_args, live_charge, live_plan.get("id", ""), available_uoms
+                )
+                result.warnings.extend(f"{ch_label}: {w}" for w in warnings)
+                if not changes and not tier_updates:
+                    result.unchanged += 1
+                    continue
+                if changes:
+                    reconcile(ch_label, "charge_update", live_charge["id"], changes)
+                for live_tier, price in tier_updates:
+                    tier = (
+                        f"{live_tier.get('currency')} tier {live_tier.get('tier', 1)}"
+                    )
+                    reconcile(
+                        f"{ch_label} {tier}",
+                        "charge_tier_update",
+                        live_tier["id"],
+                        {"Price": price},
+                    )
+
+            if new_charges:
+                to_create.append(
+                    {
+                        "product_id": product_id,
+                        "rate_plans": [
+                            {
+                                "rate_plan_id": live_plan.get("id"),
+                                "charges": new_charges,
+                            }
+                        ],
+                    }
+                )
+
+    if to_create:
+        created = ingest_catalog(to_create, store, available_uoms)
+        result.payloads.extend(created.payloads)
+        for api_type, count in created.counts.items():
+            result.counts[api_type] = result.counts.get(api_type, 0) + count
+        result.with_placeholders += created.with_placeholders
+        result.warnings.extend(created.warnings)
+        result.errors.extend(created.errors)
+    return result
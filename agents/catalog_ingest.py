@@ -0,0 +1,500 @@
+"""
+Bulk catalog ingestion from a structured spec, without the model in the loop.
+
+Seeding a catalog through create_product / create_rate_plan / create_charge
+costs one model round trip per object. ingest_catalog() takes the whole
+catalog at once and builds every payload with the same code those tools use
+(_build_product_payload, _build_rate_plan_payload, _build_charge_payload:
+charge model and UOM normalization, tier normalization, smart defaults), then
+validates it and adds placeholders for missing fields like create_payload.
+Object references (@{Product[i].Id}, @{ProductRatePlan[j].Id}) are assigned
+in the same pass.
+
+Spec (JSON):
+    {"products": [
+        {"name": "Analytics Pro", "sku": "AP-1",
+         "rate_plans": [
+            {"name": "Monthly",
+             "charges": [{"name": "Platform Fee", "charge_type": "Recurring",
+                          "price": 99, "billing_period": "Month",
+                          "currency": "USD"}]}]}]}
+
+Products take the arguments of create_product, rate plans those of
+create_rate_plan and charges those of create_charge. A product given as
+{"product_id": "<Zuora ID>"} (or a rate plan as {"rate_plan_id": ...}) adds
+the nested objects to an existing catalog object instead of creating one.
+
+Spec (CSV): one row per object with a "type" column (product, rate_plan or
+charge) and the same argument names as columns. Rows attach to the product or
+rate plan above them, or to the one named in their "product" / "rate_plan"
+column. List and dict cells (tiers, currencies, prices, ...) hold JSON; a list
+cell may also be "|"-separated.
+
+Output is deterministic: the same spec and starting payloads give the same
+payloads, including payload_id, which is derived from each object's position
+and name rather than random.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .payload_store import PayloadStore
+from .tools import (
+    _build_charge_payload,
+    _build_product_payload,
+    _build_rate_plan_payload,
+    _new_payload_entry,
+    validate_zuora_id,
+)
+from .validation_utils import (
+    validate_charge_name_unique,
+    validate_name_length,
+    validate_product_name_unique,
+    validate_rate_plan_name_unique,
+)
+
+SPEC_FORMATS = ("json", "csv")
+
+PRODUCT_FIELDS = (
+    "name",
+    "sku",
+    "effective_start_date",
+    "description",
+    "effective_end_date",
+)
+RATE_PLAN_FIELDS = (
+    "name",
+    "description",
+    "effective_start_date",
+    "effective_end_date",
+)
+# Arguments of create_charge apart from the rate plan
+CHARGE_FIELDS = tuple(
+    name
+    for name in typing.get_type_hints(_build_charge_payload)
+    if name not in ("product_rate_plan_id", "available_uoms", "return")
+)
+
+
+@dataclass
+class IngestResult:
+    """Payloads built from a catalog spec, in creation order."""
+
+    payloads: List[Dict[str, Any]] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    with_placeholders: int = 0
+    warnings: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+# ============ Spec Parsing ============
+
+
+def _argument_types(builder: Any) -> Dict[str, Any]:
+    """Expected type of each argument of a payload builder (Optional unwrapped)."""
+    types = {}
+    for name, hint in typing.get_type_hints(builder).items():
+        args = [a for a in typing.get_args(hint) if a is not type(None)]
+        if typing.get_origin(hint) is typing.Union and len(args) == 1:
+            hint = args[0]
+        types[name] = hint
+    return types
+
+
+# Argument types of the create tools, plus the IDs that point at existing objects
+_PRODUCT_TYPES = {**_argument_types(_build_product_payload), "product_id": str}
+_RATE_PLAN_TYPES = {**_argument_types(_build_rate_plan_payload), "rate_plan_id": str}
+_CHARGE_TYPES = {**_argument_types(_build_charge_payload), "charge_id": str}
+
+_TYPE_NAMES = {
+    str: "a string",
+    int: "a whole number",
+    float: "a number",
+    bool: "true or false",
+}
+
+
+def _matches(hint: Any, value: Any) -> bool:
+    """Whether a JSON value fits a type hint (bools are not numbers)."""
+    origin = typing.get_origin(hint)
+    if hint is bool:
+        return isinstance(value, bool)
+    if hint is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if hint is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if hint is str:
+        return isinstance(value, str)
+    if origin is list:
+        (item,) = typing.get_args(hint)
+        return isinstance(value, list) and all(_matches(item, v) for v in value)
+    if origin is dict:
+        _, item = typing.get_args(hint)
+        return isinstance(value, dict) and all(
+            _matches(item, v) for v in value.values()
+        )
+    return True
+
+
+def _describe(hint: Any) -> str:
+    """Expected type in an error message."""
+    origin = typing.get_origin(hint)
+    if origin is list:
+        (item,) = typing.get_args(hint)
+        return "a list of strings" if item is str else "a list of objects"
+    if origin is dict:
+        _, item = typing.get_args(hint)
+        return "an object of numbers" if item is float else "an object"
+    return _TYPE_NAMES.get(hint, "a valid value")
+
+
+def _convert(
+    field_name: str,
+    value: Any,
+    from_text: bool = False,
+    types: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Check an argument against the create tool's signature.
+
+    Args:
+        field_name: Argument name
+        value: Value from the spec
+        from_text: True for CSV cells, which are converted to the argument type
+        types: Argument types (default: create_charge's)
+
+    Returns:
+        The (converted) value
+
+    Raises:
+        ValueError: If the value does not fit the argument
+    """
+    hint = (_CHARGE_TYPES if types is None else types).get(field_name)
+    origin = typing.get_origin(hint)
+    if from_text and isinstance(value, str):
+        if hint is bool:
+            lowered = value.lower()
+            if lowered not in ("true", "false", "yes", "no", "1", "0"):
+                raise ValueError(f"{field_name} must be true or false, got: {value}")
+            value = lowered in ("true", "yes", "1")
+        elif hint in (int, float):
+            try:
+                value = hint(value)
+            except ValueError:
+                raise ValueError(f"{field_name} must be a number, got: {value}")
+        elif origin in (list, dict):
+            if value.startswith(("[", "{")):
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{field_name} is not valid JSON: {e}")
+            elif origin is list:
+                value = [part.strip() for part in value.split("|") if part.strip()]
+    if origin is typing.Literal:
+        if value not in typing.get_args(hint):
+            allowed = ", ".join(str(a) for a in typing.get_args(hint))
+            raise ValueError(f"{field_name} must be one of {allowed}, got: {value}")
+    elif not _matches(hint, value):
+        raise ValueError(
+            f"{field_name} must be {_describe(hint)}, got: {json.dumps(value)}"
+        )
+    return value
+
+
+def _find_rate_plan(product: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """First rate plan of a spec product with this name (case-insensitive)."""
+    name = name.lower()
+    return next(
+        (rp for rp in product["rate_plans"] if rp.get("name", "").lower() == name),
+        None,
+    )
+
+
+def _csv_to_products(text: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Nest CSV rows into the JSON spec structure, converting charge cells."""
+    products: List[Dict[str, Any]] = []
+    products_by_name: Dict[str, Dict[str, Any]] = {}
+    errors: List[str] = []
+    product: Optional[Dict[str, Any]] = None
+    rate_plan: Optional[Dict[str, Any]] = None
+
+    for line, row in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        values = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and isinstance(value, str) and value.strip()
+        }
+        row_type = values.pop("type", "").lower().replace(" ", "_")
+        product_name = values.pop("product", None)
+        rate_plan_name = values.pop("rate_plan", None)
+
+        if row_type == "product":
+            product = {**values, "rate_plans": []}
+            rate_plan = None
+            products.append(product)
+            products_by_name.setdefault(values.get("name", "").lower(), product)
+            continue
+        if row_type not in ("rate_plan", "charge"):
+            errors.append(
+                f"Line {line}: type must be product, rate_plan or charge, "
+                f"got: {row_type or '(empty)'}"
+            )
+            continue
+
+        # Parent named in the row, otherwise the one above it
+        if product_name is not None:
+            product = products_by_name.get(product_name.lower())
+            if product is None:
+                errors.append(f"Line {line}: unknown product '{product_name}'")
+                continue
+            rate_plan = product["rate_plans"][-1] if product["rate_plans"] else None
+        if product is None:
+            errors.append(f"Line {line}: {row_type} row before any product")
+            continue
+
+        if row_type == "rate_plan":
+            rate_plan = {**values, "charges": []}
+            product["rate_plans"].append(rate_plan)
+            continue
+
+        if rate_plan_name is not None:
+            rate_plan = _find_rate_plan(product, rate_plan_name)
+        if rate_plan is None:
+            errors.append(f"Line {line}: charge row without a rate plan")
+            continue
+        try:
+            charge = {k: _convert(k, v, from_text=True) for k, v in values.items()}
+        except ValueError as e:
+            errors.append(f"Line {line}: {e}")
+            continue
+        rate_plan["charges"].append(charge)
+    return products, errors
+
+
+def parse_catalog_spec(
+    spec: str, spec_format: str = "json"
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Parse a catalog spec into products with nested rate plans and charges.
+
+    Args:
+        spec: Spec text (see module docstring)
+        spec_format: "json" or "csv"
+
+    Returns:
+        Tuple of (products, errors)
+    """
+    spec_format = spec_format.lower()
+    if spec_format == "csv":
+        return _csv_to_products(spec)
+    if spec_format != "json":
+        return [], [f"Unknown spec format '{spec_format}' (use json or csv)"]
+    try:
+        data = json.loads(spec)
+    except json.JSONDecodeError as e:
+        return [], [f"Spec is not valid JSON: {e}"]
+    products = data.get("products") if isinstance(data, dict) else data
+    if not isinstance(products, list):
+        return [], ['Spec must be a list of products or {"products": [...]}']
+    return products, []
+
+
+# ============ Ingestion ============
+
+
+def _payload_id(store: PayloadStore, api_type: str, index: int, name: str) -> str:
+    """Deterministic 8-character payload_id, unique within the store."""
+    seed = f"{api_type}:{index}:{name}"
+    while True:
+        payload_id = hashlib.blake2b(seed.encode(), digest_size=4).hexdigest()
+        if store.get(payload_id) is None:
+            return payload_id
+        seed += "'"
+
+
+def _split(
+    item: Any,
+    allowed: Tuple[str, ...],
+    children: str,
+    label: str,
+    types: Dict[str, Any],
+) -> Tuple[Dict[str, Any], List[Any], Optional[str]]:
+    """
+    Separate an item's arguments from its children and type-check them.
+
+    Returns:
+        Tuple of (arguments, children, error); on an error (unknown field,
+        wrong type) the arguments are only good for labels
+    """
+    if not isinstance(item, dict):
+        return {}, [], f"{label}: expected an object, got {type(item).__name__}"
+    args = {k: v for k, v in item.items() if k != children and v is not None}
+    nested = item.get(children) or []
+    unknown = sorted(set(args) - set(allowed))
+    if unknown:
+        return args, nested, f"{label}: unknown field(s) {', '.join(unknown)}"
+    if not isinstance(nested, list):
+        return args, [], f"{label}: {children} must be a list"
+    try:
+        args = {k: _convert(k, v, types=types) for k, v in args.items()}
+    except ValueError as e:
+        return args, nested, f"{label}: {e}"
+    return args, nested, None
+
+
+def ingest_catalog(
+    products: List[Dict[str, Any]],
+    store: PayloadStore,
+    available_uoms: Optional[List[str]] = None,
+) -> IngestResult:
+    """
+    Build the payloads for a parsed catalog spec and add them to a store.
+
+    Objects are processed in spec order. An object whose arguments are invalid
+    is reported in errors and skipped with everything nested under it; objects
+    with missing required fields get placeholders, as with the tools.
+
+    Args:
+        products: Products from parse_catalog_spec()
+        store: Payload store to add to (its existing payloads shift the
+               object reference indexes, as for the tools)
+        available_uoms: Tenant UOM names (fetched once from settings if None)
+
+    Returns:
+        IngestResult with the new payloads
+    """
+    if available_uoms is None:
+        from .zuora_settings import get_available_uom_names
+
+        available_uoms = get_available_uom_names()
+
+    result = IngestResult()
+
+    def add(api_type: str, payload_data: Dict[str, Any]) -> int:
+        index = store.count(api_type)
+        payload_id = _payload_id(
+            store, api_type, index, str(payload_data.get("Name", ""))
+        )
+        entry, placeholders = _new_payload_entry(api_type, payload_data, payload_id)
+        store.append(entry)
+        result.payloads.append(entry)
+        result.counts[api_type] = result.counts.get(api_type, 0) + 1
+        if placeholders:
+            result.with_placeholders += 1
+        return index
+
+    def check_name(label: str, name: Any, kind: str, unique: Tuple) -> None:
+        is_valid_len, len_warning = validate_name_length(name, kind)
+        if not is_valid_len and len_warning:
+            result.warnings.append(f"{label}: {len_warning}")
+        if not unique[0] and unique[1]:
+            result.warnings.append(f"{label}: {unique[1]}")
+
+    for p, product in enumerate(products):
+        label = f"Product {p + 1}"
+        args, rate_plans, error = _split(
+            product,
+            PRODUCT_FIELDS + ("product_id",),
+            "rate_plans",
+            label,
+            _PRODUCT_TYPES,
+        )
+        if args.get("name"):
+            label = f"Product '{args['name']}'"
+        if error:
+            result.errors.append(error)
+            continue
+
+        if "product_id" in args:
+            product_ref = args.pop("product_id")
+            if args:
+                result.errors.append(
+                    f"{label}: product_id cannot be combined with {', '.join(args)}"
+                )
+                continue
+        else:
+            if not args.get("name"):
+                result.errors.append(f"{label}: name is required")
+                continue
+            payload_data, _, error = _build_product_payload(**args)
+            if error:
+                result.errors.append(f"{label}: {error}")
+                continue
+            check_name(
+                label,
+                args["name"],
+                "Product name",
+                validate_product_name_unique(args["name"], store),
+            )
+            product_ref = f"@{{Product[{add('product_create', payload_data)}].Id}}"
+
+        for r, rate_plan in enumerate(rate_plans):
+            rp_label = f"{label} rate plan {r + 1}"
+            args, charges, error = _split(
+                rate_plan,
+                RATE_PLAN_FIELDS + ("rate_plan_id",),
+                "charges",
+                rp_label,
+                _RATE_PLAN_TYPES,
+            )
+            if args.get("name"):
+                rp_label = f"{label} rate plan '{args['name']}'"
+            if error:
+                result.errors.append(error)
+                continue
+
+            if "rate_plan_id" in args:
+                rate_plan_ref = args.pop("rate_plan_id")
+                if args or not validate_zuora_id(rate_plan_ref):
+                    result.errors.append(
+                        f"{rp_label}: rate_plan_id must be a valid Zuora ID "
+                        "and the only field"
+                    )
+                    continue
+            else:
+                payload_data, error = _build_rate_plan_payload(product_ref, **args)
+                if error:
+                    result.errors.append(f"{rp_label}: {error}")
+                    continue
+                if args.get("name"):
+                    check_name(
+                        rp_label,
+                        args["name"],
+                        "Rate plan name",
+                        validate_rate_plan_name_unique(
+                            args["name"], product_ref, store
+                        ),
+                    )
+                index = add("rate_plan_create", payload_data)
+                rate_plan_ref = f"@{{ProductRatePlan[{index}].Id}}"
+
+            for c, charge in enumerate(charges):
+                ch_label = f"{rp_label} charge {c + 1}"
+                args, _, error = _split(
+                    charge, CHARGE_FIELDS, "", ch_label, _CHARGE_TYPES
+                )
+                if args.get("name"):
+                    ch_label = f"{rp_label} charge '{args['name']}'"
+                if error:
+                    result.errors.append(error)
+                    continue
+
+                payload_data, _, warnings = _build_charge_payload(
+                    rate_plan_ref, available_uoms, **args
+                )
+                result.warnings.extend(f"{ch_label}: {w}" for w in warnings)
+                if args.get("name"):
+                    check_name(
+                        ch_label,
+                        args["name"],
+                        "Charge name",
+                        validate_charge_name_unique(args["name"], rate_plan_ref, store),
+                    )
+                add("charge_create", payload_data)
+
+    return result
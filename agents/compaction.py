@@ -0,0 +1,298 @@
+"""
+Background compaction of conversation histories.
+
+After a turn is saved, the conversation's history is compacted off the request
+path so the next turn starts from a small prompt:
+- turns older than the most recent ones are condensed to the user's request
+  and the final answer (tool calls and tool results removed)
+- bulky tool results (SeedSpecs, planning payloads, knowledge-base dumps) are
+  replaced by a short head plus a note of what was removed
+- a structured state line (live payloads, tools used) is kept in the summary
+  block so condensed turns can still be referred to
+
+The compacted history replaces the stored one only if no newer turn was saved
+while compaction ran.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from .config import (
+    COMPACTION_ANSWER_CHARS,
+    COMPACTION_ENABLED,
+    COMPACTION_KEEP_RECENT_TURNS,
+    COMPACTION_TOOL_RESULT_CHARS,
+)
+from .conversation import (
+    STATE_PREFIX,
+    ConversationStore,
+    Message,
+    estimate_tokens,
+    get_conversation_store,
+    is_turn_start,
+    pop_summary,
+    split_turns,
+    with_summary,
+)
+from .observability import get_tracer
+
+logger = logging.getLogger(__name__)
+
+COMPACTED_MARKER = "[compacted:"
+
+
+# ============ Compaction ============
+
+
+def _tool_names_by_id(turn: List[Message]) -> Dict[str, str]:
+    """Map toolUseId to tool name for every tool call in a turn."""
+    names = {}
+    for message in turn:
+        for block in message.get("content", []):
+            if "toolUse" in block:
+                tool_use = block["toolUse"]
+                names[tool_use.get("toolUseId", "")] = tool_use.get("name", "unknown")
+    return names
+
+
+def _compact_tool_result_text(text: str, tool_name: str, max_chars: int) -> str:
+    """Replace a bulky tool result with its head and a note of what was removed."""
+    if len(text) <= max_chars or COMPACTED_MARKER in text:
+        return text
+    head = text[: max_chars // 2]
+    return (
+        f"{head}\n{COMPACTED_MARKER} {tool_name} output, "
+        f"{len(text) - len(head)} more characters omitted. "
+        f"Call the tool again if the full output is needed.]"
+    )
+
+
+def _compact_tool_results(turn: List[Message], max_chars: int) -> List[Message]:
+    """Compact every oversized tool result in a turn."""
+    names = _tool_names_by_id(turn)
+    compacted = []
+    for message in turn:
+        content = []
+        for block in message.get("content", []):
+            if "toolResult" in block:
+                result = block["toolResult"]
+                tool_name = names.get(result.get("toolUseId", ""), "tool")
+                items = []
+                for item in result.get("content", []):
+                    if "json" in item:
+                        item = {"text": json.dumps(item["json"], default=str)}
+                    if "text" in item:
+                        item = {
+                            "text": _compact_tool_result_text(
+                                item["text"], tool_name, max_chars
+                            )
+                        }
+                    items.append(item)
+                block = {"toolResult": {**result, "content": items}}
+            content.append(block)
+        compacted.append({**message, "content": content})
+    return compacted
+
+
+def _condense_turn(turn: List[Message], answer_chars: int) -> List[Message]:
+    """Reduce a turn to the user's request and the final answer text."""
+    request = [c for c in turn[0].get("content", []) if "text" in c]
+    answer = ""
+    for message in reversed(turn[1:]):
+        if message.get("role") == "assistant":
+            texts = [c["text"] for c in message.get("content", []) if "text" in c]
+            if texts:
+                answer = "\n".join(texts)
+                break
+
+    if len(answer) > answer_chars:
+        answer = answer[:answer_chars] + " …"
+    return [
+        {"role": "user", "content": request},
+        {"role": "assistant", "content": [{"text": answer or "(no answer)"}]},
+    ]
+
+
+def _parse_state(summary_lines: List[str]) -> Dict[str, Any]:
+    """Read the latest structured state line from a summary."""
+    for line in reversed(summary_lines):
+        if line.startswith(STATE_PREFIX):
+            try:
+                return json.loads(line[len(STATE_PREFIX) :])
+            except json.JSONDecodeError:
+                break
+    return {}
+
+
+def _payload_refs(payloads: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Summarise live payloads as id, type and name."""
+    refs = []
+    for p in payloads:
+        data = p.get("payload", {}) or {}
+        refs.append(
+            {
+                "payload_id": p.get("payload_id", "?"),
+                "type": p.get("zuora_api_type", "unknown"),
+                "name": str(data.get("Name", data.get("name", "unnamed"))),
+            }
+        )
+    return refs
+
+
+def compact_messages(
+    messages: List[Message],
+    payloads: Optional[List[Dict[str, Any]]] = None,
+    keep_recent_turns: int = COMPACTION_KEEP_RECENT_TURNS,
+    tool_result_chars: int = COMPACTION_TOOL_RESULT_CHARS,
+    answer_chars: int = COMPACTION_ANSWER_CHARS,
+) -> List[Message]:
+    """
+    Compact a conversation history.
+
+    Args:
+        messages: Full message history (oldest first)
+        payloads: Payloads in agent state after the turn (for structured state)
+        keep_recent_turns: Most recent turns kept verbatim (tool results still compacted)
+        tool_result_chars: Tool results longer than this are compacted
+        answer_chars: Maximum answer length kept for condensed turns
+
+    Returns:
+        The compacted history. Compacting an already compacted history
+        returns it unchanged.
+    """
+    turns = split_turns(messages)
+    if not turns:
+        return messages
+
+    summary_lines = pop_summary(turns[0])
+    state = _parse_state(summary_lines)
+    tools_used: Dict[str, int] = dict(state.get("tools_used", {}))
+    condensed = state.get("condensed_turns", 0)
+
+    keep_from = max(len(turns) - max(keep_recent_turns, 1), 0)
+    compacted_turns = []
+    for index, turn in enumerate(turns):
+        names = _tool_names_by_id(turn)
+        if index < keep_from and names and is_turn_start(turn[0]):
+            for name in names.values():
+                tools_used[name] = tools_used.get(name, 0) + 1
+            condensed += 1
+            compacted_turns.append(_condense_turn(turn, answer_chars))
+        else:
+            compacted_turns.append(_compact_tool_results(turn, tool_result_chars))
+
+    if condensed:
+        new_state = {
+            "payloads": _payload_refs(payloads or []),
+            "tools_used": tools_used,
+            "condensed_turns": condensed,
+        }
+        summary_lines = [
+            line for line in summary_lines if not line.startswith(STATE_PREFIX)
+        ]
+        summary_lines.insert(
+            0,
+            STATE_PREFIX + json.dumps(new_state, sort_keys=True, separators=(",", ":")),
+        )
+
+    compacted_turns[0] = with_summary(compacted_turns[0], summary_lines)
+    return [message for turn in compacted_turns for message in turn]
+
+
+# ============ Background Compactor ============
+
+
+class BackgroundCompactor:
+    """
+    Runs compaction for saved conversations on a worker thread.
+
+    At most one compaction per conversation is queued at a time; a turn saved
+    while compaction runs makes that compaction's result stale, and it is
+    discarded (the next turn schedules a fresh one).
+    """
+
+    def __init__(self, store: ConversationStore, max_workers: int = 1):
+        self.store = store
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="compaction"
+        )
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stats = {"scheduled": 0, "compacted": 0, "stale": 0, "errors": 0}
+
+    def schedule(self, key: str, payloads: Optional[List[Dict[str, Any]]] = None):
+        """
+        Queue compaction for a conversation. Returns immediately.
+
+        Args:
+            key: Conversation key in the store
+            payloads: Payloads in agent state after the turn
+
+        Returns:
+            Future for the compaction, or None if one is already queued
+        """
+        with self._lock:
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+            self._stats["scheduled"] += 1
+        return self._executor.submit(self._run, key, list(payloads or []))
+
+    def _run(self, key: str, payloads: List[Dict[str, Any]]) -> bool:
+        """Compact one conversation. Returns True if the store was updated."""
+        try:
+            with self._lock:
+                self._pending.discard(key)
+            messages, version = self.store.snapshot(key)
+            if not messages:
+                return False
+
+            with get_tracer().start_as_current_span("conversation.compact") as span:
+                compacted = compact_messages(messages, payloads)
+                if compacted == messages:
+                    return False
+
+                tokens_before = estimate_tokens(messages)
+                tokens_after = estimate_tokens(compacted)
+                span.set_attribute("tokens_before", tokens_before)
+                span.set_attribute("tokens_after", tokens_after)
+
+                if not self.store.replace(key, compacted, version):
+                    span.set_attribute("stale", True)
+                    with self._lock:
+                        self._stats["stale"] += 1
+                    return False
+
+            with self._lock:
+                self._stats["compacted"] += 1
+            logger.info(
+                f"[COMPACTION] {key}: ~{tokens_before} -> ~{tokens_after} tokens"
+            )
+            return True
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"[COMPACTION] Failed for {key}: {e}")
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Get compaction statistics."""
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending)}
+
+
+# Global compactor instance
+_compactor: Optional[BackgroundCompactor] = None
+
+
+def get_compactor() -> Optional[BackgroundCompactor]:
+    """Get or create the global compactor (None when compaction is disabled)."""
+    global _compactor
+    if not COMPACTION_ENABLED:
+        return None
+    if _compactor is None:
+        _compactor = BackgroundCompactor(get_conversation_store())
+    return _compactor
@@ -12,6 +12,21 @@ ZUORA_ENV = os.getenv("ZUORA_ENV", "sandbox")
 # Observability Configuration
 OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "zuora-seed-agent")
 OTEL_ENABLED = os.getenv("OTEL_ENABLED", "true").lower() == "true"
+# Allow {"debug_action": ...} payloads on the entrypoint (e.g. live latency stats)
+# and per-request profiling; enable only in development and load tests
+DEBUG_ACTIONS_ENABLED = os.getenv("DEBUG_ACTIONS_ENABLED", "false").lower() == "true"
+
+# Sampling profiler: fraction of requests profiled (requests can also ask with
+# "profile": true), sampling interval, and where collapsed stacks/flamegraphs go
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "")
+
+# Memory telemetry: trace Python allocations for the "memory" debug action
+MEMORY_TRACEMALLOC_ENABLED = (
+    os.getenv("MEMORY_TRACEMALLOC_ENABLED", "false").lower() == "true"
+)
+MEMORY_TRACEMALLOC_FRAMES = int(os.getenv("MEMORY_TRACEMALLOC_FRAMES", "5"))
 
 # Performance Configuration
 ZUORA_API_CACHE_ENABLED = os.getenv("ZUORA_API_CACHE_ENABLED", "true").lower() == "true"
@@ -23,6 +38,30 @@ ZUORA_API_RETRY_BACKOFF_FACTOR = float(
 ZUORA_API_CONNECTION_POOL_SIZE = int(os.getenv("ZUORA_API_CONNECTION_POOL_SIZE", "10"))
 ZUORA_API_REQUEST_TIMEOUT = int(os.getenv("ZUORA_API_REQUEST_TIMEOUT", "15"))
 ZUORA_OAUTH_TIMEOUT = int(os.getenv("ZUORA_OAUTH_TIMEOUT", "10"))
+# Parallel catalog reads (products / charges) per bulk tool call
+CATALOG_FETCH_WORKERS = int(os.getenv("CATALOG_FETCH_WORKERS", "8"))
 
 # Conversation History Management
 MAX_CONVERSATION_TURNS = int(os.getenv("MAX_CONVERSATION_TURNS", "3"))
+# Estimated prompt tokens kept from earlier turns (older turns are summarised)
+CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "8000"))
+CONVERSATION_STORE_MAX_SIZE = int(os.getenv("CONVERSATION_STORE_MAX_SIZE", "500"))
+CONVERSATION_STORE_TTL_SECONDS = int(
+    os.getenv("CONVERSATION_STORE_TTL_SECONDS", "3600")
+)
+
+# Server-side payload sessions (opt-in per request with payload_session=true)
+PAYLOAD_SESSION_MAX_SIZE = int(os.getenv("PAYLOAD_SESSION_MAX_SIZE", "500"))
+PAYLOAD_SESSION_TTL_SECONDS = int(os.getenv("PAYLOAD_SESSION_TTL_SECONDS", "3600"))
+# Directory for persisted sessions (empty = memory only)
+PAYLOAD_SESSION_DIR = os.getenv("PAYLOAD_SESSION_DIR", "")
+
+# Conversations whose payload reviews are kept for reuse on the next turn
+PAYLOAD_REVIEW_CACHE_SIZE = int(os.getenv("PAYLOAD_REVIEW_CACHE_SIZE", "500"))
+
+# Background Conversation Compaction
+COMPACTION_ENABLED = os.getenv("COMPACTION_ENABLED", "true").lower() == "true"
+# Most recent turns kept verbatim; older turns keep only request and answer
+COMPACTION_KEEP_RECENT_TURNS = int(os.getenv("COMPACTION_KEEP_RECENT_TURNS", "1"))
+COMPACTION_TOOL_RESULT_CHARS = int(os.getenv("COMPACTION_TOOL_RESULT_CHARS", "2000"))
+COMPACTION_ANSWER_CHARS = int(os.getenv("COMPACTION_ANSWER_CHARS", "800"))
@@ -0,0 +1,451 @@
+"""
+Conversation history management for the persona agents.
+
+Each conversation keeps its own message history (ConversationStore), which is
+loaded into the shared persona agent for a turn and saved back afterwards.
+TokenBudgetConversationManager bounds what is re-sent to the model:
+- a sliding window of the most recent turns
+- older turns whose tool results still reference live payloads are pinned
+- everything else is dropped and folded into a short summary
+- the kept history must fit a token budget (estimated from characters)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from strands.agent.conversation_manager import ConversationManager
+from strands.types.exceptions import ContextWindowOverflowException
+
+from .config import (
+    CONVERSATION_STORE_MAX_SIZE,
+    CONVERSATION_STORE_TTL_SECONDS,
+    CONVERSATION_TOKEN_BUDGET,
+    MAX_CONVERSATION_TURNS,
+)
+from .memory_telemetry import register_memory_source
+
+logger = logging.getLogger(__name__)
+
+PAYLOADS_STATE_KEY = "zuora_api_payloads"
+
+# Rough token estimate used for budgeting (no tokenizer round-trip)
+CHARS_PER_TOKEN = 4
+
+# Marks the text block that carries the summary of dropped turns
+SUMMARY_PREFIX = "[Earlier in this conversation]"
+# Summary line carrying structured state (written by background compaction)
+STATE_PREFIX = "State: "
+SUMMARY_MAX_LINES = 20
+SUMMARY_LINE_MAX_CHARS = 200
+
+# Tool results larger than this are truncated when the budget cannot be met
+# by dropping turns alone
+TRUNCATED_RESULT_CHARS = 1500
+
+Message = Dict[str, Any]
+
+
+# ============ Token Estimation ============
+
+
+def _block_chars(block: Dict[str, Any]) -> int:
+    """Approximate the size of a content block in characters."""
+    if "text" in block:
+        return len(block["text"])
+    if "toolUse" in block:
+        tool_use = block["toolUse"]
+        return len(tool_use.get("name", "")) + len(
+            json.dumps(tool_use.get("input", {}), default=str)
+        )
+    if "toolResult" in block:
+        return sum(_block_chars(c) for c in block["toolResult"].get("content", []))
+    if "json" in block:
+        return len(json.dumps(block["json"], default=str))
+    return len(str(block))
+
+
+def estimate_message_tokens(message: Message) -> int:
+    """Estimate the tokens a message adds to the prompt."""
+    chars = sum(_block_chars(block) for block in message.get("content", []))
+    return chars // CHARS_PER_TOKEN + 1
+
+
+def estimate_tokens(messages: List[Message]) -> int:
+    """Estimate the tokens a list of messages adds to the prompt."""
+    return sum(estimate_message_tokens(m) for m in messages)
+
+
+# ============ Turn Handling ============
+
+
+def is_turn_start(message: Message) -> bool:
+    """A turn starts with a user message that is not a tool result."""
+    if message.get("role") != "user":
+        return False
+    content = message.get("content", [])
+    return any("text" in c for c in content) and not any(
+        "toolResult" in c for c in content
+    )
+
+
+def split_turns(messages: List[Message]) -> List[List[Message]]:
+    """
+    Split a message history into turns.
+
+    A turn is a user message followed by the assistant messages and tool
+    results it produced. Messages before the first turn start (e.g. a history
+    whose head was trimmed elsewhere) form their own leading group.
+    """
+    turns: List[List[Message]] = []
+    for message in messages:
+        if not turns or is_turn_start(message):
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def _tool_result_texts(turn: List[Message]) -> List[str]:
+    """Collect the text of every tool result in a turn."""
+    texts = []
+    for message in turn:
+        for block in message.get("content", []):
+            if "toolResult" in block:
+                for item in block["toolResult"].get("content", []):
+                    if "text" in item:
+                        texts.append(item["text"])
+                    elif "json" in item:
+                        texts.append(json.dumps(item["json"], default=str))
+    return texts
+
+
+def _references_live_payload(turn: List[Message], live_payload_ids: Set[str]) -> bool:
+    """Check whether any tool result in the turn mentions a live payload id."""
+    if not live_payload_ids:
+        return False
+    for text in _tool_result_texts(turn):
+        if any(payload_id in text for payload_id in live_payload_ids):
+            return True
+    return False
+
+
+def pop_summary(turn: List[Message]) -> List[str]:
+    """Remove the summary block from a turn's first message, returning its lines."""
+    first = turn[0]
+    content = first.get("content", [])
+    if content and content[0].get("text", "").startswith(SUMMARY_PREFIX):
+        summary = content[0]["text"]
+        turn[0] = {**first, "content": content[1:]}
+        return [line for line in summary.split("\n")[1:] if line.strip()]
+    return []
+
+
+def summarize_turn(turn: List[Message]) -> str:
+    """Build a one-line summary of a dropped turn."""
+    request = ""
+    tools: List[str] = []
+    for message in turn:
+        for block in message.get("content", []):
+            if not request and message.get("role") == "user" and "text" in block:
+                request = " ".join(block["text"].split())
+            elif "toolUse" in block:
+                tools.append(block["toolUse"].get("name", "unknown"))
+
+    line = f"- User asked: {request[:SUMMARY_LINE_MAX_CHARS]}"
+    if tools:
+        line += f" (tools used: {', '.join(dict.fromkeys(tools))})"
+    return line
+
+
+def _summary_block_lines(summary_lines: List[str]) -> List[str]:
+    """Keep the latest state line plus the most recent summary lines."""
+    state = [line for line in summary_lines if line.startswith(STATE_PREFIX)]
+    others = [line for line in summary_lines if not line.startswith(STATE_PREFIX)]
+    return state[-1:] + others[-SUMMARY_MAX_LINES:]
+
+
+def with_summary(turn: List[Message], summary_lines: List[str]) -> List[Message]:
+    """Prepend the summary block to a turn's first message."""
+    if not summary_lines:
+        return turn
+    summary = "\n".join([SUMMARY_PREFIX] + _summary_block_lines(summary_lines))
+    first = turn[0]
+    return [
+        {**first, "content": [{"text": summary}] + list(first.get("content", []))}
+    ] + turn[1:]
+
+
+def _truncate_tool_results(turn: List[Message], max_chars: int) -> List[Message]:
+    """Shorten oversized tool result texts in a turn."""
+    new_turn = []
+    for message in turn:
+        new_content = []
+        for block in message.get("content", []):
+            if "toolResult" in block:
+                result = block["toolResult"]
+                items = []
+                for item in result.get("content", []):
+                    text = item.get("text")
+                    if text is not None and len(text) > max_chars:
+                        item = {
+                            "text": text[:max_chars]
+                            + f"\n...[truncated {len(text) - max_chars} characters]"
+                        }
+                    items.append(item)
+                block = {"toolResult": {**result, "content": items}}
+            new_content.append(block)
+        new_turn.append({**message, "content": new_content})
+    return new_turn
+
+
+def window_messages(
+    messages: List[Message],
+    live_payload_ids: Set[str],
+    max_turns: int = MAX_CONVERSATION_TURNS,
+    token_budget: int = CONVERSATION_TOKEN_BUDGET,
+) -> List[Message]:
+    """
+    Apply the sliding window and token budget to a message history.
+
+    Args:
+        messages: Full message history (oldest first)
+        live_payload_ids: payload_ids currently held in agent state
+        max_turns: Number of most recent turns always considered for the window
+        token_budget: Maximum estimated tokens for the kept history
+
+    Returns:
+        The bounded history. Dropped turns are summarised in a text block on
+        the first kept user message.
+    """
+    turns = split_turns(messages)
+    if not turns:
+        return messages
+
+    summary_lines = pop_summary(turns[0])
+    window_start = max(len(turns) - max(max_turns, 1), 0)
+
+    # (turn, pinned) for every kept turn, oldest first
+    kept: List[Tuple[List[Message], bool]] = []
+    for index, turn in enumerate(turns):
+        if index >= window_start:
+            kept.append((turn, False))
+        elif _references_live_payload(turn, live_payload_ids):
+            kept.append((turn, True))
+        else:
+            summary_lines.append(summarize_turn(turn))
+
+    def kept_tokens() -> int:
+        summary_chars = sum(
+            len(line) + 1 for line in _summary_block_lines(summary_lines)
+        )
+        return sum(estimate_tokens(turn) for turn, _ in kept) + (
+            summary_chars // CHARS_PER_TOKEN
+        )
+
+    # Over budget: drop the oldest unpinned turns first, then pinned ones,
+    # but always keep the most recent turn
+    while len(kept) > 1 and kept_tokens() > token_budget:
+        drop_index = next(
+            (i for i, (_, pinned) in enumerate(kept[:-1]) if not pinned), 0
+        )
+        turn, _ = kept.pop(drop_index)
+        summary_lines.append(summarize_turn(turn))
+
+    if kept_tokens() > token_budget:
+        kept = [
+            (_truncate_tool_results(turn, TRUNCATED_RESULT_CHARS), pinned)
+            for turn, pinned in kept
+        ]
+
+    # A leading group that does not start with a user message cannot lead the history
+    while len(kept) > 1 and not is_turn_start(kept[0][0][0]):
+        turn, _ = kept.pop(0)
+        summary_lines.append(summarize_turn(turn))
+
+    kept_turns = [turn for turn, _ in kept]
+    kept_turns[0] = with_summary(kept_turns[0], summary_lines)
+    return [message for turn in kept_turns for message in turn]
+
+
+# ============ Strands Conversation Manager ============
+
+
+class TokenBudgetConversationManager(ConversationManager):
+    """
+    Conversation manager enforcing a per-conversation token budget.
+
+    Applied by the agent after every invocation, and with a halved window
+    and budget when the model reports a context window overflow.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = MAX_CONVERSATION_TURNS,
+        token_budget: int = CONVERSATION_TOKEN_BUDGET,
+    ):
+        super().__init__()
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+
+    def _live_payload_ids(self, agent: Any) -> Set[str]:
+        payloads = agent.state.get(PAYLOADS_STATE_KEY) or []
+        return {p["payload_id"] for p in payloads if p.get("payload_id")}
+
+    def _apply(self, agent: Any, max_turns: int, token_budget: int) -> bool:
+        """Window the agent's messages in place. Returns True if anything changed."""
+        messages = agent.messages
+        windowed = window_messages(
+            messages,
+            self._live_payload_ids(agent),
+            max_turns=max_turns,
+            token_budget=token_budget,
+        )
+        if windowed == messages:
+            return False
+
+        removed = max(len(messages) - len(windowed), 0)
+        self.removed_message_count += removed
+        messages[:] = windowed
+        logger.info(
+            f"[CONVERSATION] Windowed history: removed {removed} messages, "
+            f"~{estimate_tokens(windowed)} tokens kept"
+        )
+        return True
+
+    def apply_management(self, agent: Any, **kwargs: Any) -> None:
+        """Bound the history after an invocation."""
+        self._apply(agent, self.max_turns, self.token_budget)
+
+    def reduce_context(
+        self, agent: Any, e: Optional[Exception] = None, **kwargs: Any
+    ) -> None:
+        """Shrink the history after a context window overflow."""
+        if not self._apply(
+            agent, max(self.max_turns // 2, 1), max(self.token_budget // 2, 1)
+        ):
+            raise ContextWindowOverflowException(
+                "Unable to reduce conversation history further"
+            ) from e
+
+
+# ============ Per-Conversation Store ============
+
+
+class ConversationStore:
+    """
+    Thread-safe LRU store of message histories keyed by conversation.
+
+    Entries expire after a period without access; the least recently used
+    entry is evicted when the store is full.
+    """
+
+    def __init__(
+        self,
+        max_conversations: int = CONVERSATION_STORE_MAX_SIZE,
+        ttl_seconds: int = CONVERSATION_STORE_TTL_SECONDS,
+    ):
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        # key -> (messages, last access time, version)
+        self._entries: "OrderedDict[str, Tuple[List[Message], float, int]]" = (
+            OrderedDict()
+        )
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Tuple[List[Message], float, int]]:
+        """Get an unexpired entry, refreshing its access time (lock held)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        messages, last_access, version = entry
+        if time.time() - last_access > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        entry = (messages, time.time(), version)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        return entry
+
+    def load(self, key: str) -> List[Message]:
+        """Get a copy of the stored history (empty if unknown or expired)."""
+        return self.snapshot(key)[0]
+
+    def snapshot(self, key: str) -> Tuple[List[Message], int]:
+        """Get a copy of the stored history and its version (0 if unknown)."""
+        with self._lock:
+            entry = self._get(key)
+            if entry is None:
+                return [], 0
+            return list(entry[0]), entry[2]
+
+    def save(self, key: str, messages: List[Message]) -> int:
+        """Store the history for a conversation, returning its new version."""
+        with self._lock:
+            self._version += 1
+            self._entries[key] = (list(messages), time.time(), self._version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_conversations:
+                self._entries.popitem(last=False)
+            return self._version
+
+    def replace(self, key: str, messages: List[Message], version: int) -> bool:
+        """
+        Store a rewritten history only if the conversation has not changed.
+
+        Args:
+            key: Conversation key
+            messages: Rewritten history
+            version: Version returned by snapshot() when the rewrite started
+
+        Returns:
+            True if stored, False if a newer turn was saved in the meantime
+        """
+        with self._lock:
+            entry = self._get(key)
+            if entry is None or entry[2] != version:
+                return False
+            self._version += 1
+            self._entries[key] = (list(messages), time.time(), self._version)
+            return True
+
+    def clear(self) -> None:
+        """Remove all stored histories."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "messages": sum(len(e[0]) for e in self._entries.values()),
+            }
+
+
+# Global store instance
+_conversation_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get or create the global conversation store."""
+    global _conversation_store
+    if _conversation_store is None:
+        _conversation_store = ConversationStore()
+        register_memory_source(
+            "conversation_store.entries", lambda: _conversation_store.stats()["size"]
+        )
+        register_memory_source(
+            "conversation_store.messages",
+            lambda: _conversation_store.stats()["messages"],
+        )
+    return _conversation_store
+
+
+def conversation_key(persona: str, conversation_id: str) -> str:
+    """Histories are per persona, since each persona has its own tool set."""
+    return f"{persona}:{conversation_id}"
@@ -7,6 +7,45 @@ import re
 from typing import List, Dict, Any, Tuple
 
 
+# ============ Precompiled Patterns ============
+
+# Placeholder values in JSON: "<<PLACEHOLDER:...>>"
+_PLACEHOLDER_VALUE_PATTERN = re.compile(r'"(<<PLACEHOLDER:[^>]+>>)"')
+_PLACEHOLDER_SPAN = (
+    '<span style="color: #ff8c00; font-weight: bold; '
+    'background-color: #fff3e0;">{marker}</span>'
+)
+
+# Inline rules (applied to the whole text, may span lines)
+_CODE_BLOCK_PATTERN = re.compile(r"```(\w*)\n?([\s\S]*?)```")
+_INLINE_CODE_PATTERN = re.compile(r"`([^`]+)`")
+_BOLD_PATTERN = re.compile(r"\*\*([^*]+)\*\*")
+_ITALIC_PATTERN = re.compile(r"(?<!\*)\*([^*]+)\*(?!\*)")
+_CODE_PLACEHOLDER_PATTERN = re.compile(r"__(?:CODE_BLOCK|INLINE_CODE)_\d+__")
+
+# Block rules (matched against a single line)
+_HEADER_PATTERN = re.compile(r"(#{1,6})\s+(.+)")
+_HORIZONTAL_RULE_PATTERN = re.compile(r"---+")
+_CHECKED_BOX_PATTERN = re.compile(r"\s*-\s*\[x\]\s*(.+)", re.IGNORECASE)
+_UNCHECKED_BOX_PATTERN = re.compile(r"\s*-\s*\[\s?\]\s*(.+)")
+_TABLE_SEPARATOR_CELL_PATTERN = re.compile(r"[-:]+")
+_ORDERED_ITEM_PATTERN = re.compile(r"(\s*)(\d+)\.\s+(.+)")
+_UNORDERED_ITEM_PATTERN = re.compile(r"(\s*)([-*\u2022])\s+(.+)")
+_UNORDERED_MARKERS = ("-", "*", "\u2022")
+
+# Lines on which the header (`#\s+`) or checkbox (`-\s*[x]\s*`) rules keep
+# matching into the next line; such text goes through the multi-pass path
+_MULTILINE_MARKUP_PATTERN = re.compile(
+    r"^(?:#{1,6}[^\S\n]*|[^\S\n]*-[^\S\n]*(?:\[[^\S\n]?[xX]?[^\S\n]?\]?[^\S\n]*)?)$",
+    re.MULTILINE,
+)
+
+_TABLE_OPEN = '<div style="overflow-x: auto;"><table style="border: 1px solid black; border-collapse: collapse;">'
+_TABLE_CLOSE = "</tbody></table></div>"
+_CHECKED_BOX_HTML = '<label><input type="checkbox" checked disabled> {}</label>'
+_UNCHECKED_BOX_HTML = '<label><input type="checkbox" disabled> {}</label>'
+
+
 def html_escape(text: str) -> str:
     """Escape HTML special characters."""
     return (
@@ -32,8 +71,7 @@ def _extract_code_blocks(text: str) -> Tuple[str, List[Tuple[str, str]]]:
         return placeholder
 
     # Match ```lang\ncode\n``` or ```\ncode\n```
-    pattern = r"```(\w*)\n?([\s\S]*?)```"
-    modified_text = re.sub(pattern, replace_block, text)
+    modified_text = _CODE_BLOCK_PATTERN.sub(replace_block, text)
 
     return modified_text, code_blocks
 
@@ -64,8 +102,7 @@ def _extract_inline_code(text: str) -> Tuple[str, List[str]]:
         return placeholder
 
     # Match `code` but not inside code blocks
-    pattern = r"`([^`]+)`"
-    modified_text = re.sub(pattern, replace_inline, text)
+    modified_text = _INLINE_CODE_PATTERN.sub(replace_inline, text)
 
     return modified_text, inline_codes
 
@@ -91,12 +128,12 @@ def _convert_headers(text: str) -> str:
 
 def _convert_bold(text: str) -> str:
     """Convert **bold** to <strong>."""
-    return re.sub(r"\*\*([^*]+)\*\*", r"<strong>\1</strong>", text)
+    return _BOLD_PATTERN.sub(r"<strong>\1</strong>", text)
 
 
 def _convert_italic(text: str) -> str:
     """Convert *italic* to <em>."""
-    return re.sub(r"(?<!\*)\*([^*]+)\*(?!\*)", r"<em>\1</em>", text)
+    return _ITALIC_PATTERN.sub(r"<em>\1</em>", text)
 
 
 def _convert_horizontal_rule(text: str) -> str:
@@ -303,6 +340,22 @@ def markdown_to_html(text: str) -> str:
     if not text:
         return text
 
+    text = _render_markdown(text)
+
+    # Step 5: Replace \n with <br> for proper HTML line breaks
+    return _convert_line_breaks(text)
+
+
+def _render_markdown(text: str) -> str:
+    """
+    Convert markdown elements to HTML, leaving line breaks as newlines.
+
+    Inline rules run as precompiled whole-text substitutions (they may span
+    lines); block rules run in a single pass over the lines. Text containing
+    a line on which the header or checkbox rules would continue into the next
+    line is handled by the multi-pass pipeline instead, so the output is the
+    same either way.
+    """
     # Step 1: Extract code blocks to preserve them
     text, code_blocks = _extract_code_blocks(text)
 
@@ -310,6 +363,19 @@ def markdown_to_html(text: str) -> str:
     text, inline_codes = _extract_inline_code(text)
 
     # Step 3: Convert markdown elements
+    if _MULTILINE_MARKUP_PATTERN.search(text):
+        text = _convert_markdown_multipass(text)
+    else:
+        text = _convert_bold(text)
+        text = _convert_italic(text)
+        text = _convert_blocks(text)
+
+    # Step 4: Restore code elements
+    return _restore_code(text, inline_codes, code_blocks)
+
+
+def _convert_markdown_multipass(text: str) -> str:
+    """Convert markdown elements with one whole-text pass per rule."""
     text = _convert_headers(text)
     text = _convert_bold(text)
     text = _convert_italic(text)
@@ -317,23 +383,370 @@ def markdown_to_html(text: str) -> str:
     text = _convert_checkboxes(text)
     text = _convert_tables(text)
     text = _convert_ordered_lists(text)
-    text = _convert_unordered_lists(text)
+    return _convert_unordered_lists(text)
 
-    # Step 4: Restore code elements
-    text = _restore_inline_code(text, inline_codes)
-    text = _restore_code_blocks(text, code_blocks)
 
-    # Step 5: Replace \n with <br> for proper HTML line breaks
-    # Only replace \n that are NOT between HTML tags (i.e., content line breaks)
-    # First, replace double newlines with <br><br> (paragraph breaks)
-    # Then replace single newlines with <br> (line breaks)
+def _convert_blocks(text: str) -> str:
+    """
+    Convert headers, rules, checkboxes, tables and lists in one pass.
+
+    Each line goes through the same rules, in the same order, as the
+    multi-pass pipeline; the table and list rules are chained so every rule
+    sees the lines the previous one produced. Whitespace-only lines directly
+    before a checkbox are dropped, as the checkbox pattern's leading
+    whitespace match consumes them. Bold and italic must already be converted.
+    """
+    result: List[str] = []
+    emit = result.append
+    in_table = header_done = in_ordered = in_unordered = False
+    blank_lines: List[str] = []
+
+    def unordered(line: str) -> None:
+        nonlocal in_unordered
+        match = (
+            _UNORDERED_ITEM_PATTERN.fullmatch(line)
+            if line.lstrip()[:1] in _UNORDERED_MARKERS
+            else None
+        )
+        if match:
+            if not in_unordered:
+                emit("<ul>")
+                in_unordered = True
+            emit(f"<li>{match.group(3)}</li>")
+        else:
+            if in_unordered:
+                emit("</ul>")
+                in_unordered = False
+            emit(line)
+
+    def ordered(line: str) -> None:
+        nonlocal in_ordered
+        match = (
+            _ORDERED_ITEM_PATTERN.fullmatch(line)
+            if line.lstrip()[:1].isdecimal()
+            else None
+        )
+        if match:
+            if not in_ordered:
+                unordered("<ol>")
+                in_ordered = True
+            unordered(f"<li>{match.group(3)}</li>")
+        else:
+            if in_ordered:
+                unordered("</ol>")
+                in_ordered = False
+            unordered(line)
+
+    def table(line: str) -> None:
+        nonlocal in_table, header_done
+        stripped = line.strip()
+        if "|" in line and stripped.startswith("|") and stripped.endswith("|"):
+            cells = [c.strip() for c in line.strip("|").split("|")]
+            # Skip separator row (|---|---|)
+            if all(_TABLE_SEPARATOR_CELL_PATTERN.fullmatch(c) for c in cells):
+                return
+            if not in_table:
+                ordered(_TABLE_OPEN)
+                in_table = True
+                header_done = False
+            if not header_done:
+                ordered("<thead><tr>")
+                for cell in cells:
+                    ordered(
+                        f'<th style="border: 1px solid black; padding: 5px;">{cell}</th>'
+                    )
+                ordered("</tr></thead>")
+                ordered("<tbody>")
+                header_done = True
+            else:
+                ordered("<tr>")
+                for cell in cells:
+                    ordered(
+                        f'<td style="border: 1px solid black; padding: 5px;">{cell}</td>'
+                    )
+                ordered("</tr>")
+        else:
+            if in_table:
+                ordered(_TABLE_CLOSE)
+                in_table = False
+                header_done = False
+            ordered(line)
+
+    for line in text.split("\n"):
+        if line.startswith("#"):
+            match = _HEADER_PATTERN.fullmatch(line)
+            if match:
+                level = len(match.group(1))
+                line = f"<h{level}>{match.group(2)}</h{level}>"
+        elif line.startswith("---") and _HORIZONTAL_RULE_PATTERN.fullmatch(line):
+            line = "<hr>"
+        elif not line or line.isspace():
+            blank_lines.append(line)
+            continue
+
+        if "-" in line and "[" in line:
+            match = _CHECKED_BOX_PATTERN.fullmatch(line)
+            if match:
+                line = _CHECKED_BOX_HTML.format(match.group(1))
+            else:
+                match = _UNCHECKED_BOX_PATTERN.fullmatch(line)
+                if match:
+                    line = _UNCHECKED_BOX_HTML.format(match.group(1))
+            if match:
+                blank_lines.clear()
+
+        for blank_line in blank_lines:
+            table(blank_line)
+        blank_lines.clear()
+        table(line)
+
+    for blank_line in blank_lines:
+        table(blank_line)
+    if in_table:
+        ordered(_TABLE_CLOSE)
+    if in_ordered:
+        unordered("</ol>")
+    if in_unordered:
+        emit("</ul>")
+
+    return "\n".join(result)
+
+
+def _restore_code(
+    text: str, inline_codes: List[str], code_blocks: List[Tuple[str, str]]
+) -> str:
+    """Restore inline code and code blocks in a single substitution pass."""
+    if not inline_codes and not code_blocks:
+        return text
+    if any("__" in code for code in inline_codes):
+        # Restored code could itself contain a placeholder; keep replace order
+        text = _restore_inline_code(text, inline_codes)
+        return _restore_code_blocks(text, code_blocks)
+
+    replacements: Dict[str, str] = {}
+    for i, code in enumerate(inline_codes):
+        replacements[f"__INLINE_CODE_{i}__"] = f"<code>{html_escape(code)}</code>"
+    for i, (lang, code) in enumerate(code_blocks):
+        escaped_code = html_escape(code.strip())
+        if lang:
+            html_block = (
+                f'<pre><code class="language-{lang}">{escaped_code}</code></pre>'
+            )
+        else:
+            html_block = f"<pre><code>{escaped_code}</code></pre>"
+        replacements[f"__CODE_BLOCK_{i}__"] = html_block
+
+    return _CODE_PLACEHOLDER_PATTERN.sub(
+        lambda match: replacements.get(match.group(0), match.group(0)), text
+    )
+
+
+def _convert_line_breaks(text: str) -> str:
+    """
+    Replace content line breaks with <br>.
+
+    Only replaces \n that are NOT between HTML tags (i.e., content line breaks).
+    First, replace double newlines with <br><br> (paragraph breaks), then
+    replace single newlines with <br> (line breaks).
+    """
     # Pattern: \n that is NOT preceded by > or followed by <
     text = re.sub(r"(?<!>)\n\n(?!<)", "<br><br>", text)
     text = re.sub(r"(?<!>)\n(?!<)", "<br>", text)
-
     return text
 
 
+# ============ Incremental Conversion ============
+
+# Blank-line runs are the only places a response can be split into blocks
+_BLOCK_SEPARATOR_PATTERN = re.compile(r"\n{2,}")
+
+# A block whose last line looks like this lets the header (`#\s+`) or
+# checkbox (`-\s*[x]\s*`) patterns run on into the following block.
+_OPEN_LINE_END_PATTERN = re.compile(
+    r"^(?:#{1,6}\s*|\s*(?:-\s*(?:\[\s?[xX]?\s?\]?\s*)?)?)$"
+)
+
+# A block starting like this can be swallowed by a checkbox match that begins
+# on the blank line in front of it.
+_OPEN_LINE_START_PATTERN = re.compile(r"^\s*(?:-\s*(?:\[.*)?)?$")
+
+
+def _has_open_inline_markup(text: str) -> bool:
+    """
+    Check whether a block leaves inline markup open.
+
+    Mirrors the inline steps of markdown_to_html(); any backtick or asterisk
+    left unconsumed could pair with markup in a later block.
+    """
+    text, _ = _extract_code_blocks(text)
+    text, _ = _extract_inline_code(text)
+    if "`" in text:
+        return True
+    text = _convert_bold(text)
+    text = _convert_italic(text)
+    return "*" in text
+
+
+class IncrementalMarkdownConverter:
+    """
+    Chunk-fed markdown to HTML converter.
+
+    Feed model output as it arrives and forward the returned HTML. Only the
+    block still being written (the text after the last blank line, or a
+    longer span while a code fence, emphasis or checkbox is open) is
+    buffered, so each completed block is converted exactly once. The
+    concatenated output of feed() and close() is identical to
+    markdown_to_html() on the full text (as long as the text does not itself
+    contain the __CODE_BLOCK_n__ / __INLINE_CODE_n__ placeholder markers).
+
+    Example:
+        converter = IncrementalMarkdownConverter()
+        for chunk in chunks:
+            send(converter.feed(chunk))
+        send(converter.close())
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._scan_from = 0
+        self._closed = False
+        # Output state: whether any output line exists yet, the last
+        # character emitted and newlines held back until the next character
+        # is known (the <br> rules look one character either side)
+        self._started = False
+        self._last_char = ""
+        self._held_newlines = 0
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a chunk of markdown.
+
+        Args:
+            chunk: Next piece of the markdown text
+
+        Returns:
+            HTML for any blocks completed by this chunk (may be empty)
+        """
+        if self._closed:
+            raise ValueError("Cannot feed a closed IncrementalMarkdownConverter")
+        if not chunk:
+            return ""
+        self._buffer += chunk
+        return self._drain(final=False)
+
+    def close(self) -> str:
+        """
+        Flush the remaining buffered markdown.
+
+        Returns:
+            HTML for everything not yet returned by feed()
+        """
+        if self._closed:
+            return ""
+        self._closed = True
+        html = self._drain(final=True)
+
+        remainder, self._buffer = self._buffer, ""
+        block = remainder.rstrip("\n")
+        if block:
+            html += self._emit_block(block)
+        # Trailing newlines end the text: one empty line each, plus the empty
+        # line they follow when the text held nothing else
+        trailing = len(remainder) - len(block)
+        if trailing and not block and not self._started:
+            trailing += 1
+        html += self._emit_empty_lines(trailing)
+        return html + self._convert_held_newlines("")
+
+    def _drain(self, final: bool) -> str:
+        """Convert every block that can no longer be affected by later text."""
+        parts: List[str] = []
+        while True:
+            match = _BLOCK_SEPARATOR_PATTERN.search(self._buffer, self._scan_from)
+            if not match or match.end() == len(self._buffer):
+                # A run at the end may still grow, or is trailing text for close()
+                break
+
+            end = match.end()
+            line_end = self._buffer.find("\n", end)
+            if line_end == -1 and not final:
+                # Need the whole first line of the next block to decide
+                break
+            next_line = self._buffer[end : line_end if line_end != -1 else None]
+
+            block = self._buffer[: match.start()]
+            if not self._can_split(block, next_line):
+                self._scan_from = end
+                continue
+
+            newlines = len(match.group())
+            if block:
+                parts.append(self._emit_block(block))
+                # n newlines between two lines leave n - 1 empty lines
+                newlines -= 1
+            parts.append(self._emit_empty_lines(newlines))
+            self._buffer = self._buffer[end:]
+            self._scan_from = 0
+
+        return "".join(parts)
+
+    @staticmethod
+    def _can_split(block: str, next_line: str) -> bool:
+        """Check that converting block on its own matches the full conversion."""
+        if block:
+            last_line = block[block.rfind("\n") + 1 :]
+            if _OPEN_LINE_END_PATTERN.match(last_line):
+                return False
+            if _has_open_inline_markup(block):
+                return False
+        return not _OPEN_LINE_START_PATTERN.match(next_line)
+
+    def _emit_block(self, block: str) -> str:
+        """Convert a completed block and emit its lines."""
+        html = ""
+        body = block.lstrip("\n")
+        if len(body) < len(block) and self._can_split("", body.split("\n", 1)[0]):
+            # Leading newlines (start of text only): one empty line each
+            html = self._emit_empty_lines(len(block) - len(body))
+            block = body
+
+        rendered = _render_markdown(block)
+        if not rendered:
+            # Only table separator rows, which produce no lines at all
+            return html
+        return html + self._emit_line(rendered)
+
+    def _emit_empty_lines(self, count: int) -> str:
+        """Emit count empty output lines."""
+        return "".join(self._emit_line("") for _ in range(count))
+
+    def _emit_line(self, line: str) -> str:
+        """Append a rendered line (or lines) to the output."""
+        text = "\n" + line if self._started else line
+        self._started = True
+
+        core = text.strip("\n")
+        if not core:
+            self._held_newlines += len(text)
+            return ""
+
+        leading = len(text) - len(text.lstrip("\n"))
+        html = self._convert_held_newlines(core[0], extra=leading)
+        html += _convert_line_breaks(core)
+        self._last_char = core[-1]
+        self._held_newlines = len(text) - leading - len(core)
+        return html
+
+    def _convert_held_newlines(self, next_char: str, extra: int = 0) -> str:
+        """Convert held-back newlines once the character after them is known."""
+        newlines = self._held_newlines + extra
+        self._held_newlines = 0
+        if not newlines:
+            return ""
+        converted = _convert_line_breaks(self._last_char + "\n" * newlines + next_char)
+        return converted[len(self._last_char) : len(converted) - len(next_char)]
+
+
 def generate_reference_documentation(payload_structure: Dict[str, Any]) -> str:
     """
     Generate HTML documentation showing @{Reference.Id} relationships.
@@ -431,20 +844,11 @@ def highlight_placeholders_in_json(json_str: str) -> str:
     Returns:
         HTML string with styled placeholders
     """
-    import re
-
-    # Pattern to match placeholders in JSON: "<<PLACEHOLDER:...>>"
-    pattern = r'"(<<PLACEHOLDER:[^>]+>>)"'
-
     # Replace with styled span
-    styled = re.sub(
-        pattern,
-        r'"<span style="color: #ff8c00; font-weight: bold; background-color: #fff3e0;">\1</span>"',
-        json_str,
+    return _PLACEHOLDER_VALUE_PATTERN.sub(
+        lambda m: f'"{_PLACEHOLDER_SPAN.format(marker=m.group(1))}"', json_str
     )
 
-    return styled
-
 
 def format_defaults_applied_html(defaults: List[Dict[str, str]]) -> str:
     """
@@ -482,57 +886,52 @@ def format_defaults_applied_html(defaults: List[Dict[str, str]]) -> str:
 """
 
 
-def generate_placeholder_warning_html(
-    payloads_with_placeholders: List[Dict[str, Any]],
+def placeholder_warning_item(
+    api_type: str, payload: Dict[str, Any], placeholders: List[str]
 ) -> str:
     """
-    Generate an orange warning table for payloads containing placeholders.
+    Generate the warning list item for one payload's placeholders.
 
     Args:
-        payloads_with_placeholders: List of payload dicts that have _placeholders field
+        api_type: The payload's zuora_api_type
+        payload: The payload body
+        placeholders: Placeholder fields of the payload (non-empty)
 
     Returns:
-        HTML string with styled warning table
+        HTML <li> string
     """
-    if not payloads_with_placeholders:
-        return ""
+    # Determine friendly name based on api_type
+    if api_type == "charge_create":
+        name = payload.get("Name", "Unnamed Charge")
+        type_label = "Rate Plan Charge"
+    elif api_type == "rate_plan_create":
+        name = payload.get("Name", "Unnamed Rate Plan")
+        type_label = "Rate Plan"
+    elif api_type == "product_create":
+        name = payload.get("Name", "Unnamed Product")
+        type_label = "Product"
+    else:
+        name = payload.get("Name", "Unnamed")
+        type_label = "Payload"
 
-    # Build list items for each payload's placeholders
-    items = []
-    for p in payloads_with_placeholders:
-        payload = p.get("payload", {})
-        api_type = p.get("zuora_api_type", "")
-        placeholders = p.get("_placeholders", [])
+    # Format placeholder fields - combine multiple into one line
+    if len(placeholders) == 1:
+        fields_str = f"<code>{placeholders[0]}</code>"
+        return f'<li>{type_label} "{name}" has a placeholder for {fields_str}</li>'
+    fields_str = ", ".join(f"<code>{f}</code>" for f in placeholders)
+    return f'<li>{type_label} "{name}" has placeholders for {fields_str}</li>'
 
-        if not placeholders:
-            continue
 
-        # Determine friendly name based on api_type
-        if api_type == "charge_create":
-            name = payload.get("Name", "Unnamed Charge")
-            type_label = "Rate Plan Charge"
-        elif api_type == "rate_plan_create":
-            name = payload.get("Name", "Unnamed Rate Plan")
-            type_label = "Rate Plan"
-        elif api_type == "product_create":
-            name = payload.get("Name", "Unnamed Product")
-            type_label = "Product"
-        else:
-            name = payload.get("Name", "Unnamed")
-            type_label = "Payload"
-
-        # Format placeholder fields - combine multiple into one line
-        if len(placeholders) == 1:
-            fields_str = f"<code>{placeholders[0]}</code>"
-            items.append(
-                f'<li>{type_label} "{name}" has a placeholder for {fields_str}</li>'
-            )
-        else:
-            fields_str = ", ".join(f"<code>{f}</code>" for f in placeholders)
-            items.append(
-                f'<li>{type_label} "{name}" has placeholders for {fields_str}</li>'
-            )
+def render_placeholder_warning_html(items: List[str]) -> str:
+    """
+    Wrap placeholder warning list items in the orange warning table.
+
+    Args:
+        items: HTML <li> strings from placeholder_warning_item()
 
+    Returns:
+        HTML string with styled warning table, or "" if there are no items
+    """
     if not items:
         return ""
 
@@ -553,6 +952,55 @@ def generate_placeholder_warning_html(
 """
 
 
+def render_placeholder_recommendations_html(
+    recommendations: List[Tuple[str, str]],
+) -> str:
+    """
+    Render the recommendations section.
+
+    Args:
+        recommendations: (field, recommendation) pairs in display order
+
+    Returns:
+        HTML string with recommendations list, or "" if there are none
+    """
+    if not recommendations:
+        return ""
+
+    items_html = "\n".join(
+        f"<li><code>{field}</code>: {recommendation}</li>"
+        for field, recommendation in recommendations
+    )
+
+    return f"""<p><strong>Recommendations</strong></p>
+<ul style="margin: 4px 0 12px 0; padding-left: 20px;">
+{items_html}
+</ul>
+"""
+
+
+def generate_placeholder_warning_html(
+    payloads_with_placeholders: List[Dict[str, Any]],
+) -> str:
+    """
+    Generate an orange warning table for payloads containing placeholders.
+
+    Args:
+        payloads_with_placeholders: List of payload dicts that have _placeholders field
+
+    Returns:
+        HTML string with styled warning table
+    """
+    items = [
+        placeholder_warning_item(
+            p.get("zuora_api_type", ""), p.get("payload", {}), p["_placeholders"]
+        )
+        for p in payloads_with_placeholders
+        if p.get("_placeholders")
+    ]
+    return render_placeholder_warning_html(items)
+
+
 def generate_placeholder_recommendations_html(
     payloads_with_placeholders: List[Dict[str, Any]],
 ) -> str:
@@ -579,22 +1027,12 @@ def generate_placeholder_recommendations_html(
         for field in placeholders:
             unique_fields.add((field, api_type))
 
-    if not unique_fields:
-        return ""
-
-    # Build recommendation items
-    items = []
-    for field, api_type in sorted(unique_fields, key=lambda x: x[0]):
-        recommendation = _get_placeholder_recommendation(field, api_type)
-        items.append(f"<li><code>{field}</code>: {recommendation}</li>")
-
-    items_html = "\n".join(items)
-
-    return f"""<p><strong>Recommendations</strong></p>
-<ul style="margin: 4px 0 12px 0; padding-left: 20px;">
-{items_html}
-</ul>
-"""
+    return render_placeholder_recommendations_html(
+        [
+            (field, _get_placeholder_recommendation(field, api_type))
+            for field, api_type in sorted(unique_fields)
+        ]
+    )
 
 
 def generate_payload_action_cta(has_placeholders: bool) -> str:
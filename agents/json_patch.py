@@ -0,0 +1,115 @@
+"""
+Minimal RFC 6902 JSON Patch support for payload deltas.
+
+make_patch() diffs two JSON documents into add/remove/replace operations;
+apply_patch() applies such a patch. Paths use RFC 6901 JSON Pointer escaping
+("~" -> "~0", "/" -> "~1"). Lists are diffed index by index, with trailing
+items added or removed, which matches how payloads change (fields edited in
+place, tiers appended).
+"""
+
+import copy
+from typing import Any, Dict, List
+
+Patch = List[Dict[str, Any]]
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(before: Any, after: Any, path: str = "") -> Patch:
+    """
+    Operations turning before into after.
+
+    Args:
+        before: Original JSON document
+        after: Target JSON document
+        path: JSON Pointer prefix (used when recursing)
+
+    Returns:
+        RFC 6902 operations (empty if the documents are equal)
+    """
+    if before == after:
+        return []
+    if isinstance(before, dict) and isinstance(after, dict):
+        ops: Patch = []
+        for key in before:
+            if key not in after:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in after.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in before:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(before[key], value, child))
+        return ops
+    if isinstance(before, list) and isinstance(after, list):
+        ops = []
+        common = min(len(before), len(after))
+        for i in range(common):
+            ops.extend(make_patch(before[i], after[i], f"{path}/{i}"))
+        for i in range(common, len(after)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": after[i]})
+        # Remove from the end so earlier indexes stay valid
+        for i in range(len(before) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        return ops
+    return [{"op": "replace", "path": path, "value": after}]
+
+
+def apply_patch(document: Any, patch: Patch) -> Any:
+    """
+    Apply add/remove/replace operations to a copy of a document.
+
+    Args:
+        document: JSON document
+        patch: RFC 6902 operations (add, remove and replace)
+
+    Returns:
+        The patched copy
+
+    Raises:
+        ValueError: If an operation is unsupported or its path does not exist
+    """
+    result = copy.deepcopy(document)
+    for op in patch:
+        tokens = [_unescape(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            if op["op"] not in ("add", "replace"):
+                raise ValueError(f"Cannot {op['op']} the whole document")
+            result = copy.deepcopy(op["value"])
+            continue
+        parent = result
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token) if isinstance(parent, list) else token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Path not found: {op['path']}")
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            elif op["op"] == "replace":
+                parent[index] = copy.deepcopy(op["value"])
+            else:
+                raise ValueError(f"Unsupported op: {op['op']}")
+        else:
+            if op["op"] in ("add", "replace"):
+                if op["op"] == "replace" and last not in parent:
+                    raise ValueError(f"Path not found: {op['path']}")
+                parent[last] = copy.deepcopy(op["value"])
+            elif op["op"] == "remove":
+                if last not in parent:
+                    raise ValueError(f"Path not found: {op['path']}")
+                del parent[last]
+            else:
+                raise ValueError(f"Unsupported op: {op['op']}")
+    return result
@@ -0,0 +1,169 @@
+"""
+In-process latency percentiles.
+
+OTEL histograms are only visible through a collector. This module keeps a
+small HDR-style histogram per timing (request, agent invocation, tool, Zuora
+endpoint) so p50/p90/p99/max can be read from a running process, e.g. via the
+entrypoint's "stats" debug action or benchmark.py.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from .memory_telemetry import register_memory_source
+
+# Timing categories recorded by MetricsCollector
+LATENCY_REQUEST = "request"
+LATENCY_AGENT = "agent"
+LATENCY_TOOL = "tool"
+LATENCY_ZUORA = "zuora"
+
+# Name used once a category has MAX_NAMES_PER_CATEGORY histograms
+OTHER_NAME = "other"
+MAX_NAMES_PER_CATEGORY = 200
+
+# 2^7 linear sub-buckets per power of two: values are kept within ~1.6%
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1
+
+PERCENTILES = (50, 90, 99)
+
+
+def _bucket_index(value: int) -> int:
+    """Log-linear bucket for a non-negative integer value."""
+    if value < _SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS
+    return shift * _SUB_BUCKET_HALF + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value that maps to a bucket."""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = index // _SUB_BUCKET_HALF - 1
+    sub_bucket = index - shift * _SUB_BUCKET_HALF
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations.
+
+    Durations are recorded in microseconds into log-linear buckets, so memory
+    grows with the number of distinct magnitudes rather than with samples and
+    percentiles are accurate to ~1.6%.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        """Record one duration in milliseconds."""
+        index = _bucket_index(max(0, int(duration_ms * 1000)))
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total_ms += duration_ms
+            if duration_ms > self.max_ms:
+                self.max_ms = duration_ms
+
+    def percentile(self, percent: float) -> float:
+        """Duration in milliseconds at or below which percent% of samples fall."""
+        with self._lock:
+            return self._percentile(percent)
+
+    def _percentile(self, percent: float) -> float:
+        if self.count == 0:
+            return 0.0
+        target = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(_bucket_upper(index) / 1000, self.max_ms)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, mean, p50/p90/p99 and max in milliseconds."""
+        with self._lock:
+            summary: Dict[str, Any] = {"count": self.count}
+            summary["mean_ms"] = (
+                round(self.total_ms / self.count, 2) if self.count else 0.0
+            )
+            for percent in PERCENTILES:
+                summary[f"p{percent}_ms"] = round(self._percentile(percent), 2)
+            summary["max_ms"] = round(self.max_ms, 2)
+            return summary
+
+
+class LatencyRegistry:
+    """Latency histograms keyed by category and name (persona, tool, endpoint)."""
+
+    def __init__(self, max_names_per_category: int = MAX_NAMES_PER_CATEGORY):
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._max_names = max_names_per_category
+        self._lock = threading.Lock()
+
+    def histogram(self, category: str, name: str) -> LatencyHistogram:
+        """Get or create the histogram for a category and name."""
+        names = self._histograms.get(category)
+        histogram = names.get(name) if names else None
+        if histogram is not None:
+            return histogram
+
+        with self._lock:
+            names = self._histograms.setdefault(category, {})
+            if name not in names and len(names) >= self._max_names:
+                name = OTHER_NAME
+            return names.setdefault(name, LatencyHistogram())
+
+    def record(self, category: str, name: str, duration_ms: float) -> None:
+        """Record a duration in milliseconds."""
+        self.histogram(category, name).record(duration_ms)
+
+    def snapshot(self, category: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Percentile summaries for every histogram.
+
+        Args:
+            category: Only include this category (default: all)
+
+        Returns:
+            {category: {name: {count, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}}}
+        """
+        with self._lock:
+            categories = {
+                key: dict(names)
+                for key, names in self._histograms.items()
+                if category is None or key == category
+            }
+        return {
+            key: {name: names[name].snapshot() for name in sorted(names)}
+            for key, names in categories.items()
+        }
+
+    def clear(self) -> None:
+        """Remove all histograms."""
+        with self._lock:
+            self._histograms.clear()
+
+
+_latency_registry: Optional[LatencyRegistry] = None
+
+
+def get_latency_registry() -> LatencyRegistry:
+    """Get the global latency registry."""
+    global _latency_registry
+    if _latency_registry is None:
+        _latency_registry = LatencyRegistry()
+        register_memory_source(
+            "latency.histograms",
+            lambda: sum(len(names) for names in _latency_registry._histograms.values()),
+        )
+    return _latency_registry
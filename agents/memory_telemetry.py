@@ -0,0 +1,145 @@
+"""
+Memory telemetry for long-lived runtimes.
+
+Module-level structures (agent cache, conversation histories, API cache,
+metric attribute sets, ...) register a size callback here. Their sizes and
+the process RSS are exported as OTEL gauges on every metric export and can be
+dumped with the "memory" debug action, together with the growth since the
+previous dump and, when MEMORY_TRACEMALLOC_ENABLED is set, the top allocators.
+"""
+
+import logging
+import os
+import threading
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_sources: Dict[str, Callable[[], int]] = {}
+_sources_lock = threading.Lock()
+
+# Last report returned by memory_report(), for growth deltas
+_previous_report: Optional[Dict[str, Any]] = None
+
+
+def register_memory_source(name: str, size_func: Callable[[], int]) -> None:
+    """
+    Register a structure whose size should be reported.
+
+    Args:
+        name: Dotted name, e.g. "conversation_store.entries"
+        size_func: Returns the current size (entries, messages, ...)
+    """
+    with _sources_lock:
+        _sources[name] = size_func
+
+
+def structure_sizes() -> Dict[str, int]:
+    """Current size of every registered structure (failing sources are skipped)."""
+    with _sources_lock:
+        sources = list(_sources.items())
+
+    sizes = {}
+    for name, size_func in sources:
+        try:
+            sizes[name] = int(size_func())
+        except Exception as e:
+            # Structures may be mutated by a request while being measured
+            logger.debug(f"[MEMORY] Could not measure {name}: {e}")
+    return sizes
+
+
+def process_memory() -> Dict[str, int]:
+    """Current and peak resident set size in bytes (0 where unavailable)."""
+    rss_bytes = 0
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            rss_bytes = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    peak_rss_bytes = 0
+    try:
+        import resource
+
+        # ru_maxrss is in kilobytes on Linux
+        peak_rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        pass
+
+    memory = {"rss_bytes": rss_bytes, "peak_rss_bytes": peak_rss_bytes}
+    if tracemalloc.is_tracing():
+        memory["traced_bytes"], memory["traced_peak_bytes"] = (
+            tracemalloc.get_traced_memory()
+        )
+    return memory
+
+
+def start_tracemalloc(frames: int = 5) -> None:
+    """Start tracing Python allocations (adds CPU and memory overhead)."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info(f"[MEMORY] tracemalloc started ({frames} frames)")
+
+
+def top_allocations(limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Largest allocation sites by current size.
+
+    Returns:
+        [{"location": "file.py:123", "size_bytes": ..., "count": ...}, ...]
+        (empty when tracemalloc is not tracing)
+    """
+    if not tracemalloc.is_tracing():
+        return []
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def memory_report(top_n: int = 20) -> Dict[str, Any]:
+    """
+    Process memory, structure sizes and growth since the previous report.
+
+    Args:
+        top_n: Number of top allocation sites to include (tracemalloc only)
+
+    Returns:
+        {"process", "sizes", "growth", "top_allocations"}
+    """
+    global _previous_report
+
+    report: Dict[str, Any] = {
+        "process": process_memory(),
+        "sizes": structure_sizes(),
+    }
+
+    growth: Optional[Dict[str, Any]] = None
+    if _previous_report is not None:
+        previous = _previous_report
+        growth = {
+            "rss_bytes": report["process"]["rss_bytes"]
+            - previous["process"]["rss_bytes"],
+            "sizes": {
+                name: size - previous["sizes"].get(name, 0)
+                for name, size in report["sizes"].items()
+                if size != previous["sizes"].get(name, 0)
+            },
+        }
+    _previous_report = report
+
+    return {
+        **report,
+        "growth": growth,
+        "top_allocations": top_allocations(top_n) if tracemalloc.is_tracing() else None,
+    }
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Optional, Dict, Any, Literal, Set
 from enum import Enum
+from functools import lru_cache
 
 
 class Tier(BaseModel):
@@ -693,6 +694,39 @@ class ChatRequest(BaseModel):
         default_factory=list,
         description="List of Zuora API payloads for the agent to work with",
     )
+    debug: bool = Field(
+        False,
+        description="Include per-request token and tool accounting in the response",
+    )
+    timings: bool = Field(
+        False, description="Include a per-phase timing breakdown in the response"
+    )
+    profile: bool = Field(
+        False,
+        description="Run the sampling profiler for this request and include the "
+        "profile in the response debug block",
+    )
+    payload_session: bool = Field(
+        False,
+        description="Keep this conversation's payloads on the server and exchange "
+        "only changes (see payloads_version)",
+    )
+    payloads_version: Optional[str] = Field(
+        None,
+        description="payloads_version from the previous response. With "
+        "payload_session, zuora_api_payloads then holds only the payloads the "
+        "client added or changed; without it, the full list. With payloads_delta, "
+        "the base the returned patches apply to",
+    )
+    removed_payload_ids: List[str] = Field(
+        default_factory=list,
+        description="payload_ids the client removed since payloads_version",
+    )
+    payloads_delta: bool = Field(
+        False,
+        description="Return payload_patches (RFC 6902 per payload_id) instead of "
+        "payloads, when payloads_version matches the payloads the turn starts from",
+    )
 
 
 class ChatResponse(BaseModel):
@@ -706,6 +740,110 @@ class ChatResponse(BaseModel):
     zuora_api_payloads: List[ZuoraApiPayload] = Field(
         default_factory=list, description="Modified/created Zuora API payloads"
     )
+    debug: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Per-request accounting and/or profile (only when requested "
+        "with debug=true or profile=true)",
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Per-phase and per-component timings in ms with a Server-Timing "
+        "value (only when requested with timings=true)",
+    )
+    payloads_version: Optional[str] = Field(
+        None,
+        description="Version of the payloads after this turn (only with "
+        "payload_session=true or payloads_delta=true); with payload_session, "
+        "zuora_api_payloads then holds only added or changed payloads",
+    )
+    removed_payload_ids: Optional[List[str]] = Field(
+        None,
+        description="payload_ids removed during this turn (only with "
+        "payload_session=true)",
+    )
+    payload_patches: Optional[Dict[str, Any]] = Field(
+        None,
+        description="With payloads_delta: {added: [payload], removed: [payload_id], "
+        "changed: {payload_id: [RFC 6902 operation]}} relative to the request's "
+        "payloads_version; zuora_api_payloads is then empty",
+    )
+    payloads_resync: Optional[bool] = Field(
+        None,
+        description="True when payloads_version did not match the server session; "
+        "resend the full zuora_api_payloads without payloads_version",
+    )
+
+
+# ============ Response Fast Path ============
+
+# ChatResponse fields left out of the response when unset
+CHAT_RESPONSE_OPTIONAL_FIELDS = (
+    "debug",
+    "timings",
+    "payloads_version",
+    "removed_payload_ids",
+    "payload_patches",
+    "payloads_resync",
+)
+
+
+@lru_cache(maxsize=None)
+def _payload_list_adapter() -> TypeAdapter:
+    return TypeAdapter(List[ZuoraApiPayload])
+
+
+def _fallback_payload(entry: Dict[str, Any]) -> ZuoraApiPayload:
+    try:
+        return ZuoraApiPayload(**entry)
+    except Exception:
+        # If payload doesn't validate, include as-is with raw data
+        return ZuoraApiPayload(
+            payload=entry.get("payload", {}),
+            zuora_api_type=entry.get("zuora_api_type", "product"),
+            payload_id=entry.get("payload_id"),
+        )
+
+
+def trusted_payloads(entries: List[Dict[str, Any]]) -> List[ZuoraApiPayload]:
+    """
+    ZuoraApiPayload models for payload entries produced by our own tools.
+
+    The whole list is validated in one call of a cached TypeAdapter, which is
+    cheaper than one model per entry (and than model_construct(), which runs
+    in Python). If any entry fails, entries are built one by one, falling back
+    to the raw payload data as before.
+
+    Args:
+        entries: Payload entries from agent state
+
+    Returns:
+        List of ZuoraApiPayload in entry order
+    """
+    try:
+        return _payload_list_adapter().validate_python(entries)
+    except Exception:
+        return [_fallback_payload(entry) for entry in entries]
+
+
+@lru_cache(maxsize=None)
+def _chat_response_adapter() -> TypeAdapter:
+    return TypeAdapter(ChatResponse)
+
+
+def _unset_optional_fields(response: ChatResponse) -> Set[str]:
+    return {f for f in CHAT_RESPONSE_OPTIONAL_FIELDS if getattr(response, f) is None}
+
+
+def chat_response_dict(response: ChatResponse) -> Dict[str, Any]:
+    """ChatResponse as a plain dict, without unset optional fields."""
+    return response.model_dump(exclude=_unset_optional_fields(response))
+
+
+def chat_response_json(response: ChatResponse) -> bytes:
+    """ChatResponse serialized straight to JSON bytes, without unset optional fields."""
+    return _chat_response_adapter().dump_json(
+        response, exclude=_unset_optional_fields(response)
+    )
 
 
 # ============ Billing Architect Models ============
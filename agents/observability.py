@@ -4,11 +4,16 @@ Provides centralized tracing, metrics collection, and instrumentation.
 """
 
 import os
+import re
+import threading
 import time
 import functools
+from contextvars import ContextVar
 from typing import Optional, Dict, Any, Callable
 from opentelemetry import trace, metrics
+from opentelemetry.metrics import CallbackOptions, Observation
 from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased, TraceIdRatioBased
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
@@ -17,19 +22,36 @@ from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExport
 from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
 from opentelemetry.trace import Status, StatusCode
 
+from .config import OTEL_ENABLED
+from .latency import (
+    LATENCY_AGENT,
+    LATENCY_REQUEST,
+    LATENCY_TOOL,
+    LATENCY_ZUORA,
+    get_latency_registry,
+)
+from .memory_telemetry import process_memory, register_memory_source, structure_sizes
+from .tail_sampling import JsonlSpanExporter, TailSamplingProcessor
+
 # Global singleton instances
 _tracer: Optional[trace.Tracer] = None
 _meter: Optional[metrics.Meter] = None
 _metrics_collector: Optional["MetricsCollector"] = None
+_tail_sampler: Optional[TailSamplingProcessor] = None
 _initialized = False
 
+# Zuora API calls made by the tool currently executing (None outside tools)
+_tool_zuora_calls: ContextVar[Optional[Dict[str, int]]] = ContextVar(
+    "tool_zuora_calls", default=None
+)
+
 
 def initialize_observability() -> None:
     """
     Initialize OpenTelemetry tracing and metrics.
     Safe to call multiple times - will only initialize once.
     """
-    global _tracer, _meter, _metrics_collector, _initialized
+    global _tracer, _meter, _metrics_collector, _tail_sampler, _initialized
 
     if _initialized:
         return
@@ -62,17 +84,50 @@ def initialize_observability() -> None:
 
     resource = Resource.create(resource_attributes)
 
-    # Configure tracing
-    trace_provider = TracerProvider(resource=resource)
-
-    # OTLP exporter for traces
+    # Configure tracing. Sampling follows the parent's decision; root spans are
+    # sampled at OTEL_TRACE_SAMPLE_RATIO unless OTEL_TRACES_SAMPLER picks a sampler.
+    # With tail sampling every span is recorded and the keep decision is made
+    # when the request finishes
+    tail_sampling = os.getenv("OTEL_TAIL_SAMPLING_ENABLED", "false").lower() == "true"
+    sampler = None
+    if not os.getenv("OTEL_TRACES_SAMPLER"):
+        if tail_sampling:
+            sampler = ALWAYS_ON
+        else:
+            sample_ratio = float(os.getenv("OTEL_TRACE_SAMPLE_RATIO", "1.0"))
+            sampler = ParentBased(TraceIdRatioBased(sample_ratio))
+    trace_provider = TracerProvider(resource=resource, sampler=sampler)
+
+    # Span export: OTLP and/or (tail sampling only) a local JSONL file
+    span_processors = []
     otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
     if otlp_endpoint:
         trace_exporter = OTLPSpanExporter(
             endpoint=f"{otlp_endpoint}/v1/traces",
             headers=_parse_otlp_headers("OTEL_EXPORTER_OTLP_TRACES_HEADERS"),
         )
-        trace_provider.add_span_processor(BatchSpanProcessor(trace_exporter))
+        span_processors.append(BatchSpanProcessor(trace_exporter))
+
+    if tail_sampling:
+        traces_file = os.getenv("OTEL_TAIL_SAMPLING_FILE", "")
+        if traces_file:
+            span_processors.append(BatchSpanProcessor(JsonlSpanExporter(traces_file)))
+        _tail_sampler = TailSamplingProcessor(
+            span_processors,
+            latency_threshold_ms=float(
+                os.getenv("OTEL_TAIL_SAMPLING_LATENCY_MS", "10000")
+            ),
+            sample_ratio=float(os.getenv("OTEL_TAIL_SAMPLING_RATIO", "0.01")),
+            max_traces=int(os.getenv("OTEL_TAIL_SAMPLING_MAX_TRACES", "1000")),
+        )
+        trace_provider.add_span_processor(_tail_sampler)
+        register_memory_source(
+            "tail_sampling.buffered_traces",
+            lambda: _tail_sampler.stats()["traces_buffered"],
+        )
+    else:
+        for processor in span_processors:
+            trace_provider.add_span_processor(processor)
 
     trace.set_tracer_provider(trace_provider)
     _tracer = trace.get_tracer(__name__)
@@ -135,6 +190,13 @@ def get_meter() -> metrics.Meter:
     return _meter
 
 
+def get_tail_sampler() -> Optional[TailSamplingProcessor]:
+    """Get the tail sampling processor (None unless tail sampling is enabled)."""
+    if not _initialized:
+        initialize_observability()
+    return _tail_sampler
+
+
 def get_metrics_collector() -> "MetricsCollector":
     """Get the global metrics collector instance."""
     if _metrics_collector is None:
@@ -153,6 +215,9 @@ def trace_function(
         span_name: Custom span name (defaults to function name)
         attributes: Additional span attributes to set
 
+    When OTEL_ENABLED is false the function is returned undecorated, and
+    spans that are not sampled skip attribute and timing work.
+
     Usage:
         @trace_function(span_name="my_operation", attributes={"component": "api"})
         def my_function(arg1, arg2):
@@ -160,21 +225,30 @@ def trace_function(
     """
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        # Tracing disabled for the process: leave the function untouched
+        if not OTEL_ENABLED:
+            return func
+
+        func_name = getattr(func, "__name__", "unknown")
+        func_module = getattr(func, "__module__", "unknown")
+        name = span_name or f"{func_module}.{func_name}"
+        span_attributes = {
+            **(attributes or {}),
+            "function.name": func_name,
+            "function.module": func_module,
+        }
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            tracer = get_tracer()
-            func_name = getattr(func, "__name__", "unknown")
-            func_module = getattr(func, "__module__", "unknown")
-            name = span_name or f"{func_module}.{func_name}"
-
-            with tracer.start_as_current_span(name) as span:
-                # Set default attributes
-                if attributes:
-                    for key, value in attributes.items():
-                        span.set_attribute(key, value)
-
-                span.set_attribute("function.name", func_name)
-                span.set_attribute("function.module", func_module)
+            with get_tracer().start_as_current_span(
+                name,
+                attributes=span_attributes,
+                record_exception=False,
+                set_status_on_exception=False,
+            ) as span:
+                # Unsampled span: skip timing and attribute work
+                if not span.is_recording():
+                    return func(*args, **kwargs)
 
                 # Execute function
                 start_time = time.time()
@@ -199,6 +273,124 @@ def trace_function(
     return decorator
 
 
+# ============ Endpoint Templates ============
+
+# Zuora endpoints called by ZuoraClient; "{id}" matches one path segment
+KNOWN_ENDPOINT_TEMPLATES = (
+    "/v1/catalog/products",
+    "/v1/catalog/products/{id}",
+    "/v1/catalog/query/products",
+    "/v1/catalog/product-rate-plans/{id}",
+    "/v1/catalog/product-rate-plan-charges/{id}",
+    "/v1/object/product/{id}",
+    "/v1/object/product-rate-plan/{id}",
+    "/v1/object/product-rate-plan-charge/{id}",
+    "/v1/object/product-rate-plan-charge-tier/{id}",
+    "/settings/batch-requests",
+    "/oauth/token",
+)
+
+# Endpoint attribute used once the cardinality limit is reached
+OTHER_ENDPOINT = "/other"
+
+_KNOWN_ENDPOINT_PATTERNS = [
+    (re.compile(re.escape(t).replace(r"\{id\}", "[^/]+")), t)
+    for t in KNOWN_ENDPOINT_TEMPLATES
+]
+
+# Segments that look like ids: hex ids, or anything with a digit that is longer
+# than a version prefix such as "v1"
+_ID_SEGMENT_PATTERN = re.compile(r"\d+|[0-9a-fA-F]{16,}|(?=.*\d).{5,}")
+
+
+class EndpointTemplater:
+    """
+    Maps raw API endpoints to low-cardinality templates for metric attributes.
+
+    Features:
+    - Known Zuora endpoints map to fixed templates (/v1/catalog/products/{id})
+    - Unknown endpoints have id-like segments replaced with {id}
+    - Cardinality guard: at most max_templates distinct unknown templates,
+      anything beyond collapses to OTHER_ENDPOINT
+    - Results cached per raw endpoint (bounded)
+    """
+
+    def __init__(self, max_templates: int = 50, cache_size: int = 2048):
+        self.max_templates = max_templates
+        self.cache_size = cache_size
+        self._cache: Dict[str, str] = {}
+        self._templates: set = set(KNOWN_ENDPOINT_TEMPLATES)
+        self._lock = threading.Lock()
+
+    def template(self, endpoint: str) -> str:
+        """Get the template for a raw endpoint (path, optionally with a query string)."""
+        cached = self._cache.get(endpoint)
+        if cached is not None:
+            return cached
+
+        path = endpoint.split("?", 1)[0]
+        template = None
+        for pattern, known in _KNOWN_ENDPOINT_PATTERNS:
+            if pattern.fullmatch(path):
+                template = known
+                break
+
+        with self._lock:
+            if template is None:
+                template = "/".join(
+                    (
+                        "{id}"
+                        if segment and _ID_SEGMENT_PATTERN.fullmatch(segment)
+                        else segment
+                    )
+                    for segment in path.split("/")
+                )
+                if template not in self._templates:
+                    if (
+                        len(self._templates) - len(KNOWN_ENDPOINT_TEMPLATES)
+                        >= self.max_templates
+                    ):
+                        template = OTHER_ENDPOINT
+                    else:
+                        self._templates.add(template)
+
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[endpoint] = template
+        return template
+
+
+_endpoint_templater = EndpointTemplater(
+    max_templates=int(os.getenv("OTEL_MAX_ENDPOINT_TEMPLATES", "50"))
+)
+register_memory_source("otel.endpoint_cache", lambda: len(_endpoint_templater._cache))
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Get the low-cardinality template for an API endpoint.
+
+    Args:
+        endpoint: Raw endpoint, e.g. "/v1/catalog/products/8a80..."
+
+    Returns:
+        Template, e.g. "/v1/catalog/products/{id}"
+    """
+    return _endpoint_templater.template(endpoint)
+
+
+def _observe_process_memory(options: CallbackOptions):
+    """Gauge callback: process memory in bytes by type."""
+    for key, value in process_memory().items():
+        yield Observation(value, {"type": key.removesuffix("_bytes")})
+
+
+def _observe_structure_sizes(options: CallbackOptions):
+    """Gauge callback: sizes of registered structures."""
+    for name, size in structure_sizes().items():
+        yield Observation(size, {"structure": name})
+
+
 class MetricsCollector:
     """
     Centralized metrics collection for the Zuora Seed Agent.
@@ -208,6 +400,15 @@ class MetricsCollector:
     def __init__(self):
         meter = get_meter()
 
+        # Attribute dicts reused across calls, keyed by their values; metric
+        # attributes are never mutated after being passed to an instrument
+        self._attribute_sets: Dict[tuple, Dict[str, str]] = {}
+        self._max_attribute_sets = 1000
+
+        # Local percentiles for the duration histograms (readable without OTLP)
+        self._latency = get_latency_registry()
+        register_memory_source("otel.attribute_sets", lambda: len(self._attribute_sets))
+
         # Request metrics
         self.requests_total = meter.create_counter(
             name="requests_total",
@@ -234,6 +435,33 @@ class MetricsCollector:
             description="Agent invocation duration in milliseconds",
             unit="ms",
         )
+        self.prompt_tokens = meter.create_histogram(
+            name="conversation_prompt_tokens",
+            description="Estimated prompt tokens sent per turn (history + message)",
+            unit="1",
+        )
+
+        # Per-request accounting metrics
+        self.model_calls_total = meter.create_counter(
+            name="model_calls_total",
+            description="Total number of model calls",
+            unit="1",
+        )
+        self.tokens_total = meter.create_counter(
+            name="tokens_total",
+            description="Total model tokens by type (input, output, cache_read, cache_write)",
+            unit="1",
+        )
+        self.tool_calls_per_request = meter.create_histogram(
+            name="tool_calls_per_request",
+            description="Tool calls made per request",
+            unit="1",
+        )
+        self.tool_output_bytes = meter.create_histogram(
+            name="tool_output_bytes",
+            description="Bytes of tool output fed back to the model per request",
+            unit="By",
+        )
 
         # Tool metrics
         self.tool_executions_total = meter.create_counter(
@@ -246,6 +474,16 @@ class MetricsCollector:
             description="Tool execution duration in milliseconds",
             unit="ms",
         )
+        self.tool_io_bytes = meter.create_histogram(
+            name="tool_io_bytes",
+            description="Tool input and output size in bytes",
+            unit="By",
+        )
+        self.tool_zuora_calls = meter.create_histogram(
+            name="tool_zuora_calls",
+            description="Zuora API calls made per tool execution",
+            unit="1",
+        )
 
         # API metrics
         self.api_calls_total = meter.create_counter(
@@ -274,13 +512,38 @@ class MetricsCollector:
             unit="1",
         )
 
+        # Memory gauges (observed on every metric export)
+        self.process_memory = meter.create_observable_gauge(
+            name="process_memory_bytes",
+            callbacks=[_observe_process_memory],
+            description="Process memory by type (rss, peak_rss, traced)",
+            unit="By",
+        )
+        self.structure_size = meter.create_observable_gauge(
+            name="memory_structure_size",
+            callbacks=[_observe_structure_sizes],
+            description="Size of long-lived in-memory structures",
+            unit="1",
+        )
+
+    def _attributes(self, *items: tuple) -> Dict[str, str]:
+        """Get the shared attribute dict for the given (key, value) pairs."""
+        attributes = self._attribute_sets.get(items)
+        if attributes is None:
+            attributes = dict(items)
+            # Values such as persona come from requests; stop caching if unbounded
+            if len(self._attribute_sets) < self._max_attribute_sets:
+                self._attribute_sets[items] = attributes
+        return attributes
+
     def record_request(
         self, persona: str, duration_ms: float, success: bool = True
     ) -> None:
         """Record a request metric."""
-        attributes = {"persona": persona, "success": str(success)}
+        attributes = self._attributes(("persona", persona), ("success", str(success)))
         self.requests_total.add(1, attributes)
         self.request_duration.record(duration_ms, attributes)
+        self._latency.record(LATENCY_REQUEST, persona, duration_ms)
 
         if not success:
             self.errors_total.add(1, attributes)
@@ -289,41 +552,131 @@ class MetricsCollector:
         self, persona: str, duration_ms: float, success: bool = True
     ) -> None:
         """Record an agent invocation metric."""
-        attributes = {"persona": persona, "success": str(success)}
+        attributes = self._attributes(("persona", persona), ("success", str(success)))
         self.agent_invocations_total.add(1, attributes)
         self.agent_invocation_duration.record(duration_ms, attributes)
+        self._latency.record(LATENCY_AGENT, persona, duration_ms)
+
+    def record_prompt_tokens(self, persona: str, tokens: int) -> None:
+        """Record the estimated prompt tokens for a conversation turn."""
+        self.prompt_tokens.record(tokens, self._attributes(("persona", persona)))
+
+    def record_request_accounting(self, persona: str, accounting: Any) -> None:
+        """Record model calls, token usage and tool output for a request."""
+        attributes = self._attributes(("persona", persona))
+        self.model_calls_total.add(accounting.model_calls, attributes)
+        for token_type, count in (
+            ("input", accounting.input_tokens),
+            ("output", accounting.output_tokens),
+            ("cache_read", accounting.cache_read_tokens),
+            ("cache_write", accounting.cache_write_tokens),
+        ):
+            if count:
+                self.tokens_total.add(
+                    count, self._attributes(("persona", persona), ("type", token_type))
+                )
+        self.tool_calls_per_request.record(accounting.total_tool_calls, attributes)
+        self.tool_output_bytes.record(accounting.tool_output_bytes, attributes)
 
     def record_tool_execution(
         self, tool_name: str, category: str, duration_ms: float, success: bool = True
     ) -> None:
         """Record a tool execution metric."""
-        attributes = {
-            "tool_name": tool_name,
-            "category": category,
-            "success": str(success),
-        }
+        attributes = self._attributes(
+            ("tool_name", tool_name), ("category", category), ("success", str(success))
+        )
         self.tool_executions_total.add(1, attributes)
         self.tool_execution_duration.record(duration_ms, attributes)
+        self._latency.record(LATENCY_TOOL, tool_name, duration_ms)
+
+    def record_tool_io(
+        self,
+        tool_name: str,
+        category: str,
+        input_bytes: int,
+        output_bytes: int,
+        zuora_calls: int,
+    ) -> None:
+        """Record tool input/output sizes and the Zuora calls it made."""
+        tool = (("tool_name", tool_name), ("category", category))
+        self.tool_io_bytes.record(
+            input_bytes, self._attributes(*tool, ("direction", "input"))
+        )
+        self.tool_io_bytes.record(
+            output_bytes, self._attributes(*tool, ("direction", "output"))
+        )
+        self.tool_zuora_calls.record(zuora_calls, self._attributes(*tool))
 
     def record_api_call(
         self, method: str, endpoint: str, duration_ms: float, success: bool = True
     ) -> None:
-        """Record a Zuora API call metric."""
-        attributes = {"method": method, "endpoint": endpoint, "success": str(success)}
+        """Record a Zuora API call metric (endpoint is reduced to its template)."""
+        endpoint_template = normalize_endpoint(endpoint)
+        attributes = self._attributes(
+            ("method", method),
+            ("endpoint", endpoint_template),
+            ("success", str(success)),
+        )
         self.api_calls_total.add(1, attributes)
         self.api_call_duration.record(duration_ms, attributes)
+        self._latency.record(
+            LATENCY_ZUORA, f"{method} {endpoint_template}", duration_ms
+        )
 
     def record_api_error(
         self, method: str, endpoint: str, error_type: str = "unknown"
     ) -> None:
-        """Record a Zuora API error metric."""
-        attributes = {"method": method, "endpoint": endpoint, "error_type": error_type}
+        """Record a Zuora API error metric (endpoint is reduced to its template)."""
+        attributes = self._attributes(
+            ("method", method),
+            ("endpoint", normalize_endpoint(endpoint)),
+            ("error_type", error_type),
+        )
         self.api_errors_total.add(1, attributes)
 
     def record_cache_hit(self, operation: str) -> None:
         """Record a cache hit metric."""
-        self.cache_hits_total.add(1, {"operation": operation})
+        self.cache_hits_total.add(1, self._attributes(("operation", operation)))
 
     def record_cache_miss(self, operation: str) -> None:
         """Record a cache miss metric."""
-        self.cache_misses_total.add(1, {"operation": operation})
+        self.cache_misses_total.add(1, self._attributes(("operation", operation)))
+
+
+# ============ Tool Call Scope ============
+
+
+def start_tool_call_scope() -> Any:
+    """
+    Start counting Zuora API calls for the current tool execution.
+
+    Returns:
+        Token for end_tool_call_scope()
+    """
+    return _tool_zuora_calls.set({"zuora_calls": 0})
+
+
+def end_tool_call_scope(token: Any) -> int:
+    """
+    Stop counting Zuora API calls for a tool execution.
+
+    Args:
+        token: Token returned by start_tool_call_scope()
+
+    Returns:
+        Number of Zuora API calls made within the scope
+    """
+    counters = _tool_zuora_calls.get()
+    try:
+        _tool_zuora_calls.reset(token)
+    except ValueError:
+        # Generator finalised from another context; just clear the scope
+        _tool_zuora_calls.set(None)
+    return counters["zuora_calls"] if counters else 0
+
+
+def record_tool_zuora_call(count: int = 1) -> None:
+    """Count Zuora API calls against the executing tool, if any."""
+    counters = _tool_zuora_calls.get()
+    if counters is not None:
+        counters["zuora_calls"] += count
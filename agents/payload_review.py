@@ -0,0 +1,234 @@
+"""
+Single batch review of the payloads returned by a /chat turn.
+
+At response-build time every payload is validated against its compiled
+REQUIRED_FIELDS schema, its placeholder state is derived, and the data for
+the placeholder warning and recommendations is produced, all in one pass.
+review_payloads() then renders the warning and recommendations HTML from
+that data without walking the payloads again.
+
+Placeholder state comes from the payload's placeholder registry (see
+agents.placeholders): its _placeholders list when it has one. Payloads without
+it (e.g. sent back by the client, which never sees _placeholders) are scanned
+for <<PLACEHOLDER:...>> values instead, so the warning does not disappear
+while placeholders remain.
+
+Reviews are cached per conversation by payload content hash. A payload whose
+type, body and _placeholders are unchanged since the previous turn reuses
+that turn's review.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import PAYLOAD_REVIEW_CACHE_SIZE
+from .html_formatter import (
+    placeholder_warning_item,
+    render_placeholder_recommendations_html,
+    render_placeholder_warning_html,
+)
+from .memory_telemetry import register_memory_source
+from .placeholders import placeholder_fields
+from .validation_schemas import _get_placeholder_recommendation, validate_payload
+
+
+@dataclass(frozen=True)
+class PayloadReview:
+    """Review of one payload (shared between turns, so never modified)."""
+
+    api_type: str
+    placeholders: Tuple[str, ...]
+    missing: Tuple[Tuple[str, str], ...]
+    warning_item: Optional[str]
+    # (field, recommendation) for each placeholder
+    recommendations: Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class BatchReview:
+    """Review of all payloads of a turn, in payload order."""
+
+    reviews: List[PayloadReview] = field(default_factory=list)
+    reused: int = 0
+
+    @property
+    def with_placeholders(self) -> List[PayloadReview]:
+        return [r for r in self.reviews if r.placeholders]
+
+    @property
+    def has_placeholders(self) -> bool:
+        return any(r.placeholders for r in self.reviews)
+
+    @property
+    def invalid_count(self) -> int:
+        """Payloads missing required fields (placeholders count as present)."""
+        return sum(1 for r in self.reviews if r.missing)
+
+    def warning_html(self) -> str:
+        """Orange warning table for payloads with placeholders."""
+        return render_placeholder_warning_html(
+            [r.warning_item for r in self.reviews if r.warning_item]
+        )
+
+    def recommendations_html(self) -> str:
+        """Recommendations for each distinct placeholder field and api type."""
+        unique: Dict[Tuple[str, str], str] = {}
+        for review in self.reviews:
+            for name, recommendation in review.recommendations:
+                unique.setdefault((name, review.api_type), recommendation)
+        return render_placeholder_recommendations_html(
+            [(name, unique[(name, api_type)]) for name, api_type in sorted(unique)]
+        )
+
+
+def payload_placeholders(entry: Dict[str, Any]) -> List[str]:
+    """
+    Placeholder fields of a payload entry.
+
+    Args:
+        entry: Payload entry (payload, zuora_api_type, payload_id, ...)
+
+    Returns:
+        The entry's _placeholders list if present, otherwise the fields of
+        <<PLACEHOLDER:...>> values found in the payload body
+    """
+    return placeholder_fields(entry)
+
+
+def content_hash(entry: Dict[str, Any]) -> str:
+    """Hash of everything a review depends on: type, body and _placeholders."""
+    encoded = json.dumps(
+        [entry.get("zuora_api_type"), entry.get("payload"), entry.get("_placeholders")],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    ).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def review_payload(entry: Dict[str, Any]) -> PayloadReview:
+    """
+    Validate one payload and derive its placeholder and warning data.
+
+    Args:
+        entry: Payload entry (payload, zuora_api_type, payload_id, ...)
+
+    Returns:
+        PayloadReview
+    """
+    api_type = entry.get("zuora_api_type", "")
+    body = entry.get("payload", {})
+    if not isinstance(body, dict):
+        body = {}
+    placeholders = payload_placeholders(entry)
+    _, missing = validate_payload(api_type, body)
+    return PayloadReview(
+        api_type=api_type,
+        placeholders=tuple(placeholders),
+        missing=tuple(missing),
+        warning_item=(
+            placeholder_warning_item(api_type, body, placeholders)
+            if placeholders
+            else None
+        ),
+        recommendations=tuple(
+            (name, _get_placeholder_recommendation(name, api_type))
+            for name in placeholders
+        ),
+    )
+
+
+class PayloadReviewCache:
+    """
+    Reviews of each conversation's previous turn, keyed by content hash.
+
+    Each turn replaces the conversation's entry with the reviews of its
+    payloads; the least recently reviewed conversation is evicted when full.
+
+    Args:
+        max_conversations: Conversations kept
+    """
+
+    def __init__(self, max_conversations: int = PAYLOAD_REVIEW_CACHE_SIZE):
+        self.max_conversations = max_conversations
+        self._entries: "OrderedDict[str, Dict[str, PayloadReview]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"reviewed": 0, "reused": 0}
+
+    def review(
+        self, payloads: List[Dict[str, Any]], key: Optional[str] = None
+    ) -> BatchReview:
+        """
+        Review a turn's payloads, reusing the previous turn's unchanged reviews.
+
+        Args:
+            payloads: Payload entries at the end of the turn
+            key: Conversation key (None disables reuse)
+
+        Returns:
+            BatchReview in payload order
+        """
+        with self._lock:
+            previous = self._entries.get(key, {}) if key else {}
+        batch = BatchReview()
+        current: Dict[str, PayloadReview] = {}
+        for entry in payloads:
+            digest = content_hash(entry)
+            review = current.get(digest) or previous.get(digest)
+            if review is None:
+                review = review_payload(entry)
+            else:
+                batch.reused += 1
+            current[digest] = review
+            batch.reviews.append(review)
+
+        with self._lock:
+            self._stats["reviewed"] += len(payloads) - batch.reused
+            self._stats["reused"] += batch.reused
+            if key:
+                self._entries[key] = current
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_conversations:
+                    self._entries.popitem(last=False)
+        return batch
+
+    def clear(self) -> None:
+        """Forget all cached reviews."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "conversations": len(self._entries),
+                "reviews": sum(len(e) for e in self._entries.values()),
+                **self._stats,
+            }
+
+
+# Global cache instance
+_payload_review_cache: Optional[PayloadReviewCache] = None
+
+
+def get_payload_review_cache() -> PayloadReviewCache:
+    """Get or create the global payload review cache."""
+    global _payload_review_cache
+    if _payload_review_cache is None:
+        _payload_review_cache = PayloadReviewCache()
+        register_memory_source(
+            "payload_reviews.entries",
+            lambda: _payload_review_cache.stats()["reviews"],
+        )
+    return _payload_review_cache
+
+
+def review_payloads(
+    payloads: List[Dict[str, Any]], key: Optional[str] = None
+) -> BatchReview:
+    """Review a turn's payloads with the global cache (see PayloadReviewCache)."""
+    return get_payload_review_cache().review(payloads, key)
@@ -0,0 +1,315 @@
+"""
+Server-side payload sessions for the /chat API.
+
+By default a client resends every payload on each turn and gets every payload
+back. With payload_session=true the server keeps the conversation's payloads
+here between turns, keyed like the conversation history:
+
+- the response carries a payloads_version token, only the payloads that were
+  added or changed during the turn, and the payload_ids that were removed
+- the next request sends that payloads_version plus only the payloads the
+  client changed (upserted by payload_id) and removed_payload_ids
+
+A request whose payloads_version does not match the stored session (expired,
+evicted, or another client moved it on) is refused with payloads_resync, and
+the client resends the full list without a version.
+
+With payloads_delta=true the response instead carries RFC 6902 patches per
+payload_id against the payloads the client already holds (payload_patches()).
+
+Sessions live in memory (LRU with a TTL) and, when PAYLOAD_SESSION_DIR is set,
+are also written to one JSON file each so they survive restarts. A session
+read back from disk expires TTL seconds after it was last saved.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import (
+    PAYLOAD_SESSION_DIR,
+    PAYLOAD_SESSION_MAX_SIZE,
+    PAYLOAD_SESSION_TTL_SECONDS,
+)
+from .json_patch import Patch, make_patch
+from .memory_telemetry import register_memory_source
+
+logger = logging.getLogger(__name__)
+
+PayloadList = List[Dict[str, Any]]
+
+# Fields of a payload entry the client sees (ZuoraApiPayload); internal keys
+# such as _placeholders are not part of versions or patches
+CLIENT_FIELDS = ("payload", "zuora_api_type", "payload_id")
+
+
+def client_view(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """A payload entry as returned to the client, as plain JSON values."""
+    return json.loads(
+        json.dumps({key: entry.get(key) for key in CLIENT_FIELDS}, default=str)
+    )
+
+
+def payloads_version(payloads: PayloadList) -> str:
+    """Content hash of a payload list as the client sees it (order-sensitive)."""
+    encoded = json.dumps(
+        [{key: p.get(key) for key in CLIENT_FIELDS} for p in payloads],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    ).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def ensure_payload_ids(payloads: PayloadList) -> PayloadList:
+    """Give payloads without a payload_id one, so they can be tracked by ID."""
+    for entry in payloads:
+        if not entry.get("payload_id"):
+            entry["payload_id"] = str(uuid.uuid4())[:8]
+    return payloads
+
+
+def apply_payload_changes(
+    base: PayloadList, upserts: PayloadList, removed_ids: Iterable[str]
+) -> PayloadList:
+    """
+    Apply a client's changes to the stored payloads.
+
+    Args:
+        base: Stored payloads
+        upserts: Payloads replacing the stored payload with the same payload_id,
+                 or appended if the ID is new
+        removed_ids: payload_ids to drop
+
+    Returns:
+        New payload list (base is not modified)
+    """
+    removed = set(removed_ids)
+    merged = [p for p in base if p.get("payload_id") not in removed]
+    positions = {p.get("payload_id"): i for i, p in enumerate(merged)}
+    for entry in ensure_payload_ids(upserts):
+        index = positions.get(entry["payload_id"])
+        if index is None:
+            positions[entry["payload_id"]] = len(merged)
+            merged.append(entry)
+        else:
+            merged[index] = entry
+    return merged
+
+
+def diff_payloads(
+    before: PayloadList, after: PayloadList, assigned_ids: Iterable[str] = ()
+) -> Tuple[PayloadList, List[str]]:
+    """
+    Payloads added or changed between two lists, and payload_ids removed.
+
+    Args:
+        before: Payloads at the start of the turn
+        after: Payloads at the end of the turn
+        assigned_ids: payload_ids assigned by the server this turn; their
+                      payloads are always returned so the client learns the IDs
+
+    Returns:
+        Tuple of (added or changed payloads in list order, removed payload_ids)
+    """
+    assigned = set(assigned_ids)
+    previous = {p.get("payload_id"): p for p in before}
+    changed = [
+        p
+        for p in after
+        if p.get("payload_id") in assigned or previous.get(p.get("payload_id")) != p
+    ]
+    current = {p.get("payload_id") for p in after}
+    removed = [pid for pid in previous if pid and pid not in current]
+    return changed, removed
+
+
+def payload_patches(
+    before: PayloadList, after: PayloadList, assigned_ids: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    RFC 6902 patches turning the client's payloads into this turn's result.
+
+    Args:
+        before: Payloads at the start of the turn
+        after: Payloads at the end of the turn
+        assigned_ids: payload_ids assigned by the server this turn; their
+                      payloads are listed as added, with the new ID
+
+    Returns:
+        {"added": [payload, ...] (appended in order),
+         "removed": [payload_id, ...],
+         "changed": {payload_id: [operation, ...]}}
+    """
+    assigned = set(assigned_ids)
+    changed_entries, removed = diff_payloads(before, after, assigned)
+    previous = {
+        p.get("payload_id"): p for p in before if p.get("payload_id") not in assigned
+    }
+    added: PayloadList = []
+    changed: Dict[str, Patch] = {}
+    for entry in changed_entries:
+        old = previous.get(entry.get("payload_id"))
+        if old is None:
+            added.append(client_view(entry))
+            continue
+        patch = make_patch(client_view(old), client_view(entry))
+        if patch:
+            changed[entry["payload_id"]] = patch
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+class PayloadSessionStore:
+    """
+    Thread-safe LRU store of payload lists keyed by conversation.
+
+    Entries expire after a period without access; the least recently used
+    entry is evicted from memory when the store is full. With a directory,
+    every save is also written to disk and a memory miss falls back to it.
+
+    Args:
+        max_sessions: Sessions kept in memory
+        ttl_seconds: Seconds without access before a session expires
+        directory: Optional directory for persistent sessions
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = PAYLOAD_SESSION_MAX_SIZE,
+        ttl_seconds: int = PAYLOAD_SESSION_TTL_SECONDS,
+        directory: Optional[str] = PAYLOAD_SESSION_DIR or None,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        # key -> (payloads, version, last access time)
+        self._entries: "OrderedDict[str, Tuple[PayloadList, str, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.directory or "", f"{name}.json")
+
+    def _read_file(self, key: str) -> Optional[Tuple[PayloadList, str, float]]:
+        """Load a persisted session (lock held)."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[PAYLOAD SESSION] Unreadable session file {path}: {e}")
+            return None
+        if data.get("key") != key:
+            return None
+        return data["payloads"], data["version"], data["saved_at"]
+
+    def _write_file(self, key: str, payloads: PayloadList, version: str) -> None:
+        """Persist a session atomically (lock held)."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data = {
+            "key": key,
+            "version": version,
+            "saved_at": time.time(),
+            "payloads": payloads,
+        }
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"), default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[PAYLOAD SESSION] Failed to persist session: {e}")
+
+    def _remove_file(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[Tuple[PayloadList, str]]:
+        """
+        Get a conversation's payloads and version, refreshing its access time.
+
+        Returns:
+            (copy of the payload list, version), or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.directory:
+                entry = self._read_file(key)
+            if entry is None:
+                return None
+            payloads, version, last_access = entry
+            if time.time() - last_access > self.ttl_seconds:
+                self._entries.pop(key, None)
+                if self.directory:
+                    self._remove_file(key)
+                return None
+            self._store(key, payloads, version)
+            return list(payloads), version
+
+    def _store(self, key: str, payloads: PayloadList, version: str) -> None:
+        """Put an entry at the most recent end of the LRU (lock held)."""
+        self._entries[key] = (payloads, version, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+
+    def save(self, key: str, payloads: PayloadList) -> str:
+        """Store a conversation's payloads, returning their version."""
+        version = payloads_version(payloads)
+        with self._lock:
+            self._store(key, list(payloads), version)
+            if self.directory:
+                self._write_file(key, payloads, version)
+        return version
+
+    def clear(self) -> None:
+        """Remove all sessions, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    if name.endswith(".json"):
+                        os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "payloads": sum(len(e[0]) for e in self._entries.values()),
+                "persistent": bool(self.directory),
+            }
+
+
+# Global store instance
+_payload_session_store: Optional[PayloadSessionStore] = None
+
+
+def get_payload_session_store() -> PayloadSessionStore:
+    """Get or create the global payload session store."""
+    global _payload_session_store
+    if _payload_session_store is None:
+        _payload_session_store = PayloadSessionStore()
+        register_memory_source(
+            "payload_sessions.entries",
+            lambda: _payload_session_store.stats()["size"],
+        )
+        register_memory_source(
+            "payload_sessions.payloads",
+            lambda: _payload_session_store.stats()["payloads"],
+        )
+    return _payload_session_store
@@ -0,0 +1,259 @@
+"""
+Indexed view over the payload list held in agent state.
+
+Tools used to rescan the whole ``zuora_api_payloads`` list for every lookup
+(by payload_id, type, name, parent reference or endpoint entity). PayloadStore
+builds those indexes in one pass when it is loaded and keeps them current as
+payloads are added, so lookups inside a tool call are O(1) (or O(k) over the
+payloads of one type) however large the batch grows.
+
+The list itself stays the boundary format: the store wraps the list read from
+agent state, and save() writes that same list back. Request and response
+payloads, conversation snapshots and compaction are unchanged.
+
+Usage:
+    store = PayloadStore.load(tool_context.agent)
+    hit = store.get("a1b2c3d4")
+    store.append(new_entry)
+    store.save(tool_context.agent)
+"""
+
+import bisect
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+PAYLOADS_STATE_KEY = "zuora_api_payloads"
+
+# Payload field holding the parent object reference, per api type
+PARENT_FIELDS: Dict[str, Tuple[str, str]] = {
+    "rate_plan": ("ProductId", "productId"),
+    "rate_plan_create": ("ProductId", "productId"),
+    "product_rate_plan": ("ProductId", "productId"),
+    "charge": ("ProductRatePlanId", "productRatePlanId"),
+    "charge_create": ("ProductRatePlanId", "productRatePlanId"),
+    "product_rate_plan_charge": ("ProductRatePlanId", "productRatePlanId"),
+}
+
+PayloadEntry = Dict[str, Any]
+
+
+def payload_type(entry: PayloadEntry) -> str:
+    """Lowercased zuora_api_type of a payload entry."""
+    return (entry.get("zuora_api_type") or "").lower()
+
+
+def payload_name(entry: PayloadEntry) -> str:
+    """Name of the object a payload creates ("Name" or "name"), or ""."""
+    body = entry.get("payload") or {}
+    name = body.get("Name") or body.get("name")
+    # Client-sent payloads may carry any JSON value here
+    return name if isinstance(name, str) else ""
+
+
+def payload_parent(entry: PayloadEntry) -> Optional[str]:
+    """Parent object reference (ProductId / ProductRatePlanId) of a payload."""
+    fields = PARENT_FIELDS.get(payload_type(entry))
+    if not fields:
+        return None
+    body = entry.get("payload") or {}
+    parent = body.get(fields[0]) or body.get(fields[1])
+    return parent if isinstance(parent, str) else None
+
+
+def endpoint_entity_id(endpoint: Optional[str]) -> Optional[str]:
+    """Last path segment of an update endpoint, e.g. the product ID."""
+    if not endpoint:
+        return None
+    return endpoint.rstrip("/").split("/")[-1] or None
+
+
+class PayloadStore:
+    """
+    Payload list with maintained indexes.
+
+    Indexes (all values are positions in the list):
+        by payload_id, by api type, by (api type, lowercased name),
+        by (api type, lowercased name, parent reference),
+        by (api type, parent reference) and by (api type, endpoint entity ID)
+
+    Entries are the same dicts as in the list, so in-place edits are visible
+    to both; call reindex() after changing a payload's name, parent or
+    endpoint so the indexes follow.
+
+    Args:
+        payloads: Payload entries as stored in agent state
+    """
+
+    def __init__(self, payloads: Optional[List[PayloadEntry]] = None):
+        self.payloads: List[PayloadEntry] = payloads if payloads is not None else []
+        self._by_id: Dict[str, int] = {}
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+        self._by_name: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_name_parent: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+        self._by_parent: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_entity: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        # Index keys of each entry as last indexed, so reindex() can drop them
+        self._entry_keys: List[Dict[str, Any]] = []
+        for index, entry in enumerate(self.payloads):
+            self._index(index, entry)
+
+    @classmethod
+    def of(cls, payloads: Union["PayloadStore", List[PayloadEntry]]) -> "PayloadStore":
+        """Wrap a payload list, or return an existing store unchanged."""
+        if isinstance(payloads, PayloadStore):
+            return payloads
+        return cls(payloads)
+
+    @classmethod
+    def load(cls, agent: Any) -> "PayloadStore":
+        """Store over the payloads in an agent's state."""
+        return cls(agent.state.get(PAYLOADS_STATE_KEY) or [])
+
+    def save(self, agent: Any) -> None:
+        """Write the payload list back to the agent's state."""
+        agent.state.set(PAYLOADS_STATE_KEY, self.payloads)
+
+    def to_list(self) -> List[PayloadEntry]:
+        """The payloads in the list format used by requests and responses."""
+        return self.payloads
+
+    # ---- index maintenance ----
+
+    def _keys(self, entry: PayloadEntry) -> Dict[str, Any]:
+        api_type = payload_type(entry)
+        name = payload_name(entry)
+        parent = payload_parent(entry)
+        body = entry.get("payload") or {}
+        entity_id = (
+            endpoint_entity_id(body.get("endpoint")) if isinstance(body, dict) else None
+        )
+        return {
+            "id": entry.get("payload_id"),
+            "type": api_type,
+            "name": (api_type, name.lower()) if name else None,
+            "name_parent": (
+                (api_type, name.lower(), parent) if name and parent else None
+            ),
+            "parent": (api_type, parent) if parent else None,
+            "entity": (api_type, entity_id) if entity_id else None,
+        }
+
+    def _index(self, index: int, entry: PayloadEntry) -> None:
+        keys = self._keys(entry)
+        if index == len(self._entry_keys):
+            self._entry_keys.append(keys)
+        else:
+            self._entry_keys[index] = keys
+        if keys["id"]:
+            self._by_id.setdefault(keys["id"], index)
+        for key, table in (
+            ("type", self._by_type),
+            ("name", self._by_name),
+            ("name_parent", self._by_name_parent),
+            ("parent", self._by_parent),
+            ("entity", self._by_entity),
+        ):
+            if keys[key] is not None:
+                # Positions stay sorted, so the first hit is the earliest payload
+                bisect.insort(table[keys[key]], index)
+
+    def _unindex(self, index: int) -> None:
+        keys = self._entry_keys[index]
+        if keys["id"] and self._by_id.get(keys["id"]) == index:
+            del self._by_id[keys["id"]]
+        for key, table in (
+            ("type", self._by_type),
+            ("name", self._by_name),
+            ("name_parent", self._by_name_parent),
+            ("parent", self._by_parent),
+            ("entity", self._by_entity),
+        ):
+            positions = table.get(keys[key]) if keys[key] is not None else None
+            if positions and index in positions:
+                positions.remove(index)
+
+    def append(self, entry: PayloadEntry) -> int:
+        """Add a payload entry and return its position in the list."""
+        index = len(self.payloads)
+        self.payloads.append(entry)
+        self._index(index, entry)
+        return index
+
+    def reindex(self, index: int) -> None:
+        """Re-index the entry at a position after it was modified in place."""
+        self._unindex(index)
+        self._index(index, self.payloads[index])
+
+    # ---- lookups ----
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def __iter__(self) -> Iterator[PayloadEntry]:
+        return iter(self.payloads)
+
+    def types(self) -> List[str]:
+        """Api types present, in order of first appearance."""
+        return [t for t, positions in self._by_type.items() if positions]
+
+    def of_type(self, api_type: str) -> List[Tuple[int, PayloadEntry]]:
+        """(position, entry) for every payload of a type (case-insensitive)."""
+        return [(i, self.payloads[i]) for i in self._by_type.get(api_type.lower(), [])]
+
+    def count(self, api_type: str) -> int:
+        """Number of payloads of a type (case-insensitive)."""
+        return len(self._by_type.get(api_type.lower(), []))
+
+    def get(
+        self, payload_id: str, api_type: Optional[str] = None
+    ) -> Optional[Tuple[int, PayloadEntry]]:
+        """(position, entry) for a payload_id, optionally requiring its type."""
+        index = self._by_id.get(payload_id)
+        if index is None:
+            return None
+        entry = self.payloads[index]
+        if api_type is not None and payload_type(entry) != api_type.lower():
+            return None
+        return index, entry
+
+    def find_by_name(
+        self,
+        name: str,
+        api_types: Iterable[str],
+        parent: Optional[str] = None,
+    ) -> Optional[Tuple[int, PayloadEntry]]:
+        """
+        First payload of one of api_types with this exact name (case-insensitive).
+
+        Args:
+            name: Name to look up
+            api_types: Api types to consider
+            parent: If given, the payload's parent reference must equal it
+
+        Returns:
+            (position, entry) of the first match, or None
+        """
+        hits: List[int] = []
+        for api_type in api_types:
+            if parent is not None:
+                key = (api_type.lower(), name.lower(), parent)
+                positions = self._by_name_parent.get(key, [])
+            else:
+                positions = self._by_name.get((api_type.lower(), name.lower()), [])
+            hits.extend(positions)
+        if not hits:
+            return None
+        index = min(hits)
+        return index, self.payloads[index]
+
+    def children(self, parent: str, api_type: str) -> List[Tuple[int, PayloadEntry]]:
+        """(position, entry) for payloads of a type referencing a parent."""
+        return [
+            (i, self.payloads[i])
+            for i in self._by_parent.get((api_type.lower(), parent), [])
+        ]
+
+    def find_update(self, api_type: str, entity_id: str) -> Optional[int]:
+        """Position of the first payload of a type whose endpoint targets entity_id."""
+        positions = self._by_entity.get((api_type.lower(), entity_id))
+        return positions[0] if positions else None
@@ -0,0 +1,164 @@
+"""
+Per-payload placeholder registry.
+
+A payload entry created with missing required fields carries
+``<<PLACEHOLDER:...>>`` values in its body. The registry records them once,
+when they are generated, under the entry's ``_placeholder_registry`` key:
+
+    {"billtocontact.firstname": {
+        "field": "billToContact.firstName",
+        "path": ["billToContact", "firstName"],
+        "marker": "<<PLACEHOLDER:billToContact.firstName>>",
+        "description": "Contact first name"}}
+
+Keys are normalized field paths (lowercase, no underscores), matching how
+update_payload accepts field names, so resolving a placeholder is a dict
+lookup. The entry's ``_placeholders`` list stays the ordered view of the
+registry's fields for existing readers. Entries without a registry (older
+state, or payloads sent back by the client) get one built from
+``_placeholders`` or from a single scan of the body.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+PLACEHOLDER_REGISTRY_KEY = "_placeholder_registry"
+PLACEHOLDERS_KEY = "_placeholders"
+
+# "<<PLACEHOLDER:Field>>" or "<<PLACEHOLDER:Field (required because ...)>>"
+PLACEHOLDER_PATTERN = re.compile(r"<<PLACEHOLDER:([^>(]+?)\s*(?:\([^>]*\))?>>")
+
+PlaceholderRegistry = Dict[str, Dict[str, Any]]
+
+
+def placeholder_key(field: str) -> str:
+    """Registry key for a field path ("Bill_Cycle_Type" -> "billcycletype")."""
+    return field.lower().replace("_", "")
+
+
+def add_placeholder(
+    registry: PlaceholderRegistry,
+    field: str,
+    marker: str,
+    description: str = "",
+    path: Optional[List[str]] = None,
+) -> None:
+    """
+    Record a placeholder in a registry.
+
+    Args:
+        registry: Registry to add to
+        field: Field path as shown to the user (e.g. "billToContact.firstName")
+        marker: The placeholder string stored at the field
+        description: Description of the missing field
+        path: Keys leading to the value in the payload body (default: field split on ".")
+    """
+    registry[placeholder_key(field)] = {
+        "field": field,
+        "path": path if path is not None else field.split("."),
+        "marker": marker,
+        "description": description,
+    }
+
+
+def _value_at(body: Any, path: List[str]) -> Any:
+    current = body
+    for key in path:
+        if isinstance(current, dict) and key in current:
+            current = current[key]
+        elif isinstance(current, list) and key.isdigit() and int(key) < len(current):
+            current = current[int(key)]
+        else:
+            return None
+    return current
+
+
+def _scan(value: Any, path: List[str], registry: PlaceholderRegistry) -> None:
+    """Add every placeholder value found in a body, in document order."""
+    if isinstance(value, str):
+        if "<<PLACEHOLDER:" in value:
+            for match in PLACEHOLDER_PATTERN.finditer(value):
+                field = match.group(1)
+                if placeholder_key(field) not in registry:
+                    add_placeholder(registry, field, match.group(0), path=list(path))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _scan(item, path + [str(key)], registry)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _scan(item, path + [str(index)], registry)
+
+
+def placeholder_registry(entry: Dict[str, Any]) -> PlaceholderRegistry:
+    """
+    The placeholder registry of a payload entry (not stored on the entry).
+
+    Args:
+        entry: Payload entry (payload, zuora_api_type, payload_id, ...)
+
+    Returns:
+        The entry's registry; for entries without one, a registry built from
+        _placeholders, or from the placeholder values in the body
+    """
+    registry = entry.get(PLACEHOLDER_REGISTRY_KEY)
+    if registry is not None:
+        return registry
+    body = entry.get("payload")
+    registry = {}
+    if PLACEHOLDERS_KEY in entry:
+        for field in entry[PLACEHOLDERS_KEY] or []:
+            value = _value_at(body, field.split("."))
+            marker = value if isinstance(value, str) else f"<<PLACEHOLDER:{field}>>"
+            add_placeholder(registry, field, marker)
+    else:
+        _scan(body, [], registry)
+    return registry
+
+
+def placeholder_fields(entry: Dict[str, Any]) -> List[str]:
+    """
+    Placeholder fields of a payload entry, in the order they were added.
+
+    Args:
+        entry: Payload entry
+
+    Returns:
+        The entry's _placeholders list if present, otherwise the fields of
+        its registry (built from the body if needed)
+    """
+    if PLACEHOLDERS_KEY in entry:
+        return list(entry[PLACEHOLDERS_KEY] or [])
+    return [meta["field"] for meta in placeholder_registry(entry).values()]
+
+
+def set_placeholders(entry: Dict[str, Any], registry: PlaceholderRegistry) -> None:
+    """Store a registry on an entry with its _placeholders view (removed if empty)."""
+    if registry:
+        entry[PLACEHOLDER_REGISTRY_KEY] = registry
+        entry[PLACEHOLDERS_KEY] = [meta["field"] for meta in registry.values()]
+    else:
+        entry.pop(PLACEHOLDER_REGISTRY_KEY, None)
+        entry.pop(PLACEHOLDERS_KEY, None)
+
+
+def resolve_placeholder(entry: Dict[str, Any], *names: str) -> Optional[str]:
+    """
+    Drop the placeholder for a field that has just been given a value.
+
+    Args:
+        entry: Payload entry (updated in place)
+        names: Names the field may be registered under (e.g. the requested
+               field path and the key actually written), tried in order
+
+    Returns:
+        The resolved field, or None if none of the names was a placeholder
+    """
+    registry = placeholder_registry(entry)
+    if not registry:
+        return None
+    for name in names:
+        meta = registry.pop(placeholder_key(name), None)
+        if meta is not None:
+            set_placeholders(entry, registry)
+            return meta["field"]
+    return None
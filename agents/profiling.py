@@ -0,0 +1,317 @@
+"""
+Request-scoped sampling profiler.
+
+Profilers cannot be attached to AgentCore runtimes, so invoke() can run this
+in-process profiler for a request: a background thread samples the stacks of
+threads running repo code every few milliseconds (wall-clock, so time blocked
+on Zuora or the model shows up too). Samples are aggregated into collapsed
+stacks (the flamegraph.pl / speedscope input format), an SVG flamegraph, and
+per-tool totals.
+
+Profiling is enabled per request with "profile": true, or for a random
+fraction of requests with PROFILE_SAMPLE_RATE. Concurrent requests in the same
+process are sampled together.
+"""
+
+import html
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stacks outside any tool (model calls, prompt building, formatting)
+NO_TOOL = "(agent)"
+
+# Code object of each tool function -> tool name, filled by InstrumentedTool
+TOOL_CODE_NAMES: Dict[CodeType, str] = {}
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+_THREADING_FILE = threading.__file__
+# threading functions a thread blocks in while waiting on another thread
+_WAIT_FUNCTIONS = {"wait", "_wait_for_tstate_lock"}
+
+Stack = Tuple[CodeType, ...]
+
+
+def register_tool_code(func: Callable[..., Any], tool_name: str) -> None:
+    """Attribute samples inside func to tool_name."""
+    code = getattr(func, "__code__", None)
+    if code is not None:
+        TOOL_CODE_NAMES[code] = tool_name
+
+
+def should_profile(sample_rate: float) -> bool:
+    """Randomly select a request for profiling at the given rate."""
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+class SamplingProfiler:
+    """
+    Background thread sampling the stacks of threads running repo code.
+
+    Usage:
+        profiler = SamplingProfiler(interval_ms=10)
+        profiler.start()
+        ...  # handle the request
+        profile = profiler.stop()
+    """
+
+    def __init__(self, interval_ms: float = 10.0, max_depth: int = 128):
+        self.interval_ms = interval_ms
+        self.max_depth = max_depth
+        self._samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_time = 0.0
+        self._duration_ms = 0.0
+        # Whether a code object belongs to the repo (cached per code object)
+        self._in_repo: Dict[CodeType, bool] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> "Profile":
+        """Stop sampling and return the aggregated profile."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._duration_ms = (time.perf_counter() - self._start_time) * 1000
+        return Profile(dict(self._samples), self.interval_ms, self._duration_ms)
+
+    def _run(self) -> None:
+        interval = self.interval_ms / 1000
+        own_id = threading.get_ident()
+        while not self._stop.wait(interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if stack:
+                    self._samples[stack] += 1
+
+    def _stack(self, frame: Any) -> Optional[Stack]:
+        """
+        Root-to-leaf code objects, or None to skip the thread.
+
+        Threads with no repo code are skipped, as are threads blocked waiting on
+        another thread (e.g. invoke() waiting for the agent's event loop
+        thread), whose work is sampled in that thread instead.
+        """
+        code = frame.f_code
+        if code.co_filename == _THREADING_FILE and code.co_name in _WAIT_FUNCTIONS:
+            return None
+        codes: List[CodeType] = []
+        in_repo = False
+        while frame is not None and len(codes) < self.max_depth:
+            code = frame.f_code
+            codes.append(code)
+            if not in_repo:
+                in_repo = self._is_repo_code(code)
+            frame = frame.f_back
+        if not in_repo:
+            return None
+        codes.reverse()
+        return tuple(codes)
+
+    def _is_repo_code(self, code: CodeType) -> bool:
+        result = self._in_repo.get(code)
+        if result is None:
+            filename = os.path.abspath(code.co_filename)
+            result = (
+                filename.startswith(_REPO_ROOT)
+                and filename != _THIS_FILE
+                and "site-packages" not in filename
+            )
+            self._in_repo[code] = result
+        return result
+
+
+def _frame_label(code: CodeType) -> str:
+    """module:function label used in collapsed stacks."""
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}:{name}"
+
+
+class Profile:
+    """Aggregated samples from one profiling run."""
+
+    def __init__(
+        self, samples: Dict[Stack, int], interval_ms: float, duration_ms: float
+    ):
+        self.interval_ms = interval_ms
+        self.duration_ms = duration_ms
+        self.total_samples = sum(samples.values())
+        self._samples = samples
+
+    def collapsed_stacks(self) -> Dict[str, int]:
+        """Sample counts keyed by "tool;frame;frame" (root to leaf)."""
+        stacks: Counter = Counter()
+        for codes, count in self._samples.items():
+            tool_name = self._tool_for(codes)
+            labels = ";".join(_frame_label(code) for code in codes)
+            stacks[f"{tool_name};{labels}"] += count
+        return dict(stacks)
+
+    def collapsed_text(self) -> str:
+        """Collapsed stack lines ("stack count"), heaviest first."""
+        stacks = sorted(self.collapsed_stacks().items(), key=lambda kv: -kv[1])
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def by_tool(self, top_n: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Samples per tool with the functions where the most samples landed.
+
+        Returns:
+            {tool_name: {"samples", "ms", "top_functions": [[label, samples], ...]}}
+        """
+        totals: Counter = Counter()
+        leaves: Dict[str, Counter] = {}
+        for codes, count in self._samples.items():
+            tool_name = self._tool_for(codes)
+            totals[tool_name] += count
+            leaf = self._innermost_repo_label(codes)
+            leaves.setdefault(tool_name, Counter())[leaf] += count
+
+        return {
+            tool_name: {
+                "samples": samples,
+                "ms": round(samples * self.interval_ms, 1),
+                "top_functions": [
+                    [label, n] for label, n in leaves[tool_name].most_common(top_n)
+                ],
+            }
+            for tool_name, samples in totals.most_common()
+        }
+
+    def to_dict(self, max_stacks: int = 200) -> Dict[str, Any]:
+        """Summary for a debug payload (heaviest max_stacks collapsed stacks)."""
+        lines = self.collapsed_text().splitlines()
+        return {
+            "samples": self.total_samples,
+            "interval_ms": self.interval_ms,
+            "duration_ms": round(self.duration_ms, 1),
+            "by_tool": self.by_tool(),
+            "collapsed": lines[:max_stacks],
+        }
+
+    @staticmethod
+    def _tool_for(codes: Stack) -> str:
+        for code in codes:
+            tool_name = TOOL_CODE_NAMES.get(code)
+            if tool_name is not None:
+                return tool_name
+        return NO_TOOL
+
+    @staticmethod
+    def _innermost_repo_label(codes: Stack) -> str:
+        """Deepest frame in repo code (library frames are grouped under it)."""
+        for code in reversed(codes):
+            filename = os.path.abspath(code.co_filename)
+            if filename.startswith(_REPO_ROOT) and "site-packages" not in filename:
+                return _frame_label(code)
+        return _frame_label(codes[-1])
+
+
+# ============ Flamegraph ============
+
+_FRAME_HEIGHT = 16
+_WIDTH = 1200
+
+
+def render_flamegraph(stacks: Dict[str, int], title: str = "Flamegraph") -> str:
+    """
+    Render collapsed stacks as a standalone SVG flamegraph.
+
+    Args:
+        stacks: Sample counts keyed by ";"-separated stacks (root first)
+        title: Title drawn above the graph
+
+    Returns:
+        SVG document (hover a frame to see its samples)
+    """
+    # Build the call tree: node = [samples, children]
+    root: List[Any] = [0, {}]
+    for stack, count in stacks.items():
+        node = root
+        node[0] += count
+        for label in stack.split(";"):
+            node = node[1].setdefault(label, [0, {}])
+            node[0] += count
+
+    def tree_depth(children: Dict[str, List[Any]]) -> int:
+        return max((1 + tree_depth(c[1]) for c in children.values()), default=0)
+
+    # Root frames at the bottom, leaving room for the title at the top
+    total = max(root[0], 1)
+    height = tree_depth(root[1]) * _FRAME_HEIGHT + 30
+    rects: List[str] = []
+
+    def draw(children: Dict[str, List[Any]], x: float, depth: int) -> None:
+        for label, (samples, grandchildren) in sorted(children.items()):
+            width = samples / total * _WIDTH
+            if width >= 0.5:
+                y = height - (depth + 1) * _FRAME_HEIGHT
+                text = html.escape(label)
+                hue = 10 + sum(map(ord, label)) % 40
+                rects.append(
+                    f"<g><title>{text} ({samples} samples, "
+                    f"{samples / total * 100:.1f}%)</title>"
+                    f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" '
+                    f'height="{_FRAME_HEIGHT - 1}" fill="hsl({hue},85%,60%)"/>'
+                )
+                if width > 30:
+                    rects.append(
+                        f'<text x="{x + 3:.1f}" y="{y + _FRAME_HEIGHT - 4}" '
+                        f'font-size="11">{html.escape(label[: int(width / 7)])}</text>'
+                    )
+                rects.append("</g>")
+                draw(grandchildren, x, depth + 1)
+            x += width
+
+    draw(root[1], 0.0, 0)
+    body = "".join(rects)
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" '
+        f'height="{height}" font-family="monospace">\n'
+        f'<text x="{_WIDTH / 2}" y="18" text-anchor="middle" font-size="14">'
+        f"{html.escape(title)} ({root[0]} samples)</text>\n{body}\n</svg>\n"
+    )
+
+
+def write_profile(profile: Profile, output_dir: str, name: str) -> Dict[str, str]:
+    """
+    Write collapsed stacks and an SVG flamegraph to output_dir.
+
+    Returns:
+        Paths of the written files ({"collapsed": ..., "flamegraph": ...})
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        "collapsed": os.path.join(output_dir, f"{name}.collapsed"),
+        "flamegraph": os.path.join(output_dir, f"{name}.svg"),
+    }
+    with open(paths["collapsed"], "w", encoding="utf-8") as f:
+        f.write(profile.collapsed_text())
+    with open(paths["flamegraph"], "w", encoding="utf-8") as f:
+        f.write(render_flamegraph(profile.collapsed_stacks(), title=name))
+    logger.info(f"[PROFILE] Wrote {profile.total_samples} samples to {output_dir}")
+    return paths
@@ -0,0 +1,192 @@
+"""
+Tail-based trace sampling.
+
+Spans are buffered per trace until the trace's local root span (normally
+"agentcore.invoke") ends. The whole span tree is then kept if the request was
+slow or failed, plus a small random sample of the rest, and handed to the
+downstream span processors (OTLP batch export and/or a local JSONL file).
+Requests can then be debugged from complete traces without exporting every one.
+"""
+
+import logging
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import StatusCode
+
+logger = logging.getLogger(__name__)
+
+# Reasons recorded for a keep decision
+KEEP_SLOW = "slow"
+KEEP_ERROR = "error"
+KEEP_SAMPLED = "sampled"
+
+
+def _is_local_root(span: ReadableSpan) -> bool:
+    """A span with no parent in this process ends its trace here."""
+    return span.parent is None or span.parent.is_remote
+
+
+def _is_error(span: ReadableSpan) -> bool:
+    """Failed spans either set an ERROR status or an "error" attribute."""
+    if span.status.status_code == StatusCode.ERROR:
+        return True
+    return bool(span.attributes and span.attributes.get("error"))
+
+
+def _duration_ms(span: ReadableSpan) -> float:
+    if span.start_time is None or span.end_time is None:
+        return 0.0
+    return (span.end_time - span.start_time) / 1_000_000
+
+
+class TailSamplingProcessor(SpanProcessor):
+    """
+    Span processor that decides whether to keep a trace once it has finished.
+
+    A trace is kept when its local root span took at least latency_threshold_ms
+    or any span in it failed; otherwise it is kept with probability
+    sample_ratio. Kept spans are passed to the downstream processors' on_end.
+
+    Memory is bounded: at most max_traces unfinished traces are buffered (the
+    oldest is dropped when full) and at most max_spans_per_trace spans are kept
+    per trace. Spans ending after their root (late spans) follow the decision
+    already made for the trace.
+    """
+
+    def __init__(
+        self,
+        processors: Sequence[SpanProcessor],
+        latency_threshold_ms: float = 10000.0,
+        sample_ratio: float = 0.01,
+        max_traces: int = 1000,
+        max_spans_per_trace: int = 500,
+    ):
+        self._processors = list(processors)
+        self.latency_threshold_ms = latency_threshold_ms
+        self.sample_ratio = sample_ratio
+        self._max_traces = max_traces
+        self._max_spans_per_trace = max_spans_per_trace
+        self._traces: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._decisions: "OrderedDict[int, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "traces_kept": 0,
+            "traces_dropped": 0,
+            "kept_slow": 0,
+            "kept_error": 0,
+            "kept_sampled": 0,
+            "traces_evicted": 0,
+            "spans_truncated": 0,
+        }
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context is None or not span.context.trace_flags.sampled:
+            return
+        trace_id = span.context.trace_id
+
+        with self._lock:
+            decision = self._decisions.get(trace_id)
+            if decision is None and not _is_local_root(span):
+                self._buffer(trace_id, span)
+                return
+
+            if decision is None:
+                spans = self._traces.pop(trace_id, [])
+                spans.append(span)
+                reason = self._decide(span, spans)
+                decision = reason is not None
+                self._record_decision(trace_id, decision, reason)
+            else:
+                # Late span: the trace has already been decided
+                spans = [span]
+
+        if decision:
+            self._export(spans)
+
+    def _buffer(self, trace_id: int, span: ReadableSpan) -> None:
+        """Add a span to its trace's buffer. Caller holds the lock."""
+        spans = self._traces.get(trace_id)
+        if spans is None:
+            if len(self._traces) >= self._max_traces:
+                self._traces.popitem(last=False)
+                self._stats["traces_evicted"] += 1
+            spans = self._traces[trace_id] = []
+        if len(spans) >= self._max_spans_per_trace:
+            self._stats["spans_truncated"] += 1
+            return
+        spans.append(span)
+
+    def _decide(self, root: ReadableSpan, spans: List[ReadableSpan]) -> Optional[str]:
+        """Reason to keep the trace, or None to drop it."""
+        if _duration_ms(root) >= self.latency_threshold_ms:
+            return KEEP_SLOW
+        if any(_is_error(span) for span in spans):
+            return KEEP_ERROR
+        if random.random() < self.sample_ratio:
+            return KEEP_SAMPLED
+        return None
+
+    def _record_decision(
+        self, trace_id: int, keep: bool, reason: Optional[str]
+    ) -> None:
+        """Remember a decision for late spans. Caller holds the lock."""
+        self._decisions[trace_id] = keep
+        if len(self._decisions) > self._max_traces:
+            self._decisions.popitem(last=False)
+        if keep:
+            self._stats["traces_kept"] += 1
+            self._stats[f"kept_{reason}"] += 1
+        else:
+            self._stats["traces_dropped"] += 1
+
+    def _export(self, spans: List[ReadableSpan]) -> None:
+        for processor in self._processors:
+            for span in spans:
+                try:
+                    processor.on_end(span)
+                except Exception as e:
+                    logger.warning(f"Tail sampling export failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Keep/drop counts and the number of traces currently buffered."""
+        with self._lock:
+            return {**self._stats, "traces_buffered": len(self._traces)}
+
+    def shutdown(self) -> None:
+        for processor in self._processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return all(
+            processor.force_flush(timeout_millis) for processor in self._processors
+        )
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Append spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.warning(f"Failed to write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
@@ -0,0 +1,130 @@
+"""
+Per-request timing breakdown.
+
+invoke() times each phase of a request; code deeper in the call stack (Zuora
+client, payload validation, HTML formatting) adds its time to the request's
+RequestTimings through a context variable, which Strands copies into the
+threads that run the agent and its tools. The result can be returned in the
+response as a "timings" block with a Server-Timing compatible string.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+# Components whose time is summed across a request
+TIMING_MODEL = "model"
+TIMING_ZUORA = "zuora"
+TIMING_HTML = "html"
+TIMING_VALIDATION = "validation"
+
+
+class RequestTimings:
+    """Phase durations and per-component totals for one request."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.components: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        # Tools and catalog fetches may record from several threads at once
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a request phase (recorded even if it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    def add(self, component: str, duration_ms: float, count: int = 1) -> None:
+        """Add time spent in a component."""
+        with self._lock:
+            self.components[component] = (
+                self.components.get(component, 0.0) + duration_ms
+            )
+            self.counts[component] = self.counts.get(component, 0) + count
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Timings in milliseconds, plus the equivalent Server-Timing value."""
+        total_ms = self.total_ms
+        return {
+            "total_ms": round(total_ms, 1),
+            "phases": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "components": {
+                name: {"duration_ms": round(ms, 1), "count": self.counts[name]}
+                for name, ms in self.components.items()
+            },
+            "server_timing": self.server_timing(total_ms),
+        }
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """
+        Format as a Server-Timing header value.
+
+        Example: 'parse;dur=0.4, invoke;dur=5120.3, zuora;desc="3 calls";dur=812.0, total;dur=5301.2'
+        """
+        entries = [f"{name};dur={ms:.1f}" for name, ms in self.phases.items()]
+        for name, ms in self.components.items():
+            count = self.counts[name]
+            unit = "call" if count == 1 else "calls"
+            entries.append(f'{name};desc="{count} {unit}";dur={ms:.1f}')
+        entries.append(
+            f"total;dur={self.total_ms if total_ms is None else total_ms:.1f}"
+        )
+        return ", ".join(entries)
+
+
+# Timings of the request currently being handled (None outside invoke)
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> Any:
+    """
+    Start collecting timings for the current request.
+
+    Returns:
+        Token to pass to end_request_timings()
+    """
+    return _request_timings.set(RequestTimings())
+
+
+def end_request_timings(token: Any) -> None:
+    """Stop collecting timings for the current request."""
+    try:
+        _request_timings.reset(token)
+    except ValueError:
+        # Token created in a different context; nothing to restore
+        pass
+
+
+def get_request_timings() -> Optional[RequestTimings]:
+    """Timings of the current request, or None outside a request."""
+    return _request_timings.get()
+
+
+def record_timing(component: str, duration_ms: float, count: int = 1) -> None:
+    """Add time spent in a component to the current request (no-op outside one)."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(component, duration_ms, count)
+
+
+@contextmanager
+def timed(component: str) -> Iterator[None]:
+    """Time a block and add it to the current request's component total."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(component, (time.perf_counter() - start) * 1000)
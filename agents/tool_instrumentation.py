@@ -0,0 +1,165 @@
+"""
+Automatic instrumentation for agent tools.
+
+Tools are wrapped when the persona tool lists are built, so every @tool
+invocation is timed, tagged with its category, and recorded through
+MetricsCollector without editing the tools themselves. Each execution gets a
+child span; Zuora API calls made by the tool are counted and attached to it.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+from opentelemetry import trace
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+
+from .observability import (
+    end_tool_call_scope,
+    get_metrics_collector,
+    get_tracer,
+    start_tool_call_scope,
+)
+from .profiling import register_tool_code
+
+logger = logging.getLogger(__name__)
+
+# Tool categories used as the "category" metric attribute
+TOOL_CATEGORY_READ = "read"
+TOOL_CATEGORY_CREATE = "create"
+TOOL_CATEGORY_UPDATE = "update"
+TOOL_CATEGORY_ADVISORY = "advisory"
+TOOL_CATEGORY_PWD = "pwd"
+
+
+def _result_bytes(result: Dict[str, Any]) -> int:
+    """Size of a tool result's content in bytes."""
+    total = 0
+    for item in result.get("content", []):
+        if "text" in item:
+            total += len(item["text"].encode("utf-8"))
+        elif "json" in item:
+            total += len(json.dumps(item["json"], default=str).encode("utf-8"))
+    return total
+
+
+class InstrumentedTool(AgentTool):
+    """
+    Proxy around an AgentTool that records execution metrics.
+
+    Records per execution:
+    - duration and success (tool_executions_total / tool_execution_duration_ms)
+    - input and output size in bytes (tool_io_bytes)
+    - Zuora API calls made (tool_zuora_calls)
+    - a "tool.<name>" span, parent of the tool's Zuora API spans
+    """
+
+    def __init__(self, tool: AgentTool, category: str):
+        super().__init__()
+        self._tool = tool
+        self.category = category
+        # Decorated tools expose the original function; attribute profiler samples
+        wrapped_func = getattr(tool, "__wrapped__", None)
+        if wrapped_func is not None:
+            register_tool_code(wrapped_func, tool.tool_name)
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self._tool.tool_type
+
+    @property
+    def supports_hot_reload(self) -> bool:
+        return self._tool.supports_hot_reload
+
+    def get_display_properties(self) -> Dict[str, str]:
+        properties = self._tool.get_display_properties()
+        properties["Category"] = self.category
+        return properties
+
+    async def stream(
+        self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any
+    ) -> ToolGenerator:
+        """Run the wrapped tool inside a span, recording metrics when it finishes."""
+        tool_name = self.tool_name
+        input_bytes = len(
+            json.dumps(tool_use.get("input", {}), default=str).encode("utf-8")
+        )
+        span = get_tracer().start_span(
+            f"tool.{tool_name}",
+            attributes={
+                "tool.name": tool_name,
+                "tool.category": self.category,
+                "tool.input_bytes": input_bytes,
+            },
+        )
+
+        result: Dict[str, Any] = {}
+        start_time = time.time()
+        scope = start_tool_call_scope()
+        events = self._tool.stream(tool_use, invocation_state, **kwargs)
+        try:
+            while True:
+                # Make the span current only while the tool runs, so the
+                # Zuora client spans nest under it
+                with trace.use_span(span, end_on_exit=False):
+                    try:
+                        event = await events.__anext__()
+                    except StopAsyncIteration:
+                        break
+
+                # Decorated tools yield a ToolResultEvent; other tools yield the result itself
+                if isinstance(event, dict) and "tool_result" in event:
+                    result = event["tool_result"]
+                elif (
+                    isinstance(event, dict)
+                    and "toolUseId" in event
+                    and "status" in event
+                ):
+                    result = event
+                yield event
+        finally:
+            await events.aclose()
+            duration_ms = (time.time() - start_time) * 1000
+            zuora_calls = end_tool_call_scope(scope)
+            success = result.get("status") == "success"
+            output_bytes = _result_bytes(result) if result else 0
+
+            span.set_attribute("tool.output_bytes", output_bytes)
+            span.set_attribute("tool.zuora_calls", zuora_calls)
+            span.set_attribute("duration_ms", duration_ms)
+            span.set_attribute("success", success)
+            span.end()
+
+            metrics = get_metrics_collector()
+            metrics.record_tool_execution(
+                tool_name, self.category, duration_ms, success
+            )
+            metrics.record_tool_io(
+                tool_name, self.category, input_bytes, output_bytes, zuora_calls
+            )
+
+
+def instrument_tools(tools: List[AgentTool], category: str) -> List[AgentTool]:
+    """
+    Wrap tools so their executions are recorded under a category.
+
+    Args:
+        tools: Tools to wrap (already instrumented tools are kept as-is)
+        category: Category recorded for every tool in the list
+
+    Returns:
+        List of instrumented tools, in the same order
+    """
+    return [
+        tool if isinstance(tool, InstrumentedTool) else InstrumentedTool(tool, category)
+        for tool in tools
+    ]
@@ -1,6 +1,6 @@
 from strands import tool
 from strands.types.tools import ToolContext
-from typing import Optional, List, Dict, Any, Literal, Tuple
+from typing import Optional, List, Dict, Any, Literal, Tuple, Union
 import datetime
 import json
 import logging
@@ -9,6 +9,9 @@ import uuid
 import jellyfish
 
 from .models import ZuoraApiType
+from .payload_store import PayloadStore
+from .placeholders import resolve_placeholder, set_placeholders
+from .timings import TIMING_VALIDATION, timed
 from .zuora_client import get_zuora_client
 from .validation_schemas import (
     validate_payload,
@@ -110,30 +113,8 @@ def _is_update_payload(payload: Dict[str, Any]) -> bool:
     return "method" in payload and "endpoint" in payload and "body" in payload
 
 
-def _extract_entity_id_from_endpoint(endpoint: str) -> Optional[str]:
-    """
-    Extract the entity ID from a Zuora API endpoint URL.
-
-    Examples:
-        "/v1/object/product/6a629cfee87443778306054d7badcb57" -> "6a629cfee87443778306054d7badcb57"
-        "/v1/object/product-rate-plan/0efc4ea7f9d8411bbeaa07b9e2c27c42" -> "0efc4ea7f9d8411bbeaa07b9e2c27c42"
-
-    Args:
-        endpoint: The API endpoint URL
-
-    Returns:
-        The entity ID if found, None otherwise
-    """
-    if not endpoint:
-        return None
-    parts = endpoint.rstrip("/").split("/")
-    if parts:
-        return parts[-1]
-    return None
-
-
 def _find_existing_update_payload(
-    payloads: List[Dict[str, Any]],
+    payloads: Union[List[Dict[str, Any]], PayloadStore],
     api_type: str,
     entity_id: str,
 ) -> Optional[int]:
@@ -141,24 +122,20 @@ def _find_existing_update_payload(
     Find an existing update payload for a given entity by ID.
 
     This is more robust than exact endpoint matching because it extracts
-    the entity ID from the endpoint and compares just the IDs.
+    the entity ID from the endpoint and compares just the IDs. A PayloadStore
+    answers from its endpoint entity index instead of scanning.
 
     Args:
-        payloads: List of payload dicts
+        payloads: List of payload dicts, or a PayloadStore over them
         api_type: The zuora_api_type to match (e.g., "product_update", "rate_plan_update")
         entity_id: The Zuora entity ID to find
 
     Returns:
         Index of the matching payload if found, None otherwise
     """
-    for i, p in enumerate(payloads):
-        if p.get("zuora_api_type") != api_type:
-            continue
-        endpoint = p.get("payload", {}).get("endpoint", "")
-        payload_entity_id = _extract_entity_id_from_endpoint(endpoint)
-        if payload_entity_id and payload_entity_id == entity_id:
-            return i
-    return None
+    if not entity_id:
+        return None
+    return PayloadStore.of(payloads).find_update(api_type, entity_id)
 
 
 def _resolve_field_path_for_update_payload(
@@ -287,13 +264,16 @@ def validate_sku_format(sku: str) -> bool:
 # ============ Object Reference Helpers ============
 
 
-def _count_payloads_by_type(payloads: List[Dict[str, Any]], api_type: str) -> int:
+def _count_payloads_by_type(
+    payloads: Union[List[Dict[str, Any]], PayloadStore], api_type: str
+) -> int:
     """Count the number of payloads of a specific type."""
-    return len([p for p in payloads if p.get("zuora_api_type") == api_type])
+    return PayloadStore.of(payloads).count(api_type)
 
 
 def _get_product_object_reference(
-    payloads: List[Dict[str, Any]], product_index: Optional[int] = None
+    payloads: Union[List[Dict[str, Any]], PayloadStore],
+    product_index: Optional[int] = None,
 ) -> Optional[str]:
     """
     Generate a product object reference for batch execution.
@@ -325,7 +305,8 @@ def _get_product_object_reference(
 
 
 def _get_rate_plan_object_reference(
-    payloads: List[Dict[str, Any]], rate_plan_index: Optional[int] = None
+    payloads: Union[List[Dict[str, Any]], PayloadStore],
+    rate_plan_index: Optional[int] = None,
 ) -> Optional[str]:
     """
     Generate a rate plan object reference for batch execution.
@@ -395,13 +376,11 @@ PAYLOADS_STATE_KEY = "zuora_api_payloads"
 @tool(context=True)
 def get_payloads(tool_context: ToolContext, api_type: Optional[str] = None) -> str:
     """Retrieve Zuora API payloads from state. Filter by api_type if provided."""
-    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
+    store = PayloadStore.load(tool_context.agent)
+    payloads = store.to_list()
 
     if api_type:
-        api_type_lower = api_type.lower()
-        payloads = [
-            p for p in payloads if p.get("zuora_api_type", "").lower() == api_type_lower
-        ]
+        payloads = [p for _, p in store.of_type(api_type)]
 
     if not payloads:
         return "No payloads found" + (f" for type '{api_type}'" if api_type else "")
@@ -479,17 +458,13 @@ def update_payload(
         f"new_value={new_value}, payload_name={payload_name}, payload_id={payload_id}, payload_index={payload_index}"
     )
 
-    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
+    store = PayloadStore.load(tool_context.agent)
 
     # Find matching payloads by api_type
-    matching = [
-        (i, p)
-        for i, p in enumerate(payloads)
-        if p.get("zuora_api_type", "").lower() == api_type.lower()
-    ]
+    matching = store.of_type(api_type)
 
     if not matching:
-        available_types = set(p.get("zuora_api_type", "") for p in payloads)
+        available_types = store.types()
         return f"<p>❌ <strong>Error:</strong> No payload found with type '<code>{api_type}</code>'.</p><p>Available types: {', '.join(available_types) if available_types else 'none'}</p>"
 
     # Determine which payload to update
@@ -498,11 +473,9 @@ def update_payload(
 
     if payload_id:
         # Find by payload_id (preferred)
-        for idx, p in matching:
-            if p.get("payload_id") == payload_id:
-                target_idx = idx
-                target_entry = p
-                break
+        found = store.get(payload_id, api_type)
+        if found:
+            target_idx, target_entry = found
 
         if target_entry is None:
             # payload_id not found - provide helpful error
@@ -651,30 +624,12 @@ def update_payload(
         actual_key = existing_key if existing_key else final_key
         current[actual_key] = new_value
 
-    # Remove from placeholder list if this field was a placeholder
-    if "_placeholders" in payload_entry:
-        placeholders = payload_entry["_placeholders"]
-
-        # Build set of normalized keys to match against (field_path, final_key, actual_key)
-        keys_to_match = {
-            field_path.lower().replace("_", ""),
-            final_key.lower().replace("_", ""),
-            actual_key.lower().replace("_", ""),
-        }
-
-        # Find and remove matching placeholder
-        for ph in list(placeholders):
-            ph_normalized = ph.lower().replace("_", "")
-            if ph_normalized in keys_to_match:
-                placeholders.remove(ph)
-                break
-
-        # Remove the _placeholders key if empty
-        if not placeholders:
-            del payload_entry["_placeholders"]
+    # Resolve the placeholder for this field, if it was one
+    resolve_placeholder(payload_entry, field_path, final_key, actual_key)
 
-    # Update state
-    tool_context.agent.state.set(PAYLOADS_STATE_KEY, payloads)
+    # Update state (the field may have been the payload's name or parent)
+    store.reindex(target_idx)
+    store.save(tool_context.agent)
 
     # Get human-friendly type and name for response
     friendly_type = (
@@ -700,6 +655,51 @@ def update_payload(
     return response
 
 
+def _new_payload_entry(
+    api_type: str, payload_data: Dict[str, Any], payload_id: Optional[str] = None
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Validate payload data and wrap it in a payload entry.
+
+    Missing required fields get placeholders, recorded in the entry's
+    placeholder registry.
+
+    Args:
+        api_type: Type of Zuora API payload (e.g., 'product_create')
+        payload_data: Dictionary of payload fields and values
+        payload_id: ID for the entry (default: random 8-character ID)
+
+    Returns:
+        Tuple of (payload_entry, placeholder_fields)
+    """
+    # Validate required fields
+    with timed(TIMING_VALIDATION):
+        is_valid, missing_fields = validate_payload(api_type, payload_data)
+
+    # Prepare the payload (with or without placeholders)
+    placeholder_registry: Dict[str, Dict[str, Any]] = {}
+    if not is_valid:
+        # Generate payload WITH placeholders for missing fields
+        complete_payload, placeholder_list = generate_placeholder_payload(
+            api_type, payload_data, missing_fields, placeholder_registry
+        )
+    else:
+        # All required fields present
+        complete_payload = payload_data
+        placeholder_list = []
+
+    new_payload = {
+        "payload": complete_payload,
+        "zuora_api_type": api_type.lower(),
+        "payload_id": payload_id or str(uuid.uuid4())[:8],
+    }
+
+    # Add placeholder tracking if present
+    set_placeholders(new_payload, placeholder_registry)
+
+    return new_payload, placeholder_list
+
+
 @tool(context=True)
 def create_payload(
     tool_context: ToolContext,
@@ -728,40 +728,16 @@ def create_payload(
     if api_type.lower() not in valid_types:
         return f"<p>Error: Invalid api_type '{api_type}'. Valid types are: {', '.join(valid_types)}</p>"
 
-    # Validate required fields
-    is_valid, missing_fields = validate_payload(api_type, payload_data)
-
-    # Prepare the payload (with or without placeholders)
-    if not is_valid:
-        # Generate payload WITH placeholders for missing fields
-        complete_payload, placeholder_list = generate_placeholder_payload(
-            api_type, payload_data, missing_fields
-        )
-    else:
-        # All required fields present
-        complete_payload = payload_data
-        placeholder_list = []
-
-    # Create the payload entry
-    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
-
-    new_payload = {
-        "payload": complete_payload,
-        "zuora_api_type": api_type.lower(),
-        "payload_id": str(uuid.uuid4())[:8],
-    }
-
-    # Add placeholder tracking if present
-    if placeholder_list:
-        new_payload["_placeholders"] = placeholder_list
+    new_payload, placeholder_list = _new_payload_entry(api_type, payload_data)
+    complete_payload = new_payload["payload"]
 
-    payloads.append(new_payload)
-    tool_context.agent.state.set(PAYLOADS_STATE_KEY, payloads)
+    # Add the payload entry to state
+    store = PayloadStore.load(tool_context.agent)
+    store.append(new_payload)
+    store.save(tool_context.agent)
 
     # Count payloads of same type for index info
-    same_type_count = len(
-        [p for p in payloads if p.get("zuora_api_type", "").lower() == api_type.lower()]
-    )
+    same_type_count = store.count(api_type)
     current_index = same_type_count - 1  # 0-based index of this payload
 
     # Generate output
@@ -803,11 +779,7 @@ def list_payload_structure(
     tool_context: ToolContext, api_type: str, payload_index: int = 0
 ) -> str:
     """List payload structure and fields."""
-    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
-
-    matching = [
-        p for p in payloads if p.get("zuora_api_type", "").lower() == api_type.lower()
-    ]
+    matching = [p for _, p in PayloadStore.load(tool_context.agent).of_type(api_type)]
 
     if not matching:
         return f"No payload found with type '{api_type}'"
@@ -1466,6 +1438,120 @@ Please try using the Zuora UI to update this charge's price, or contact support.
     return output
 
 
+BULK_PRICE_ROW_LIMIT = 50  # Price change rows shown in the bulk repricing summary
+
+
+@tool(context=True)
+def bulk_update_charge_prices(
+    tool_context: ToolContext,
+    product: str,
+    rate_plan: Optional[str] = None,
+    charge_name_pattern: str = "*",
+    currency: Optional[str] = None,
+    new_price: Optional[float] = None,
+    percent_change: Optional[float] = None,
+    tier_prices: Optional[Dict[str, float]] = None,
+    decimals: int = 2,
+) -> str:
+    """Reprice many charges of a product with one price rule.
+
+    Use this instead of repeated update_zuora_charge_price calls when the user
+    changes prices across charges, rate plans or currencies ("raise all USD
+    prices of Analytics Suite by 10%", "set tier 2 of every API charge to 0.07").
+    The selected charges are fetched together and one tier update payload is
+    generated per changed tier price. Prices that already match are skipped.
+
+    Args:
+        product: Product ID, SKU or name
+        rate_plan: Rate plan ID or name (default: all rate plans)
+        charge_name_pattern: Charge name pattern, case-insensitive, '*' wildcards
+                             (e.g. 'API*'; default: all charges)
+        currency: Currency code (default: all currencies; required with new_price
+                  or tier_prices for charges priced in several currencies)
+        new_price: Set every selected price to this value (single-tier charges only)
+        percent_change: Change every selected price by this percentage
+                        (e.g. 10 for +10%, -5 for -5%)
+        tier_prices: Price per tier number (e.g. {"1": 0.09, "2": 0.06});
+                     tiers not listed keep their price
+        decimals: Decimal places for percentage results (default 2)
+
+    Returns:
+        Table of price changes, or an error if nothing matched
+
+    Note:
+        Give exactly one of new_price, percent_change or tier_prices. Updates only
+        affect NEW subscriptions. Existing subscriptions keep old values.
+    """
+    from .bulk_pricing import reprice_charges
+
+    logger.info(
+        f"[TOOL CALL] bulk_update_charge_prices: product={product}, "
+        f"rate_plan={rate_plan}, charge_name_pattern={charge_name_pattern}, "
+        f"currency={currency}, new_price={new_price}, "
+        f"percent_change={percent_change}, tier_prices={tier_prices}"
+    )
+
+    store = PayloadStore.load(tool_context.agent)
+    result = reprice_charges(
+        store,
+        product,
+        rate_plan=rate_plan,
+        charge_name_pattern=charge_name_pattern,
+        currency=currency,
+        new_price=new_price,
+        percent_change=percent_change,
+        tier_prices=tier_prices,
+        decimals=decimals,
+    )
+    if result.error:
+        return format_error_message(
+            "Cannot reprice charges",
+            f"{result.error}. Use get_zuora_product to check the product, rate "
+            "plan and charge names.",
+        )
+    if result.payloads:
+        store.save(tool_context.agent)
+
+    product_name = result.product.get("name", product)
+    if result.changes:
+        output = "## ✅ Price Update Payloads Generated\n\n"
+    else:
+        output = "## No Price Changes Needed\n\n"
+    output += f"**Product:** {product_name}\n"
+    output += f"**Charges Selected:** {result.charges}\n"
+    output += f"**Payloads Generated:** {len(result.payloads)}\n"
+    if result.unchanged:
+        output += f"**Prices Already Matching:** {result.unchanged}\n"
+
+    if result.changes:
+        output += "\n| Charge | Currency | Tier | Old Price | New Price |\n"
+        output += "|--------|----------|------|-----------|-----------|\n"
+        for change in result.changes[:BULK_PRICE_ROW_LIMIT]:
+            output += (
+                f"| {change['charge']} | {change['currency']} | {change['tier']} "
+                f"| {change['old_price']} | {change['new_price']} |\n"
+            )
+        if len(result.changes) > BULK_PRICE_ROW_LIMIT:
+            output += (
+                f"\n... and {len(result.changes) - BULK_PRICE_ROW_LIMIT} more price "
+                "change(s)\n"
+            )
+
+    if result.warnings:
+        output += "\n**Skipped:**\n"
+        for warning in result.warnings[:BULK_PRICE_ROW_LIMIT]:
+            output += f"- {warning}\n"
+        if len(result.warnings) > BULK_PRICE_ROW_LIMIT:
+            output += f"- ... and {len(result.warnings) - BULK_PRICE_ROW_LIMIT} more\n"
+
+    if result.payloads:
+        output += "\n---\n\n"
+        output += "The payloads have been added to the response. **Send to Zuora** to apply the updates.\n\n"
+        output += "⚠️ **Note:** Updates only affect NEW subscriptions. Existing subscriptions keep the old values.\n"
+
+    return output
+
+
 # ============ Product Expiration Tool ============
 
 
@@ -1555,11 +1641,12 @@ If you want to extend the product, use `update_zuora_product` to set a new end d
         )
 
     # 6. Generate or update product update payload
-    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
+    store = PayloadStore.load(tool_context.agent)
+    payloads = store.to_list()
 
     # Use robust helper to find existing payload by entity ID
     existing_product_update_idx = _find_existing_update_payload(
-        payloads, "product_update", product_id
+        store, "product_update", product_id
     )
     product_endpoint = f"/v1/object/product/{product_id}"
 
@@ -1580,7 +1667,7 @@ If you want to extend the product, use `update_zuora_product` to set a new end d
             "zuora_api_type": "product_update",
             "payload_id": str(uuid.uuid4())[:8],
         }
-        payloads.append(product_payload)
+        store.append(product_payload)
 
     # 7. Generate or update rate plan update payloads
     rate_plans_to_expire: List[Dict[str, Any]] = []
@@ -1594,7 +1681,7 @@ If you want to extend the product, use `update_zuora_product` to set a new end d
         # Check for existing rate_plan_update payload for this rate plan FIRST
         # This ensures we always update existing payloads regardless of date condition
         existing_rp_update_idx = _find_existing_update_payload(
-            payloads, "rate_plan_update", rp_id
+            store, "rate_plan_update", rp_id
         )
 
         # Determine if we need to update/create a payload for this rate plan
@@ -1625,7 +1712,7 @@ If you want to extend the product, use `update_zuora_product` to set a new end d
                     "zuora_api_type": "rate_plan_update",
                     "payload_id": str(uuid.uuid4())[:8],
                 }
-                payloads.append(rp_payload)
+                store.append(rp_payload)
 
             rate_plans_to_expire.append(
                 {
@@ -1645,7 +1732,7 @@ If you want to extend the product, use `update_zuora_product` to set a new end d
             )
 
     # 8. Save payloads to state
-    tool_context.agent.state.set(PAYLOADS_STATE_KEY, payloads)
+    store.save(tool_context.agent)
 
     # 9. Build response
     output = "## Product Expiration Payloads Generated\n\n"
@@ -1702,30 +1789,20 @@ If you want to extend the product, use `update_zuora_product` to set a new end d
 # ============ Product/Rate Plan/Charge Creation Tools (Payload Generation) ============
 
 
-@tool(context=True)
-def create_product(
-    tool_context: ToolContext,
+def _build_product_payload(
     name: str,
     sku: Optional[str] = None,
     effective_start_date: Optional[str] = None,
     description: Optional[str] = None,
     effective_end_date: Optional[str] = None,
-) -> str:
-    """Generate payload to create new product. Missing fields will use smart defaults.
-
-    Per Zuora v1 API, both EffectiveStartDate and EffectiveEndDate are required.
-    Smart defaults:
-    - EffectiveStartDate: today's date if not provided
-    - EffectiveEndDate: 10 years from start date if not provided
-
-    Uses PascalCase field names to match Zuora v1 CRUD API.
+) -> Tuple[Dict[str, Any], List[Dict[str, str]], Optional[str]]:
     """
-    # Entry logging for debugging tool call issues
-    logger.info(
-        f"[TOOL CALL] create_product: name={name}, sku={sku}, "
-        f"effective_start_date={effective_start_date}, effective_end_date={effective_end_date}"
-    )
+    Build a product_create payload with smart defaults (see create_product).
 
+    Returns:
+        Tuple of (payload_data, defaults_applied, error)
+        - error: formatted error message if the input is invalid, else None
+    """
     from datetime import datetime
     from dateutil.relativedelta import relativedelta
 
@@ -1749,7 +1826,7 @@ def create_product(
     # Validate date format if provided
     if effective_start_date:
         if not validate_date_format(effective_start_date):
-            return format_error_message(
+            return payload_data, defaults_applied, format_error_message(
                 "Invalid date format",
                 f"effective_start_date must be YYYY-MM-DD format (e.g., 2024-01-01), got: {effective_start_date}",
             )
@@ -1770,13 +1847,13 @@ def create_product(
 
     if effective_end_date:
         if not validate_date_format(effective_end_date):
-            return format_error_message(
+            return payload_data, defaults_applied, format_error_message(
                 "Invalid date format",
                 f"effective_end_date must be YYYY-MM-DD format (e.g., 2024-12-31), got: {effective_end_date}",
             )
         # Validate end date is after start date
         if not validate_date_range(effective_start_date, effective_end_date):
-            return format_error_message(
+            return payload_data, defaults_applied, format_error_message(
                 "Invalid date range",
                 "effective_end_date must be after effective_start_date",
             )
@@ -1784,7 +1861,7 @@ def create_product(
 
     if sku:
         if not validate_sku_format(sku):
-            return format_error_message(
+            return payload_data, defaults_applied, format_error_message(
                 "Invalid SKU format",
                 "Use only alphanumeric characters, hyphens, and underscores",
             )
@@ -1793,6 +1870,39 @@ def create_product(
     if description:
         payload_data["Description"] = description
 
+    return payload_data, defaults_applied, None
+
+
+@tool(context=True)
+def create_product(
+    tool_context: ToolContext,
+    name: str,
+    sku: Optional[str] = None,
+    effective_start_date: Optional[str] = None,
+    description: Optional[str] = None,
+    effective_end_date: Optional[str] = None,
+) -> str:
+    """Generate payload to create new product. Missing fields will use smart defaults.
+
+    Per Zuora v1 API, both EffectiveStartDate and EffectiveEndDate are required.
+    Smart defaults:
+    - EffectiveStartDate: today's date if not provided
+    - EffectiveEndDate: 10 years from start date if not provided
+
+    Uses PascalCase field names to match Zuora v1 CRUD API.
+    """
+    # Entry logging for debugging tool call issues
+    logger.info(
+        f"[TOOL CALL] create_product: name={name}, sku={sku}, "
+        f"effective_start_date={effective_start_date}, effective_end_date={effective_end_date}"
+    )
+
+    payload_data, defaults_applied, error = _build_product_payload(
+        name, sku, effective_start_date, description, effective_end_date
+    )
+    if error:
+        return error
+
     # Collect warnings for name validation
     warnings = []
 
@@ -1802,8 +1912,8 @@ def create_product(
         warnings.append(len_warning)
 
     # Validate name uniqueness
-    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
-    is_unique, unique_warning = validate_product_name_unique(name, payloads)
+    store = PayloadStore.load(tool_context.agent)
+    is_unique, unique_warning = validate_product_name_unique(name, store)
     if not is_unique:
         warnings.append(unique_warning)
 
@@ -1823,6 +1933,67 @@ def create_product(
     return result
 
 
+def _build_rate_plan_payload(
+    product_id: str,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    effective_start_date: Optional[str] = None,
+    effective_end_date: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Build a rate_plan_create payload (see create_rate_plan).
+
+    Args:
+        product_id: Zuora product ID or object reference (e.g., '@{Product[0].Id}')
+
+    Returns:
+        Tuple of (payload_data, error)
+        - error: formatted error message if the input is invalid, else None
+    """
+    # Use PascalCase for Zuora v1 CRUD API
+    payload_data: Dict[str, Any] = {}
+
+    # Validate if it's a real Zuora ID or object reference
+    if not validate_zuora_id(product_id):
+        return payload_data, format_error_message(
+            "Invalid product_id",
+            "Provide a valid Zuora product ID (e.g., '8a1234567890abcd') or object reference (e.g., '@{Product[0].Id}')",
+        )
+    payload_data["ProductId"] = product_id
+
+    if name:
+        payload_data["Name"] = name
+
+    if description:
+        payload_data["Description"] = description
+
+    if effective_start_date:
+        if not validate_date_format(effective_start_date):
+            return payload_data, format_error_message(
+                "Invalid date format",
+                f"effective_start_date must be YYYY-MM-DD format, got: {effective_start_date}",
+            )
+        payload_data["EffectiveStartDate"] = effective_start_date
+
+    if effective_end_date:
+        if not validate_date_format(effective_end_date):
+            return payload_data, format_error_message(
+                "Invalid date format",
+                f"effective_end_date must be YYYY-MM-DD format, got: {effective_end_date}",
+            )
+        # Validate end date is after start date if both provided
+        if effective_start_date and not validate_date_range(
+            effective_start_date, effective_end_date
+        ):
+            return payload_data, format_error_message(
+                "Invalid date range",
+                "effective_end_date must be after effective_start_date",
+            )
+        payload_data["EffectiveEndDate"] = effective_end_date
+
+    return payload_data, None
+
+
 @tool(context=True)
 def create_rate_plan(
     tool_context: ToolContext,
@@ -1854,30 +2025,27 @@ def create_rate_plan(
         f"product_index={product_index}"
     )
 
-    # Build rate plan payload with provided values
-    payload_data = {}
-
     # Track defaults applied for transparency
     defaults_applied: List[Dict[str, str]] = []
 
-    # Handle ProductId - use PascalCase for Zuora v1 CRUD API
+    # Handle ProductId (validated by _build_rate_plan_payload)
     if product_id:
-        # Validate if it's a real Zuora ID or object reference
-        if not validate_zuora_id(product_id):
+        product_ref = product_id
+    elif product_index is not None:
+        if product_index < 0:
             return format_error_message(
-                "Invalid product_id",
-                "Provide a valid Zuora product ID (e.g., '8a1234567890abcd') or object reference (e.g., '@{Product[0].Id}')",
+                "Invalid product_index",
+                "Provide the 0-based index of the product in the current batch "
+                f"(e.g., 0), got: {product_index}",
             )
-        payload_data["ProductId"] = product_id
-    elif product_index is not None:
         # Generate object reference from explicit index
-        payload_data["ProductId"] = f"@{{Product[{product_index}].Id}}"
+        product_ref = f"@{{Product[{product_index}].Id}}"
     else:
         # Try to auto-generate object reference based on products in current batch
-        payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
-        object_ref = _get_product_object_reference(payloads)
+        store = PayloadStore.load(tool_context.agent)
+        object_ref = _get_product_object_reference(store)
         if object_ref:
-            payload_data["ProductId"] = object_ref
+            product_ref = object_ref
             defaults_applied.append(
                 {
                     "field": "ProductId",
@@ -1886,7 +2054,7 @@ def create_rate_plan(
             )
         else:
             # Default to first product in batch (index 0) - mandatory for batch creation
-            payload_data["ProductId"] = "@{Product[0].Id}"
+            product_ref = "@{Product[0].Id}"
             defaults_applied.append(
                 {
                     "field": "ProductId",
@@ -1894,35 +2062,11 @@ def create_rate_plan(
                 }
             )
 
-    if name:
-        payload_data["Name"] = name
-
-    if description:
-        payload_data["Description"] = description
-
-    if effective_start_date:
-        if not validate_date_format(effective_start_date):
-            return format_error_message(
-                "Invalid date format",
-                f"effective_start_date must be YYYY-MM-DD format, got: {effective_start_date}",
-            )
-        payload_data["EffectiveStartDate"] = effective_start_date
-
-    if effective_end_date:
-        if not validate_date_format(effective_end_date):
-            return format_error_message(
-                "Invalid date format",
-                f"effective_end_date must be YYYY-MM-DD format, got: {effective_end_date}",
-            )
-        # Validate end date is after start date if both provided
-        if effective_start_date and not validate_date_range(
-            effective_start_date, effective_end_date
-        ):
-            return format_error_message(
-                "Invalid date range",
-                "effective_end_date must be after effective_start_date",
-            )
-        payload_data["EffectiveEndDate"] = effective_end_date
+    payload_data, error = _build_rate_plan_payload(
+        product_ref, name, description, effective_start_date, effective_end_date
+    )
+    if error:
+        return error
 
     # Collect warnings for name validation
     warnings = []
@@ -1934,10 +2078,10 @@ def create_rate_plan(
             warnings.append(len_warning)
 
         # Validate name uniqueness within product
-        payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
+        store = PayloadStore.load(tool_context.agent)
         product_ref = payload_data.get("ProductId", "")
         is_unique, unique_warning = validate_rate_plan_name_unique(
-            name, product_ref, payloads
+            name, product_ref, store
         )
         if not is_unique:
             warnings.append(unique_warning)
@@ -2279,12 +2423,10 @@ def _get_charge_model_inference_reason(
     return None
 
 
-@tool(context=True)
-def create_charge(
-    tool_context: ToolContext,
-    # ============ Core Identification ============
-    rate_plan_id: Optional[str] = None,
-    rate_plan_index: Optional[int] = None,
+def _build_charge_payload(
+    product_rate_plan_id: str,
+    available_uoms: Optional[List[str]] = None,
+    *,
     name: Optional[str] = None,
     description: Optional[str] = None,
     product_rate_plan_charge_number: Optional[str] = None,
@@ -2483,228 +2625,22 @@ def create_charge(
     formula: Optional[str] = None,
     charge_model_configuration: Optional[Dict[str, Any]] = None,
     delivery_schedule: Optional[Dict[str, Any]] = None,
-) -> str:
-    """Generate charge creation payload per Zuora v1 API schema.
+) -> Tuple[Dict[str, Any], List[Dict[str, str]], List[str]]:
+    """
+    Build a charge_create payload: charge model, tiers, UOM and smart defaults.
 
-    For batch creation (creating rate plan and charge together), use object references:
-    - If rate_plan_index is provided, generates @{ProductRatePlan[index].Id}
-    - If neither rate_plan_id nor rate_plan_index provided, auto-generates reference to most recent rate plan
-    - For existing Zuora rate plans, use rate_plan_id with the actual Zuora ID
-
-    Required fields per Zuora API:
-    - Name, ProductRatePlanId, ChargeModel, ChargeType
-    - BillCycleType, BillingPeriod, TriggerEvent
-    - ProductRatePlanChargeTierData (pricing container)
-
-    Smart defaults applied:
-    - BillCycleType: DefaultFromCustomer
-    - TriggerEvent: ContractEffective
-    - BillingTiming: In Advance for Recurring/OneTime charges (not applicable to Usage)
-    - Currency: USD
-    - RatingGroup: ByBillingPeriod for tiered/volume Usage charges
-
-    Pricing Models Supported:
-    - Flat Fee Pricing: Single flat price (use 'price' parameter)
-    - Per Unit Pricing: Price per unit (use 'price' parameter)
-    - Tiered Pricing: Graduated pricing - each tier has its own rate (use 'tiers' parameter)
-    - Volume Pricing: All-units pricing - entire qty priced at one tier's rate (use 'tiers' parameter)
-    - Overage Pricing: X units included, then $Y per unit (use 'included_units' + 'overage_price')
-    - Tiered with Overage: Tiered pricing + overage (use 'tiers' + 'included_units' + 'overage_price')
-    - Discount-Fixed Amount / Discount-Percentage: Use discount fields
-    - Delivery Pricing: Use delivery_schedule
-    - Multi-Attribute Pricing: Use charge_model_configuration
+    Takes the arguments of create_charge apart from the rate plan, which is
+    resolved by the caller.
 
     Args:
-        rate_plan_id: Zuora rate plan ID OR object reference (e.g., '@{ProductRatePlan[0].Id}')
-        rate_plan_index: Index of rate plan in current batch (0-based) to auto-generate object reference
-        name: Charge name (max 100 chars)
-        description: Charge description (max 500 chars)
-        product_rate_plan_charge_number: Natural key (max 100 chars). Auto-generated if null.
-        charge_type: OneTime, Recurring, or Usage
-        charge_model: Pricing model (accepts simplified names like 'FlatFee' or full names like 'Flat Fee Pricing')
-        price: Price amount (for single-tier pricing: Flat Fee, Per Unit, or overage rate)
-        tiers: List of pricing tiers for Tiered/Volume pricing. Supports two formats:
-               Explicit format (full control):
-               - Price (required): Price for this tier
-               - StartingUnit: Unit where tier starts (default: 1 for first tier, auto-calculated for rest)
-               - EndingUnit: Unit where tier ends (omit for unlimited/last tier)
-               - PriceFormat: "Per Unit" or "Flat Fee" (default: "Per Unit")
-               - Currency: Override currency for this tier (default: uses charge currency)
-               Simplified format (auto-calculates boundaries):
-                - units: EndingUnit for this tier (omit or None for unlimited)
-                - price: Price for this tier
-        currency: Single currency code (for backward compatibility). Prefer 'currencies' for new code.
-        currencies: List of currency codes for multi-currency support (e.g., ["USD", "EUR"])
-        prices: Dict mapping currency to price (e.g., {"USD": 49.0, "EUR": 45.0})
-               Used with 'currencies' for different prices per currency.
-               If not provided, 'price' is used for all currencies.
-        default_quantity: Default quantity of units. Required for Per Unit/Volume/Tiered Pricing. Defaults to 1.
-        min_quantity: Minimum units allowed (max 16 chars)
-        max_quantity: Maximum units allowed (max 16 chars)
-        included_units: Units included before overage pricing (for Overage models)
-        overage_price: Base price per unit after included units consumed (for Overage models)
-        overage_prices: Dict mapping currency to overage price (e.g., {"USD": 0.003, "EUR": 0.003})
-                       Used with 'currencies' for different overage prices per currency.
-        billing_period: Billing period for recurring charges
-        billing_timing: 'In Advance' or 'In Arrears'. Not for Usage charges.
-        bill_cycle_type: How to determine billing day
-        bill_cycle_day: Bill cycle day (1-31). Account BCD can override.
-        weekly_bill_cycle_day: Weekly bill cycle day. Required when BillCycleType='SpecificDayofWeek'
-        specific_billing_period: Custom months/weeks when BillingPeriod='Specific Months/Weeks'
-        billing_period_alignment: Align charges within subscription
-        list_price_base: List price base. Defaults to BillingPeriod if not set.
-        specific_list_price_base: Months for list price base (1-120). Required when ListPriceBase='Per Specific Months'
-        trigger_event: When to start billing
-        end_date_condition: 'SubscriptionEnd' or 'FixedPeriod'
-        up_to_periods: Charge duration (0-65535). Required when EndDateCondition='FixedPeriod'
-        up_to_periods_type: Period type for up_to_periods
-        price_change_option: Automatic price change on renewal
-        price_increase_option: Price increase on renewal behavior
-        price_increase_percentage: Percentage to increase/decrease price on renewal (-100 to 100)
-        use_tenant_default_for_price_change: Set false when using specific percentage
-        uom: Unit of measure for usage charges (max 25 chars)
-        rating_group: How to aggregate usage for rating
-        usage_record_rating_option: When to rate usage records
-        overage_calculation_option: When to calculate overage
-        overage_unused_units_credit_option: Credit unused units
-        number_of_period: Periods for overage smoothing
-        smoothing_model: Overage smoothing model
-        apply_discount_to: Charge types discount applies to (for discount models)
-        discount_level: Discount scope: 'rateplan', 'subscription', or 'account'
-        is_stacked_discount: Calculate as stacked discount (Discount-Percentage only)
-        apply_to_billing_period_partially: Allow discount duration aligned with billing period partially
-        reflect_discount_in_net_amount: Reflect discount in net amount for Zuora Revenue
-        use_discount_specific_accounting_code: Use specific accounting code for discount charge
-        accounting_code: Accounting code (max 100 chars)
-        deferred_revenue_account: Deferred revenue account name (max 100 chars)
-        recognized_revenue_account: Recognized revenue account name (max 100 chars)
-        revenue_recognition_rule_name: 'Recognize upon invoicing' or 'Recognize daily over time'
-        rev_rec_code: Revenue recognition code (max 70 chars)
-        rev_rec_trigger_condition: When revenue recognition begins
-        exclude_item_billing_from_revenue_accounting: Exclude billing items from revenue accounting
-        exclude_item_booking_from_revenue_accounting: Exclude booking items from revenue accounting
-        is_allocation_eligible: Allocation eligible for revenue recognition
-        is_unbilled: Unbilled accounting
-        legacy_revenue_reporting: Legacy revenue reporting
-        revenue_recognition_timing: Revenue recognition timing
-        revenue_amortization_method: Revenue amortization method
-        product_category: Product category for Zuora Revenue integration
-        product_class: Product class for Zuora Revenue integration
-        product_family: Product family for Zuora Revenue integration
-        product_line: Product line for Zuora Revenue integration
-        taxable: Whether charge is taxable. Requires TaxMode and TaxCode if true.
-        tax_code: Tax code (max 64 chars). Required when Taxable=true.
-        tax_mode: 'TaxExclusive' or 'TaxInclusive'. Required when Taxable=true.
-        proration_option: Charge-level proration option
-        charge_function: Charge function type (Prepaid with Drawdown feature)
-        commitment_type: Commitment type: 'UNIT' or 'CURRENCY'
-        credit_option: Credit calculation: 'TimeBased', 'ConsumptionBased', 'FullCreditBack'
-        drawdown_rate: Conversion rate between Usage UOM and Drawdown UOM
-        drawdown_uom: Drawdown unit of measure
-        is_prepaid: Whether this is a prepayment (topup) or drawdown charge
-        prepaid_operation_type: 'topup' or 'drawdown'
-        prepaid_quantity: Units included in prepayment charge
-        prepaid_total_quantity: Total units available during validity period
-        prepaid_uom: Unit of measure for prepayment
-        validity_period_type: Prepaid validity period
-        is_rollover: Enable rollover for prepaid
-        rollover_apply: Rollover priority: 'ApplyFirst' or 'ApplyLast'
-        rollover_periods: Number of rollover periods (max 3)
-        rollover_period_length: Rollover fund period length
-        formula: Price lookup formula for Attribute-based Pricing
-        charge_model_configuration: Container for charge model configuration (Multi-Attribute/Pre-Rated Pricing)
-        delivery_schedule: Delivery schedule configuration (Delivery Pricing)
-
-    Examples:
-        # Flat Fee Pricing (single price)
-        create_charge(name="Monthly Fee", charge_type="Recurring", charge_model="Flat Fee Pricing", price=99.00)
-
-        # Per Unit Pricing
-        create_charge(name="API Calls", charge_type="Usage", charge_model="Per Unit Pricing", price=0.01, uom="Calls")
-
-        # Tiered Pricing - Explicit format (full control over boundaries)
-        create_charge(
-            name="API Calls",
-            charge_type="Usage",
-            charge_model="Tiered Pricing",
-            uom="Calls",
-            tiers=[
-                {"StartingUnit": 1, "EndingUnit": 1000, "Price": 0.10, "PriceFormat": "Per Unit"},
-                {"StartingUnit": 1001, "EndingUnit": 10000, "Price": 0.08, "PriceFormat": "Per Unit"},
-                {"StartingUnit": 10001, "Price": 0.05, "PriceFormat": "Per Unit"},  # No EndingUnit = unlimited
-            ]
-        )
-
-        # Tiered Pricing - Simplified format (auto-calculates boundaries)
-        create_charge(
-            name="API Calls",
-            charge_type="Usage",
-            charge_model="Tiered Pricing",
-            uom="Calls",
-            tiers=[
-                {"units": 1000, "price": 0.10},   # 1-1000 @ $0.10/unit
-                {"units": 10000, "price": 0.08},  # 1001-10000 @ $0.08/unit
-                {"price": 0.05},                   # 10001+ @ $0.05/unit (unlimited)
-            ]
-        )
-
-        # Volume Pricing (entire quantity priced at one tier's rate)
-        create_charge(
-            name="Storage",
-            charge_type="Usage",
-            charge_model="Volume Pricing",
-            uom="GB",
-            tiers=[
-                {"units": 100, "price": 1.00},
-                {"units": 1000, "price": 0.80},
-                {"price": 0.50},
-            ]
-        )
-
-        # Overage Pricing (X units included, then $Y per unit after)
-        create_charge(
-            name="API Usage",
-            charge_type="Usage",
-            charge_model="Overage Pricing",
-            uom="Calls",
-            included_units=10000,   # 10,000 calls included
-            overage_price=0.003,    # $0.003 per call after included units
-        )
-
-        # Tiered with Overage Pricing (tiered pricing + overage after all tiers)
-        create_charge(
-            name="Data Transfer",
-            charge_type="Usage",
-            charge_model="Tiered with Overage Pricing",
-            uom="GB",
-            included_units=100,     # 100 GB included in base
-            tiers=[
-                {"units": 500, "price": 0.10},   # 0-500 GB @ $0.10/GB
-                {"units": 1000, "price": 0.08},  # 501-1000 GB @ $0.08/GB
-            ],
-            overage_price=0.05,     # $0.05/GB after 1000 GB
-        )
+        product_rate_plan_id: Zuora rate plan ID or object reference
+        available_uoms: Tenant UOM names (fetched from settings if None)
 
-        # Recurring charge with 10% price increase on each renewal
-        create_charge(
-            name="Monthly Subscription",
-            charge_type="Recurring",
-            charge_model="Per Unit Pricing",
-            price=30.00,
-            billing_period="Month",
-            price_increase_option="SpecificPercentageValue",
-            price_increase_percentage=10,  # 10% increase on each renewal
-        )
+    Returns:
+        Tuple of (payload_data, defaults_applied, warnings)
     """
-    # Entry logging for debugging tool call issues
-    logger.info(
-        f"[TOOL CALL] create_charge: name={name}, charge_type={charge_type}, "
-        f"charge_model={charge_model}, price={price}, billing_period={billing_period}, "
-        f"rate_plan_id={rate_plan_id}, rate_plan_index={rate_plan_index}"
-    )
-
     # Build charge payload with provided values - use PascalCase for Zuora v1 CRUD API
-    payload_data = {}
+    payload_data: Dict[str, Any] = {"ProductRatePlanId": product_rate_plan_id}
 
     # Track defaults applied for transparency
     defaults_applied: List[Dict[str, str]] = []
@@ -2741,41 +2677,6 @@ def create_charge(
     # Track if user provided currency explicitly
     user_provided_currency = currencies is not None or currency is not None
 
-    # Handle ProductRatePlanId
-    if rate_plan_id:
-        if not validate_zuora_id(rate_plan_id):
-            return format_error_message(
-                "Invalid rate_plan_id",
-                "Provide a valid Zuora rate plan ID (e.g., '8a1234567890abcd') or object reference (e.g., '@{ProductRatePlan[0].Id}')",
-            )
-        payload_data["ProductRatePlanId"] = rate_plan_id
-    elif rate_plan_index is not None:
-        # Generate object reference from explicit index
-        payload_data["ProductRatePlanId"] = (
-            f"@{{ProductRatePlan[{rate_plan_index}].Id}}"
-        )
-    else:
-        # Try to auto-generate object reference based on rate plans in current batch
-        payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
-        object_ref = _get_rate_plan_object_reference(payloads)
-        if object_ref:
-            payload_data["ProductRatePlanId"] = object_ref
-            defaults_applied.append(
-                {
-                    "field": "ProductRatePlanId",
-                    "value": f"{object_ref} (auto-linked to rate plan in batch)",
-                }
-            )
-        else:
-            # Default to first rate plan in batch (index 0) - mandatory for batch creation
-            payload_data["ProductRatePlanId"] = "@{ProductRatePlan[0].Id}"
-            defaults_applied.append(
-                {
-                    "field": "ProductRatePlanId",
-                    "value": "@{ProductRatePlan[0].Id} (auto-linked to first rate plan in batch)",
-                }
-            )
-
     if name:
         payload_data["Name"] = name
 
@@ -2846,9 +2747,10 @@ def create_charge(
 
     if uom:
         # Auto-correct UOM to valid tenant UOM
-        from .zuora_settings import get_available_uom_names
+        if available_uoms is None:
+            from .zuora_settings import get_available_uom_names
 
-        available_uoms = get_available_uom_names()
+            available_uoms = get_available_uom_names()
         if available_uoms:
             normalized_uom, was_corrected = _normalize_uom(uom, available_uoms)
             if was_corrected:
@@ -3299,24 +3201,499 @@ def create_charge(
     if delivery_schedule:
         payload_data["DeliverySchedule"] = delivery_schedule
 
-    if name:
-        # Validate name length
-        is_valid_len, len_warning = validate_name_length(name, "Charge name")
-        if not is_valid_len and len_warning:
-            warnings.append(len_warning)
+    return payload_data, defaults_applied, warnings
 
-        # Validate name uniqueness within rate plan
-        payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY) or []
-        rp_ref = payload_data.get("ProductRatePlanId", "")
-        is_unique, unique_warning = validate_charge_name_unique(name, rp_ref, payloads)
-        if not is_unique and unique_warning:
-            warnings.append(unique_warning)
 
-    # Delegate to create_payload which handles placeholders and validation
-    # It will add placeholders for conditionally required fields based on ChargeType
-    result = create_payload(
-        tool_context, "charge_create", payload_data, defaults_applied=defaults_applied
-    )
+@tool(context=True)
+def create_charge(
+    tool_context: ToolContext,
+    # ============ Core Identification ============
+    rate_plan_id: Optional[str] = None,
+    rate_plan_index: Optional[int] = None,
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    product_rate_plan_charge_number: Optional[str] = None,
+    # ============ Charge Type & Model ============
+    charge_type: Optional[Literal["Recurring", "OneTime", "Usage"]] = None,
+    charge_model: Optional[str] = None,
+    # ============ Pricing Fields ============
+    price: Optional[float] = None,
+    tiers: Optional[List[Dict[str, Any]]] = None,
+    currency: Optional[str] = None,  # Single currency (for backward compatibility)
+    currencies: Optional[List[str]] = None,  # Multiple currencies: ["USD", "EUR"]
+    prices: Optional[
+        Dict[str, float]
+    ] = None,  # Price per currency: {"USD": 49.0, "EUR": 45.0}
+    default_quantity: Optional[float] = None,
+    min_quantity: Optional[float] = None,
+    max_quantity: Optional[float] = None,
+    included_units: Optional[float] = None,
+    overage_price: Optional[float] = None,
+    overage_prices: Optional[Dict[str, float]] = None,  # Overage price per currency
+    # ============ Billing Configuration ============
+    billing_period: Optional[
+        Literal[
+            "Month",
+            "Quarter",
+            "Annual",
+            "Semi-Annual",
+            "Week",
+            "Specific Months",
+            "Specific Weeks",
+            "Specific Days",
+            "Subscription Term",
+        ]
+    ] = None,
+    billing_timing: Optional[Literal["In Advance", "In Arrears"]] = None,
+    bill_cycle_type: Literal[
+        "DefaultFromCustomer",
+        "SpecificDayofMonth",
+        "SubscriptionStartDay",
+        "ChargeTriggerDay",
+        "SpecificDayofWeek",
+        "TermStartDay",
+        "TermEndDay",
+    ] = "DefaultFromCustomer",
+    bill_cycle_day: Optional[int] = None,
+    weekly_bill_cycle_day: Optional[
+        Literal[
+            "Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"
+        ]
+    ] = None,
+    specific_billing_period: Optional[int] = None,
+    billing_period_alignment: Optional[
+        Literal[
+            "AlignToCharge",
+            "AlignToSubscriptionStart",
+            "AlignToTermStart",
+            "AlignToTermEnd",
+        ]
+    ] = None,
+    list_price_base: Optional[
+        Literal[
+            "Per Billing Period",
+            "Per Month",
+            "Per Week",
+            "Per Year",
+            "Per Specific Months",
+        ]
+    ] = None,
+    specific_list_price_base: Optional[int] = None,
+    trigger_event: Literal[
+        "ContractEffective", "ServiceActivation", "CustomerAcceptance"
+    ] = "ContractEffective",
+    # ============ Charge Duration ============
+    end_date_condition: Optional[Literal["SubscriptionEnd", "FixedPeriod"]] = None,
+    up_to_periods: Optional[int] = None,
+    up_to_periods_type: Optional[
+        Literal["Billing Periods", "Days", "Weeks", "Months", "Years"]
+    ] = None,
+    # ============ Price Change on Renewal ============
+    price_change_option: Optional[
+        Literal["NoChange", "SpecificPercentageValue", "UseLatestProductCatalogPricing"]
+    ] = None,
+    price_increase_option: Optional[
+        Literal["FromTenantPercentageValue", "SpecificPercentageValue"]
+    ] = None,
+    price_increase_percentage: Optional[float] = None,
+    use_tenant_default_for_price_change: Optional[bool] = None,
+    # ============ Usage Charge Fields ============
+    uom: Optional[str] = None,
+    rating_group: Optional[
+        Literal[
+            "ByBillingPeriod",
+            "ByUsageStartDate",
+            "ByUsageRecord",
+            "ByUsageUpload",
+            "ByGroupId",
+        ]
+    ] = None,
+    usage_record_rating_option: Optional[
+        Literal["EndOfBillingPeriod", "OnDemand"]
+    ] = None,
+    # ============ Overage Fields ============
+    overage_calculation_option: Optional[
+        Literal["EndOfSmoothingPeriod", "PerBillingPeriod"]
+    ] = None,
+    overage_unused_units_credit_option: Optional[
+        Literal["NoCredit", "CreditBySpecificRate"]
+    ] = None,
+    number_of_period: Optional[int] = None,
+    smoothing_model: Optional[Literal["RollingWindow", "Rollover"]] = None,
+    # ============ Discount Fields ============
+    apply_discount_to: Optional[
+        Literal[
+            "ONETIME",
+            "RECURRING",
+            "USAGE",
+            "ONETIMERECURRING",
+            "ONETIMEUSAGE",
+            "RECURRINGUSAGE",
+            "ONETIMERECURRINGUSAGE",
+        ]
+    ] = None,
+    discount_level: Optional[Literal["rateplan", "subscription", "account"]] = None,
+    is_stacked_discount: Optional[bool] = None,
+    apply_to_billing_period_partially: Optional[bool] = None,
+    reflect_discount_in_net_amount: Optional[bool] = None,
+    use_discount_specific_accounting_code: Optional[bool] = None,
+    # ============ Accounting Fields ============
+    accounting_code: Optional[str] = None,
+    deferred_revenue_account: Optional[str] = None,
+    recognized_revenue_account: Optional[str] = None,
+    # ============ Revenue Recognition Fields ============
+    revenue_recognition_rule_name: Optional[
+        Literal["Recognize upon invoicing", "Recognize daily over time"]
+    ] = None,
+    rev_rec_code: Optional[str] = None,
+    rev_rec_trigger_condition: Optional[
+        Literal[
+            "ContractEffectiveDate", "ServiceActivationDate", "CustomerAcceptanceDate"
+        ]
+    ] = None,
+    exclude_item_billing_from_revenue_accounting: Optional[bool] = None,
+    exclude_item_booking_from_revenue_accounting: Optional[bool] = None,
+    is_allocation_eligible: Optional[bool] = None,
+    is_unbilled: Optional[bool] = None,
+    legacy_revenue_reporting: Optional[bool] = None,
+    revenue_recognition_timing: Optional[str] = None,
+    revenue_amortization_method: Optional[str] = None,
+    product_category: Optional[str] = None,
+    product_class: Optional[str] = None,
+    product_family: Optional[str] = None,
+    product_line: Optional[str] = None,
+    # ============ Tax Fields ============
+    taxable: Optional[bool] = None,
+    tax_code: Optional[str] = None,
+    tax_mode: Optional[Literal["TaxExclusive", "TaxInclusive"]] = None,
+    # ============ Proration Fields ============
+    proration_option: Optional[
+        Literal[
+            "NoProration",
+            "TimeBasedProration",
+            "DefaultFromTenantSetting",
+            "ChargeFullPeriod",
+        ]
+    ] = None,
+    # ============ Prepaid with Drawdown Fields ============
+    charge_function: Optional[
+        Literal[
+            "Standard",
+            "Prepayment",
+            "CommitmentTrueUp",
+            "Drawdown",
+            "CreditCommitment",
+            "DrawdownAndCreditCommitment",
+        ]
+    ] = None,
+    commitment_type: Optional[Literal["UNIT", "CURRENCY"]] = None,
+    credit_option: Optional[
+        Literal["TimeBased", "ConsumptionBased", "FullCreditBack"]
+    ] = None,
+    drawdown_rate: Optional[float] = None,
+    drawdown_uom: Optional[str] = None,
+    is_prepaid: Optional[bool] = None,
+    prepaid_operation_type: Optional[Literal["topup", "drawdown"]] = None,
+    prepaid_quantity: Optional[float] = None,
+    prepaid_total_quantity: Optional[float] = None,
+    prepaid_uom: Optional[str] = None,
+    validity_period_type: Optional[
+        Literal["SUBSCRIPTION_TERM", "ANNUAL", "SEMI_ANNUAL", "QUARTER", "MONTH"]
+    ] = None,
+    is_rollover: Optional[bool] = None,
+    rollover_apply: Optional[Literal["ApplyFirst", "ApplyLast"]] = None,
+    rollover_periods: Optional[int] = None,
+    rollover_period_length: Optional[int] = None,
+    # ============ Attribute-based Pricing ============
+    formula: Optional[str] = None,
+    charge_model_configuration: Optional[Dict[str, Any]] = None,
+    delivery_schedule: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Generate charge creation payload per Zuora v1 API schema.
+
+    For batch creation (creating rate plan and charge together), use object references:
+    - If rate_plan_index is provided, generates @{ProductRatePlan[index].Id}
+    - If neither rate_plan_id nor rate_plan_index provided, auto-generates reference to most recent rate plan
+    - For existing Zuora rate plans, use rate_plan_id with the actual Zuora ID
+
+    Required fields per Zuora API:
+    - Name, ProductRatePlanId, ChargeModel, ChargeType
+    - BillCycleType, BillingPeriod, TriggerEvent
+    - ProductRatePlanChargeTierData (pricing container)
+
+    Smart defaults applied:
+    - BillCycleType: DefaultFromCustomer
+    - TriggerEvent: ContractEffective
+    - BillingTiming: In Advance for Recurring/OneTime charges (not applicable to Usage)
+    - Currency: USD
+    - RatingGroup: ByBillingPeriod for tiered/volume Usage charges
+
+    Pricing Models Supported:
+    - Flat Fee Pricing: Single flat price (use 'price' parameter)
+    - Per Unit Pricing: Price per unit (use 'price' parameter)
+    - Tiered Pricing: Graduated pricing - each tier has its own rate (use 'tiers' parameter)
+    - Volume Pricing: All-units pricing - entire qty priced at one tier's rate (use 'tiers' parameter)
+    - Overage Pricing: X units included, then $Y per unit (use 'included_units' + 'overage_price')
+    - Tiered with Overage: Tiered pricing + overage (use 'tiers' + 'included_units' + 'overage_price')
+    - Discount-Fixed Amount / Discount-Percentage: Use discount fields
+    - Delivery Pricing: Use delivery_schedule
+    - Multi-Attribute Pricing: Use charge_model_configuration
+
+    Args:
+        rate_plan_id: Zuora rate plan ID OR object reference (e.g., '@{ProductRatePlan[0].Id}')
+        rate_plan_index: Index of rate plan in current batch (0-based) to auto-generate object reference
+        name: Charge name (max 100 chars)
+        description: Charge description (max 500 chars)
+        product_rate_plan_charge_number: Natural key (max 100 chars). Auto-generated if null.
+        charge_type: OneTime, Recurring, or Usage
+        charge_model: Pricing model (accepts simplified names like 'FlatFee' or full names like 'Flat Fee Pricing')
+        price: Price amount (for single-tier pricing: Flat Fee, Per Unit, or overage rate)
+        tiers: List of pricing tiers for Tiered/Volume pricing. Supports two formats:
+               Explicit format (full control):
+               - Price (required): Price for this tier
+               - StartingUnit: Unit where tier starts (default: 1 for first tier, auto-calculated for rest)
+               - EndingUnit: Unit where tier ends (omit for unlimited/last tier)
+               - PriceFormat: "Per Unit" or "Flat Fee" (default: "Per Unit")
+               - Currency: Override currency for this tier (default: uses charge currency)
+               Simplified format (auto-calculates boundaries):
+                - units: EndingUnit for this tier (omit or None for unlimited)
+                - price: Price for this tier
+        currency: Single currency code (for backward compatibility). Prefer 'currencies' for new code.
+        currencies: List of currency codes for multi-currency support (e.g., ["USD", "EUR"])
+        prices: Dict mapping currency to price (e.g., {"USD": 49.0, "EUR": 45.0})
+               Used with 'currencies' for different prices per currency.
+               If not provided, 'price' is used for all currencies.
+        default_quantity: Default quantity of units. Required for Per Unit/Volume/Tiered Pricing. Defaults to 1.
+        min_quantity: Minimum units allowed (max 16 chars)
+        max_quantity: Maximum units allowed (max 16 chars)
+        included_units: Units included before overage pricing (for Overage models)
+        overage_price: Base price per unit after included units consumed (for Overage models)
+        overage_prices: Dict mapping currency to overage price (e.g., {"USD": 0.003, "EUR": 0.003})
+                       Used with 'currencies' for different overage prices per currency.
+        billing_period: Billing period for recurring charges
+        billing_timing: 'In Advance' or 'In Arrears'. Not for Usage charges.
+        bill_cycle_type: How to determine billing day
+        bill_cycle_day: Bill cycle day (1-31). Account BCD can override.
+        weekly_bill_cycle_day: Weekly bill cycle day. Required when BillCycleType='SpecificDayofWeek'
+        specific_billing_period: Custom months/weeks when BillingPeriod='Specific Months/Weeks'
+        billing_period_alignment: Align charges within subscription
+        list_price_base: List price base. Defaults to BillingPeriod if not set.
+        specific_list_price_base: Months for list price base (1-120). Required when ListPriceBase='Per Specific Months'
+        trigger_event: When to start billing
+        end_date_condition: 'SubscriptionEnd' or 'FixedPeriod'
+        up_to_periods: Charge duration (0-65535). Required when EndDateCondition='FixedPeriod'
+        up_to_periods_type: Period type for up_to_periods
+        price_change_option: Automatic price change on renewal
+        price_increase_option: Price increase on renewal behavior
+        price_increase_percentage: Percentage to increase/decrease price on renewal (-100 to 100)
+        use_tenant_default_for_price_change: Set false when using specific percentage
+        uom: Unit of measure for usage charges (max 25 chars)
+        rating_group: How to aggregate usage for rating
+        usage_record_rating_option: When to rate usage records
+        overage_calculation_option: When to calculate overage
+        overage_unused_units_credit_option: Credit unused units
+        number_of_period: Periods for overage smoothing
+        smoothing_model: Overage smoothing model
+        apply_discount_to: Charge types discount applies to (for discount models)
+        discount_level: Discount scope: 'rateplan', 'subscription', or 'account'
+        is_stacked_discount: Calculate as stacked discount (Discount-Percentage only)
+        apply_to_billing_period_partially: Allow discount duration aligned with billing period partially
+        reflect_discount_in_net_amount: Reflect discount in net amount for Zuora Revenue
+        use_discount_specific_accounting_code: Use specific accounting code for discount charge
+        accounting_code: Accounting code (max 100 chars)
+        deferred_revenue_account: Deferred revenue account name (max 100 chars)
+        recognized_revenue_account: Recognized revenue account name (max 100 chars)
+        revenue_recognition_rule_name: 'Recognize upon invoicing' or 'Recognize daily over time'
+        rev_rec_code: Revenue recognition code (max 70 chars)
+        rev_rec_trigger_condition: When revenue recognition begins
+        exclude_item_billing_from_revenue_accounting: Exclude billing items from revenue accounting
+        exclude_item_booking_from_revenue_accounting: Exclude booking items from revenue accounting
+        is_allocation_eligible: Allocation eligible for revenue recognition
+        is_unbilled: Unbilled accounting
+        legacy_revenue_reporting: Legacy revenue reporting
+        revenue_recognition_timing: Revenue recognition timing
+        revenue_amortization_method: Revenue amortization method
+        product_category: Product category for Zuora Revenue integration
+        product_class: Product class for Zuora Revenue integration
+        product_family: Product family for Zuora Revenue integration
+        product_line: Product line for Zuora Revenue integration
+        taxable: Whether charge is taxable. Requires TaxMode and TaxCode if true.
+        tax_code: Tax code (max 64 chars). Required when Taxable=true.
+        tax_mode: 'TaxExclusive' or 'TaxInclusive'. Required when Taxable=true.
+        proration_option: Charge-level proration option
+        charge_function: Charge function type (Prepaid with Drawdown feature)
+        commitment_type: Commitment type: 'UNIT' or 'CURRENCY'
+        credit_option: Credit calculation: 'TimeBased', 'ConsumptionBased', 'FullCreditBack'
+        drawdown_rate: Conversion rate between Usage UOM and Drawdown UOM
+        drawdown_uom: Drawdown unit of measure
+        is_prepaid: Whether this is a prepayment (topup) or drawdown charge
+        prepaid_operation_type: 'topup' or 'drawdown'
+        prepaid_quantity: Units included in prepayment charge
+        prepaid_total_quantity: Total units available during validity period
+        prepaid_uom: Unit of measure for prepayment
+        validity_period_type: Prepaid validity period
+        is_rollover: Enable rollover for prepaid
+        rollover_apply: Rollover priority: 'ApplyFirst' or 'ApplyLast'
+        rollover_periods: Number of rollover periods (max 3)
+        rollover_period_length: Rollover fund period length
+        formula: Price lookup formula for Attribute-based Pricing
+        charge_model_configuration: Container for charge model configuration (Multi-Attribute/Pre-Rated Pricing)
+        delivery_schedule: Delivery schedule configuration (Delivery Pricing)
+
+    Examples:
+        # Flat Fee Pricing (single price)
+        create_charge(name="Monthly Fee", charge_type="Recurring", charge_model="Flat Fee Pricing", price=99.00)
+
+        # Per Unit Pricing
+        create_charge(name="API Calls", charge_type="Usage", charge_model="Per Unit Pricing", price=0.01, uom="Calls")
+
+        # Tiered Pricing - Explicit format (full control over boundaries)
+        create_charge(
+            name="API Calls",
+            charge_type="Usage",
+            charge_model="Tiered Pricing",
+            uom="Calls",
+            tiers=[
+                {"StartingUnit": 1, "EndingUnit": 1000, "Price": 0.10, "PriceFormat": "Per Unit"},
+                {"StartingUnit": 1001, "EndingUnit": 10000, "Price": 0.08, "PriceFormat": "Per Unit"},
+                {"StartingUnit": 10001, "Price": 0.05, "PriceFormat": "Per Unit"},  # No EndingUnit = unlimited
+            ]
+        )
+
+        # Tiered Pricing - Simplified format (auto-calculates boundaries)
+        create_charge(
+            name="API Calls",
+            charge_type="Usage",
+            charge_model="Tiered Pricing",
+            uom="Calls",
+            tiers=[
+                {"units": 1000, "price": 0.10},   # 1-1000 @ $0.10/unit
+                {"units": 10000, "price": 0.08},  # 1001-10000 @ $0.08/unit
+                {"price": 0.05},                   # 10001+ @ $0.05/unit (unlimited)
+            ]
+        )
+
+        # Volume Pricing (entire quantity priced at one tier's rate)
+        create_charge(
+            name="Storage",
+            charge_type="Usage",
+            charge_model="Volume Pricing",
+            uom="GB",
+            tiers=[
+                {"units": 100, "price": 1.00},
+                {"units": 1000, "price": 0.80},
+                {"price": 0.50},
+            ]
+        )
+
+        # Overage Pricing (X units included, then $Y per unit after)
+        create_charge(
+            name="API Usage",
+            charge_type="Usage",
+            charge_model="Overage Pricing",
+            uom="Calls",
+            included_units=10000,   # 10,000 calls included
+            overage_price=0.003,    # $0.003 per call after included units
+        )
+
+        # Tiered with Overage Pricing (tiered pricing + overage after all tiers)
+        create_charge(
+            name="Data Transfer",
+            charge_type="Usage",
+            charge_model="Tiered with Overage Pricing",
+            uom="GB",
+            included_units=100,     # 100 GB included in base
+            tiers=[
+                {"units": 500, "price": 0.10},   # 0-500 GB @ $0.10/GB
+                {"units": 1000, "price": 0.08},  # 501-1000 GB @ $0.08/GB
+            ],
+            overage_price=0.05,     # $0.05/GB after 1000 GB
+        )
+
+        # Recurring charge with 10% price increase on each renewal
+        create_charge(
+            name="Monthly Subscription",
+            charge_type="Recurring",
+            charge_model="Per Unit Pricing",
+            price=30.00,
+            billing_period="Month",
+            price_increase_option="SpecificPercentageValue",
+            price_increase_percentage=10,  # 10% increase on each renewal
+        )
+    """
+    # Charge arguments for _build_charge_payload (everything but the rate plan)
+    charge_args = {
+        key: value
+        for key, value in locals().items()
+        if key not in ("tool_context", "rate_plan_id", "rate_plan_index")
+    }
+
+    # Entry logging for debugging tool call issues
+    logger.info(
+        f"[TOOL CALL] create_charge: name={name}, charge_type={charge_type}, "
+        f"charge_model={charge_model}, price={price}, billing_period={billing_period}, "
+        f"rate_plan_id={rate_plan_id}, rate_plan_index={rate_plan_index}"
+    )
+
+    # Track defaults applied for transparency
+    defaults_applied: List[Dict[str, str]] = []
+
+    # Handle ProductRatePlanId
+    if rate_plan_id:
+        if not validate_zuora_id(rate_plan_id):
+            return format_error_message(
+                "Invalid rate_plan_id",
+                "Provide a valid Zuora rate plan ID (e.g., '8a1234567890abcd') or object reference (e.g., '@{ProductRatePlan[0].Id}')",
+            )
+        rate_plan_ref = rate_plan_id
+    elif rate_plan_index is not None:
+        # Generate object reference from explicit index
+        rate_plan_ref = f"@{{ProductRatePlan[{rate_plan_index}].Id}}"
+    else:
+        # Try to auto-generate object reference based on rate plans in current batch
+        store = PayloadStore.load(tool_context.agent)
+        object_ref = _get_rate_plan_object_reference(store)
+        if object_ref:
+            rate_plan_ref = object_ref
+            defaults_applied.append(
+                {
+                    "field": "ProductRatePlanId",
+                    "value": f"{object_ref} (auto-linked to rate plan in batch)",
+                }
+            )
+        else:
+            # Default to first rate plan in batch (index 0) - mandatory for batch creation
+            rate_plan_ref = "@{ProductRatePlan[0].Id}"
+            defaults_applied.append(
+                {
+                    "field": "ProductRatePlanId",
+                    "value": "@{ProductRatePlan[0].Id} (auto-linked to first rate plan in batch)",
+                }
+            )
+
+    payload_data, charge_defaults, warnings = _build_charge_payload(
+        rate_plan_ref, **charge_args
+    )
+    defaults_applied.extend(charge_defaults)
+
+    if name:
+        # Validate name length
+        is_valid_len, len_warning = validate_name_length(name, "Charge name")
+        if not is_valid_len and len_warning:
+            warnings.append(len_warning)
+
+        # Validate name uniqueness within rate plan
+        store = PayloadStore.load(tool_context.agent)
+        rp_ref = payload_data.get("ProductRatePlanId", "")
+        is_unique, unique_warning = validate_charge_name_unique(name, rp_ref, store)
+        if not is_unique and unique_warning:
+            warnings.append(unique_warning)
+
+    # Delegate to create_payload which handles placeholders and validation
+    # It will add placeholders for conditionally required fields based on ChargeType
+    result = create_payload(
+        tool_context, "charge_create", payload_data, defaults_applied=defaults_applied
+    )
 
     # Prepend warnings if any
     if warnings:
@@ -3653,6 +4030,166 @@ def create_drawdown_charge(
     )
 
 
+# ============ Bulk Catalog Ingestion ============
+
+# Spec problems listed in the tool result (the rest are counted)
+INGEST_MESSAGE_LIMIT = 20
+
+
+def _spec_messages_html(sections: List[Tuple[str, List[str]]]) -> str:
+    """Warning lists for a spec tool result, capped at INGEST_MESSAGE_LIMIT each."""
+    output = ""
+    for title, messages in sections:
+        if not messages:
+            continue
+        output += f"<div class='warnings'><p>⚠️ <strong>{title}:</strong></p><ul>"
+        for message in messages[:INGEST_MESSAGE_LIMIT]:
+            output += f"<li>{message}</li>"
+        if len(messages) > INGEST_MESSAGE_LIMIT:
+            output += f"<li>... and {len(messages) - INGEST_MESSAGE_LIMIT} more</li>"
+        output += "</ul></div>"
+    return output
+
+
+@tool(context=True)
+def ingest_catalog_spec(
+    tool_context: ToolContext,
+    spec: str,
+    spec_format: Literal["json", "csv"] = "json",
+) -> str:
+    """Generate the payloads for a whole catalog spec in one call.
+
+    Use this instead of repeated create_product / create_rate_plan / create_charge
+    calls when the user provides a structured catalog (JSON or CSV). Every object
+    gets the same defaults, normalization and placeholders as with those tools,
+    and rate plans and charges are linked with object references.
+
+    Args:
+        spec: The catalog spec, passed through unchanged.
+              JSON: {"products": [{"name", "sku", ..., "rate_plans": [{"name", ...,
+              "charges": [{create_charge arguments}]}]}]}
+              CSV: a "type" column (product, rate_plan, charge) plus argument
+              columns; rows belong to the product / rate plan above them
+        spec_format: 'json' or 'csv'
+    """
+    from .catalog_ingest import ingest_catalog, parse_catalog_spec
+
+    logger.info(
+        f"[TOOL CALL] ingest_catalog_spec: spec_format={spec_format}, "
+        f"spec_length={len(spec)}"
+    )
+
+    products, errors = parse_catalog_spec(spec, spec_format)
+    store = PayloadStore.load(tool_context.agent)
+    result = ingest_catalog(products, store)
+    result.errors[:0] = errors
+    if result.payloads:
+        store.save(tool_context.agent)
+
+    friendly = {
+        "product_create": "product(s)",
+        "rate_plan_create": "rate plan(s)",
+        "charge_create": "charge(s)",
+    }
+    created = ", ".join(
+        f"{result.counts[api_type]} {label}"
+        for api_type, label in friendly.items()
+        if result.counts.get(api_type)
+    )
+    output = (
+        f"Ingested catalog spec: <strong>{created}</strong><br>"
+        if created
+        else "No payloads were created from the spec.<br>"
+    )
+    if result.with_placeholders:
+        output += (
+            f"{result.with_placeholders} payload(s) need more details before "
+            "execution (see placeholders).<br>"
+        )
+
+    output += _spec_messages_html(
+        [("Errors (skipped)", result.errors), ("Warnings", result.warnings)]
+    )
+
+    return output
+
+
+# ============ Catalog Reconciliation ============
+
+
+@tool(context=True)
+def reconcile_catalog_spec(
+    tool_context: ToolContext,
+    spec: str,
+    spec_format: Literal["json", "csv"] = "json",
+) -> str:
+    """Generate the minimal payloads that make the live catalog match a spec.
+
+    Use this when the user re-seeds or edits an EXISTING catalog with a structured
+    spec, instead of update_zuora_product / update_zuora_rate_plan /
+    update_zuora_charge / update_zuora_charge_price calls per field. Live products
+    are fetched and compared; only changed fields get update payloads (tier
+    prices get tier update payloads), and missing products, rate plans and
+    charges get create payloads. Unchanged objects produce nothing.
+
+    Args:
+        spec: The desired catalog, in the ingest_catalog_spec format. Products are
+              matched by product_id, sku or name; rate plans and charges by
+              rate_plan_id / charge_id or by name. Only fields given are compared.
+        spec_format: 'json' or 'csv'
+    """
+    from .catalog_diff import diff_catalog
+    from .catalog_ingest import parse_catalog_spec
+
+    logger.info(
+        f"[TOOL CALL] reconcile_catalog_spec: spec_format={spec_format}, "
+        f"spec_length={len(spec)}"
+    )
+
+    products, errors = parse_catalog_spec(spec, spec_format)
+    store = PayloadStore.load(tool_context.agent)
+    result = diff_catalog(products, store)
+    result.errors[:0] = errors
+    if result.payloads:
+        store.save(tool_context.agent)
+
+    friendly = {
+        "product_update": "product update(s)",
+        "rate_plan_update": "rate plan update(s)",
+        "charge_update": "charge update(s)",
+        "charge_tier_update": "tier price update(s)",
+        "product_create": "new product(s)",
+        "rate_plan_create": "new rate plan(s)",
+        "charge_create": "new charge(s)",
+    }
+    generated = ", ".join(
+        f"{result.counts[api_type]} {label}"
+        for api_type, label in friendly.items()
+        if result.counts.get(api_type)
+    )
+    output = (
+        f"Reconciled catalog spec: <strong>{generated}</strong><br>"
+        if generated
+        else "The live catalog already matches the spec; no payloads were created.<br>"
+    )
+    if result.unchanged:
+        output += f"{result.unchanged} object(s) already match and were skipped.<br>"
+    if result.with_placeholders:
+        output += (
+            f"{result.with_placeholders} payload(s) need more details before "
+            "execution (see placeholders).<br>"
+        )
+    output += _spec_messages_html(
+        [
+            ("Changes", result.changes),
+            ("Errors (skipped)", result.errors),
+            ("Warnings", result.warnings),
+        ]
+    )
+
+    return output
+
+
 # ============ Billing Architect Advisory Tools ============
 
 ADVISORY_PAYLOADS_STATE_KEY = "advisory_payloads"
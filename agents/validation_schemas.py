@@ -5,7 +5,9 @@ Defines required fields and validation rules for different entity types.
 This module is extracted from tools.py for better organization and maintainability.
 """
 
-from typing import Dict, Any, List, Tuple, cast
+from typing import Dict, Any, List, Optional, Tuple, cast
+
+from .placeholders import add_placeholder
 
 
 # ============ Human-Friendly Labels for Technical Zuora Values ============
@@ -451,12 +453,195 @@ def _check_field_exists(data: Dict[str, Any], field: str) -> bool:
     return target in existing_keys
 
 
+def _normalize_key(key: str) -> str:
+    """Key form used for flexible matching ("effective_start_date" -> "effectivestartdate")."""
+    return key.lower().replace("_", "")
+
+
+def _key_maps(data: Dict[str, Any]) -> Tuple[Dict[str, Any], set]:
+    """
+    Key lookups for one payload, built in a single pass.
+
+    Returns:
+        Tuple of (lowercased key -> value of its first occurrence, used by
+        condition checks; case- and underscore-insensitive forms of all keys,
+        used by field checks)
+    """
+    lowered: Dict[str, Any] = {}
+    normalized = set()
+    for key, value in data.items():
+        lower = key.lower()
+        if lower not in lowered:
+            lowered[lower] = value
+        normalized.add(lower.replace("_", ""))
+    return lowered, normalized
+
+
+class CompiledValidator:
+    """
+    Required-field checks for one API type, pre-parsed from REQUIRED_FIELDS.
+
+    Field names are normalized, dotted paths split and condition strings
+    (including compound "A=x,B=y" conditions) parsed once, together with the
+    missing-field descriptions they produce. validate() then only looks up
+    keys of the payload.
+
+    Args:
+        schema: The REQUIRED_FIELDS entry for the API type
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        descriptions: Dict[str, str] = cast(
+            Dict[str, str], schema.get("descriptions", {})
+        )
+
+        # (field, normalized field or dotted path parts, missing tuple)
+        self.always: List[Tuple[str, Any, Tuple[str, str]]] = [
+            self._field_check(field, descriptions.get(field, field))
+            for field in cast(List[str], schema.get("always", []))
+        ]
+
+        # (parent field, [(nested field, missing tuple)])
+        self.nested: List[Tuple[str, List[Tuple[str, Tuple[str, str]]]]] = []
+        for parent_field, nested_fields in cast(
+            Dict[str, List[str]], schema.get("nested", {})
+        ).items():
+            checks = []
+            for nested_field in nested_fields:
+                full_path = f"{parent_field}.{nested_field}"
+                desc = descriptions.get(full_path, nested_field)
+                checks.append((nested_field, (full_path, desc)))
+            self.nested.append((parent_field, checks))
+
+        # ([(lowercased field, uppercased value)] or None if never met, field checks)
+        self.conditional: List[
+            Tuple[
+                Optional[List[Tuple[str, str]]], List[Tuple[str, Any, Tuple[str, str]]]
+            ]
+        ] = []
+        for condition, conditional_fields in cast(
+            Dict[str, List[str]], schema.get("conditional", {})
+        ).items():
+            parts: Optional[List[Tuple[str, str]]] = []
+            description_parts: List[str] = []
+            for cond_part in condition.split(","):
+                if "=" not in cond_part:
+                    # Malformed part: the condition can never be met
+                    parts = None
+                    break
+                cond_field, cond_value = cond_part.split("=", 1)
+                cast(List[Tuple[str, str]], parts).append(
+                    (cond_field.lower(), cond_value.upper())
+                )
+                description_parts.append(f"{cond_field}={cond_value}")
+            condition_desc_str = " and ".join(description_parts)
+            checks = [
+                self._field_check(
+                    field,
+                    f"{descriptions.get(field, field)} (required because {condition_desc_str})",
+                )
+                for field in conditional_fields
+            ]
+            self.conditional.append((parts, checks))
+
+    @staticmethod
+    def _field_check(field: str, desc: str) -> Tuple[str, Any, Tuple[str, str]]:
+        if "." in field:
+            return (field, field.split("."), (field, desc))
+        return (field, _normalize_key(field), (field, desc))
+
+    @staticmethod
+    def _path_missing(data: Dict[str, Any], parts: List[str]) -> bool:
+        current: Any = data
+        for key in parts:
+            if isinstance(current, dict) and key in current:
+                current = current[key]
+            else:
+                return True
+        return current is None
+
+    def _check_fields(
+        self,
+        data: Dict[str, Any],
+        checks: List[Tuple[str, Any, Tuple[str, str]]],
+        normalized: Optional[set],
+        missing: List[Tuple[str, str]],
+    ) -> Optional[set]:
+        """Append missing fields; returns the normalized key set if it was built."""
+        for field, match, missing_entry in checks:
+            if isinstance(match, list):
+                if self._path_missing(data, match):
+                    missing.append(missing_entry)
+            elif field not in data:
+                if normalized is None:
+                    normalized = _key_maps(data)[1]
+                if match not in normalized:
+                    missing.append(missing_entry)
+        return normalized
+
+    def validate(self, payload_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Missing (field_name, description) tuples for a payload."""
+        missing: List[Tuple[str, str]] = []
+        lowered: Optional[Dict[str, Any]] = None
+        normalized: Optional[set] = None
+        if self.conditional:
+            lowered, normalized = _key_maps(payload_data)
+
+        normalized = self._check_fields(payload_data, self.always, normalized, missing)
+
+        for parent_field, nested_checks in self.nested:
+            parent_data = payload_data.get(parent_field, {})
+            for nested_field, missing_entry in nested_checks:
+                if not parent_data or nested_field not in parent_data:
+                    missing.append(missing_entry)
+
+        if lowered is not None:
+            for parts, checks in self.conditional:
+                if parts is None:
+                    continue
+                for lower_field, upper_value in parts:
+                    actual_value = lowered.get(lower_field)
+                    if not actual_value or str(actual_value).upper() != upper_value:
+                        break
+                else:
+                    self._check_fields(payload_data, checks, normalized, missing)
+
+        return missing
+
+
+# Compiled validators by lowercased API type (None for types without a schema)
+_COMPILED_VALIDATORS: Dict[str, Optional[CompiledValidator]] = {}
+
+
+def get_validator(api_type: str) -> Optional[CompiledValidator]:
+    """
+    Compiled validator for an API type, compiled on first use.
+
+    Args:
+        api_type: The API type (case-insensitive)
+
+    Returns:
+        CompiledValidator, or None if the type has no schema
+    """
+    api_type_lower = api_type.lower()
+    try:
+        return _COMPILED_VALIDATORS[api_type_lower]
+    except KeyError:
+        schema = REQUIRED_FIELDS.get(api_type_lower)
+        validator = CompiledValidator(schema) if schema else None
+        _COMPILED_VALIDATORS[api_type_lower] = validator
+        return validator
+
+
 def validate_payload(
     api_type: str, payload_data: Dict[str, Any]
 ) -> Tuple[bool, List[Tuple[str, str]]]:
     """
     Validate payload against required fields for the given API type.
 
+    Uses the compiled validator for the type (see CompiledValidator), so the
+    schema is only interpreted once per process.
+
     Args:
         api_type: The API type (product, account, subscription, etc.)
         payload_data: The payload data dictionary
@@ -465,85 +650,12 @@ def validate_payload(
         Tuple of (is_valid, list_of_missing_field_tuples)
         Each tuple is (field_name, description)
     """
-    api_type_lower = api_type.lower()
-
-    # Get schema for this API type
-    schema_raw = REQUIRED_FIELDS.get(api_type_lower)
-    if not schema_raw:
+    validator = get_validator(api_type)
+    if validator is None:
         # Unknown type, skip validation
         return (True, [])
 
-    # Type-safe access to schema components
-    schema: Dict[str, Any] = schema_raw
-    missing: List[Tuple[str, str]] = []
-    descriptions: Dict[str, str] = cast(Dict[str, str], schema.get("descriptions", {}))
-    always_fields: List[str] = cast(List[str], schema.get("always", []))
-    nested_fields_map: Dict[str, List[str]] = cast(
-        Dict[str, List[str]], schema.get("nested", {})
-    )
-    conditional_map: Dict[str, List[str]] = cast(
-        Dict[str, List[str]], schema.get("conditional", {})
-    )
-
-    # Check "always" required fields
-    for field in always_fields:
-        if not _check_field_exists(payload_data, field):
-            desc = descriptions.get(field, field)
-            missing.append((field, desc))
-
-    # Check "nested" required fields
-    for parent_field, nested_fields in nested_fields_map.items():
-        parent_data = payload_data.get(parent_field, {})
-        if not parent_data:
-            # Parent is missing, add all nested fields
-            for nested_field in nested_fields:
-                full_path = f"{parent_field}.{nested_field}"
-                desc = descriptions.get(full_path, nested_field)
-                missing.append((full_path, desc))
-        else:
-            # Check each nested field
-            for nested_field in nested_fields:
-                if nested_field not in parent_data:
-                    full_path = f"{parent_field}.{nested_field}"
-                    desc = descriptions.get(full_path, nested_field)
-                    missing.append((full_path, desc))
-
-    # Check "conditional" required fields
-    for condition, conditional_fields in conditional_map.items():
-        # Support compound conditions (comma-separated), e.g. "IsPrepaid=true,PrepaidOperationType=topup"
-        condition_parts = condition.split(",")
-        all_conditions_met = True
-        condition_description_parts: List[str] = []
-
-        for cond_part in condition_parts:
-            if "=" in cond_part:
-                cond_field, cond_value = cond_part.split("=", 1)
-                # Get actual value from payload (case-insensitive)
-                actual_value = None
-                for key in payload_data.keys():
-                    if key.lower() == cond_field.lower():
-                        actual_value = payload_data[key]
-                        break
-
-                # Check if this part of the condition is met
-                if actual_value and str(actual_value).upper() == cond_value.upper():
-                    condition_description_parts.append(f"{cond_field}={cond_value}")
-                else:
-                    all_conditions_met = False
-                    break
-            else:
-                all_conditions_met = False
-                break
-
-        # If all conditions are met, check required fields
-        if all_conditions_met:
-            condition_desc_str = " and ".join(condition_description_parts)
-            for field in conditional_fields:
-                if not _check_field_exists(payload_data, field):
-                    desc = descriptions.get(field, field)
-                    cond_desc = f"{desc} (required because {condition_desc_str})"
-                    missing.append((field, cond_desc))
-
+    missing = validator.validate(payload_data)
     return (len(missing) == 0, missing)
 
 
@@ -604,7 +716,10 @@ def generate_placeholder_value(field_name: str, description: str) -> str:
 
 
 def generate_placeholder_payload(
-    api_type: str, payload_data: Dict[str, Any], missing_fields: List[Tuple[str, str]]
+    api_type: str,
+    payload_data: Dict[str, Any],
+    missing_fields: List[Tuple[str, str]],
+    registry: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Tuple[Dict[str, Any], List[str]]:
     """
     Generate a complete payload with placeholders for missing required fields.
@@ -613,6 +728,8 @@ def generate_placeholder_payload(
         api_type: The API type (product, account, subscription, etc.)
         payload_data: The partial payload data
         missing_fields: List of (field_name, description) tuples for missing fields
+        registry: Optional placeholder registry to record each placeholder in
+                  (see agents.placeholders)
 
     Returns:
         Tuple of (complete_payload_with_placeholders, list_of_placeholder_fields)
@@ -624,6 +741,8 @@ def generate_placeholder_payload(
     for field_name, description in missing_fields:
         placeholder_value = generate_placeholder_value(field_name, description)
         placeholder_list.append(field_name)
+        if registry is not None:
+            add_placeholder(registry, field_name, placeholder_value, description)
 
         # Handle nested fields (e.g., "billToContact.firstName")
         if "." in field_name:
@@ -7,7 +7,9 @@ Extracted from tools.py to reduce code duplication.
 
 import re
 from datetime import datetime
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Union
+
+from .payload_store import PayloadStore
 
 
 def validate_date_format(
@@ -196,14 +198,14 @@ def validate_name_length(
 
 
 def validate_product_name_unique(
-    name: str, existing_payloads: List[dict]
+    name: str, existing_payloads: Union[List[dict], PayloadStore]
 ) -> Tuple[bool, Optional[str]]:
     """
     Check if product name is unique among existing product payloads in current session.
 
     Args:
         name: Product name to check
-        existing_payloads: List of payload dicts from agent state
+        existing_payloads: List of payload dicts from agent state, or a PayloadStore
 
     Returns:
         Tuple of (is_unique, warning_message)
@@ -212,22 +214,18 @@ def validate_product_name_unique(
     if not name:
         return (True, None)
 
-    for payload in existing_payloads:
-        if payload.get("zuora_api_type") in ("product", "product_create"):
-            existing_name = payload.get("payload", {}).get("Name") or payload.get(
-                "payload", {}
-            ).get("name")
-            if existing_name and existing_name.lower() == name.lower():
-                return (
-                    False,
-                    f"Duplicate product name '{name}' - a product with this name already exists in the current payload",
-                )
+    store = PayloadStore.of(existing_payloads)
+    if store.find_by_name(name, ("product", "product_create")):
+        return (
+            False,
+            f"Duplicate product name '{name}' - a product with this name already exists in the current payload",
+        )
 
     return (True, None)
 
 
 def validate_rate_plan_name_unique(
-    name: str, product_id: str, existing_payloads: List[dict]
+    name: str, product_id: str, existing_payloads: Union[List[dict], PayloadStore]
 ) -> Tuple[bool, Optional[str]]:
     """
     Check if rate plan name is unique within the same product in current session.
@@ -235,44 +233,30 @@ def validate_rate_plan_name_unique(
     Args:
         name: Rate plan name to check
         product_id: Product ID or object reference this rate plan belongs to
-        existing_payloads: List of payload dicts from agent state
+        existing_payloads: List of payload dicts from agent state, or a PayloadStore
 
     Returns:
         Tuple of (is_unique, warning_message)
         warning_message is None if unique
     """
-    if not name:
+    if not name or not product_id:
         return (True, None)
 
-    for payload in existing_payloads:
-        if payload.get("zuora_api_type") in (
-            "rate_plan",
-            "rate_plan_create",
-            "product_rate_plan",
-        ):
-            payload_data = payload.get("payload", {})
-            existing_name = payload_data.get("Name") or payload_data.get("name")
-            existing_product_id = payload_data.get("ProductId") or payload_data.get(
-                "productId"
-            )
-
-            # Check if same name AND same product
-            if (
-                existing_name
-                and existing_name.lower() == name.lower()
-                and existing_product_id
-                and existing_product_id == product_id
-            ):
-                return (
-                    False,
-                    f"Duplicate rate plan name '{name}' - a rate plan with this name already exists for this product",
-                )
+    # Same name AND same product
+    store = PayloadStore.of(existing_payloads)
+    if store.find_by_name(
+        name, ("rate_plan", "rate_plan_create", "product_rate_plan"), parent=product_id
+    ):
+        return (
+            False,
+            f"Duplicate rate plan name '{name}' - a rate plan with this name already exists for this product",
+        )
 
     return (True, None)
 
 
 def validate_charge_name_unique(
-    name: str, rate_plan_id: str, existing_payloads: List[dict]
+    name: str, rate_plan_id: str, existing_payloads: Union[List[dict], PayloadStore]
 ) -> Tuple[bool, Optional[str]]:
     """
     Check if charge name is unique within the same rate plan in current session.
@@ -280,38 +264,26 @@ def validate_charge_name_unique(
     Args:
         name: Charge name to check
         rate_plan_id: Rate plan ID or object reference this charge belongs to
-        existing_payloads: List of payload dicts from agent state
+        existing_payloads: List of payload dicts from agent state, or a PayloadStore
 
     Returns:
         Tuple of (is_unique, warning_message)
         warning_message is None if unique
     """
-    if not name:
+    if not name or not rate_plan_id:
         return (True, None)
 
-    for payload in existing_payloads:
-        if payload.get("zuora_api_type") in (
-            "charge",
-            "charge_create",
-            "product_rate_plan_charge",
-        ):
-            payload_data = payload.get("payload", {})
-            existing_name = payload_data.get("Name") or payload_data.get("name")
-            existing_rp_id = payload_data.get("ProductRatePlanId") or payload_data.get(
-                "productRatePlanId"
-            )
-
-            # Check if same name AND same rate plan
-            if (
-                existing_name
-                and existing_name.lower() == name.lower()
-                and existing_rp_id
-                and existing_rp_id == rate_plan_id
-            ):
-                return (
-                    False,
-                    f"Duplicate charge name '{name}' - a charge with this name already exists for this rate plan",
-                )
+    # Same name AND same rate plan
+    store = PayloadStore.of(existing_payloads)
+    if store.find_by_name(
+        name,
+        ("charge", "charge_create", "product_rate_plan_charge"),
+        parent=rate_plan_id,
+    ):
+        return (
+            False,
+            f"Duplicate charge name '{name}' - a charge with this name already exists for this rate plan",
+        )
 
     return (True, None)
 
@@ -1,8 +1,18 @@
 import logging
+from typing import Optional
 from strands import Agent
-from strands.models import BedrockModel
+from strands.models import BedrockModel, Model
 from .config import GEN_MODEL_ID
+from .conversation import TokenBudgetConversationManager
 from .observability import trace_function, get_tracer
+from .tool_instrumentation import (
+    TOOL_CATEGORY_ADVISORY,
+    TOOL_CATEGORY_CREATE,
+    TOOL_CATEGORY_PWD,
+    TOOL_CATEGORY_READ,
+    TOOL_CATEGORY_UPDATE,
+    instrument_tools,
+)
 from .zuora_settings import (
     fetch_environment_settings,
     is_settings_loaded,
@@ -30,11 +40,15 @@ from .tools import (
     # Prepaid with Drawdown helper tools
     create_prepaid_charge,
     create_drawdown_charge,
+    # Bulk catalog ingestion and reconciliation
+    ingest_catalog_spec,
+    reconcile_catalog_spec,
     # Zuora API tools (update - payload generation)
     update_zuora_product,
     update_zuora_rate_plan,
     update_zuora_charge,
     update_zuora_charge_price,
+    bulk_update_charge_prices,
     # Zuora API tools (expire - payload generation)
     expire_product,
     # Billing Architect advisory tools
@@ -127,6 +141,16 @@ Optimal flow for creating a product with rate plan and charges:
 
 Total: 5-7 tools maximum
 
+### Rule 4b: Bulk Catalogs
+When the user provides a structured catalog (JSON or CSV listing products, rate plans and charges),
+call `ingest_catalog_spec` ONCE with the spec instead of one create call per entity.
+When the spec describes changes to products that already exist in Zuora (re-seeding or
+editing the catalog), call `reconcile_catalog_spec` ONCE instead: it compares the spec with
+the live catalog and only generates payloads for what differs.
+When one price rule applies to several charges (a percentage change, one new price, or new
+prices per tier across rate plans, charges or currencies), call `bulk_update_charge_prices`
+ONCE instead of `update_zuora_charge_price` per charge.
+
 ### Rule 5: Ask Before Recreating
 If you realize you need more information AFTER creating a payload:
 - Use `update_payload()` to modify the existing payload
@@ -597,69 +621,96 @@ Remember: As an advisor, you provide knowledge, not exploration. Minimize tool c
 
 # ============ Tool Sets by Persona ============
 
+# Every tool is wrapped for execution metrics and spans, tagged by category
+# (see agents/tool_instrumentation.py)
+
 # Tools available to all personas (read-only operations)
-SHARED_TOOLS = [
-    # Utility tools
-    get_current_date,
-    get_zuora_environment_info,
-    # Zuora connection and read tools
-    connect_to_zuora,
-    list_zuora_products,
-    get_zuora_product,
-    get_zuora_rate_plan_details,
-    get_payloads,
-    list_payload_structure,
-]
+SHARED_TOOLS = instrument_tools(
+    [
+        # Utility tools
+        get_current_date,
+        get_zuora_environment_info,
+        # Zuora connection and read tools
+        connect_to_zuora,
+        list_zuora_products,
+        get_zuora_product,
+        get_zuora_rate_plan_details,
+        get_payloads,
+        list_payload_structure,
+    ],
+    TOOL_CATEGORY_READ,
+)
 
 # Tools specific to Project Manager (executes API calls)
-PROJECT_MANAGER_TOOLS = [
-    # Create operations (payload generation)
-    create_product,
-    create_rate_plan,
-    create_charge,
-    # Prepaid with Drawdown helper tools
-    create_prepaid_charge,
-    create_drawdown_charge,
-    # Update operations (payload generation)
-    update_zuora_product,
-    update_zuora_rate_plan,
-    update_zuora_charge,
-    update_zuora_charge_price,
-    # Expire operations (payload generation)
-    expire_product,
-    # Payload manipulation
-    update_payload,
-    create_payload,
-]
+PROJECT_MANAGER_TOOLS = instrument_tools(
+    [
+        # Create operations (payload generation)
+        create_product,
+        create_rate_plan,
+        create_charge,
+        # Prepaid with Drawdown helper tools
+        create_prepaid_charge,
+        create_drawdown_charge,
+        # Bulk catalog ingestion
+        ingest_catalog_spec,
+        # Payload creation
+        create_payload,
+    ],
+    TOOL_CATEGORY_CREATE,
+) + instrument_tools(
+    [
+        # Update operations (payload generation)
+        update_zuora_product,
+        update_zuora_rate_plan,
+        update_zuora_charge,
+        update_zuora_charge_price,
+        bulk_update_charge_prices,
+        # Expire operations (payload generation)
+        expire_product,
+        # Catalog reconciliation (update payloads for what differs)
+        reconcile_catalog_spec,
+        # Payload manipulation
+        update_payload,
+    ],
+    TOOL_CATEGORY_UPDATE,
+)
 
 # Tools specific to Billing Architect (advisory only)
-BILLING_ARCHITECT_TOOLS = [
-    generate_prepaid_config,
-    generate_workflow_config,
-    generate_notification_rule,
-    generate_order_payload,
-    explain_field_lookup,
-    generate_multi_attribute_pricing,
-    generate_custom_field_definition,
-    validate_billing_configuration,
-    get_zuora_documentation,
-    # PWD SeedSpec tools (Architect Persona)
-    generate_pwd_seedspec,
-    validate_pwd_spec,
-    generate_pwd_planning_payloads,
-    get_pwd_knowledge_base,
-]
+BILLING_ARCHITECT_TOOLS = instrument_tools(
+    [
+        generate_prepaid_config,
+        generate_workflow_config,
+        generate_notification_rule,
+        generate_order_payload,
+        explain_field_lookup,
+        generate_multi_attribute_pricing,
+        generate_custom_field_definition,
+        validate_billing_configuration,
+        get_zuora_documentation,
+    ],
+    TOOL_CATEGORY_ADVISORY,
+) + instrument_tools(
+    [
+        # PWD SeedSpec tools (Architect Persona)
+        generate_pwd_seedspec,
+        validate_pwd_spec,
+        generate_pwd_planning_payloads,
+        get_pwd_knowledge_base,
+    ],
+    TOOL_CATEGORY_PWD,
+)
 
 # ============ Agent Factory ============
 
 
 @trace_function(span_name="agent.create", attributes={"component": "agent_factory"})
-def create_agent(persona: str) -> Agent:
+def create_agent(persona: str, model: Optional[Model] = None) -> Agent:
     """
     Create an agent configured for the specified persona.
 
     Args:
         persona: The persona type ("ProductManager" or "BillingArchitect")
+        model: Model to use instead of Bedrock (e.g. the load test's replay model)
 
     Returns:
         Agent instance configured with appropriate system prompt and tools
@@ -677,14 +728,17 @@ def create_agent(persona: str) -> Agent:
     environment_context = get_environment_context_for_prompt()
 
     with tracer.start_as_current_span("agent.create.model") as span:
-        span.set_attribute("model_id", GEN_MODEL_ID)
-        model = BedrockModel(
-            model_id=GEN_MODEL_ID,
-            streaming=False,  # Frontend cannot handle streaming
-            temperature=0.1,  # Lower temperature = more deterministic, faster
-            max_tokens=2000,  # Reasonable limit for responses
-            top_p=0.9,  # More focused token sampling
-        )
+        if model is None:
+            span.set_attribute("model_id", GEN_MODEL_ID)
+            model = BedrockModel(
+                model_id=GEN_MODEL_ID,
+                streaming=False,  # Frontend cannot handle streaming
+                temperature=0.1,  # Lower temperature = more deterministic, faster
+                max_tokens=2000,  # Reasonable limit for responses
+                top_p=0.9,  # More focused token sampling
+            )
+        else:
+            span.set_attribute("model_id", type(model).__name__)
 
     with tracer.start_as_current_span("agent.create.configure") as span:
         span.set_attribute("persona", persona)
@@ -699,6 +753,7 @@ def create_agent(persona: str) -> Agent:
                 model=model,
                 system_prompt=system_prompt,
                 tools=tools,
+                conversation_manager=TokenBudgetConversationManager(),
             )
         else:  # Default to ProductManager
             tools = SHARED_TOOLS + PROJECT_MANAGER_TOOLS
@@ -710,6 +765,7 @@ def create_agent(persona: str) -> Agent:
                 model=model,
                 system_prompt=system_prompt,
                 tools=tools,
+                conversation_manager=TokenBudgetConversationManager(),
             )
 
 
@@ -739,5 +795,6 @@ def get_default_agent() -> Agent:
             model=model,
             system_prompt=PROJECT_MANAGER_SYSTEM_PROMPT + environment_context,
             tools=ALL_TOOLS,
+            conversation_manager=TokenBudgetConversationManager(),
         )
     return _default_agent
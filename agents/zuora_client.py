@@ -20,7 +20,14 @@ from .config import (
     ZUORA_OAUTH_TIMEOUT,
 )
 from .cache import get_cache
-from .observability import get_tracer, get_metrics_collector, trace_function
+from .timings import TIMING_ZUORA, record_timing
+from .observability import (
+    get_tracer,
+    get_metrics_collector,
+    normalize_endpoint,
+    record_tool_zuora_call,
+    trace_function,
+)
 
 
 # Base URLs by environment
@@ -144,6 +151,7 @@ class ZuoraClient:
             )
 
             duration_ms = (time.time() - start_time) * 1000
+            record_timing(TIMING_ZUORA, duration_ms)
 
             if response.status_code == 200:
                 data = response.json()
@@ -186,6 +194,7 @@ class ZuoraClient:
 
         except requests.RequestException as e:
             duration_ms = (time.time() - start_time) * 1000
+            record_timing(TIMING_ZUORA, duration_ms)
             self.metrics.record_api_call("POST", "/oauth/token", duration_ms, False)
             self.metrics.record_api_error("POST", "/oauth/token", type(e).__name__)
             return {"success": False, "message": f"Connection error: {str(e)}"}
@@ -221,6 +230,9 @@ class ZuoraClient:
         with self.tracer.start_as_current_span("zuora.api.request") as span:
             span.set_attribute("http.method", method)
             span.set_attribute("http.url", endpoint)
+            # Metric attributes use the template so ids don't create new series
+            endpoint_template = normalize_endpoint(endpoint)
+            span.set_attribute("http.route", endpoint_template)
             span.set_attribute("zuora.env", self.env)
 
             # Try cache for GET requests
@@ -244,6 +256,7 @@ class ZuoraClient:
                 "Accept": "application/json",
             }
 
+            record_tool_zuora_call()
             start_time = time.time()
             try:
                 response = self.session.request(
@@ -256,6 +269,7 @@ class ZuoraClient:
                 )
 
                 duration_ms = (time.time() - start_time) * 1000
+                record_timing(TIMING_ZUORA, duration_ms)
                 span.set_attribute("http.status_code", response.status_code)
                 span.set_attribute("duration_ms", duration_ms)
 
@@ -266,7 +280,9 @@ class ZuoraClient:
                     if use_cache and self.cache and method == "GET":
                         self.cache.set(method, endpoint, result, params, data)
 
-                    self.metrics.record_api_call(method, endpoint, duration_ms, True)
+                    self.metrics.record_api_call(
+                        method, endpoint_template, duration_ms, True
+                    )
                     return result
                 else:
                     error_data = response.json() if response.text else {}
@@ -279,21 +295,28 @@ class ZuoraClient:
                     }
 
                     span.set_attribute("error", True)
-                    self.metrics.record_api_call(method, endpoint, duration_ms, False)
+                    self.metrics.record_api_call(
+                        method, endpoint_template, duration_ms, False
+                    )
                     self.metrics.record_api_error(
-                        method, endpoint, f"http_{response.status_code}"
+                        method, endpoint_template, f"http_{response.status_code}"
                     )
 
                     return result
 
             except requests.RequestException as e:
                 duration_ms = (time.time() - start_time) * 1000
+                record_timing(TIMING_ZUORA, duration_ms)
                 span.set_attribute("error", True)
                 span.set_attribute("error.type", type(e).__name__)
                 span.record_exception(e)
 
-                self.metrics.record_api_call(method, endpoint, duration_ms, False)
-                self.metrics.record_api_error(method, endpoint, type(e).__name__)
+                self.metrics.record_api_call(
+                    method, endpoint_template, duration_ms, False
+                )
+                self.metrics.record_api_error(
+                    method, endpoint_template, type(e).__name__
+                )
 
                 return {"success": False, "error": str(e)}
 
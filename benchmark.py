@@ -7,6 +7,7 @@ import time
 import sys
 from agents.zuora_client import get_zuora_client
 from agents.cache import get_cache
+from agents.latency import get_latency_registry
 from rich.console import Console
 from rich.table import Table
 
@@ -76,6 +77,31 @@ def benchmark_operation(name: str, operation_func, iterations: int = 3):
         }
 
 
+def print_latency_percentiles():
+    """Print the in-process latency percentiles recorded during the run."""
+    console.print("\n[bold magenta]═══ Latency Percentiles ═══[/bold magenta]\n")
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Category", style="dim")
+    table.add_column("Name", width=40)
+    for column in ("Count", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)"):
+        table.add_column(column, justify="right")
+
+    for category, histograms in get_latency_registry().snapshot().items():
+        for name, summary in histograms.items():
+            table.add_row(
+                category,
+                name,
+                str(summary["count"]),
+                f"{summary['p50_ms']:.0f}",
+                f"{summary['p90_ms']:.0f}",
+                f"{summary['p99_ms']:.0f}",
+                f"{summary['max_ms']:.0f}",
+            )
+
+    console.print(table)
+
+
 def run_benchmarks():
     """Run comprehensive performance benchmarks."""
     console.print(
@@ -172,6 +198,8 @@ def run_benchmarks():
 
     console.print(stats_table)
 
+    print_latency_percentiles()
+
     console.print("\n[bold green]✓ Benchmark complete![/bold green]\n")
 
 
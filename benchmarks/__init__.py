@@ -0,0 +1,6 @@
+"""
+Offline microbenchmarks for hot paths that run on every request.
+
+Run a benchmark module directly, e.g.:
+    python -m benchmarks.markdown_benchmark
+"""
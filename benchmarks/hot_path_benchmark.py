@@ -0,0 +1,661 @@
+"""
+Microbenchmark suite for the pure-Python hot paths, with regression checks.
+
+Times payload validation and placeholder generation, markdown_to_html,
+fuzzy product matching, tier normalisation, bulk catalog ingestion,
+diffing and repricing,
+TTLCache get/set/invalidate and ChatRequest/ChatResponse handling (validated and trusted construction, dict
+and JSON bytes output) over several input sizes. Results can be
+written as JSON and compared against a stored baseline: the compare mode exits
+with status 1 when any benchmark's median is slower than the baseline by more
+than the threshold.
+
+Baselines are machine-specific; record one on the machine that runs the check.
+
+Usage:
+    python -m benchmarks.hot_path_benchmark
+    python -m benchmarks.hot_path_benchmark --output baseline.json
+    python -m benchmarks.hot_path_benchmark --compare baseline.json --threshold 15
+    python -m benchmarks.hot_path_benchmark --filter cache --quick
+"""
+
+import argparse
+import datetime
+import functools
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agents.bulk_pricing import reprice_charges
+from agents.cache import TTLCache
+from agents.catalog_diff import diff_catalog
+from agents.catalog_ingest import ingest_catalog, parse_catalog_spec
+from agents.html_formatter import markdown_to_html
+from agents.models import (
+    ChatRequest,
+    ChatResponse,
+    Citation,
+    ZuoraApiPayload,
+    chat_response_dict,
+    chat_response_json,
+    trusted_payloads,
+)
+from agents.payload_store import PayloadStore
+from agents.tools import _find_best_product_match, _normalize_tiers
+from agents.validation_schemas import generate_placeholder_payload, validate_payload
+from benchmarks.markdown_benchmark import build_answer
+from benchmarks.mock_zuora import build_catalog
+
+# (parameter label, zero-argument callable to time)
+Case = Tuple[str, Callable[[], Any]]
+
+DEFAULT_THRESHOLD_PCT = 10.0
+
+
+# ============ Inputs ============
+
+
+def _charge_payload(extra_fields: int) -> Dict[str, Any]:
+    """A complete usage charge payload padded with optional fields."""
+    payload: Dict[str, Any] = {
+        "Name": "API Calls",
+        "ProductRatePlanId": "@{ProductRatePlan[0].Id}",
+        "ChargeModel": "Tiered Pricing",
+        "ChargeType": "Usage",
+        "BillCycleType": "DefaultFromCustomer",
+        "TriggerEvent": "ContractEffective",
+        "UOM": "API_CALL",
+        "DefaultQuantity": 1,
+        "ProductRatePlanChargeTierData": {
+            "ProductRatePlanChargeTier": [
+                {"Currency": "USD", "StartingUnit": 1, "EndingUnit": 1000, "Price": 0.1}
+            ]
+        },
+    }
+    for i in range(extra_fields):
+        payload[f"CustomField{i}__c"] = f"value {i}"
+    return payload
+
+
+def _stored_payloads(count: int) -> List[Dict[str, Any]]:
+    """Payloads as held in agent state (dicts with type, id and placeholders)."""
+    payloads = []
+    for i in range(count):
+        payload = _charge_payload(5)
+        payload["Name"] = f"Charge {i}"
+        payloads.append(
+            {
+                "payload": payload,
+                "zuora_api_type": "charge_create",
+                "payload_id": f"{i:08x}",
+            }
+        )
+    return payloads
+
+
+def _build_response(payloads: List[Dict[str, Any]], answer: str) -> Dict[str, Any]:
+    """Response build as in invoke(): payload models, ChatResponse, model_dump()."""
+    response = ChatResponse(
+        conversation_id="benchmark",
+        answer=answer,
+        citations=[Citation(id="cite-1", title="Zuora Product Catalog Guide")],
+        zuora_api_payloads=[ZuoraApiPayload(**p) for p in payloads],
+    )
+    return response.model_dump()
+
+
+def _build_response_trusted(
+    payloads: List[Dict[str, Any]], answer: str
+) -> Dict[str, Any]:
+    """Response build on the trusted path: one batch validation of the payloads."""
+    response = ChatResponse(
+        conversation_id="benchmark",
+        answer=answer,
+        citations=[Citation(id="cite-1", title="Zuora Product Catalog Guide")],
+        zuora_api_payloads=trusted_payloads(payloads),
+    )
+    return chat_response_dict(response)
+
+
+def _response_json(payloads: List[Dict[str, Any]], answer: str) -> bytes:
+    """Validated build, model_dump() and json.dumps() as the runtime does for dicts."""
+    return json.dumps(_build_response(payloads, answer), ensure_ascii=False).encode()
+
+
+def _response_json_trusted(payloads: List[Dict[str, Any]], answer: str) -> bytes:
+    """Trusted build serialized straight to JSON bytes."""
+    response = ChatResponse(
+        conversation_id="benchmark",
+        answer=answer,
+        citations=[Citation(id="cite-1", title="Zuora Product Catalog Guide")],
+        zuora_api_payloads=trusted_payloads(payloads),
+    )
+    return chat_response_json(response)
+
+
+# ============ Benchmarks ============
+
+
+def validate_payload_cases() -> List[Case]:
+    return [
+        (
+            f"fields={fields}",
+            functools.partial(
+                validate_payload, "charge_create", _charge_payload(fields)
+            ),
+        )
+        for fields in (0, 50, 200)
+    ]
+
+
+def _mixed_payloads(count: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """(api type, payload) pairs across types, some complete and some not."""
+    templates: List[Tuple[str, Dict[str, Any]]] = [
+        ("charge_create", _charge_payload(5)),
+        (
+            "charge_create",
+            {
+                "name": "Seats",
+                "charge_model": "Per Unit Pricing",
+                "ChargeType": "Recurring",
+                "IsPrepaid": True,
+                "PrepaidOperationType": "topup",
+                "Taxable": "true",
+            },
+        ),
+        (
+            "product_create",
+            {"Name": "Analytics", "effective_start_date": "2025-01-01", "SKU": "AN"},
+        ),
+        ("rate_plan_create", {"Name": "Monthly", "ProductId": "@{Product[0].Id}"}),
+        (
+            "account",
+            {"name": "Acme", "currency": "USD", "billToContact": {"firstName": "A"}},
+        ),
+        ("subscription", {"accountKey": "A-1", "termType": "TERMED"}),
+    ]
+    return [templates[i % len(templates)] for i in range(count)]
+
+
+def _validate_all(payloads: List[Tuple[str, Dict[str, Any]]]) -> int:
+    return sum(not validate_payload(t, p)[0] for t, p in payloads)
+
+
+def validate_payload_batch_cases() -> List[Case]:
+    return [
+        (f"payloads={count}", functools.partial(_validate_all, _mixed_payloads(count)))
+        for count in (100, 1000, 5000)
+    ]
+
+
+def generate_placeholder_payload_cases() -> List[Case]:
+    cases = []
+    for missing_count in (2, 10, 40):
+        missing = [
+            (f"billToContact.field{i}" if i % 2 else f"Field{i}", f"Field {i}")
+            for i in range(missing_count)
+        ]
+        cases.append(
+            (
+                f"missing={missing_count}",
+                functools.partial(
+                    generate_placeholder_payload,
+                    "charge_create",
+                    _charge_payload(10),
+                    missing,
+                ),
+            )
+        )
+    return cases
+
+
+def markdown_to_html_cases() -> List[Case]:
+    return [
+        (
+            f"kb={size_kb}",
+            functools.partial(markdown_to_html, build_answer(size_kb * 1024)),
+        )
+        for size_kb in (1, 10, 50)
+    ]
+
+
+def find_best_product_match_cases() -> List[Case]:
+    # A typo, so every product is scored (no exact-match early exit)
+    return [
+        (
+            f"products={size}",
+            functools.partial(
+                _find_best_product_match,
+                build_catalog(size, rate_plans_per_product=0),
+                "Analitics Suite 8",
+                "name",
+            ),
+        )
+        for size in (20, 100, 500)
+    ]
+
+
+def normalize_tiers_cases() -> List[Case]:
+    cases = []
+    for count in (3, 10, 50):
+        tiers = [
+            {"units": (i + 1) * 1000, "price": 1.0 / (i + 1)} for i in range(count)
+        ]
+        tiers[-1] = {"price": 0.01}
+        cases.append((f"tiers={count}", functools.partial(_normalize_tiers, tiers)))
+    return cases
+
+
+def _catalog_spec(charges: int) -> str:
+    """JSON spec with 10 charges per rate plan and 5 rate plans per product."""
+    templates = [
+        {"charge_type": "Recurring", "price": 99.0, "billing_period": "Month"},
+        {"charge_type": "Usage", "charge_model": "Per Unit", "price": 0.01},
+        {
+            "charge_type": "Usage",
+            "charge_model": "Tiered",
+            "uom": "calls",
+            "tiers": [{"units": 1000, "price": 0.1}, {"price": 0.05}],
+        },
+    ]
+    products = []
+    for i in range(0, charges, 50):
+        rate_plans = []
+        for j in range(min(5, (charges - i + 9) // 10)):
+            count = min(10, charges - i - j * 10)
+            rate_plans.append(
+                {
+                    "name": f"Plan {j}",
+                    "charges": [
+                        {
+                            **templates[k % 3],
+                            "name": f"Charge {k}",
+                            "currencies": ["USD", "EUR"],
+                        }
+                        for k in range(count)
+                    ],
+                }
+            )
+        products.append({"name": f"Product {i // 50}", "rate_plans": rate_plans})
+    return json.dumps({"products": products})
+
+
+def _ingest(spec: str) -> int:
+    products, _ = parse_catalog_spec(spec)
+    return len(ingest_catalog(products, PayloadStore(), ["each", "APICalls"]).payloads)
+
+
+def catalog_ingest_cases() -> List[Case]:
+    return [
+        (f"charges={count}", functools.partial(_ingest, _catalog_spec(count)))
+        for count in (100, 1000, 5000)
+    ]
+
+
+class _CatalogClient:
+    """Answers get_product from a generated catalog, like a warm API cache."""
+
+    def __init__(self, products: List[Dict[str, Any]]):
+        self.by_key = {p["id"]: p for p in products}
+        self.by_key.update({p["sku"]: p for p in products})
+        self.charges = {
+            c["id"]: c
+            for p in products
+            for plan in p["productRatePlans"]
+            for c in plan["productRatePlanCharges"]
+        }
+
+    def get_product(self, key: str) -> Dict[str, Any]:
+        return {"success": True, "data": self.by_key[key]}
+
+    def get_charge(self, charge_id: str) -> Dict[str, Any]:
+        return {"success": True, "data": self.charges[charge_id]}
+
+
+def _desired_catalog(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Spec for a catalog: every field restated, every other flat fee repriced."""
+    spec = []
+    for i, product in enumerate(products):
+        rate_plans = []
+        for plan in product["productRatePlans"]:
+            charges = []
+            for charge in plan["productRatePlanCharges"]:
+                item = {"name": charge["name"], "billing_period": "Month"}
+                if charge["model"] == "FlatFee":
+                    item["price"] = charge["pricing"][0]["price"] + i % 2
+                    item["currencies"] = ["USD", "EUR"]
+                charges.append(item)
+            rate_plans.append(
+                {
+                    "name": plan["name"],
+                    "description": plan["description"],
+                    "charges": charges,
+                }
+            )
+        spec.append(
+            {"sku": product["sku"], "name": product["name"], "rate_plans": rate_plans}
+        )
+    return spec
+
+
+def _diff(products: List[Dict[str, Any]], client: _CatalogClient) -> int:
+    return len(diff_catalog(products, PayloadStore(), client, ["Each"]).payloads)
+
+
+def catalog_diff_cases() -> List[Case]:
+    cases = []
+    for size in (10, 100, 500):
+        catalog = build_catalog(size)
+        cases.append(
+            (
+                f"products={size}",
+                functools.partial(
+                    _diff, _desired_catalog(catalog), _CatalogClient(catalog)
+                ),
+            )
+        )
+    return cases
+
+
+def _reprice(client: _CatalogClient) -> int:
+    return len(
+        reprice_charges(
+            PayloadStore(), "SKU-00000", percent_change=5, client=client
+        ).payloads
+    )
+
+
+def bulk_pricing_cases() -> List[Case]:
+    cases = []
+    for size in (10, 100, 500):
+        catalog = build_catalog(size)
+        # One product holding every rate plan of the catalog (4 charges each)
+        product = dict(
+            catalog[0],
+            productRatePlans=[plan for p in catalog for plan in p["productRatePlans"]],
+        )
+        cases.append(
+            (
+                f"charges={4 * size}",
+                functools.partial(_reprice, _CatalogClient([product])),
+            )
+        )
+    return cases
+
+
+def _filled_cache(entries: int) -> Tuple[TTLCache, List[str]]:
+    cache = TTLCache(default_ttl_seconds=3600)
+    endpoints = [f"/v1/catalog/products/8a80{i:028x}" for i in range(entries)]
+    for endpoint in endpoints:
+        cache.set("GET", endpoint, {"success": True, "data": {"id": endpoint}})
+    return cache, endpoints
+
+
+def cache_get_cases() -> List[Case]:
+    cases = []
+    for entries in (100, 1000, 10000):
+        cache, endpoints = _filled_cache(entries)
+        keys = itertools.cycle(endpoints)
+        cases.append(
+            (
+                f"entries={entries}",
+                lambda cache=cache, keys=keys: cache.get("GET", next(keys)),
+            )
+        )
+    return cases
+
+
+def cache_set_cases() -> List[Case]:
+    cases = []
+    for entries in (100, 1000, 10000):
+        cache, endpoints = _filled_cache(entries)
+        keys = itertools.cycle(endpoints)
+        value = {"success": True, "data": {}}
+        cases.append(
+            (
+                f"entries={entries}",
+                lambda cache=cache, keys=keys, value=value: cache.set(
+                    "GET", next(keys), value
+                ),
+            )
+        )
+    return cases
+
+
+def cache_invalidate_cases() -> List[Case]:
+    """Invalidate one endpoint; the entry is re-added so the size stays constant."""
+    cases = []
+    for entries in (100, 1000, 10000):
+        cache, endpoints = _filled_cache(entries)
+        endpoint = endpoints[entries // 2]
+
+        def invalidate(cache=cache, endpoint=endpoint) -> None:
+            cache.invalidate("GET", endpoint)
+            cache.set("GET", endpoint, {"success": True})
+
+        cases.append((f"entries={entries}", invalidate))
+    return cases
+
+
+def chat_request_parse_cases() -> List[Case]:
+    cases = []
+    for count in (0, 10, 50):
+        request = {
+            "persona": "ProductManager",
+            "message": "Add a usage charge for API calls to the Pro plan",
+            "conversation_id": "benchmark",
+            "zuora_api_payloads": _stored_payloads(count),
+        }
+        cases.append(
+            (f"payloads={count}", lambda request=request: ChatRequest(**request))
+        )
+    return cases
+
+
+def _response_cases(build: Callable[..., Any]) -> List[Case]:
+    answer = markdown_to_html(build_answer(5 * 1024))
+    return [
+        (f"payloads={count}", functools.partial(build, _stored_payloads(count), answer))
+        for count in (0, 10, 50)
+    ]
+
+
+def chat_response_build_cases() -> List[Case]:
+    return _response_cases(_build_response)
+
+
+def chat_response_build_trusted_cases() -> List[Case]:
+    return _response_cases(_build_response_trusted)
+
+
+def chat_response_json_cases() -> List[Case]:
+    return _response_cases(_response_json)
+
+
+def chat_response_json_trusted_cases() -> List[Case]:
+    return _response_cases(_response_json_trusted)
+
+
+BENCHMARKS: Dict[str, Callable[[], List[Case]]] = {
+    "validate_payload": validate_payload_cases,
+    "validate_payload_batch": validate_payload_batch_cases,
+    "generate_placeholder_payload": generate_placeholder_payload_cases,
+    "markdown_to_html": markdown_to_html_cases,
+    "find_best_product_match": find_best_product_match_cases,
+    "normalize_tiers": normalize_tiers_cases,
+    "catalog_ingest": catalog_ingest_cases,
+    "catalog_diff": catalog_diff_cases,
+    "bulk_pricing": bulk_pricing_cases,
+    "cache_get": cache_get_cases,
+    "cache_set": cache_set_cases,
+    "cache_invalidate": cache_invalidate_cases,
+    "chat_request_parse": chat_request_parse_cases,
+    "chat_response_build": chat_response_build_cases,
+    "chat_response_build_trusted": chat_response_build_trusted_cases,
+    "chat_response_json": chat_response_json_cases,
+    "chat_response_json_trusted": chat_response_json_trusted_cases,
+}
+
+
+# ============ Measurement ============
+
+
+def measure(
+    func: Callable[[], Any], repeats: int = 7, min_time_s: float = 0.05
+) -> Dict[str, Any]:
+    """
+    Time func per call in microseconds.
+
+    The loop count is calibrated so each repeat runs for at least min_time_s.
+
+    Returns:
+        {"median_us", "min_us", "stdev_us", "loops", "repeats"}
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time_s:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time_s / elapsed) + 1))
+
+    per_call_us = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call_us.append((time.perf_counter() - start) / loops * 1_000_000)
+
+    return {
+        "median_us": round(statistics.median(per_call_us), 3),
+        "min_us": round(min(per_call_us), 3),
+        "stdev_us": round(statistics.stdev(per_call_us), 3) if repeats > 1 else 0.0,
+        "loops": loops,
+        "repeats": repeats,
+    }
+
+
+def run_benchmarks(
+    name_filter: Optional[str] = None, repeats: int = 7, min_time_s: float = 0.05
+) -> Dict[str, Any]:
+    """
+    Run every benchmark case (optionally only names containing name_filter).
+
+    Returns:
+        {"meta": {...}, "results": {"name[param]": measurement}}
+    """
+    results: Dict[str, Any] = {}
+    print(f"{'Benchmark':<48} {'median (us)':>12} {'min (us)':>10} {'loops':>8}")
+    for name, cases_func in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for label, func in cases_func():
+            key = f"{name}[{label}]"
+            results[key] = measure(func, repeats, min_time_s)
+            print(
+                f"{key:<48} {results[key]['median_us']:>12.3f} "
+                f"{results[key]['min_us']:>10.3f} {results[key]['loops']:>8}"
+            )
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "min_time_s": min_time_s,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold_pct: float = DEFAULT_THRESHOLD_PCT,
+) -> List[Dict[str, Any]]:
+    """
+    Compare medians against a baseline run.
+
+    Args:
+        current: Output of run_benchmarks()
+        baseline: Stored output of a previous run
+        threshold_pct: Slowdown above which a benchmark counts as a regression
+
+    Returns:
+        One row per benchmark present in both runs:
+        {"name", "baseline_us", "current_us", "change_pct", "regression"}
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median_us"):
+            continue
+        change_pct = (result["median_us"] / previous["median_us"] - 1) * 100
+        rows.append(
+            {
+                "name": name,
+                "baseline_us": previous["median_us"],
+                "current_us": result["median_us"],
+                "change_pct": round(change_pct, 1),
+                "regression": change_pct > threshold_pct,
+            }
+        )
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], threshold_pct: float) -> None:
+    """Print a baseline comparison table."""
+    print(f"\n{'Benchmark':<48} {'baseline':>10} {'current':>10} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<48} {row['baseline_us']:>10.3f} {row['current_us']:>10.3f} "
+            f"{row['change_pct']:>+7.1f}%{flag}"
+        )
+    regressions = sum(row["regression"] for row in rows)
+    print(
+        f"\n{regressions} of {len(rows)} benchmarks slower than baseline by more "
+        f"than {threshold_pct}%"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Seconds per repeat"
+    )
+    parser.add_argument("--quick", action="store_true", help="3 repeats of 10ms")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PCT,
+        help="Allowed slowdown in percent before --compare fails",
+    )
+    args = parser.parse_args()
+
+    repeats, min_time_s = (3, 0.01) if args.quick else (args.repeats, args.min_time)
+    current_results = run_benchmarks(args.filter, repeats, min_time_s)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current_results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline_results = json.load(f)
+        comparison = compare_results(current_results, baseline_results, args.threshold)
+        print_comparison(comparison, args.threshold)
+        if any(row["regression"] for row in comparison):
+            sys.exit(1)
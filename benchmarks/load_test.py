@@ -0,0 +1,421 @@
+"""
+Offline end-to-end load test for agentcore_app.invoke.
+
+Starts the mock Zuora server, points the Zuora client at it, gives every
+worker thread its own agents backed by the replay model, and replays the
+/chat conversation corpus concurrently through invoke(). Reports throughput,
+turn latency percentiles, Zuora calls per turn and cache hit rates, so a
+performance change can be measured without network access.
+
+Each worker has its own agent per persona, as each AgentCore session runs in
+its own runtime; the Zuora client, API cache and conversation store are shared
+as in production.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --concurrency 8 --iterations 20
+    python -m benchmarks.load_test --zuora-latency-ms 80 --model-latency-ms 800 --error-rate 0.02
+    python -m benchmarks.load_test --corpus recorded.json --json
+    python -m benchmarks.load_test --payload-session
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from strands.handlers.callback_handler import null_callback_handler
+
+import agentcore_app
+from agents.cache import get_cache
+from agents.latency import LatencyHistogram
+from agents.zuora_agent import create_agent
+from agents.zuora_client import get_zuora_client
+from agents.zuora_settings import fetch_environment_settings
+from benchmarks.load_test_corpus import CONVERSATIONS, replay_scripts
+from benchmarks.mock_zuora import MockZuoraServer
+from benchmarks.replay_model import ReplayModel
+
+ERROR_ANSWER_PREFIX = "<p>Error processing request"
+
+
+def configure_zuora_client(server: MockZuoraServer) -> None:
+    """
+    Point the global Zuora client at the mock server and empty the API cache.
+
+    Tenant settings are fetched from the mock here, once, rather than by the
+    first agents the workers create at the same time.
+    """
+    client = get_zuora_client()
+    client.base_url = server.url
+    client.client_id = client.client_secret = "load-test"
+    client._access_token = None
+    client._token_expires_at = 0
+    get_cache().clear()
+    fetch_environment_settings(force_refresh=True)
+
+
+@contextmanager
+def worker_agents(model: ReplayModel) -> Iterator[None]:
+    """Give each thread calling invoke() its own agent per persona."""
+    local = threading.local()
+    original = agentcore_app.get_agent_for_persona
+
+    def get_agent_for_persona(persona: str):
+        agents = local.__dict__.setdefault("agents", {})
+        if persona not in agents:
+            agent = create_agent(persona, model=model)
+            agent.callback_handler = null_callback_handler
+            agents[persona] = agent
+        return agents[persona]
+
+    agentcore_app.get_agent_for_persona = get_agent_for_persona
+    try:
+        yield
+    finally:
+        agentcore_app.get_agent_for_persona = original
+
+
+class LoadTestStats:
+    """Per-turn results collected from all workers."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.by_conversation: Dict[str, LatencyHistogram] = {}
+        self.zuora_calls: Counter = Counter()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.turns = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record_turn(
+        self,
+        conversation: str,
+        duration_ms: float,
+        request: Dict[str, Any],
+        response: Optional[Dict[str, Any]],
+    ) -> None:
+        zuora = (response or {}).get("timings", {}).get("components", {}).get("zuora")
+        failed = response is None or response.get("answer", "").startswith(
+            ERROR_ANSWER_PREFIX
+        )
+        self.latency.record(duration_ms)
+        with self._lock:
+            self.by_conversation.setdefault(conversation, LatencyHistogram()).record(
+                duration_ms
+            )
+            self.zuora_calls[zuora["count"] if zuora else 0] += 1
+            self.request_bytes += len(json.dumps(request, default=str))
+            self.response_bytes += len(json.dumps(response or {}, default=str))
+            self.turns += 1
+            self.errors += failed
+
+
+def run_conversation(
+    conversation: Dict[str, Any],
+    stats: LoadTestStats,
+    seed_payloads: Optional[List[Dict[str, Any]]] = None,
+    payload_session: bool = False,
+) -> None:
+    """
+    Send a conversation's turns in order, carrying payloads between turns.
+
+    Args:
+        conversation: Conversation to replay
+        stats: Collected results
+        seed_payloads: Payloads sent with the first turn
+        payload_session: Keep payloads on the server and send only the version
+                         token (the replayed client never edits payloads itself)
+    """
+    conversation_id = str(uuid.uuid4())
+    payloads: List[Dict[str, Any]] = list(seed_payloads or [])
+    version: Optional[str] = None
+    for turn in conversation["turns"]:
+        payload = {
+            "persona": conversation["persona"],
+            "message": turn["message"],
+            "conversation_id": conversation_id,
+            "zuora_api_payloads": [] if version else payloads,
+            "timings": True,
+        }
+        if payload_session:
+            payload["payload_session"] = True
+            payload["payloads_version"] = version
+        start = time.perf_counter()
+        try:
+            response = agentcore_app.invoke(payload)
+        except Exception:
+            response = None
+        stats.record_turn(
+            conversation["name"],
+            (time.perf_counter() - start) * 1000,
+            payload,
+            response,
+        )
+        if response is None:
+            return
+        if payload_session:
+            version = response.get("payloads_version")
+        else:
+            payloads = response.get("zuora_api_payloads", [])
+
+
+def build_seed_payloads(count: int) -> List[Dict[str, Any]]:
+    """Charge create payloads standing in for a large seed batch."""
+    return [
+        {
+            "payload": {
+                "Name": f"Seed Charge {i}",
+                "ProductRatePlanId": "@{ProductRatePlan[0].Id}",
+                "ChargeModel": "Flat Fee Pricing",
+                "ChargeType": "Recurring",
+                "BillingPeriod": "Month",
+                "TriggerEvent": "ContractEffective",
+                "ProductRatePlanChargeTierData": {
+                    "ProductRatePlanChargeTier": [
+                        {"Currency": "USD", "Price": float(i % 100)}
+                    ]
+                },
+            },
+            "zuora_api_type": "charge_create",
+            "payload_id": f"seed{i:04d}",
+        }
+        for i in range(count)
+    ]
+
+
+def _cache_counts() -> Dict[str, int]:
+    cache_stats = get_cache().stats()
+    return {"hits": cache_stats["hits"], "misses": cache_stats["misses"]}
+
+
+def run_load_test(
+    conversations: Optional[List[Dict[str, Any]]] = None,
+    concurrency: int = 4,
+    iterations: int = 5,
+    catalog_size: int = 100,
+    zuora_latency_ms: float = 20.0,
+    zuora_jitter_ms: float = 5.0,
+    model_latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    seed: Optional[int] = None,
+    seed_payloads: int = 0,
+    payload_session: bool = False,
+) -> Dict[str, Any]:
+    """
+    Replay the conversation corpus concurrently and summarise the results.
+
+    Args:
+        conversations: Conversations to replay (default: the built-in corpus)
+        concurrency: Worker threads calling invoke()
+        iterations: Times each conversation is replayed
+        catalog_size: Products in the mock catalog
+        zuora_latency_ms: Mean mock Zuora response time
+        zuora_jitter_ms: Maximum deviation from zuora_latency_ms
+        model_latency_ms: Simulated model latency per model call
+        error_rate: Fraction of Zuora API requests failing with HTTP 503
+        seed: Random seed for the mock server
+        seed_payloads: Charge payloads every conversation starts with
+        payload_session: Use server-side payload sessions instead of resending
+                         all payloads every turn
+
+    Returns:
+        Throughput, latency percentiles, Zuora calls per turn and cache stats
+    """
+    conversations = conversations or CONVERSATIONS
+    personas = sorted({c["persona"] for c in conversations})
+    model = ReplayModel(replay_scripts(conversations), latency_ms=model_latency_ms)
+    server = MockZuoraServer(
+        catalog_size=catalog_size,
+        latency_ms=zuora_latency_ms,
+        jitter_ms=zuora_jitter_ms,
+        error_rate=error_rate,
+        seed=seed,
+    ).start()
+
+    stats = LoadTestStats()
+    seed_payload_list = build_seed_payloads(seed_payloads)
+    tasks: queue.SimpleQueue = queue.SimpleQueue()
+    for _ in range(iterations):
+        for conversation in conversations:
+            tasks.put(conversation)
+    ready = threading.Barrier(concurrency + 1)
+
+    def worker() -> None:
+        # Agent creation is not measured
+        for persona in personas:
+            agentcore_app.get_agent_for_persona(persona)
+        ready.wait()
+        while True:
+            try:
+                conversation = tasks.get_nowait()
+            except queue.Empty:
+                return
+            run_conversation(conversation, stats, seed_payload_list, payload_session)
+
+    try:
+        configure_zuora_client(server)
+        with worker_agents(model):
+            threads = [
+                threading.Thread(target=worker, name=f"load-test-{i}")
+                for i in range(concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            ready.wait()
+            server.reset_counts()
+            cache_before = _cache_counts()
+            start = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            duration_s = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    cache_after = _cache_counts()
+    hits = cache_after["hits"] - cache_before["hits"]
+    misses = cache_after["misses"] - cache_before["misses"]
+    turns = max(stats.turns, 1)
+    zuora_calls = sum(count * n for count, n in stats.zuora_calls.items())
+    return {
+        "config": {
+            "concurrency": concurrency,
+            "iterations": iterations,
+            "conversations": len(conversations),
+            "catalog_size": catalog_size,
+            "zuora_latency_ms": zuora_latency_ms,
+            "model_latency_ms": model_latency_ms,
+            "error_rate": error_rate,
+            "seed_payloads": seed_payloads,
+            "payload_session": payload_session,
+        },
+        "duration_s": round(duration_s, 2),
+        "turns": stats.turns,
+        "errors": stats.errors,
+        "throughput_turns_per_s": round(stats.turns / duration_s, 2),
+        "latency": stats.latency.snapshot(),
+        "bytes_per_turn": {
+            "request": round(stats.request_bytes / turns),
+            "response": round(stats.response_bytes / turns),
+        },
+        "latency_by_conversation": {
+            name: histogram.snapshot()
+            for name, histogram in sorted(stats.by_conversation.items())
+        },
+        "zuora": {
+            "calls_per_turn": round(zuora_calls / turns, 2),
+            "max_calls_per_turn": max(stats.zuora_calls, default=0),
+            "calls_per_turn_histogram": dict(sorted(stats.zuora_calls.items())),
+            "server_requests": dict(server.calls.most_common()),
+            "errors_injected": server.errors_injected,
+        },
+        "cache": {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (
+                round(hits / (hits + misses) * 100, 2) if hits + misses else 0.0
+            ),
+        },
+    }
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    """Print a load test summary."""
+    config = results["config"]
+    latency = results["latency"]
+    print("=" * 70)
+    print(
+        f"Load test: {config['conversations']} conversations x "
+        f"{config['iterations']} iterations, concurrency {config['concurrency']}"
+    )
+    print("=" * 70)
+    print(
+        f"Turns: {results['turns']} in {results['duration_s']}s "
+        f"({results['throughput_turns_per_s']} turns/s), errors: {results['errors']}"
+    )
+    print(
+        f"Latency (ms): p50 {latency['p50_ms']}  p90 {latency['p90_ms']}  "
+        f"p99 {latency['p99_ms']}  max {latency['max_ms']}"
+    )
+    print(
+        f"Bytes per turn: request {results['bytes_per_turn']['request']}  "
+        f"response {results['bytes_per_turn']['response']}"
+    )
+    print(f"\n{'Conversation':<32} {'turns':>6} {'p50':>9} {'p90':>9} {'p99':>9}")
+    for name, summary in results["latency_by_conversation"].items():
+        print(
+            f"{name:<32} {summary['count']:>6} {summary['p50_ms']:>9.1f} "
+            f"{summary['p90_ms']:>9.1f} {summary['p99_ms']:>9.1f}"
+        )
+
+    zuora = results["zuora"]
+    print(
+        f"\nZuora calls per turn: {zuora['calls_per_turn']} "
+        f"(max {zuora['max_calls_per_turn']}), injected errors: {zuora['errors_injected']}"
+    )
+    for endpoint, count in zuora["server_requests"].items():
+        print(f"  {endpoint:<58} {count:>6}")
+
+    cache = results["cache"]
+    print(
+        f"\nAPI cache: {cache['hits']} hits / {cache['misses']} misses "
+        f"({cache['hit_rate']}% hit rate)"
+    )
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--catalog-size", type=int, default=100)
+    parser.add_argument("--zuora-latency-ms", type=float, default=20.0)
+    parser.add_argument("--zuora-jitter-ms", type=float, default=5.0)
+    parser.add_argument("--model-latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--seed-payloads",
+        type=int,
+        default=0,
+        help="Charge payloads every conversation starts with",
+    )
+    parser.add_argument(
+        "--payload-session",
+        action="store_true",
+        help="Keep payloads on the server instead of resending them every turn",
+    )
+    parser.add_argument(
+        "--corpus", help="JSON file of conversations (default: built-in corpus)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    corpus = None
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = json.load(f)
+
+    load_test_results = run_load_test(
+        conversations=corpus,
+        concurrency=args.concurrency,
+        iterations=args.iterations,
+        catalog_size=args.catalog_size,
+        zuora_latency_ms=args.zuora_latency_ms,
+        zuora_jitter_ms=args.zuora_jitter_ms,
+        model_latency_ms=args.model_latency_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        seed_payloads=args.seed_payloads,
+        payload_session=args.payload_session,
+    )
+    if args.json:
+        print(json.dumps(load_test_results, indent=2))
+    else:
+        print_report(load_test_results)
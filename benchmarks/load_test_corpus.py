@@ -0,0 +1,266 @@
+"""
+/chat conversations replayed by the load test.
+
+Each conversation is a list of turns sent in order with the same
+conversation_id; each turn holds the user message and the recorded model
+steps (see benchmarks/replay_model.py) that answer it. Product, rate plan and
+charge IDs refer to the mock catalog in benchmarks/mock_zuora.py.
+"""
+
+from typing import Any, Dict, List
+
+from benchmarks.mock_zuora import charge_id, product_id, product_name
+
+CATALOG_ANSWER = """Here are the most recently updated products in your catalog:
+
+| Product | SKU | Effective |
+|---------|-----|-----------|
+| {first} | SKU-00000 | 2024-01-01 to 2034-01-01 |
+| {second} | SKU-00001 | 2024-01-01 to 2034-01-01 |
+
+Would you like to see the rate plans of one of these products?"""
+
+CONVERSATIONS: List[Dict[str, Any]] = [
+    {
+        "name": "browse_catalog",
+        "persona": "ProductManager",
+        "turns": [
+            {
+                "message": "Show me the products in our catalog",
+                "script": [
+                    {"tool_calls": [{"name": "list_zuora_products", "input": {}}]},
+                    {
+                        "text": CATALOG_ANSWER.format(
+                            first=product_name(0), second=product_name(1)
+                        )
+                    },
+                ],
+            }
+        ],
+    },
+    {
+        "name": "lookup_and_reprice",
+        "persona": "ProductManager",
+        "turns": [
+            {
+                "message": f"What rate plans does {product_name(1)} have?",
+                "script": [
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "get_zuora_product",
+                                "input": {"identifier": product_name(1)},
+                            }
+                        ]
+                    },
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "get_zuora_rate_plan_details",
+                                "input": {"product_id": product_id(1)},
+                            }
+                        ]
+                    },
+                    {
+                        "text": f"**{product_name(1)}** has two rate plans:\n\n"
+                        "1. **Standard** - Subscription Fee (USD 11.00 / month) "
+                        "and tiered API Calls usage\n"
+                        "2. **Professional** - Subscription Fee (USD 21.00 / month) "
+                        "and tiered API Calls usage\n\n"
+                        "Would you like to change any of these prices?"
+                    },
+                ],
+            },
+            {
+                "message": "Raise the Standard subscription fee to 29 USD",
+                "script": [
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "update_zuora_charge_price",
+                                "input": {
+                                    "charge_id": charge_id(1, 0, 0),
+                                    "new_price": 29.0,
+                                    "currency": "USD",
+                                },
+                            }
+                        ]
+                    },
+                    {
+                        "text": "I've prepared a payload updating the **Subscription Fee** "
+                        "of the Standard plan to `USD 29.00`. The change only affects "
+                        "new subscriptions."
+                    },
+                ],
+            },
+        ],
+    },
+    {
+        "name": "create_product",
+        "persona": "ProductManager",
+        "turns": [
+            {
+                "message": "Create a product called Analytics Pro with SKU ANALYTICS-PRO, "
+                "a Pro Monthly rate plan and a 99 USD monthly platform fee",
+                "script": [
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "create_product",
+                                "input": {
+                                    "name": "Analytics Pro",
+                                    "sku": "ANALYTICS-PRO",
+                                    "effective_start_date": "2025-01-01",
+                                },
+                            }
+                        ]
+                    },
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "create_rate_plan",
+                                "input": {"name": "Pro Monthly", "product_index": 0},
+                            }
+                        ]
+                    },
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "create_charge",
+                                "input": {
+                                    "name": "Platform Fee",
+                                    "rate_plan_index": 0,
+                                    "charge_type": "Recurring",
+                                    "charge_model": "Flat Fee Pricing",
+                                    "price": 99.0,
+                                    "currency": "USD",
+                                    "billing_period": "Month",
+                                },
+                            }
+                        ]
+                    },
+                    {
+                        "text": "I've created payloads for:\n\n"
+                        "- **Product:** Analytics Pro (`ANALYTICS-PRO`)\n"
+                        "- **Rate plan:** Pro Monthly\n"
+                        "- **Charge:** Platform Fee, flat fee of USD 99.00 billed "
+                        "monthly in advance\n\n"
+                        "Review the payloads below before executing them."
+                    },
+                ],
+            },
+            {
+                "message": "Add the description 'Self-service analytics' to Analytics Pro",
+                "script": [
+                    {"tool_calls": [{"name": "get_payloads", "input": {}}]},
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "update_payload",
+                                "input": {
+                                    "api_type": "product_create",
+                                    "field_path": "Description",
+                                    "new_value": "Self-service analytics",
+                                    "payload_name": "Analytics Pro",
+                                },
+                            }
+                        ]
+                    },
+                    {
+                        "text": "Done - the Analytics Pro product payload now has the "
+                        "description *Self-service analytics*."
+                    },
+                ],
+            },
+        ],
+    },
+    {
+        "name": "fuzzy_search",
+        "persona": "ProductManager",
+        "turns": [
+            {
+                "message": "Find the product called Analitics Suite 8",
+                "script": [
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "get_zuora_product",
+                                "input": {"identifier": "Analitics Suite 8"},
+                            }
+                        ]
+                    },
+                    {
+                        "text": f"The closest match is **{product_name(8)}** "
+                        f"(`{product_id(8)}`). Is this the product you meant?"
+                    },
+                ],
+            }
+        ],
+    },
+    {
+        "name": "prepaid_notification_advice",
+        "persona": "BillingArchitect",
+        "turns": [
+            {
+                "message": "How do I notify customers when their prepaid balance is low?",
+                "script": [
+                    {
+                        "tool_calls": [
+                            {
+                                "name": "get_zuora_documentation",
+                                "input": {"topic": "notification"},
+                            },
+                            {
+                                "name": "generate_notification_rule",
+                                "input": {
+                                    "rule_name": "Prepaid Balance Low",
+                                    "event_type": "PrepaidBalanceLow",
+                                    "description": "Alert customers when their "
+                                    "prepaid balance drops below 20%",
+                                    "channel_type": "Email",
+                                },
+                            },
+                        ]
+                    },
+                    {
+                        "text": "## Low balance notifications\n\n"
+                        "1. Enable the **PrepaidBalanceLow** event in *Settings > "
+                        "Notifications*.\n"
+                        "2. Create the email notification rule shown above.\n"
+                        "3. Set the threshold on the prepaid charge's `Fund` "
+                        "configuration."
+                    },
+                ],
+            }
+        ],
+    },
+    {
+        "name": "capabilities",
+        "persona": "ProductManager",
+        "turns": [
+            {
+                "message": "What can you help me with?",
+                "script": [
+                    {
+                        "text": "I can help you:\n\n"
+                        "- Browse and search the product catalog\n"
+                        "- Create products, rate plans and charges\n"
+                        "- Update prices and expire products\n\n"
+                        "What would you like to do?"
+                    }
+                ],
+            }
+        ],
+    },
+]
+
+
+def replay_scripts(
+    conversations: List[Dict[str, Any]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Scripts for the ReplayModel, keyed by each turn's user message."""
+    return {
+        turn["message"]: turn["script"]
+        for conversation in conversations
+        for turn in conversation["turns"]
+    }
@@ -0,0 +1,130 @@
+"""
+Microbenchmark for markdown_to_html on realistic agent answers (5-50 KB).
+
+Compares the single-pass converter against the previous multi-pass pipeline
+(one whole-text regex or split/join pass per rule) and checks that both
+produce identical HTML.
+
+Usage:
+    python -m benchmarks.markdown_benchmark
+    python -m benchmarks.markdown_benchmark --iterations 50
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from agents.html_formatter import (
+    _convert_line_breaks,
+    _convert_markdown_multipass,
+    _extract_code_blocks,
+    _extract_inline_code,
+    _restore_code_blocks,
+    _restore_inline_code,
+    markdown_to_html,
+)
+
+ANSWER_SECTION = """## Rate Plan: {name}
+
+I've prepared the **{name}** rate plan with *monthly* billing. The charge uses
+the `Tiered` charge model and bills in `USD`.
+
+| Field | Value |
+|-------|-------|
+| Name | {name} |
+| Charge Model | Tiered Pricing |
+| Billing Period | Month |
+| UOM | `API_CALL` |
+
+**Pricing tiers:**
+
+1. 0 - 1,000 units at $0.10 per unit
+2. 1,001 - 10,000 units at $0.08 per unit
+3. 10,001+ units at $0.05 per unit
+
+- Effective start date: 2025-01-01
+- Bill cycle: *Default From Customer*
+- Trigger event: `ContractEffective`
+
+```json
+{{
+  "Name": "{name}",
+  "ChargeModel": "Tiered Pricing",
+  "BillingPeriod": "Month",
+  "ProductRatePlanChargeTierData": {{
+    "ProductRatePlanChargeTier": [
+      {{"StartingUnit": 0, "EndingUnit": 1000, "Price": 0.10}}
+    ]
+  }}
+}}
+```
+
+- [x] Rate plan payload created
+- [ ] Review pricing tiers
+
+---
+
+"""
+
+
+def build_answer(target_bytes: int) -> str:
+    """Build a realistic agent answer of roughly target_bytes."""
+    sections: List[str] = []
+    size = 0
+    index = 0
+    while size < target_bytes:
+        section = ANSWER_SECTION.format(name=f"Usage Plan {index}")
+        sections.append(section)
+        size += len(section)
+        index += 1
+    return "".join(sections)
+
+
+def multipass_markdown_to_html(text: str) -> str:
+    """The previous pipeline: one whole-text pass per rule."""
+    text, code_blocks = _extract_code_blocks(text)
+    text, inline_codes = _extract_inline_code(text)
+    text = _convert_markdown_multipass(text)
+    text = _restore_inline_code(text, inline_codes)
+    text = _restore_code_blocks(text, code_blocks)
+    return _convert_line_breaks(text)
+
+
+def time_call(func: Callable[[str], str], text: str, iterations: int) -> List[float]:
+    """Time func(text) over several iterations, returning milliseconds."""
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(text)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run_benchmarks(iterations: int = 30) -> None:
+    """Run the markdown conversion benchmark over several answer sizes."""
+    print("=" * 72)
+    print("markdown_to_html microbenchmark")
+    print("=" * 72)
+    print(
+        f"{'Size':>8} {'Multi-pass (ms)':>17} {'Single-pass (ms)':>18} {'Speedup':>9}  Identical"
+    )
+
+    for size_kb in (5, 10, 25, 50):
+        text = build_answer(size_kb * 1024)
+        identical = markdown_to_html(text) == multipass_markdown_to_html(text)
+
+        old = statistics.median(time_call(multipass_markdown_to_html, text, iterations))
+        new = statistics.median(time_call(markdown_to_html, text, iterations))
+        print(
+            f"{size_kb:>6}KB {old:>17.3f} {new:>18.3f} {old / new:>8.2f}x  {identical}"
+        )
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+    run_benchmarks(args.iterations)
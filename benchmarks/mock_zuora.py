@@ -0,0 +1,388 @@
+"""
+Local mock of the Zuora REST endpoints used by ZuoraClient.
+
+Serves OAuth, the v1 catalog (products, rate plans, charges), object updates
+and the settings batch endpoint from a generated catalog, with configurable
+latency and error rate. Used by the load test to exercise the client, cache
+and tools without network access.
+
+Usage:
+    server = MockZuoraServer(catalog_size=200, latency_ms=40, error_rate=0.01)
+    server.start()
+    ...  # point ZuoraClient.base_url at server.url
+    server.stop()
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from agents.observability import normalize_endpoint
+
+PRODUCT_FAMILIES = [
+    "Analytics Suite",
+    "Cloud Storage",
+    "API Gateway",
+    "Support Plan",
+    "Data Pipeline",
+    "Video Streaming",
+    "Identity Manager",
+    "Edge Compute",
+]
+
+_ID_KINDS = {"product": 1, "rate_plan": 2, "charge": 3, "tier": 4}
+
+
+def zuora_id(kind: str, *indexes: int) -> str:
+    """Deterministic 32-character Zuora-style ID for a catalog object."""
+    number = 0
+    for index in indexes:
+        number = number * 1000 + index
+    return f"8a80{_ID_KINDS[kind]:04x}{number:024x}"
+
+
+def product_name(index: int) -> str:
+    """Name of the index-th mock product."""
+    return f"{PRODUCT_FAMILIES[index % len(PRODUCT_FAMILIES)]} {index}"
+
+
+def product_id(index: int) -> str:
+    return zuora_id("product", index)
+
+
+def rate_plan_id(product_index: int, plan_index: int = 0) -> str:
+    return zuora_id("rate_plan", product_index, plan_index)
+
+
+def charge_id(product_index: int, plan_index: int = 0, charge_index: int = 0) -> str:
+    return zuora_id("charge", product_index, plan_index, charge_index)
+
+
+def _charge(product_index: int, plan_index: int, charge_index: int) -> Dict[str, Any]:
+    """A flat fee (first) or tiered usage charge."""
+    cid = charge_id(product_index, plan_index, charge_index)
+    if charge_index == 0:
+        pricing = [
+            {
+                "id": zuora_id(
+                    "tier", product_index, plan_index, charge_index * 10 + number
+                ),
+                "tier": 1,
+                "currency": currency,
+                "price": float(10 * (plan_index + 1) + product_index % 10),
+            }
+            for number, currency in enumerate(("USD", "EUR"))
+        ]
+        return {
+            "id": cid,
+            "name": "Subscription Fee",
+            "type": "Recurring",
+            "model": "FlatFee",
+            "billingPeriod": "Month",
+            "billingTiming": "IN_ADVANCE",
+            "billingDay": "DefaultFromCustomer",
+            "triggerEvent": "ContractEffective",
+            "pricing": pricing,
+        }
+    pricing = [
+        {
+            "id": zuora_id("tier", product_index, plan_index, charge_index * 10 + tier),
+            "tier": tier,
+            "currency": "USD",
+            "startingUnit": start,
+            "endingUnit": end,
+            "price": price,
+        }
+        for tier, (start, end, price) in enumerate(
+            [(0, 1000, 0.1), (1001, 10000, 0.08), (10001, None, 0.05)], 1
+        )
+    ]
+    return {
+        "id": cid,
+        "name": "API Calls",
+        "type": "Usage",
+        "model": "Tiered",
+        "billingPeriod": "Month",
+        "billingTiming": "IN_ARREARS",
+        "billingDay": "DefaultFromCustomer",
+        "triggerEvent": "ContractEffective",
+        "uom": "API_CALL",
+        "pricing": pricing,
+    }
+
+
+def build_catalog(
+    size: int, rate_plans_per_product: int = 2, charges_per_plan: int = 2
+) -> List[Dict[str, Any]]:
+    """Products shaped like GET /v1/catalog/products/{key} responses."""
+    products = []
+    for index in range(size):
+        plans = [
+            {
+                "id": rate_plan_id(index, plan),
+                "name": ["Standard", "Professional", "Enterprise"][plan % 3],
+                "description": f"Plan {plan + 1} of {product_name(index)}",
+                "effectiveStartDate": "2024-01-01",
+                "effectiveEndDate": "2034-01-01",
+                "productRatePlanCharges": [
+                    _charge(index, plan, charge) for charge in range(charges_per_plan)
+                ],
+            }
+            for plan in range(rate_plans_per_product)
+        ]
+        products.append(
+            {
+                "id": product_id(index),
+                "name": product_name(index),
+                "sku": f"SKU-{index:05d}",
+                "description": f"Mock product {index}",
+                "category": "Base Products",
+                "effectiveStartDate": "2024-01-01",
+                "effectiveEndDate": "2034-01-01",
+                "productRatePlans": plans,
+            }
+        )
+    return products
+
+
+# Bodies for the settings batch request (ZuoraClient.get_settings_batch)
+SETTINGS = {
+    "charge-models": {
+        "chargeModels": [
+            {"name": name}
+            for name in [
+                "Flat Fee Pricing",
+                "Per Unit Pricing",
+                "Tiered Pricing",
+                "Volume Pricing",
+                "Overage Pricing",
+            ]
+        ]
+    },
+    "billing-periods": {
+        "billingPeriods": [
+            {"name": name} for name in ["Month", "Quarter", "Annual", "Semi-Annual"]
+        ]
+    },
+    "billing-cycle-types": {
+        "billingCycleTypes": [
+            {"name": name} for name in ["DefaultFromCustomer", "SpecificDayofMonth"]
+        ]
+    },
+    "currencies": {
+        "currencies": [
+            {"currencyCode": code, "active": True} for code in ["USD", "EUR", "GBP"]
+        ]
+    },
+    "units-of-measure": {
+        "unitsOfMeasure": [
+            {"name": name, "active": True} for name in ["Each", "API_CALL", "GB"]
+        ]
+    },
+    "billing-rules": {"billingPeriodStartDay": "SubscriptionStartDay"},
+    "subscription-settings": {"defaultTermType": "TERMED"},
+}
+
+
+class MockZuoraServer:
+    """
+    Threaded HTTP server answering Zuora API requests from a generated catalog.
+
+    Args:
+        catalog_size: Number of products in the catalog
+        latency_ms: Mean delay added to every response
+        jitter_ms: Maximum random deviation from latency_ms
+        error_rate: Fraction of API requests (not OAuth) answered with error_status
+        error_status: HTTP status for injected errors
+        port: Port to listen on (0 = any free port)
+        seed: Random seed for jitter and injected errors
+    """
+
+    def __init__(
+        self,
+        catalog_size: int = 100,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.products = build_catalog(catalog_size)
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._rate_plans: Dict[str, Dict[str, Any]] = {}
+        self._charges: Dict[str, Dict[str, Any]] = {}
+        for product in self.products:
+            self._by_key[product["id"]] = self._by_key[product["sku"]] = product
+            for plan in product["productRatePlans"]:
+                self._rate_plans[plan["id"]] = plan
+                for charge in plan["productRatePlanCharges"]:
+                    self._charges[charge["id"]] = charge
+
+        self.calls: Counter = Counter()
+        self.errors_injected = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockZuoraServer":
+        """Serve requests in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-zuora", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.errors_injected = 0
+
+    def total_calls(self, include_oauth: bool = False) -> int:
+        """Requests served, optionally including token requests."""
+        with self._lock:
+            return sum(
+                count
+                for endpoint, count in self.calls.items()
+                if include_oauth or not endpoint.endswith("/oauth/token")
+            )
+
+    # ---- request handling (called from server threads) ----
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, List[str]], body: Any
+    ) -> Tuple[int, Any]:
+        """Status and JSON body for a request."""
+        with self._lock:
+            self.calls[f"{method} {normalize_endpoint(path)}"] += 1
+            inject_error = (
+                path != "/oauth/token" and self._random.random() < self.error_rate
+            )
+            if inject_error:
+                self.errors_injected += 1
+            delay_ms = self.latency_ms + self._random.uniform(
+                -self.jitter_ms, self.jitter_ms
+            )
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        if inject_error:
+            return self.error_status, {"message": "Injected mock error"}
+        return self._route(method, path, query, body)
+
+    def _route(
+        self, method: str, path: str, query: Dict[str, List[str]], body: Any
+    ) -> Tuple[int, Any]:
+        if method == "POST" and path == "/oauth/token":
+            return 200, {"access_token": "mock-token", "expires_in": 3600}
+
+        if method == "GET" and path == "/v1/catalog/products":
+            page_size = int(query.get("pageSize", ["20"])[0])
+            summaries = [
+                {k: v for k, v in p.items() if k != "productRatePlans"}
+                for p in self.products[:page_size]
+            ]
+            return 200, {"products": summaries, "success": True}
+
+        if method == "POST" and path == "/v1/catalog/query/products":
+            name = (body or {}).get("name")
+            matches = [p for p in self.products if name is None or p["name"] == name]
+            return 200, {"products": matches, "success": True}
+
+        match = re.fullmatch(r"/v1/catalog/products/([^/]+)", path)
+        if method == "GET" and match:
+            return self._found(self._by_key.get(match.group(1)), "Product")
+
+        match = re.fullmatch(r"/v1/catalog/product-rate-plans/([^/]+)", path)
+        if method == "GET" and match:
+            return self._found(self._rate_plans.get(match.group(1)), "Rate plan")
+
+        match = re.fullmatch(r"/v1/catalog/product-rate-plan-charges/([^/]+)", path)
+        if method == "GET" and match:
+            return self._found(self._charges.get(match.group(1)), "Charge")
+
+        match = re.fullmatch(r"/v1/object/[a-z-]+/([^/]+)", path)
+        if method == "PUT" and match:
+            return 200, {"Id": match.group(1), "Success": True}
+
+        if method == "POST" and path == "/settings/batch-requests":
+            responses = []
+            for request in (body or {}).get("requests", []):
+                key = request.get("url", "").lstrip("/")
+                responses.append(
+                    {
+                        "id": request.get("id"),
+                        "url": request.get("url"),
+                        "response": {"status": "200 OK", "body": SETTINGS.get(key, {})},
+                    }
+                )
+            return 200, {"responses": responses}
+
+        return 404, {"message": f"No mock for {method} {path}"}
+
+    @staticmethod
+    def _found(item: Optional[Dict[str, Any]], label: str) -> Tuple[int, Any]:
+        if item is None:
+            return 404, {"message": f"{label} not found"}
+        return 200, item
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so the client's connection pool is exercised as in production
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        body: Any = None
+        if raw:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                body = json.loads(raw)
+            else:
+                body = parse_qs(raw.decode())
+
+        status, data = self.server.mock.handle(  # type: ignore[attr-defined]
+            method, parsed.path, parse_qs(parsed.query), body
+        )
+        encoded = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Silence per-request stderr logging
+        pass
@@ -0,0 +1,168 @@
+"""
+Scripted stand-in for BedrockModel that replays recorded tool-call sequences.
+
+A script is the list of assistant steps for one user message: each step calls
+one or more tools and/or answers with text. The model is stateless: it finds
+the current turn's user message in the conversation it is given and replays
+the step matching the number of assistant messages since then, so one
+instance can serve concurrent agents.
+
+Script format:
+    [
+        {"tool_calls": [{"name": "get_zuora_product", "input": {"identifier": "Cloud Storage 1"}}]},
+        {"text": "Here is the product..."},
+    ]
+
+script_from_messages() turns a recorded conversation (e.g. one loaded from
+the conversation store) into scripts.
+"""
+
+import asyncio
+import json
+import random
+import uuid
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from strands.models import Model
+
+from agents.conversation import estimate_tokens, is_turn_start
+
+Script = List[Dict[str, Any]]
+
+DEFAULT_ANSWER = "I don't have a recorded answer for that request."
+
+
+def _prompt_and_step(messages: List[Dict[str, Any]]) -> Tuple[str, int]:
+    """Text of the current turn's user message and the assistant step to replay."""
+    step = 0
+    for message in reversed(messages):
+        if is_turn_start(message):
+            text = "".join(c.get("text", "") for c in message.get("content", []))
+            return text, step
+        if message.get("role") == "assistant":
+            step += 1
+    return "", step
+
+
+def script_from_messages(messages: List[Dict[str, Any]]) -> Dict[str, Script]:
+    """
+    Extract replay scripts from a recorded conversation.
+
+    Args:
+        messages: Strands messages (user prompts, assistant tool calls and answers)
+
+    Returns:
+        {user prompt text: [step, ...]} for every turn in the conversation
+    """
+    scripts: Dict[str, Script] = {}
+    current: Optional[Script] = None
+    for message in messages:
+        if is_turn_start(message):
+            prompt = "".join(c.get("text", "") for c in message.get("content", []))
+            current = scripts.setdefault(prompt, [])
+        elif message.get("role") == "assistant" and current is not None:
+            step: Dict[str, Any] = {}
+            for block in message.get("content", []):
+                if "toolUse" in block:
+                    step.setdefault("tool_calls", []).append(
+                        {
+                            "name": block["toolUse"]["name"],
+                            "input": block["toolUse"].get("input", {}),
+                        }
+                    )
+                elif "text" in block:
+                    step["text"] = step.get("text", "") + block["text"]
+            current.append(step)
+    return scripts
+
+
+class ReplayModel(Model):
+    """
+    Model that replays scripted steps instead of calling Bedrock.
+
+    Args:
+        scripts: Scripts keyed by a substring of the user message they answer
+                 (the longest matching key wins)
+        latency_ms: Mean simulated model latency per call
+        jitter_ms: Maximum random deviation from latency_ms
+    """
+
+    def __init__(
+        self,
+        scripts: Dict[str, Script],
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+    ):
+        self.scripts = scripts
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._keys = sorted(scripts, key=len, reverse=True)
+        self.config: Dict[str, Any] = {"model_id": "replay"}
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.config
+
+    async def structured_output(  # type: ignore[override]
+        self, output_model: Any, prompt: Any, system_prompt: Any = None, **kwargs: Any
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        raise NotImplementedError("ReplayModel does not support structured output")
+        yield  # pragma: no cover
+
+    def step_for(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """The scripted step answering the conversation so far."""
+        prompt, step = _prompt_and_step(messages)
+        for key in self._keys:
+            if key in prompt:
+                script = self.scripts[key]
+                if step < len(script):
+                    return script[step]
+                break
+        return {"text": DEFAULT_ANSWER}
+
+    async def stream(  # type: ignore[override]
+        self,
+        messages: List[Dict[str, Any]],
+        tool_specs: Optional[List[Dict[str, Any]]] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        step = self.step_for(messages)
+        delay_ms = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        yield {"messageStart": {"role": "assistant"}}
+        text = step.get("text")
+        if text:
+            yield {"contentBlockDelta": {"delta": {"text": text}}}
+            yield {"contentBlockStop": {}}
+        tool_calls = step.get("tool_calls", [])
+        for call in tool_calls:
+            tool_use = {
+                "toolUseId": f"tooluse_{uuid.uuid4().hex[:22]}",
+                "name": call["name"],
+            }
+            yield {"contentBlockStart": {"start": {"toolUse": tool_use}}}
+            yield {
+                "contentBlockDelta": {
+                    "delta": {"toolUse": {"input": json.dumps(call.get("input", {}))}}
+                }
+            }
+            yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "tool_use" if tool_calls else "end_turn"}}
+
+        input_tokens = estimate_tokens(messages) + len(system_prompt or "") // 4
+        output_tokens = len(text or "") // 4 + 30 * len(tool_calls)
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": input_tokens,
+                    "outputTokens": output_tokens,
+                    "totalTokens": input_tokens + output_tokens,
+                },
+                "metrics": {"latencyMs": max(0, int(delay_ms))},
+            }
+        }
@@ -0,0 +1,124 @@
+"""
+Microbenchmark for trace_function per-call overhead.
+
+Measures the cost added to a trivial function in each tracing mode:
+- disabled: OTEL_ENABLED=false (function returned undecorated)
+- unsampled: tracing on, span not sampled (ratio 0)
+- sampled: tracing on, every span recorded (ratio 1, no exporter)
+and compares against the previous decorator, which always set attributes.
+
+Usage:
+    python -m benchmarks.tracing_benchmark
+    python -m benchmarks.tracing_benchmark --calls 200000
+"""
+
+import argparse
+import functools
+import time
+from typing import Any, Callable, Dict
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Status, StatusCode
+
+import agents.observability as observability
+
+
+def work(value: int) -> int:
+    """The traced function: as cheap as possible so overhead dominates."""
+    return value + 1
+
+
+def legacy_trace_function(tracer, span_name: str) -> Callable:
+    """The previous decorator: span, attributes and timing on every call."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            func_name = getattr(func, "__name__", "unknown")
+            func_module = getattr(func, "__module__", "unknown")
+            with tracer.start_as_current_span(span_name) as span:
+                span.set_attribute("component", "benchmark")
+                span.set_attribute("function.name", func_name)
+                span.set_attribute("function.module", func_module)
+                start_time = time.time()
+                result = func(*args, **kwargs)
+                span.set_attribute("duration_ms", (time.time() - start_time) * 1000)
+                span.set_status(Status(StatusCode.OK))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def _tracer(sample_ratio: float):
+    provider = TracerProvider(sampler=ParentBased(TraceIdRatioBased(sample_ratio)))
+    return provider.get_tracer("benchmark")
+
+
+def _decorate(enabled: bool, tracer) -> Callable[[int], int]:
+    """Decorate work() with trace_function in the given mode."""
+    observability.OTEL_ENABLED = enabled
+    observability._tracer = tracer
+    return observability.trace_function(
+        span_name="benchmark.work", attributes={"component": "benchmark"}
+    )(work)
+
+
+def time_per_call(func: Callable[[int], int], calls: int) -> float:
+    """Average time per call in microseconds."""
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def run_benchmarks(calls: int = 100_000) -> Dict[str, float]:
+    """Run the tracing overhead benchmark, returning microseconds per call."""
+    original_enabled, original_tracer = (
+        observability.OTEL_ENABLED,
+        observability._tracer,
+    )
+    try:
+        sampled, unsampled = _tracer(1.0), _tracer(0.0)
+        # mode -> (function, tracer returned by get_tracer() while it runs)
+        modes = {
+            "undecorated": (work, None),
+            "disabled": (_decorate(False, None), None),
+            "unsampled": (_decorate(True, unsampled), unsampled),
+            "sampled": (_decorate(True, sampled), sampled),
+            "legacy unsampled": (
+                legacy_trace_function(unsampled, "benchmark.work")(work),
+                None,
+            ),
+            "legacy sampled": (
+                legacy_trace_function(sampled, "benchmark.work")(work),
+                None,
+            ),
+        }
+
+        print("=" * 60)
+        print("trace_function per-call overhead")
+        print("=" * 60)
+        print(f"{'Mode':<20} {'us/call':>10} {'overhead (us)':>15}")
+
+        results = {}
+        baseline = time_per_call(work, calls)
+        for mode, (func, tracer) in modes.items():
+            observability._tracer = tracer
+            results[mode] = time_per_call(func, calls)
+            overhead = results[mode] - baseline
+            print(f"{mode:<20} {results[mode]:>10.3f} {overhead:>15.3f}")
+        print("=" * 60)
+        return results
+    finally:
+        observability.OTEL_ENABLED = original_enabled
+        observability._tracer = original_tracer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+    run_benchmarks(args.calls)
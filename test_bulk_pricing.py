@@ -0,0 +1,233 @@
+"""
+Test cases for bulk charge repricing.
+Checks against the mock Zuora catalog that a selector and price rule give one
+tier update payload per changed tier, that charges are fetched once through
+the cache, that invalid rules and empty selections are reported, and that
+repeating a repricing adds nothing.
+"""
+
+import copy
+from types import SimpleNamespace
+
+from strands.agent.state import AgentState
+
+from agents.bulk_pricing import reprice_charges
+from agents.payload_store import PAYLOADS_STATE_KEY, PayloadStore
+from agents.tools import bulk_update_charge_prices
+from benchmarks.load_test import configure_zuora_client
+from agents.zuora_client import get_zuora_client
+from benchmarks.mock_zuora import MockZuoraServer, zuora_id
+
+
+def _tier_prices(payloads):
+    return {
+        entry["payload"]["endpoint"].rsplit("/", 1)[1]: entry["payload"]["body"]
+        for entry in payloads
+    }
+
+
+def test_percent_change():
+    """A percentage applies to every selected tier; charges are fetched once."""
+    print("\n🧪 Test: Percentage repricing")
+
+    server = MockZuoraServer(catalog_size=2).start()
+    try:
+        configure_zuora_client(server)
+        store = PayloadStore()
+        server.reset_counts()
+        result = reprice_charges(
+            store, "SKU-00000", currency="usd", percent_change=10, decimals=4
+        )
+        assert result.error is None and result.warnings == [], result.warnings
+        assert result.charges == 4
+        assert server.total_calls() == 5, "One product and four charge fetches"
+        assert len(result.payloads) == 8 and len(store) == 8
+        assert {e["zuora_api_type"] for e in result.payloads} == {"charge_tier_update"}
+        prices = _tier_prices(result.payloads)
+        assert prices[zuora_id("tier", 0, 0, 0)] == {"Price": 11.0}
+        assert prices[zuora_id("tier", 0, 1, 0)] == {"Price": 22.0}
+        assert prices[zuora_id("tier", 0, 0, 12)] == {"Price": 0.088}
+        assert prices[zuora_id("tier", 0, 1, 13)] == {"Price": 0.055}
+        assert result.changes[0]["charge"] == "Standard / Subscription Fee"
+
+        again = reprice_charges(
+            store, "SKU-00000", currency="USD", percent_change=10, decimals=4
+        )
+        assert server.total_calls() == 5, "Second pass served from the cache"
+        assert again.payloads == [] and again.unchanged == 8
+        assert len(store) == 8, "Merged into pending payloads"
+    finally:
+        server.stop()
+    print("✅ Test passed: one payload per changed tier")
+
+
+def test_selectors_and_rules():
+    """Rate plan and charge name selectors, per-tier and absolute rules."""
+    print("\n🧪 Test: Selectors and price rules")
+
+    server = MockZuoraServer(catalog_size=2).start()
+    try:
+        configure_zuora_client(server)
+        store = PayloadStore()
+        result = reprice_charges(
+            store,
+            "Analytics Suite 0",
+            rate_plan="standard",
+            charge_name_pattern="api*",
+            tier_prices={"2": 0.07, "3": 0.05},
+        )
+        assert result.charges == 1 and result.unchanged == 1, "Tier 3 already 0.05"
+        assert _tier_prices(result.payloads) == {
+            zuora_id("tier", 0, 0, 12): {"Price": 0.07}
+        }
+
+        result = reprice_charges(
+            store, "SKU-00000", rate_plan="Standard", currency="USD", new_price=15
+        )
+        assert _tier_prices(result.payloads) == {
+            zuora_id("tier", 0, 0, 0): {"Price": 15}
+        }
+        assert result.warnings == [
+            "Standard / API Calls: 3 USD tiers (use tier_prices or percent_change)"
+        ]
+
+        result = reprice_charges(
+            store, "SKU-00000", charge_name_pattern="subscription*", new_price=15
+        )
+        assert result.payloads == [] and result.charges == 2
+        assert result.warnings == [
+            "Standard / Subscription Fee: prices in USD, EUR "
+            "(give currency for new_price or tier_prices)",
+            "Professional / Subscription Fee: prices in USD, EUR "
+            "(give currency for new_price or tier_prices)",
+        ], result.warnings
+
+        result = reprice_charges(store, "SKU-00000", charge_name_pattern="Support*")
+        assert result.error.startswith("Give exactly one of"), result.error
+        result = reprice_charges(
+            store, "SKU-00000", charge_name_pattern="Support*", new_price=1
+        )
+        assert result.error.startswith("No charges of 'Analytics Suite 0' match")
+        result = reprice_charges(store, "SKU-99999", percent_change=5)
+        assert result.error.startswith("Could not find product 'SKU-99999'")
+        assert reprice_charges(store, "x", tier_prices={"first": 1}).error == (
+            "tier_prices keys must be tier numbers, got: first"
+        )
+        assert len(store) == 2
+    finally:
+        server.stop()
+    print("✅ Test passed: selectors and rules applied")
+
+
+class _StringPrices:
+    """Client whose charges return tier prices as strings, tier 3 unparsable."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_product(self, key):
+        return self.client.get_product(key)
+
+    def get_charge(self, charge_id):
+        response = copy.deepcopy(self.client.get_charge(charge_id))
+        for tier in response["data"]["pricing"]:
+            tier["price"] = "n/a" if tier["tier"] == 3 else str(tier["price"])
+        return response
+
+
+def test_string_prices():
+    """Live prices given as strings are parsed; unparsable ones are reported."""
+    print("\n🧪 Test: String tier prices")
+
+    server = MockZuoraServer(catalog_size=1).start()
+    try:
+        configure_zuora_client(server)
+        client = _StringPrices(get_zuora_client())
+        store = PayloadStore()
+        result = reprice_charges(
+            store,
+            "SKU-00000",
+            rate_plan="Standard",
+            charge_name_pattern="API*",
+            percent_change=10,
+            decimals=4,
+            client=client,
+        )
+        assert _tier_prices(result.payloads) == {
+            zuora_id("tier", 0, 0, 11): {"Price": 0.11},
+            zuora_id("tier", 0, 0, 12): {"Price": 0.088},
+        }
+        assert result.warnings == [
+            "Standard / API Calls: USD tier 3 price is not a number ('n/a')"
+        ], result.warnings
+
+        result = reprice_charges(
+            store,
+            "SKU-00000",
+            rate_plan="Standard",
+            charge_name_pattern="Subscription*",
+            currency="USD",
+            new_price=10,
+            client=client,
+        )
+        assert result.payloads == [] and result.unchanged == 1, "'10.0' equals 10"
+    finally:
+        server.stop()
+    print("✅ Test passed: string prices parsed")
+
+
+def test_bulk_price_tool():
+    """The tool tabulates the changes and saves payloads once."""
+    print("\n🧪 Test: bulk_update_charge_prices tool")
+
+    server = MockZuoraServer(catalog_size=1).start()
+    try:
+        configure_zuora_client(server)
+        tool_context = SimpleNamespace(agent=SimpleNamespace(state=AgentState()))
+        result = bulk_update_charge_prices(
+            tool_context,
+            "SKU-00000",
+            charge_name_pattern="API Calls",
+            percent_change=-50,
+        )
+        assert "**Payloads Generated:** 6" in result, result
+        assert "| Professional / API Calls | USD | 3 | 0.05 | 0.03 |" in result
+        assert "only affect NEW subscriptions" in result
+        payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY)
+        assert len(payloads) == 6
+
+        result = bulk_update_charge_prices(
+            tool_context,
+            "SKU-00000",
+            charge_name_pattern="API Calls",
+            percent_change=-50,
+        )
+        assert "No Price Changes Needed" in result, result
+        assert "**Prices Already Matching:** 6" in result
+        assert len(tool_context.agent.state.get(PAYLOADS_STATE_KEY)) == 6
+
+        result = bulk_update_charge_prices(tool_context, "SKU-00000", rate_plan="Gold")
+        assert "Cannot reprice charges" in result, result
+    finally:
+        server.stop()
+    print("✅ Test passed: tool summary and state")
+
+
+def run_all_tests():
+    """Run all bulk pricing tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING BULK PRICING TESTS")
+    print("=" * 70)
+
+    test_percent_change()
+    test_selectors_and_rules()
+    test_string_prices()
+    test_bulk_price_tool()
+
+    print("\n" + "=" * 70)
+    print("ALL BULK PRICING TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
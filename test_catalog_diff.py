@@ -0,0 +1,243 @@
+"""
+Test cases for the desired-state catalog diff.
+Checks against the mock Zuora catalog that only changed fields and tier
+prices get update payloads, that missing objects are created, that changes
+the update endpoints cannot make are reported, and that repeating a
+reconcile adds nothing.
+"""
+
+import json
+from types import SimpleNamespace
+
+from strands.agent.state import AgentState
+
+from agents.catalog_diff import diff_catalog, fetch_all
+from agents.catalog_ingest import parse_catalog_spec
+from agents.observability import end_tool_call_scope, start_tool_call_scope
+from agents.payload_store import PAYLOADS_STATE_KEY, PayloadStore
+from agents.timings import (
+    TIMING_ZUORA,
+    end_request_timings,
+    get_request_timings,
+    start_request_timings,
+)
+from agents.tools import reconcile_catalog_spec
+from agents.zuora_client import get_zuora_client
+from benchmarks.load_test import configure_zuora_client
+from benchmarks.mock_zuora import (
+    MockZuoraServer,
+    charge_id,
+    product_id,
+    rate_plan_id,
+    zuora_id,
+)
+
+UOMS = ["Each", "API_CALL", "GB"]
+
+# Tiers of the mock "API Calls" charge, with tier 2 repriced
+API_TIERS = [
+    {"StartingUnit": 0, "EndingUnit": 1000, "Price": 0.1},
+    {"StartingUnit": 1001, "EndingUnit": 10000, "Price": 0.07},
+    {"StartingUnit": 10001, "Price": 0.05},
+]
+
+
+def _spec():
+    return {
+        "products": [
+            {
+                "sku": "SKU-00000",
+                "description": "Analytics for everyone",
+                "rate_plans": [
+                    {
+                        "name": "Standard",
+                        "description": "Plan 1 of Analytics Suite 0",
+                        "effective_end_date": "2030-12-31",
+                        "charges": [
+                            {
+                                "name": "Subscription Fee",
+                                "charge_type": "Recurring",
+                                "billing_timing": "In Advance",
+                                "bill_cycle_type": "DefaultFromCustomer",
+                                "accounting_code": "Sales",
+                                "price": 15,
+                                "currencies": ["USD", "EUR"],
+                            },
+                            {
+                                "name": "API Calls",
+                                "charge_model": "Tiered",
+                                "uom": "API_CALL",
+                                "bill_cycle_type": "SubscriptionStartDay",
+                                "tiers": API_TIERS,
+                                "currency": "USD",
+                            },
+                            {"name": "Support", "charge_type": "OneTime", "price": 5},
+                        ],
+                    },
+                    {
+                        "rate_plan_id": rate_plan_id(0, 1),
+                        "charges": [
+                            {"name": "Subscription Fee", "charge_type": "OneTime"},
+                            {
+                                "name": "API Calls",
+                                "tiers": API_TIERS[:2],
+                                "currency": "USD",
+                            },
+                        ],
+                    },
+                ],
+            },
+            {"product_id": product_id(1), "name": "Cloud Storage 1"},
+            {"name": "Brand New", "sku": "NEW-1", "rate_plans": [{"name": "Basic"}]},
+            {"product_id": "8a80ffff", "name": "Gone"},
+        ]
+    }
+
+
+def test_minimal_payloads():
+    """Only differences become payloads; missing objects are created."""
+    print("\n🧪 Test: Minimal update payloads")
+
+    server = MockZuoraServer(catalog_size=2).start()
+    try:
+        configure_zuora_client(server)
+        products, errors = parse_catalog_spec(json.dumps(_spec()))
+        store = PayloadStore()
+        result = diff_catalog(products, store, available_uoms=UOMS)
+        assert errors == []
+        assert result.errors == [
+            "Product 'Gone': could not fetch product 8a80ffff: Product not found"
+        ]
+        assert result.counts == {
+            "product_update": 1,
+            "rate_plan_update": 1,
+            "charge_update": 1,
+            "charge_tier_update": 3,
+            "product_create": 1,
+            "rate_plan_create": 1,
+            "charge_create": 1,
+        }, result.counts
+        by_type = {}
+        for entry in result.payloads:
+            by_type.setdefault(entry["zuora_api_type"], []).append(entry["payload"])
+
+        product = by_type["product_update"][0]
+        assert product["endpoint"] == f"/v1/object/product/{product_id(0)}"
+        assert product["body"] == {"Description": "Analytics for everyone"}
+        plan = by_type["rate_plan_update"][0]
+        assert plan["body"] == {"EffectiveEndDate": "2030-12-31"}, "Same description"
+
+        tiers = {
+            p["endpoint"].rsplit("/", 1)[1]: p["body"]
+            for p in by_type["charge_tier_update"]
+        }
+        # One update per currency of the flat fee
+        assert tiers == {
+            zuora_id("tier", 0, 0, 0): {"Price": 15},
+            zuora_id("tier", 0, 0, 1): {"Price": 15},
+            zuora_id("tier", 0, 0, 12): {"Price": 0.07},
+        }, tiers
+        assert by_type["charge_create"][0]["ProductRatePlanId"] == rate_plan_id(0, 0)
+        assert by_type["charge_create"][0]["Name"] == "Support"
+        charge = by_type["charge_update"][0]
+        assert charge["endpoint"].endswith(charge_id(0, 0, 1)), charge
+        assert charge["body"] == {
+            "BillCycleType": "SubscriptionStartDay"
+        }, "IN_ADVANCE equals In Advance, DefaultFromCustomer equals billingDay"
+        # Cloud Storage 1, and plan 2 with both its charges (nothing updatable)
+        assert result.unchanged == 4, result.unchanged
+
+        warnings = " ".join(result.warnings)
+        assert "charge_type is Recurring in Zuora, not OneTime" in warnings
+        assert "USD tier structure differs" in warnings
+        assert "Fee': accounting_code not compared (not in the live charge)" in warnings
+
+        again = diff_catalog(products, store, available_uoms=UOMS)
+        assert again.payloads == [] and again.counts == {}
+        assert len(store) == len(result.payloads), "Merged into pending payloads"
+    finally:
+        server.stop()
+    print("✅ Test passed: only differences emitted")
+
+
+def test_fetch_all():
+    """Parallel fetch keeps key order and reuses the client's cache."""
+    print("\n🧪 Test: Parallel catalog fetch")
+
+    assert fetch_all(lambda key: key * 2, list(range(20))) == list(range(0, 40, 2))
+    server = MockZuoraServer(catalog_size=12, latency_ms=20).start()
+    try:
+        configure_zuora_client(server)
+        client = get_zuora_client()
+        keys = [product_id(i) for i in range(12)]
+        server.reset_counts()
+        timings_token = start_request_timings()
+        scope = start_tool_call_scope()
+        try:
+            products = fetch_all(client.get_product, keys)
+            timings = get_request_timings()
+        finally:
+            zuora_calls = end_tool_call_scope(scope)
+            end_request_timings(timings_token)
+        assert [p["data"]["id"] for p in products] == keys
+        assert server.total_calls() == 12
+        assert zuora_calls == 12, "Counted against the caller's tool"
+        assert timings.counts[TIMING_ZUORA] == 12
+        # Wall time of the batch, not 12 overlapping 20 ms calls
+        assert timings.components[TIMING_ZUORA] <= timings.total_ms
+        fetch_all(client.get_product, keys)
+        assert server.total_calls() == 12, "Second pass served from the cache"
+    finally:
+        server.stop()
+    print("✅ Test passed: parallel fetch in order")
+
+
+def test_reconcile_tool():
+    """The tool summarizes the diff and saves payloads once."""
+    print("\n🧪 Test: reconcile_catalog_spec tool")
+
+    server = MockZuoraServer(catalog_size=1).start()
+    try:
+        configure_zuora_client(server)
+        tool_context = SimpleNamespace(agent=SimpleNamespace(state=AgentState()))
+        spec = "\n".join(
+            [
+                "type,name,sku,description",
+                "product,Analytics Suite 0,SKU-00000,New text",
+            ]
+        )
+        result = reconcile_catalog_spec(tool_context, spec, "csv")
+        assert "1 product update(s)" in result, result
+        assert "Product 'Analytics Suite 0': Description" in result
+        payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY)
+        assert [p["zuora_api_type"] for p in payloads] == ["product_update"]
+
+        result = reconcile_catalog_spec(tool_context, spec, "csv")
+        assert "already matches the spec" in result, result
+        assert len(tool_context.agent.state.get(PAYLOADS_STATE_KEY)) == 1
+
+        spec = json.dumps([{"sku": "SKU-00000", "description": "Mock product 0"}])
+        result = reconcile_catalog_spec(tool_context, spec)
+        assert "1 object(s) already match" in result, result
+    finally:
+        server.stop()
+    print("✅ Test passed: tool summary and state")
+
+
+def run_all_tests():
+    """Run all catalog diff tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING CATALOG DIFF TESTS")
+    print("=" * 70)
+
+    test_minimal_payloads()
+    test_fetch_all()
+    test_reconcile_tool()
+
+    print("\n" + "=" * 70)
+    print("ALL CATALOG DIFF TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
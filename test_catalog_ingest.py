@@ -0,0 +1,259 @@
+"""
+Test cases for bulk catalog ingestion.
+Checks that a spec gives the same payloads as calling the create tools one by
+one, CSV parsing and argument checks, deterministic output, and the
+ingest_catalog_spec tool.
+"""
+
+import json
+from types import SimpleNamespace
+
+from strands.agent.state import AgentState
+
+from agents.catalog_ingest import ingest_catalog, parse_catalog_spec
+from agents.payload_store import PAYLOADS_STATE_KEY, PayloadStore
+from agents.tools import (
+    create_charge,
+    create_product,
+    create_rate_plan,
+    ingest_catalog_spec,
+)
+
+UOMS = ["each", "APICalls", "GB"]
+
+CHARGES = [
+    {
+        "name": "Platform Fee",
+        "charge_type": "Recurring",
+        "price": 99.0,
+        "billing_period": "Month",
+        "currency": "USD",
+    },
+    {
+        "name": "API Calls",
+        "charge_type": "Usage",
+        "charge_model": "Tiered",
+        "tiers": [{"units": 1000, "price": 0.1}, {"price": 0.05}],
+        "currencies": ["USD", "EUR"],
+    },
+    {"name": "Setup", "charge_type": "OneTime"},
+]
+
+
+def _spec():
+    return {
+        "products": [
+            {
+                "name": f"Product {i}",
+                "sku": f"P-{i}",
+                "effective_start_date": "2025-01-01",
+                "rate_plans": [
+                    {"name": "Monthly", "charges": CHARGES},
+                    {"name": "Annual"},
+                ],
+            }
+            for i in range(2)
+        ]
+    }
+
+
+def _without_ids(payloads):
+    return [{k: v for k, v in p.items() if k != "payload_id"} for p in payloads]
+
+
+def test_matches_create_tools():
+    """Ingesting a spec equals calling the create tools for each object."""
+    print("\n🧪 Test: Same payloads as the create tools")
+
+    tool_context = SimpleNamespace(agent=SimpleNamespace(state=AgentState()))
+    for index, product in enumerate(_spec()["products"]):
+        create_product(
+            tool_context,
+            name=product["name"],
+            sku=product["sku"],
+            effective_start_date=product["effective_start_date"],
+        )
+        for rate_plan in product["rate_plans"]:
+            create_rate_plan(tool_context, name=rate_plan["name"], product_index=index)
+            for charge in rate_plan.get("charges", []):
+                create_charge(tool_context, **charge)
+    expected = tool_context.agent.state.get(PAYLOADS_STATE_KEY)
+    result = create_rate_plan(tool_context, name="Bad", product_index=-1)
+    assert "Invalid product_index" in result, result
+    assert len(tool_context.agent.state.get(PAYLOADS_STATE_KEY)) == len(expected)
+
+    products, errors = parse_catalog_spec(json.dumps(_spec()))
+    result = ingest_catalog(products, PayloadStore(), UOMS)
+    assert errors == [] and result.errors == []
+    assert _without_ids(result.payloads) == _without_ids(expected)
+    assert result.counts == {
+        "product_create": 2,
+        "rate_plan_create": 4,
+        "charge_create": 6,
+    }
+    assert result.with_placeholders == 4, "Usage without UOM, setup without price"
+    assert result.payloads[-2]["payload"]["ProductRatePlanId"] == (
+        "@{ProductRatePlan[2].Id}"
+    )
+    print("✅ Test passed: one pass, same payloads")
+
+
+def test_csv_spec():
+    """CSV rows nest under named or preceding parents; cells are converted."""
+    print("\n🧪 Test: CSV spec")
+
+    spec = "\n".join(
+        [
+            "type,name,product,rate_plan,charge_type,price,uom,taxable,tiers,currencies",
+            "product,Storage,,,,,,,,",
+            "rate_plan,Basic,,,,,,,,",
+            "product,Compute,,,,,,,,",
+            "rate_plan,Basic,Storage,,,,,,,",
+            'charge,Disk,Storage,Basic,Usage,,gigabytes,yes,"[{""units"": 10, ""price"": 1}, {""price"": 0.5}]",USD|EUR',
+            "charge,Bad,,,Usage,cheap,,,,",
+            "charge,Wrong,,,Monthly,,,,,",
+            "widget,x,,,,,,,,",
+        ]
+    )
+    products, errors = parse_catalog_spec(spec, "csv")
+    assert [p["name"] for p in products] == ["Storage", "Compute"]
+    storage_plans = products[0]["rate_plans"]
+    assert len(storage_plans) == 2 and products[1]["rate_plans"] == []
+    charge = storage_plans[0]["charges"][0]
+    assert charge["taxable"] is True and charge["currencies"] == ["USD", "EUR"]
+    assert charge["tiers"][0] == {"units": 10, "price": 1}
+    assert [e.split(":")[0] for e in errors] == ["Line 7", "Line 8", "Line 9"]
+
+    result = ingest_catalog(products, PayloadStore(), UOMS)
+    disk = result.payloads[2]["payload"]
+    assert disk["UOM"] == "GB" and disk["ChargeModel"] == "Tiered Pricing"
+    assert len(disk["ProductRatePlanChargeTierData"]["ProductRatePlanChargeTier"]) == 4
+    print("✅ Test passed: CSV rows ingested")
+
+
+def test_errors_and_determinism():
+    """Invalid objects are skipped with their children; output is repeatable."""
+    print("\n🧪 Test: Errors and determinism")
+
+    spec = {
+        "products": [
+            {"name": "Bad Dates", "effective_start_date": "01/01/2025"},
+            {"name": "Typo", "colour": "red", "rate_plans": [{"name": "x"}]},
+            {
+                "product_id": "8a1234567890abcd",
+                "rate_plans": [
+                    {
+                        "name": "Add-on",
+                        "charges": [
+                            {"name": "Seats", "billing_period": "Monthly"},
+                            {"name": "Seats", "charge_type": "OneTime", "price": 5},
+                            {"name": "Seats", "charge_type": "OneTime", "price": 5},
+                        ],
+                    }
+                ],
+            },
+        ]
+    }
+    products, _ = parse_catalog_spec(json.dumps(spec))
+    result = ingest_catalog(products, PayloadStore(), UOMS)
+    assert len(result.errors) == 3, result.errors
+    assert "Invalid date format" in result.errors[0]
+    assert "unknown field(s) colour" in result.errors[1]
+    assert "billing_period must be one of" in result.errors[2]
+    assert [p["zuora_api_type"] for p in result.payloads] == [
+        "rate_plan_create",
+        "charge_create",
+        "charge_create",
+    ]
+    assert result.payloads[0]["payload"]["ProductId"] == "8a1234567890abcd"
+    assert any("Duplicate charge name 'Seats'" in w for w in result.warnings)
+
+    again = ingest_catalog(parse_catalog_spec(json.dumps(spec))[0], PayloadStore())
+    assert again.payloads == result.payloads, "Same spec, same payloads and ids"
+
+    store = PayloadStore(list(result.payloads))
+    more = ingest_catalog(products, store, UOMS)
+    assert more.payloads[0]["payload"]["Name"] == "Add-on"
+    assert len({p["payload_id"] for p in store}) == len(store), "IDs stay unique"
+
+    # JSON values are type-checked like the tools' arguments, not coerced
+    spec = [
+        {"name": 123},
+        {"name": "Dated", "effective_start_date": 20250101},
+        {
+            "name": "Typed",
+            "rate_plans": [
+                {
+                    "name": "Plan",
+                    "charges": [
+                        {"name": "Fee", "currencies": "USD"},
+                        {"name": "Cheap", "price": "cheap"},
+                        {"name": "Seats", "charge_type": "OneTime", "price": 5},
+                    ],
+                }
+            ],
+        },
+    ]
+    result = ingest_catalog(parse_catalog_spec(json.dumps(spec))[0], PayloadStore())
+    assert result.errors == [
+        "Product 1: name must be a string, got: 123",
+        "Product 2: effective_start_date must be a string, got: 20250101",
+        "Product 'Typed' rate plan 'Plan' charge 1: currencies must be a list "
+        'of strings, got: "USD"',
+        "Product 'Typed' rate plan 'Plan' charge 2: price must be a number, "
+        'got: "cheap"',
+    ], result.errors
+    assert result.counts == {
+        "product_create": 1,
+        "rate_plan_create": 1,
+        "charge_create": 1,
+    }
+
+    assert parse_catalog_spec("{", "json")[1][0].startswith("Spec is not valid JSON")
+    assert parse_catalog_spec("[]", "yaml")[1] == [
+        "Unknown spec format 'yaml' (use json or csv)"
+    ]
+    print("✅ Test passed: errors reported, output repeatable")
+
+
+def test_ingest_tool():
+    """The tool adds all payloads to state once and summarizes the result."""
+    print("\n🧪 Test: ingest_catalog_spec tool")
+
+    tool_context = SimpleNamespace(agent=SimpleNamespace(state=AgentState()))
+    create_product(tool_context, name="Existing", sku="EX")
+    result = ingest_catalog_spec(tool_context, json.dumps(_spec()))
+    assert "2 product(s), 4 rate plan(s), 6 charge(s)" in result, result
+    assert "4 payload(s) need more details" in result
+    assert "Warnings" in result, "Missing currency is reported"
+
+    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY)
+    assert len(payloads) == 13
+    assert (
+        payloads[2]["payload"]["ProductId"] == "@{Product[1].Id}"
+    ), "References continue after existing payloads"
+
+    result = ingest_catalog_spec(tool_context, "type,name\nwidget,x\n", "csv")
+    assert "No payloads were created" in result and "Line 2" in result
+    assert len(tool_context.agent.state.get(PAYLOADS_STATE_KEY)) == 13
+    print("✅ Test passed: tool summary and state")
+
+
+def run_all_tests():
+    """Run all catalog ingestion tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING CATALOG INGESTION TESTS")
+    print("=" * 70)
+
+    test_matches_create_tools()
+    test_csv_spec()
+    test_errors_and_determinism()
+    test_ingest_tool()
+
+    print("\n" + "=" * 70)
+    print("ALL CATALOG INGESTION TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
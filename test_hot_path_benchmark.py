@@ -0,0 +1,86 @@
+"""
+Test cases for the hot path microbenchmark suite.
+Checks that every benchmark case runs, that results are JSON-serialisable,
+and that the compare mode flags slowdowns above the threshold.
+"""
+
+import json
+
+from benchmarks.hot_path_benchmark import (
+    BENCHMARKS,
+    compare_results,
+    measure,
+    run_benchmarks,
+)
+
+
+def test_every_case_runs():
+    """Each benchmark produces cases whose callables run without error."""
+    print("\n🧪 Test: Every benchmark case runs")
+
+    for name, cases_func in BENCHMARKS.items():
+        cases = cases_func()
+        assert len(cases) >= 3, f"{name} should cover several input sizes"
+        for label, func in cases:
+            func()
+            assert "=" in label
+    print(f"✅ Test passed: {len(BENCHMARKS)} benchmarks run")
+
+
+def test_results_json():
+    """Results are keyed by name[param] and survive a JSON round trip."""
+    print("\n🧪 Test: Results JSON")
+
+    results = run_benchmarks("normalize_tiers", repeats=2, min_time_s=0.001)
+    assert set(results["results"]) == {
+        "normalize_tiers[tiers=3]",
+        "normalize_tiers[tiers=10]",
+        "normalize_tiers[tiers=50]",
+    }
+    assert json.loads(json.dumps(results)) == results
+
+    timing = measure(lambda: sum(range(100)), repeats=3, min_time_s=0.001)
+    assert timing["median_us"] > 0 and timing["loops"] >= 1
+    assert timing["min_us"] <= timing["median_us"]
+    print("✅ Test passed: results serialisable")
+
+
+def test_compare_flags_regressions():
+    """Only slowdowns above the threshold count as regressions."""
+    print("\n🧪 Test: Compare flags regressions")
+
+    baseline = {
+        "results": {"a[n=1]": {"median_us": 10.0}, "b[n=1]": {"median_us": 10.0}}
+    }
+    current = {
+        "results": {
+            "a[n=1]": {"median_us": 10.5},
+            "b[n=1]": {"median_us": 12.0},
+            "new[n=1]": {"median_us": 1.0},
+        }
+    }
+    rows = {row["name"]: row for row in compare_results(current, baseline, 10.0)}
+    assert set(rows) == {"a[n=1]", "b[n=1]"}, "New benchmarks have no baseline"
+    assert rows["a[n=1]"]["change_pct"] == 5.0
+    assert not rows["a[n=1]"]["regression"]
+    assert rows["b[n=1]"]["regression"]
+    print("✅ Test passed: 20% slowdown flagged, 5% allowed")
+
+
+def run_all_tests():
+    """Run all hot path benchmark tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING HOT PATH BENCHMARK TESTS")
+    print("=" * 70)
+
+    test_every_case_runs()
+    test_results_json()
+    test_compare_flags_regressions()
+
+    print("\n" + "=" * 70)
+    print("ALL HOT PATH BENCHMARK TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
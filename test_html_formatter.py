@@ -0,0 +1,188 @@
+"""
+Test cases for the markdown to HTML formatter.
+Checks that the single-pass converter matches the multi-pass pipeline and
+that incremental (chunk-fed) conversion matches markdown_to_html().
+"""
+
+import random
+
+from agents.html_formatter import (
+    IncrementalMarkdownConverter,
+    _convert_line_breaks,
+    _convert_markdown_multipass,
+    _extract_code_blocks,
+    _extract_inline_code,
+    _restore_code_blocks,
+    _restore_inline_code,
+    markdown_to_html,
+)
+
+SAMPLE_ANSWER = """## Product Created
+
+I've created **Gold Plan** with the following *defaults*:
+
+| Field | Value |
+|-------|-------|
+| Name | Gold Plan |
+| SKU | `GOLD-001` |
+
+- Monthly billing
+- USD pricing
+* Starred item
+
+```json
+{"Name": "Gold Plan",
+
+ "SKU": "GOLD-001"}
+```
+
+**Next steps:**
+
+1. Review the payload
+2. Submit to Zuora
+
+- [x] Product payload
+- [ ] Rate plan payload
+
+---
+Done.
+"""
+
+# Fragments that exercise markup able to span blank lines
+EDGE_FRAGMENTS = [
+    "# Title",
+    "#",
+    "plain text",
+    "**bold**",
+    "**open",
+    "*",
+    "`code`",
+    "`",
+    "```python\nx = 1\n\ny = 2\n```",
+    "```",
+    "- item",
+    "- [x] done",
+    "- [ ] todo",
+    "-",
+    "1. one",
+    "| a | b |",
+    "|---|---|",
+    "---",
+    "  ",
+    "",
+    "<p>html</p>",
+    "  - [x] indented",
+    "2. two",
+    "* star",
+    "| **b** | `c` |",
+    "# *heading*",
+]
+
+
+def _multipass_markdown_to_html(text: str) -> str:
+    """Reference conversion: one whole-text pass per markdown rule."""
+    if not text:
+        return text
+    text, code_blocks = _extract_code_blocks(text)
+    text, inline_codes = _extract_inline_code(text)
+    text = _convert_markdown_multipass(text)
+    text = _restore_inline_code(text, inline_codes)
+    text = _restore_code_blocks(text, code_blocks)
+    return _convert_line_breaks(text)
+
+
+def _random_document(rng: random.Random) -> str:
+    """Build a random document from edge-case fragments."""
+    text = "\n".join(rng.choice(EDGE_FRAGMENTS) for _ in range(rng.randint(0, 15)))
+    return text + rng.choice(["", "\n", "\n\n"])
+
+
+def _convert_in_chunks(text: str, sizes) -> str:
+    """Feed text through the incremental converter in chunks of the given sizes."""
+    converter = IncrementalMarkdownConverter()
+    parts = []
+    pos = 0
+    for size in sizes:
+        if pos >= len(text):
+            break
+        parts.append(converter.feed(text[pos : pos + size]))
+        pos += size
+    parts.append(converter.feed(text[pos:]))
+    parts.append(converter.close())
+    return "".join(parts)
+
+
+def test_single_pass_matches_multipass():
+    """The single-pass converter produces the same HTML as the multi-pass one."""
+    print("\n🧪 Test: Single-pass conversion matches multi-pass conversion")
+
+    assert markdown_to_html(SAMPLE_ANSWER) == _multipass_markdown_to_html(SAMPLE_ANSWER)
+
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = _random_document(rng)
+        assert markdown_to_html(text) == _multipass_markdown_to_html(text), repr(text)
+
+    print("✅ Test passed: identical HTML for sample and 2000 randomized documents")
+
+
+def test_incremental_matches_full_conversion():
+    """Chunked conversion of a typical answer equals markdown_to_html()."""
+    print("\n🧪 Test: Incremental conversion matches full conversion")
+
+    expected = markdown_to_html(SAMPLE_ANSWER)
+    for chunk_size in (1, 3, 16, 64, len(SAMPLE_ANSWER)):
+        sizes = [chunk_size] * (len(SAMPLE_ANSWER) // chunk_size + 1)
+        result = _convert_in_chunks(SAMPLE_ANSWER, sizes)
+        assert result == expected, f"Mismatch with chunk size {chunk_size}"
+
+    print("✅ Test passed: identical output for all chunk sizes")
+
+
+def test_incremental_emits_before_close():
+    """Completed blocks are returned by feed() without waiting for close()."""
+    print("\n🧪 Test: Incremental conversion streams completed blocks")
+
+    converter = IncrementalMarkdownConverter()
+    first = converter.feed("## Summary\n\nThe **Gold Plan** is ready.\n\nNext")
+    assert "<h2>Summary</h2>" in first, "Header block should be emitted early"
+    assert "Next" not in first, "Open block should stay buffered"
+
+    rest = converter.close()
+    assert first + rest == markdown_to_html(
+        "## Summary\n\nThe **Gold Plan** is ready.\n\nNext"
+    )
+    print("✅ Test passed: blocks emitted as soon as they are complete")
+
+
+def test_incremental_randomized_edge_cases():
+    """Random documents built from edge-case fragments convert identically."""
+    print("\n🧪 Test: Incremental conversion on randomized edge cases")
+
+    rng = random.Random(42)
+    for _ in range(2000):
+        text = _random_document(rng)
+        sizes = [rng.choice([1, 2, 5, 40]) for _ in range(len(text))]
+        assert _convert_in_chunks(text, sizes) == markdown_to_html(text), repr(text)
+
+    print("✅ Test passed: 2000 randomized documents matched")
+
+
+def run_all_tests():
+    """Run all formatter tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING HTML FORMATTER TESTS")
+    print("=" * 70)
+
+    test_single_pass_matches_multipass()
+    test_incremental_matches_full_conversion()
+    test_incremental_emits_before_close()
+    test_incremental_randomized_edge_cases()
+
+    print("\n" + "=" * 70)
+    print("ALL HTML FORMATTER TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
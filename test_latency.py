@@ -0,0 +1,128 @@
+"""
+Test cases for in-process latency percentiles.
+Checks histogram accuracy, per-category registries, the MetricsCollector hooks
+and the "stats" debug action on the entrypoint.
+"""
+
+import os
+import random
+
+os.environ.setdefault("OTEL_ENABLED", "false")
+
+from agents import config
+from agents.latency import (
+    LATENCY_TOOL,
+    LATENCY_ZUORA,
+    OTHER_NAME,
+    LatencyHistogram,
+    LatencyRegistry,
+    get_latency_registry,
+)
+from agents.observability import get_metrics_collector
+
+
+def test_histogram_percentiles():
+    """Percentiles are within the histogram's ~1.6% precision."""
+    print("\n🧪 Test: Histogram percentiles")
+
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(6, 1.2) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    ordered = sorted(samples)
+    for percent in (50, 90, 99):
+        exact = ordered[round(len(ordered) * percent / 100) - 1]
+        estimate = histogram.percentile(percent)
+        assert abs(estimate - exact) / exact < 0.02, (percent, estimate, exact)
+
+    summary = histogram.snapshot()
+    assert summary["count"] == 20000
+    assert summary["max_ms"] == round(max(samples), 2)
+    assert summary["p99_ms"] <= summary["max_ms"]
+    assert LatencyHistogram().snapshot()["p50_ms"] == 0.0
+    print(f"✅ Test passed: p50/p90/p99 accurate ({len(histogram._counts)} buckets)")
+
+
+def test_registry_categories():
+    """Histograms are kept per category and name, with a cap per category."""
+    print("\n🧪 Test: Registry categories")
+
+    registry = LatencyRegistry(max_names_per_category=2)
+    registry.record(LATENCY_TOOL, "get_payloads", 12.0)
+    registry.record(LATENCY_TOOL, "create_product", 40.0)
+    registry.record(LATENCY_TOOL, "create_charge", 55.0)
+    registry.record(LATENCY_ZUORA, "GET /v1/catalog/products", 300.0)
+
+    snapshot = registry.snapshot()
+    assert set(snapshot[LATENCY_TOOL]) == {"get_payloads", "create_product", OTHER_NAME}
+    assert snapshot[LATENCY_ZUORA]["GET /v1/catalog/products"]["count"] == 1
+    assert set(registry.snapshot(LATENCY_ZUORA)) == {LATENCY_ZUORA}
+    print("✅ Test passed: per-name histograms, overflow collapsed to 'other'")
+
+
+def test_metrics_collector_records_latency():
+    """Recorded durations reach the registry without an OTLP collector."""
+    print("\n🧪 Test: MetricsCollector feeds the registry")
+
+    registry = get_latency_registry()
+    registry.clear()
+    metrics = get_metrics_collector()
+    metrics.record_request("ProductManager", 1200.0)
+    metrics.record_agent_invocation("ProductManager", 900.0)
+    metrics.record_tool_execution("get_payloads", "read", 5.0)
+    metrics.record_api_call("GET", "/v1/catalog/products/P-1", 250.0)
+
+    snapshot = registry.snapshot()
+    assert snapshot["request"]["ProductManager"]["count"] == 1
+    assert snapshot["agent"]["ProductManager"]["max_ms"] == 900.0
+    assert snapshot["tool"]["get_payloads"]["count"] == 1
+    assert snapshot["zuora"]["GET /v1/catalog/products/{id}"]["count"] == 1
+    print("✅ Test passed: request, agent, tool and Zuora timings recorded")
+
+
+def test_stats_debug_action():
+    """The entrypoint returns live stats for a debug action payload."""
+    print("\n🧪 Test: Stats debug action")
+
+    from agentcore_app import invoke
+
+    enabled = config.DEBUG_ACTIONS_ENABLED
+    try:
+        config.DEBUG_ACTIONS_ENABLED = False  # the default
+        response = invoke({"debug_action": "stats"})
+        assert response["error"] == "Debug actions are disabled"
+        assert "result" not in response
+
+        config.DEBUG_ACTIONS_ENABLED = True
+        response = invoke({"debug_action": "stats"})
+        assert response["debug_action"] == "stats"
+        assert "latency" in response["result"]
+        assert "hit_rate" in response["result"]["cache"]
+
+        response = invoke({"debug_action": "nope"})
+        assert "Unknown debug action" in response["error"]
+    finally:
+        config.DEBUG_ACTIONS_ENABLED = enabled
+    print("✅ Test passed: stats returned when enabled, unknown action rejected")
+
+
+def run_all_tests():
+    """Run all latency tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING LATENCY PERCENTILE TESTS")
+    print("=" * 70)
+
+    test_histogram_percentiles()
+    test_registry_categories()
+    test_metrics_collector_records_latency()
+    test_stats_debug_action()
+
+    print("\n" + "=" * 70)
+    print("ALL LATENCY PERCENTILE TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
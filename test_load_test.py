@@ -0,0 +1,144 @@
+"""
+Test cases for the offline load-test harness.
+Checks that the mock Zuora server serves the catalog, that the replay model
+replays recorded conversations, and that the driver runs the corpus through
+invoke() and reports throughput, Zuora calls and cache hit rates.
+"""
+
+import requests
+
+from benchmarks.load_test import run_load_test
+from benchmarks.load_test_corpus import CONVERSATIONS
+from benchmarks.mock_zuora import MockZuoraServer, product_id, product_name
+from benchmarks.replay_model import ReplayModel, script_from_messages
+
+
+def test_mock_zuora_server():
+    """Catalog endpoints answer from the generated catalog and count calls."""
+    print("\n🧪 Test: Mock Zuora server")
+
+    server = MockZuoraServer(catalog_size=10).start()
+    try:
+        listed = requests.get(
+            f"{server.url}/v1/catalog/products", params={"pageSize": 5}, timeout=5
+        ).json()
+        assert [p["name"] for p in listed["products"]] == [
+            product_name(i) for i in range(5)
+        ]
+
+        product = requests.get(
+            f"{server.url}/v1/catalog/products/{product_id(3)}", timeout=5
+        ).json()
+        assert product["sku"] == "SKU-00003"
+        assert len(product["productRatePlans"]) == 2
+
+        missing = requests.get(f"{server.url}/v1/catalog/products/nope", timeout=5)
+        assert missing.status_code == 404
+        assert server.calls["GET /v1/catalog/products/{id}"] == 2
+    finally:
+        server.stop()
+
+    failing = MockZuoraServer(catalog_size=1, error_rate=1.0).start()
+    try:
+        response = requests.get(f"{failing.url}/v1/catalog/products", timeout=5)
+        assert response.status_code == 503
+        token = requests.post(f"{failing.url}/oauth/token", timeout=5)
+        assert token.status_code == 200, "OAuth is never failed"
+        assert failing.errors_injected == 1
+    finally:
+        failing.stop()
+    print("✅ Test passed: catalog served, errors injected on API calls only")
+
+
+def test_replay_model_steps():
+    """Steps are chosen by the current user message and assistant messages since."""
+    print("\n🧪 Test: Replay model steps")
+
+    recorded = [
+        {"role": "user", "content": [{"text": "User (ProductManager): list products"}]},
+        {
+            "role": "assistant",
+            "content": [
+                {
+                    "toolUse": {
+                        "toolUseId": "t1",
+                        "name": "list_zuora_products",
+                        "input": {},
+                    }
+                }
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {"toolResult": {"toolUseId": "t1", "content": [{"text": "..."}]}}
+            ],
+        },
+        {"role": "assistant", "content": [{"text": "Here they are."}]},
+    ]
+    scripts = script_from_messages(recorded)
+    assert scripts == {
+        "User (ProductManager): list products": [
+            {"tool_calls": [{"name": "list_zuora_products", "input": {}}]},
+            {"text": "Here they are."},
+        ]
+    }
+
+    model = ReplayModel(
+        {"list products": scripts["User (ProductManager): list products"]}
+    )
+    assert (
+        model.step_for(recorded[:1])
+        == scripts["User (ProductManager): list products"][0]
+    )
+    assert model.step_for(recorded[:3])["text"] == "Here they are."
+    assert (
+        "recorded answer"
+        in model.step_for([{"role": "user", "content": [{"text": "something else"}]}])[
+            "text"
+        ]
+    )
+    print("✅ Test passed: recorded conversation replayed step by step")
+
+
+def test_load_test_run():
+    """The corpus runs concurrently through invoke() without errors."""
+    print("\n🧪 Test: Load test run")
+
+    results = run_load_test(
+        concurrency=2, iterations=2, catalog_size=20, zuora_latency_ms=1, seed=1
+    )
+    expected_turns = 2 * sum(len(c["turns"]) for c in CONVERSATIONS)
+    assert results["turns"] == expected_turns
+    assert results["errors"] == 0
+    assert results["throughput_turns_per_s"] > 0
+    assert results["latency"]["count"] == expected_turns
+    assert set(results["latency_by_conversation"]) == {c["name"] for c in CONVERSATIONS}
+    assert results["zuora"]["calls_per_turn"] > 0
+    assert "GET /v1/catalog/products/{id}" in results["zuora"]["server_requests"]
+    # The second iteration reads the catalog from the API cache
+    assert results["cache"]["hits"] > 0
+    print(
+        f"✅ Test passed: {results['turns']} turns, "
+        f"{results['zuora']['calls_per_turn']} Zuora calls/turn, "
+        f"{results['cache']['hit_rate']}% cache hit rate"
+    )
+
+
+def run_all_tests():
+    """Run all load test harness tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING LOAD TEST HARNESS TESTS")
+    print("=" * 70)
+
+    test_mock_zuora_server()
+    test_replay_model_steps()
+    test_load_test_run()
+
+    print("\n" + "=" * 70)
+    print("ALL LOAD TEST HARNESS TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,142 @@
+"""
+Test cases for observability helpers.
+Checks endpoint templating for metric attributes, reuse of attribute sets
+and the trace_function fast paths.
+"""
+
+import os
+
+os.environ.setdefault("OTEL_ENABLED", "false")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON
+
+import agents.observability as observability
+from agents.observability import (
+    OTHER_ENDPOINT,
+    EndpointTemplater,
+    get_metrics_collector,
+    normalize_endpoint,
+    trace_function,
+)
+
+
+def test_endpoint_templates():
+    """Ids in endpoints are replaced so each product doesn't create a new series."""
+    print("\n🧪 Test: Endpoint templating")
+
+    cases = {
+        "/v1/catalog/products/8a80811c8f1a2b3c4d5e6f708192a3b4": "/v1/catalog/products/{id}",
+        "/v1/catalog/products/GOLD-001": "/v1/catalog/products/{id}",
+        "/v1/catalog/products?pageSize=20": "/v1/catalog/products",
+        "/v1/object/product-rate-plan/2c92c0f8": "/v1/object/product-rate-plan/{id}",
+        "/v1/accounts/A00001234/summary": "/v1/accounts/{id}/summary",
+        "/settings/batch-requests": "/settings/batch-requests",
+    }
+    for endpoint, expected in cases.items():
+        assert normalize_endpoint(endpoint) == expected, endpoint
+
+    print("✅ Test passed: known and unknown endpoints templated")
+
+
+def test_endpoint_cardinality_guard():
+    """Unknown templates beyond the limit collapse to a single value."""
+    print("\n🧪 Test: Endpoint cardinality guard")
+
+    templater = EndpointTemplater(max_templates=3)
+    names = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta"]
+    templates = [templater.template(f"/v1/{name}/list") for name in names]
+    assert len(set(templates) - {OTHER_ENDPOINT}) == 3
+    assert templates[-1] == OTHER_ENDPOINT
+    assert templater.template("/v1/catalog/products/P-1") == "/v1/catalog/products/{id}"
+
+    print("✅ Test passed: unknown endpoints capped, known endpoints unaffected")
+
+
+def test_attribute_sets_are_reused():
+    """The same attribute values map to the same dict on every call."""
+    print("\n🧪 Test: Pre-bound metric attributes")
+
+    metrics = get_metrics_collector()
+    first = metrics._attributes(("method", "GET"), ("endpoint", "/v1/catalog/products"))
+    second = metrics._attributes(
+        ("method", "GET"), ("endpoint", "/v1/catalog/products")
+    )
+    assert first is second
+    assert first == {"method": "GET", "endpoint": "/v1/catalog/products"}
+
+    metrics.record_api_call("GET", "/v1/catalog/products/P-1", 12.5, True)
+    metrics.record_api_call("GET", "/v1/catalog/products/P-2", 10.0, True)
+    key = (
+        ("method", "GET"),
+        ("endpoint", "/v1/catalog/products/{id}"),
+        ("success", "True"),
+    )
+    assert key in metrics._attribute_sets
+    print("✅ Test passed: attribute dicts shared across calls")
+
+
+def _traced(enabled, sampler, exporter):
+    """Decorate a function with trace_function under the given tracing mode."""
+    provider = TracerProvider(sampler=sampler)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    observability.OTEL_ENABLED = enabled
+    observability._tracer = provider.get_tracer("test")
+
+    @trace_function(span_name="test.add", attributes={"component": "test"})
+    def add(a, b):
+        return a + b
+
+    return add
+
+
+def test_trace_function_fast_paths():
+    """Disabled tracing returns the function; unsampled spans are not exported."""
+    print("\n🧪 Test: trace_function fast paths")
+
+    original = (observability.OTEL_ENABLED, observability._tracer)
+    exporter = InMemorySpanExporter()
+    try:
+        disabled = _traced(False, ALWAYS_ON, exporter)
+        assert not hasattr(disabled, "__wrapped__"), "Should be undecorated"
+        assert disabled(1, 2) == 3
+
+        unsampled = _traced(True, ALWAYS_OFF, exporter)
+        assert unsampled(1, 2) == 3
+        assert exporter.get_finished_spans() == ()
+
+        sampled = _traced(True, ALWAYS_ON, exporter)
+        assert sampled(1, 2) == 3
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "test.add"
+        assert span.attributes["component"] == "test"
+        assert span.attributes["function.name"] == "add"
+        assert "duration_ms" in span.attributes
+    finally:
+        observability.OTEL_ENABLED, observability._tracer = original
+
+    print("✅ Test passed: no-op when disabled, full span only when sampled")
+
+
+def run_all_tests():
+    """Run all observability tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING OBSERVABILITY TESTS")
+    print("=" * 70)
+
+    test_endpoint_templates()
+    test_endpoint_cardinality_guard()
+    test_attribute_sets_are_reused()
+    test_trace_function_fast_paths()
+
+    print("\n" + "=" * 70)
+    print("ALL OBSERVABILITY TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
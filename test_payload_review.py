@@ -0,0 +1,130 @@
+"""
+Test cases for the batch payload review at response-build time.
+Checks placeholder state derivation, that the rendered warning and
+recommendations match the per-payload HTML generators, and that unchanged
+payloads reuse the previous turn's review.
+"""
+
+from agents.html_formatter import (
+    generate_placeholder_recommendations_html,
+    generate_placeholder_warning_html,
+)
+from agents.payload_review import (
+    PayloadReviewCache,
+    payload_placeholders,
+    review_payload,
+)
+
+
+def _payloads():
+    return [
+        {
+            "payload": {
+                "Name": "Platform Fee",
+                "ChargeType": "Recurring",
+                "BillingPeriod": "<<PLACEHOLDER:BillingPeriod>>",
+            },
+            "zuora_api_type": "charge_create",
+            "payload_id": "c0",
+            "_placeholders": ["BillingPeriod"],
+        },
+        {
+            "payload": {
+                "Name": "Analytics",
+                "EffectiveStartDate": "2025-01-01",
+                "EffectiveEndDate": "<<PLACEHOLDER:EffectiveEndDate>>",
+            },
+            "zuora_api_type": "product_create",
+            "payload_id": "p0",
+            "_placeholders": ["EffectiveEndDate"],
+        },
+        {
+            "payload": {"Name": "Monthly", "ProductId": "@{Product[0].Id}"},
+            "zuora_api_type": "rate_plan_create",
+            "payload_id": "rp0",
+        },
+    ]
+
+
+def test_placeholder_state():
+    """_placeholders wins; otherwise placeholder values are found in the body."""
+    print("\n🧪 Test: Placeholder state")
+
+    entry = _payloads()[0]
+    assert payload_placeholders(entry) == ["BillingPeriod"]
+
+    del entry["_placeholders"]
+    entry["payload"]["Tiers"] = [
+        {"Price": "<<PLACEHOLDER:Price (required because ChargeModel=Tiered)>>"}
+    ]
+    assert payload_placeholders(entry) == ["BillingPeriod", "Price"]
+
+    review = review_payload(_payloads()[2])
+    assert review.placeholders == () and review.warning_item is None
+    assert review.missing == (), "Complete rate plan is valid"
+    assert review_payload(_payloads()[0]).missing, "Charge misses required fields"
+    print("✅ Test passed: placeholder state derived")
+
+
+def test_batch_matches_generators():
+    """The batch warning and recommendations equal the per-payload HTML."""
+    print("\n🧪 Test: Batch HTML matches generators")
+
+    payloads = _payloads()
+    batch = PayloadReviewCache().review(payloads)
+    assert batch.has_placeholders
+    assert [r.api_type for r in batch.with_placeholders] == [
+        "charge_create",
+        "product_create",
+    ]
+    with_placeholders = [p for p in payloads if p.get("_placeholders")]
+    assert batch.warning_html() == generate_placeholder_warning_html(with_placeholders)
+    assert batch.recommendations_html() == (
+        generate_placeholder_recommendations_html(with_placeholders)
+    )
+    assert batch.invalid_count == 1
+    empty = PayloadReviewCache().review([])
+    assert empty.warning_html() == "" and empty.recommendations_html() == ""
+    print("✅ Test passed: same HTML from one pass")
+
+
+def test_reuse_between_turns():
+    """Unchanged payloads reuse the previous turn's review, per conversation."""
+    print("\n🧪 Test: Review reuse")
+
+    cache = PayloadReviewCache(max_conversations=2)
+    payloads = _payloads()
+    assert cache.review(payloads, "a").reused == 0
+    assert cache.review(payloads, "a").reused == 3
+
+    payloads[0]["payload"]["BillingPeriod"] = "Month"
+    del payloads[0]["_placeholders"]
+    batch = cache.review(payloads, "a")
+    assert batch.reused == 2, "Only the edited payload is reviewed again"
+    assert [r.api_type for r in batch.with_placeholders] == ["product_create"]
+
+    assert cache.review(payloads, "b").reused == 0, "Conversations are separate"
+    cache.review(payloads, "c")
+    assert cache.review(payloads, "a").reused == 0, "Oldest conversation evicted"
+    assert cache.review(payloads).reused == 0, "No key, no reuse"
+    assert cache.stats()["conversations"] == 2
+    print("✅ Test passed: reviews reused by content hash")
+
+
+def run_all_tests():
+    """Run all payload review tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING PAYLOAD REVIEW TESTS")
+    print("=" * 70)
+
+    test_placeholder_state()
+    test_batch_matches_generators()
+    test_reuse_between_turns()
+
+    print("\n" + "=" * 70)
+    print("ALL PAYLOAD REVIEW TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,338 @@
+"""
+Test cases for server-side payload sessions and payload deltas.
+Checks the session store (versions, TTL, LRU, persistence), the change and
+diff helpers, JSON Patch generation, and /chat round trips that exchange only
+payload changes.
+"""
+
+import tempfile
+import time
+
+import agentcore_app
+from agents.json_patch import apply_patch, make_patch
+from agents.payload_session import (
+    PayloadSessionStore,
+    apply_payload_changes,
+    client_view,
+    diff_payloads,
+    get_payload_session_store,
+    payload_patches,
+    payloads_version,
+)
+from benchmarks.load_test import (
+    build_seed_payloads,
+    configure_zuora_client,
+    worker_agents,
+)
+from benchmarks.mock_zuora import MockZuoraServer
+from benchmarks.replay_model import ReplayModel
+
+
+def test_session_store():
+    """Versions follow content; sessions expire, are evicted and persist."""
+    print("\n🧪 Test: Payload session store")
+
+    payloads = build_seed_payloads(3)
+    store = PayloadSessionStore(max_sessions=2, ttl_seconds=60)
+    version = store.save("a", payloads)
+    assert version == payloads_version(payloads)
+    assert store.get("a") == (payloads, version)
+    assert store.get("missing") is None
+
+    store.save("b", payloads[:1])
+    store.get("a")
+    store.save("c", payloads[:2])
+    assert store.get("b") is None, "Least recently used session evicted"
+    assert store.get("a") is not None
+
+    expiring = PayloadSessionStore(ttl_seconds=0)
+    expiring.save("a", payloads)
+    time.sleep(0.01)
+    assert expiring.get("a") is None, "Session expired"
+
+    with tempfile.TemporaryDirectory() as directory:
+        version = PayloadSessionStore(directory=directory).save("a", payloads)
+        restarted = PayloadSessionStore(directory=directory)
+        assert restarted.get("a") == (payloads, version), "Loaded from disk"
+        restarted.clear()
+        assert PayloadSessionStore(directory=directory).get("a") is None
+    print("✅ Test passed: versions, TTL, LRU and persistence")
+
+
+def test_changes_and_diff():
+    """Client changes are upserted by payload_id; diffs list changes and removals."""
+    print("\n🧪 Test: Apply changes and diff")
+
+    base = build_seed_payloads(3)
+    changed = dict(base[1], payload={"Name": "Renamed"})
+    new = {"payload": {"Name": "New"}, "zuora_api_type": "charge_create"}
+    merged = apply_payload_changes(base, [changed, new], ["seed0000"])
+    assert [p["payload_id"] for p in merged[:2]] == ["seed0001", "seed0002"]
+    assert merged[0]["payload"]["Name"] == "Renamed"
+    assert merged[2]["payload_id"], "New payloads get an ID"
+    assert len(base) == 3, "Base list not modified"
+
+    added_or_changed, removed = diff_payloads(base, merged)
+    assert [p["payload_id"] for p in added_or_changed] == [
+        "seed0001",
+        merged[2]["payload_id"],
+    ]
+    assert removed == ["seed0000"]
+
+    assigned = [merged[2]["payload_id"]]
+    assert diff_payloads(merged, merged, assigned)[0] == [merged[2]]
+    patches = payload_patches(merged, merged, assigned)
+    assert patches["added"] == [client_view(merged[2])] and patches["changed"] == {}
+    print("✅ Test passed: upserts, removals and diff")
+
+
+def test_json_patch():
+    """Patches round-trip nested dicts and lists, with pointer escaping."""
+    print("\n🧪 Test: JSON Patch")
+
+    before = {
+        "Name": "Fee",
+        "a/b": 1,
+        "Tiers": [{"Price": 1}, {"Price": 2}, {"Price": 3}],
+        "Old": True,
+    }
+    after = {
+        "Name": "Platform Fee",
+        "a/b": 2,
+        "Tiers": [{"Price": 1}, {"Price": 5}],
+        "New": {"x": [1]},
+    }
+    patch = make_patch(before, after)
+    assert apply_patch(before, patch) == after
+    assert {"op": "replace", "path": "/a~1b", "value": 2} in patch
+    assert {"op": "remove", "path": "/Tiers/2"} in patch
+    assert make_patch(after, after) == []
+    assert apply_patch(after, make_patch(after, before)) == before
+
+    base = build_seed_payloads(2)
+    result = [dict(base[0], payload=dict(base[0]["payload"], Name="X"))]
+    result.append(
+        {"payload": {}, "zuora_api_type": "product_create", "payload_id": "n"}
+    )
+    patches = payload_patches(base, result)
+    assert patches["removed"] == ["seed0001"]
+    assert [p["payload_id"] for p in patches["added"]] == ["n"]
+    assert patches["changed"] == {
+        "seed0000": [{"op": "replace", "path": "/payload/Name", "value": "X"}]
+    }
+    assert client_view(dict(base[0], _placeholders=["Name"])) == base[0]
+    print("✅ Test passed: patches apply and payload patches are grouped")
+
+
+def test_chat_round_trip():
+    """Responses carry only changed payloads; requests only a version token."""
+    print("\n🧪 Test: Payload session round trip")
+
+    scripts = {
+        "Rename seed charge 1": [
+            {
+                "tool_calls": [
+                    {
+                        "name": "update_payload",
+                        "input": {
+                            "api_type": "charge_create",
+                            "payload_id": "seed0001",
+                            "field_path": "Name",
+                            "new_value": "Renamed Charge",
+                        },
+                    }
+                ]
+            },
+            {"text": "Renamed."},
+        ],
+        "What is left?": [{"text": "Two charges."}],
+    }
+    server = MockZuoraServer(catalog_size=2).start()
+    try:
+        configure_zuora_client(server)
+        with worker_agents(ReplayModel(scripts)):
+            request = {
+                "persona": "ProductManager",
+                "conversation_id": "payload-session-test",
+                "payload_session": True,
+            }
+            first = agentcore_app.invoke(
+                {
+                    **request,
+                    "message": "Rename seed charge 1",
+                    "zuora_api_payloads": build_seed_payloads(3),
+                }
+            )
+            assert [p["payload_id"] for p in first["zuora_api_payloads"]] == [
+                "seed0001"
+            ], "Only the changed payload is returned"
+            assert first["removed_payload_ids"] == []
+            assert first["zuora_api_payloads"][0]["payload"]["Name"] == "Renamed Charge"
+
+            second = agentcore_app.invoke(
+                {
+                    **request,
+                    "message": "What is left?",
+                    "payloads_version": first["payloads_version"],
+                    "removed_payload_ids": ["seed0000"],
+                }
+            )
+            assert second["zuora_api_payloads"] == []
+            assert second["payloads_version"] != first["payloads_version"]
+            stored, _ = get_payload_session_store().get(
+                "ProductManager:payload-session-test"
+            )
+            assert [p["payload_id"] for p in stored] == ["seed0001", "seed0002"]
+
+            stale = agentcore_app.invoke(
+                {
+                    **request,
+                    "message": "What is left?",
+                    "payloads_version": first["payloads_version"],
+                }
+            )
+            assert stale["payloads_resync"] is True
+
+            # Payloads sent without an ID are returned with the ID they were given
+            unidentified = {
+                "payload": {"Name": "P"},
+                "zuora_api_type": "product_create",
+            }
+            third = agentcore_app.invoke(
+                {
+                    **request,
+                    "message": "What is left?",
+                    "payloads_version": second["payloads_version"],
+                    "zuora_api_payloads": [unidentified],
+                }
+            )
+            returned = third["zuora_api_payloads"]
+            assert [p["payload"] for p in returned] == [{"Name": "P"}], returned
+            stored, _ = get_payload_session_store().get(
+                "ProductManager:payload-session-test"
+            )
+            assert stored[-1]["payload_id"] == returned[0]["payload_id"]
+            fresh = agentcore_app.invoke(
+                {
+                    **request,
+                    "conversation_id": "payload-session-new",
+                    "message": "What is left?",
+                    "zuora_api_payloads": [unidentified],
+                }
+            )
+            assert len(fresh["zuora_api_payloads"]) == 1, fresh
+            assert fresh["zuora_api_payloads"][0]["payload_id"]
+
+            full = agentcore_app.invoke(
+                {
+                    "persona": "ProductManager",
+                    "message": "What is left?",
+                    "zuora_api_payloads": build_seed_payloads(2),
+                }
+            )
+            assert len(full["zuora_api_payloads"]) == 2, "Default contract unchanged"
+            assert "payloads_version" not in full
+    finally:
+        server.stop()
+    print("✅ Test passed: deltas exchanged, stale version refused")
+
+
+def test_chat_delta_mode():
+    """Delta responses patch the client's copy; a stale base gets full payloads."""
+    print("\n🧪 Test: Payload delta mode")
+
+    scripts = {
+        "Raise seed charge 2": [
+            {
+                "tool_calls": [
+                    {
+                        "name": "update_payload",
+                        "input": {
+                            "api_type": "charge_create",
+                            "payload_id": "seed0002",
+                            "field_path": "BillingPeriod",
+                            "new_value": "Quarter",
+                        },
+                    }
+                ]
+            },
+            {"text": "Done."},
+        ],
+        "Show the payloads": [{"text": "Four charges."}],
+    }
+    server = MockZuoraServer(catalog_size=2).start()
+    try:
+        configure_zuora_client(server)
+        with worker_agents(ReplayModel(scripts)):
+            request = {
+                "persona": "ProductManager",
+                "conversation_id": "payload-delta-test",
+                "message": "Raise seed charge 2",
+                "payloads_delta": True,
+            }
+            client_payloads = build_seed_payloads(4)
+
+            full = agentcore_app.invoke(
+                {
+                    **request,
+                    "message": "Show the payloads",
+                    "zuora_api_payloads": client_payloads,
+                }
+            )
+            assert "payload_patches" not in full, "No base version: full payloads"
+            assert len(full["zuora_api_payloads"]) == 4
+            client_payloads = full["zuora_api_payloads"]
+            assert full["payloads_version"] == payloads_version(client_payloads)
+
+            delta = agentcore_app.invoke(
+                {
+                    **request,
+                    "zuora_api_payloads": client_payloads,
+                    "payloads_version": full["payloads_version"],
+                }
+            )
+            assert delta["zuora_api_payloads"] == []
+            patches = delta["payload_patches"]
+            assert patches["added"] == [] and patches["removed"] == []
+            assert list(patches["changed"]) == ["seed0002"]
+
+            patched = [
+                apply_patch(p, patches["changed"].get(p["payload_id"], []))
+                for p in client_payloads
+            ]
+            assert patched[2]["payload"]["BillingPeriod"] == "Quarter"
+            assert delta["payloads_version"] == payloads_version(patched)
+
+            stale = agentcore_app.invoke(
+                {
+                    **request,
+                    "zuora_api_payloads": client_payloads,
+                    "payloads_version": "0000000000000000",
+                }
+            )
+            assert "payload_patches" not in stale, "Mismatch falls back to full"
+            assert len(stale["zuora_api_payloads"]) == 4
+    finally:
+        server.stop()
+    print("✅ Test passed: patches applied, stale base gets full payloads")
+
+
+def run_all_tests():
+    """Run all payload session tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING PAYLOAD SESSION AND DELTA TESTS")
+    print("=" * 70)
+
+    test_session_store()
+    test_changes_and_diff()
+    test_json_patch()
+    test_chat_round_trip()
+    test_chat_delta_mode()
+
+    print("\n" + "=" * 70)
+    print("ALL PAYLOAD SESSION AND DELTA TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,185 @@
+"""
+Test cases for the indexed payload store.
+Checks the payload_id, type, name, parent and endpoint indexes, that they
+follow appends and in-place edits, and that tools using the store keep the
+list format in agent state.
+"""
+
+from types import SimpleNamespace
+
+from strands.agent.state import AgentState
+
+from agents.payload_store import PAYLOADS_STATE_KEY, PayloadStore
+from agents.tools import create_payload, update_payload
+from agents.validation_utils import (
+    validate_charge_name_unique,
+    validate_product_name_unique,
+    validate_rate_plan_name_unique,
+)
+
+
+def _payloads():
+    return [
+        {
+            "payload": {"Name": "Analytics Pro", "SKU": "AP"},
+            "zuora_api_type": "product_create",
+            "payload_id": "p0",
+        },
+        {
+            "payload": {"Name": "Monthly", "ProductId": "@{Product[0].Id}"},
+            "zuora_api_type": "rate_plan_create",
+            "payload_id": "rp0",
+        },
+        {
+            "payload": {
+                "Name": "Platform Fee",
+                "ProductRatePlanId": "@{ProductRatePlan[0].Id}",
+            },
+            "zuora_api_type": "charge_create",
+            "payload_id": "c0",
+        },
+        {
+            "payload": {
+                "method": "PUT",
+                "endpoint": "/v1/object/product/8a80abc",
+                "body": {"EffectiveEndDate": "2026-01-01"},
+            },
+            "zuora_api_type": "product_update",
+            "payload_id": "u0",
+        },
+    ]
+
+
+def test_indexes():
+    """Lookups by id, type, name, parent and endpoint entity."""
+    print("\n🧪 Test: Payload store indexes")
+
+    store = PayloadStore(_payloads())
+    assert len(store) == 4
+    assert store.get("rp0")[0] == 1
+    assert store.get("rp0", "charge_create") is None, "Type must match"
+    assert store.get("missing") is None
+    assert store.count("PRODUCT_CREATE") == 1, "Types are case-insensitive"
+    assert store.types() == [
+        "product_create",
+        "rate_plan_create",
+        "charge_create",
+        "product_update",
+    ]
+    assert store.find_by_name("analytics pro", ["product_create"])[0] == 0
+    assert (
+        store.find_by_name("Monthly", ["rate_plan_create"], "@{Product[1].Id}") is None
+    )
+    assert [i for i, _ in store.children("@{Product[0].Id}", "rate_plan_create")] == [1]
+    assert store.find_update("product_update", "8a80abc") == 3
+    assert store.find_update("rate_plan_update", "8a80abc") is None
+    assert store.to_list() is store.payloads
+    print("✅ Test passed: all indexes answer")
+
+
+def test_append_and_reindex():
+    """Indexes follow appended entries and in-place edits."""
+    print("\n🧪 Test: Append and reindex")
+
+    store = PayloadStore(_payloads())
+    index = store.append(
+        {
+            "payload": {"Name": "Annual", "ProductId": "@{Product[0].Id}"},
+            "zuora_api_type": "rate_plan_create",
+            "payload_id": "rp1",
+        }
+    )
+    assert index == 4 and store.get("rp1")[0] == 4
+    assert [i for i, _ in store.of_type("rate_plan_create")] == [1, 4]
+
+    store.payloads[1]["payload"]["Name"] = "Quarterly"
+    store.reindex(1)
+    assert store.find_by_name("Monthly", ["rate_plan_create"]) is None
+    assert store.find_by_name("Quarterly", ["rate_plan_create"])[0] == 1
+    assert [i for i, _ in store.of_type("rate_plan_create")] == [1, 4]
+
+    # Client-sent payloads may hold non-string names and parents
+    odd = {
+        "payload": {"Name": 123, "ProductId": [1]},
+        "zuora_api_type": "rate_plan_create",
+    }
+    store = PayloadStore(_payloads() + [odd])
+    assert store.find_by_name("123", ["rate_plan_create"]) is None
+    assert [i for i, _ in store.of_type("rate_plan_create")] == [1, 4]
+    print("✅ Test passed: indexes current after append and edit")
+
+
+def test_unique_validators_accept_list_or_store():
+    """Name uniqueness checks give the same answer for a list or a store."""
+    print("\n🧪 Test: Unique validators")
+
+    for payloads in (_payloads(), PayloadStore(_payloads())):
+        assert not validate_product_name_unique("ANALYTICS PRO", payloads)[0]
+        assert validate_product_name_unique("Other", payloads)[0]
+        assert not validate_rate_plan_name_unique(
+            "monthly", "@{Product[0].Id}", payloads
+        )[0]
+        is_unique, _ = validate_rate_plan_name_unique(
+            "Monthly", "@{Product[1].Id}", payloads
+        )
+        assert is_unique, "Same name under another product is allowed"
+        assert not validate_charge_name_unique(
+            "Platform Fee", "@{ProductRatePlan[0].Id}", payloads
+        )[0]
+        assert validate_charge_name_unique("Platform Fee", "", payloads)[0]
+    print("✅ Test passed: list and store agree")
+
+
+def test_tools_keep_list_format():
+    """create_payload and update_payload read and write the plain list."""
+    print("\n🧪 Test: Tools keep list format")
+
+    tool_context = SimpleNamespace(agent=SimpleNamespace(state=AgentState()))
+    tool_context.agent.state.set(PAYLOADS_STATE_KEY, _payloads())
+
+    create_payload(
+        tool_context,
+        "product_create",
+        {"Name": "Storage Plus", "SKU": "SP", "EffectiveStartDate": "2025-01-01"},
+    )
+    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY)
+    assert isinstance(payloads, list) and len(payloads) == 5
+    new_id = payloads[-1]["payload_id"]
+
+    result = update_payload(
+        tool_context, "product_create", "Description", "Bigger disks", payload_id=new_id
+    )
+    assert "Updated" in result, result
+    result = update_payload(
+        tool_context,
+        "product_create",
+        "Description",
+        "Dashboards",
+        payload_name="analytics",
+    )
+    assert "Updated" in result, result
+
+    payloads = tool_context.agent.state.get(PAYLOADS_STATE_KEY)
+    assert payloads[4]["payload"]["Description"] == "Bigger disks"
+    assert payloads[0]["payload"]["Description"] == "Dashboards"
+    print("✅ Test passed: state holds the updated list")
+
+
+def run_all_tests():
+    """Run all payload store tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING PAYLOAD STORE TESTS")
+    print("=" * 70)
+
+    test_indexes()
+    test_append_and_reindex()
+    test_unique_validators_accept_list_or_store()
+    test_tools_keep_list_format()
+
+    print("\n" + "=" * 70)
+    print("ALL PAYLOAD STORE TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
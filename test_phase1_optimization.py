@@ -1,97 +1,209 @@
 """
 Test script to verify Phase 1 optimization (Conversation History Limiting).
 
-This script tests the get_bounded_session_id function to ensure it properly
-limits conversation history by rotating through N session buckets.
+This script tests the token-budgeted conversation window: recent turns are
+kept, turns whose tool results reference live payloads are pinned, older
+turns are summarised, and the kept history fits the token budget.
 """
 
-from agentcore_app import get_bounded_session_id, invoke
+from agentcore_app import invoke
+from agents.compaction import BackgroundCompactor, compact_messages
+from agents.conversation import (
+    STATE_PREFIX,
+    SUMMARY_PREFIX,
+    ConversationStore,
+    estimate_tokens,
+    split_turns,
+    window_messages,
+)
 import time
 
 
-def test_session_rotation():
-    """Test that session IDs rotate through buckets correctly."""
+def _turn(index: int, tool_result: str = "", result_size: int = 0) -> list:
+    """Build one conversation turn, optionally with a tool call and result."""
+    messages = [{"role": "user", "content": [{"text": f"Question {index}"}]}]
+    if tool_result or result_size:
+        tool_use_id = f"tool-{index}"
+        messages.append(
+            {
+                "role": "assistant",
+                "content": [
+                    {
+                        "toolUse": {
+                            "toolUseId": tool_use_id,
+                            "name": "create_product",
+                            "input": {"name": f"Product {index}"},
+                        }
+                    }
+                ],
+            }
+        )
+        messages.append(
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "toolResult": {
+                            "toolUseId": tool_use_id,
+                            "status": "success",
+                            "content": [{"text": tool_result + "x" * result_size}],
+                        }
+                    }
+                ],
+            }
+        )
+    messages.append({"role": "assistant", "content": [{"text": f"Answer {index}"}]})
+    return messages
+
+
+def _history(*turns) -> list:
+    return [message for turn in turns for message in turn]
+
+
+def test_conversation_window():
+    """Test the sliding window, payload pinning and token budget."""
     print("\n" + "=" * 70)
-    print("PHASE 1 OPTIMIZATION TEST: Session ID Rotation")
+    print("PHASE 1 OPTIMIZATION TEST: Token-Budgeted Conversation Window")
     print("=" * 70)
 
-    # Test 1: Deterministic mapping
-    print("\n[Test 1] Deterministic Mapping")
+    # Test 1: Sliding window keeps the most recent turns
+    print("\n[Test 1] Sliding Window")
     print("-" * 70)
-    conv_id = "test-conv-001"
-    session_ids = [get_bounded_session_id(conv_id, max_turns=3) for _ in range(5)]
-    print(f"Conversation ID: {conv_id}")
-    print("Generated Session IDs (5 calls):")
-    for i, sid in enumerate(session_ids, 1):
-        print(f"  Call {i}: {sid}")
-
-    if len(set(session_ids)) == 1:
-        print("✓ PASS: All calls generate the same session ID (deterministic)")
-    else:
-        print("✗ FAIL: Session IDs should be identical")
-
-    # Test 2: Bucket distribution
-    print("\n[Test 2] Bucket Distribution")
+    messages = _history(*[_turn(i) for i in range(6)])
+    windowed = window_messages(messages, set(), max_turns=3, token_budget=10000)
+    turns = split_turns(windowed)
+    print(f"Turns before: 6, after: {len(turns)}")
+    assert len(turns) == 3, "Should keep the last 3 turns"
+    first_text = turns[0][0]["content"][0]["text"]
+    assert first_text.startswith(SUMMARY_PREFIX), "Dropped turns should be summarised"
+    assert "Question 0" in first_text and "Question 2" in first_text
+    assert turns[0][0]["content"][1]["text"] == "Question 3"
+    print("✓ PASS: Last 3 turns kept, older turns folded into a summary")
+
+    # Test 2: Turns referencing live payloads are pinned
+    print("\n[Test 2] Live Payload Pinning")
     print("-" * 70)
-    bucket_counts = {0: 0, 1: 0, 2: 0}
-    for i in range(30):
-        conv_id = f"conv-{i:03d}"
-        session_id = get_bounded_session_id(conv_id, max_turns=3)
-        bucket = int(session_id.split("_b")[1])
-        bucket_counts[bucket] += 1
-
-    print("Distribution across 30 conversation IDs:")
-    for bucket, count in sorted(bucket_counts.items()):
-        pct = (count / 30) * 100
-        print(f"  Bucket {bucket}: {count:2d} conversations ({pct:5.1f}%)")
-
-    # Check if distribution is reasonable (should be roughly 33% each)
-    max_count = max(bucket_counts.values())
-    min_count = min(bucket_counts.values())
-    if max_count - min_count <= 5:  # Allow some variance
-        print("✓ PASS: Reasonable distribution across buckets")
-    else:
-        print("⚠ WARNING: Uneven distribution (may be acceptable)")
-
-    # Test 3: Empty conversation_id handling
-    print("\n[Test 3] Empty Conversation ID")
+    messages = _history(
+        _turn(0, tool_result="Created payload_id: abc123"),
+        _turn(1, tool_result="Created payload_id: old999"),
+        *[_turn(i) for i in range(2, 6)],
+    )
+    windowed = window_messages(messages, {"abc123"}, max_turns=3, token_budget=10000)
+    texts = [c.get("text", "") for m in windowed for c in m["content"]]
+    assert "Question 0" in texts, "Turn with live payload should be pinned"
+    assert "Question 1" not in texts, "Turn with stale payload should be dropped"
+    assert len(split_turns(windowed)) == 4
+    print("✓ PASS: Live payload turn pinned, stale payload turn dropped")
+
+    # Test 3: Token budget drops unpinned turns first, then truncates
+    print("\n[Test 3] Token Budget")
     print("-" * 70)
-    empty_session = get_bounded_session_id("", max_turns=3)
-    print(f"Empty conversation_id result: {empty_session}")
-    if len(empty_session) == 36 and "-" in empty_session:
-        print("✓ PASS: Returns valid UUID for empty conversation_id")
-    else:
-        print("✗ FAIL: Should return UUID")
-
-    # Test 4: Different max_turns values
-    print("\n[Test 4] Different max_turns Values")
+    messages = _history(
+        _turn(0, tool_result="payload_id: abc123 "),
+        _turn(1, result_size=8000),
+        _turn(2),
+        _turn(3, result_size=20000),
+    )
+    windowed = window_messages(messages, {"abc123"}, max_turns=3, token_budget=1000)
+    tokens = estimate_tokens(windowed)
+    texts = [c.get("text", "") for m in windowed for c in m["content"]]
+    print(f"Tokens before: {estimate_tokens(messages)}, after: {tokens}")
+    assert tokens <= 1000, "History should fit the token budget"
+    assert "Question 3" in texts, "Most recent turn is always kept"
+    assert "Question 1" not in texts and "Question 2" not in texts
+    print("✓ PASS: History fits budget, most recent turn kept")
+
+    # Test 4: Summaries are merged across windowing passes
+    print("\n[Test 4] Summary Merging")
+    print("-" * 70)
+    windowed = window_messages(
+        _history(*[_turn(i) for i in range(4)]), set(), max_turns=2, token_budget=10000
+    )
+    windowed = window_messages(
+        windowed + _turn(4) + _turn(5), set(), max_turns=2, token_budget=10000
+    )
+    summary = windowed[0]["content"][0]["text"]
+    assert summary.count(SUMMARY_PREFIX) == 1
+    assert all(f"Question {i}" in summary for i in range(4))
+    print("✓ PASS: A single summary covers every dropped turn")
+
+    # Test 5: Conversation store isolation and LRU eviction
+    print("\n[Test 5] Conversation Store")
     print("-" * 70)
-    conv_id = "test-multi-bucket"
-    for max_turns in [2, 3, 5]:
-        session_id = get_bounded_session_id(conv_id, max_turns=max_turns)
-        bucket = int(session_id.split("_b")[1])
-        print(f"  max_turns={max_turns}: bucket {bucket} (valid: 0-{max_turns - 1})")
-        if 0 <= bucket < max_turns:
-            print("    ✓ Bucket within valid range")
-        else:
-            print("    ✗ Bucket out of range!")
+    store = ConversationStore(max_conversations=2, ttl_seconds=60)
+    store.save("ProductManager:a", _turn(0))
+    store.save("ProductManager:b", _turn(1))
+    store.load("ProductManager:a")
+    store.save("ProductManager:c", _turn(2))
+    assert store.load("ProductManager:b") == [], "Least recently used is evicted"
+    assert store.load("ProductManager:a") == _turn(0)
+    assert store.load("unknown") == []
+    print("✓ PASS: Histories isolated per conversation, LRU eviction works")
 
     print("\n" + "=" * 70)
     print("PHASE 1 OPTIMIZATION TEST COMPLETE")
     print("=" * 70)
-    print("\nSummary:")
-    print("- Session ID rotation is working correctly")
-    print("- Buckets are distributed reasonably")
-    print("- Edge cases handled properly")
-    print("\nExpected benefits:")
-    print("  • 70-90% reduction in input tokens for long conversations")
-    print("  • 5-10x faster response times")
-    print("  • Significant cost savings")
+
+
+def test_background_compaction():
+    """Test that compaction condenses old turns and runs off the request path."""
+    print("\n" + "=" * 70)
+    print("PHASE 1 OPTIMIZATION TEST: Background Compaction")
     print("=" * 70)
 
+    payloads = [
+        {
+            "payload_id": "abc123",
+            "zuora_api_type": "product",
+            "payload": {"Name": "Gold Plan"},
+        }
+    ]
+
+    # Test 1: Older turns condensed, bulky tool results compacted
+    print("\n[Test 1] Compaction")
+    print("-" * 70)
+    messages = _history(
+        _turn(0, tool_result="payload_id: abc123 ", result_size=6000),
+        _turn(1, result_size=6000),
+    )
+    compacted = compact_messages(
+        messages, payloads, keep_recent_turns=1, tool_result_chars=2000
+    )
+    turns = split_turns(compacted)
+    summary = turns[0][0]["content"][0]["text"]
+    print(
+        f"Tokens before: {estimate_tokens(messages)}, after: {estimate_tokens(compacted)}"
+    )
+    assert len(turns[0]) == 2, "Older turn should keep only request and answer"
+    assert turns[0][1]["content"][0]["text"] == "Answer 0"
+    assert STATE_PREFIX in summary and '"abc123"' in summary
+    assert '"create_product":1' in summary, "State should record tools used"
+    result_text = turns[1][2]["content"][0]["toolResult"]["content"][0]["text"]
+    assert len(result_text) < 2000 and "[compacted:" in result_text
+    assert compact_messages(compacted, payloads, keep_recent_turns=1) == compacted
+    print("✓ PASS: Old turns condensed, state kept, compaction is idempotent")
+
+    # Test 2: Background compaction updates the store, stale results are dropped
+    print("\n[Test 2] Background Compactor")
+    print("-" * 70)
+    store = ConversationStore(max_conversations=10, ttl_seconds=60)
+    compactor = BackgroundCompactor(store)
+    store.save("BillingArchitect:a", messages)
+    future = compactor.schedule("BillingArchitect:a", payloads)
+    assert future.result(timeout=10) is True
+    assert estimate_tokens(store.load("BillingArchitect:a")) < estimate_tokens(messages)
+
+    _, version = store.snapshot("BillingArchitect:a")
+    store.save("BillingArchitect:a", messages)
+    assert not store.replace(
+        "BillingArchitect:a", [], version
+    ), "Stale rewrite rejected"
+    print(f"Compactor stats: {compactor.stats()}")
+    print("✓ PASS: Compacted history stored, newer turns never overwritten")
+
 
 def test_agent_invocation():
-    """Test that agent invocation works with bounded session IDs."""
+    """Test that agent invocation keeps history across turns."""
     print("\n" + "=" * 70)
     print("AGENT INVOCATION TEST")
     print("=" * 70)
@@ -135,7 +247,8 @@ def test_agent_invocation():
 
 if __name__ == "__main__":
     # Run tests
-    test_session_rotation()
+    test_conversation_window()
+    test_background_compaction()
 
     # Optional: Test agent invocation (requires Zuora credentials)
     print("\n\nTo test agent invocation, uncomment the line below:")
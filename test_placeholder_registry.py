@@ -0,0 +1,123 @@
+"""
+Test cases for the per-payload placeholder registry.
+Checks that generated placeholders are recorded once, that create_payload and
+update_payload keep the registry and _placeholders in step, and that entries
+without a registry are still handled.
+"""
+
+from types import SimpleNamespace
+
+from strands.agent.state import AgentState
+
+from agents.payload_store import PAYLOADS_STATE_KEY
+from agents.placeholders import (
+    PLACEHOLDER_REGISTRY_KEY,
+    placeholder_fields,
+    placeholder_registry,
+    resolve_placeholder,
+)
+from agents.tools import create_payload, update_payload
+from agents.validation_schemas import generate_placeholder_payload
+
+
+def test_generated_placeholders_recorded():
+    """generate_placeholder_payload fills the registry, nested fields included."""
+    print("\n🧪 Test: Generated placeholders recorded")
+
+    registry = {}
+    payload, fields = generate_placeholder_payload(
+        "account",
+        {"name": "Acme"},
+        [
+            ("billToContact.firstName", "Contact first name"),
+            ("currency", "Account currency"),
+        ],
+        registry,
+    )
+    assert fields == ["billToContact.firstName", "currency"]
+    assert list(registry) == ["billtocontact.firstname", "currency"]
+    meta = registry["billtocontact.firstname"]
+    assert meta["path"] == ["billToContact", "firstName"]
+    assert payload["billToContact"]["firstName"] == meta["marker"]
+    assert meta["description"] == "Contact first name"
+    print("✅ Test passed: registry filled while generating")
+
+
+def test_tools_track_placeholders():
+    """create_payload stores the registry; update_payload resolves by lookup."""
+    print("\n🧪 Test: Tools track placeholders")
+
+    tool_context = SimpleNamespace(agent=SimpleNamespace(state=AgentState()))
+    create_payload(
+        tool_context, "charge_create", {"Name": "Platform Fee", "ChargeType": "Usage"}
+    )
+    entry = tool_context.agent.state.get(PAYLOADS_STATE_KEY)[0]
+    registry = entry[PLACEHOLDER_REGISTRY_KEY]
+    assert entry["_placeholders"] == [meta["field"] for meta in registry.values()]
+    assert "BillingPeriod" not in entry["_placeholders"], "Usage has no period"
+    assert "UOM" in entry["_placeholders"]
+
+    remaining = [f for f in entry["_placeholders"] if f != "UOM"]
+    result = update_payload(
+        tool_context, "charge_create", "uom", "Each", payload_id=entry["payload_id"]
+    )
+    entry = tool_context.agent.state.get(PAYLOADS_STATE_KEY)[0]
+    assert entry["_placeholders"] == remaining
+    assert "uom" not in entry[PLACEHOLDER_REGISTRY_KEY]
+    assert f"Still needs: {', '.join(remaining)}" in result, result
+
+    for field in remaining:
+        update_payload(
+            tool_context, "charge_create", field, "x", payload_id=entry["payload_id"]
+        )
+    entry = tool_context.agent.state.get(PAYLOADS_STATE_KEY)[0]
+    assert "_placeholders" not in entry and PLACEHOLDER_REGISTRY_KEY not in entry
+    print("✅ Test passed: registry and _placeholders kept in step")
+
+
+def test_entries_without_registry():
+    """Older entries use _placeholders; client-returned ones are scanned once."""
+    print("\n🧪 Test: Entries without a registry")
+
+    legacy = {
+        "payload": {"Name": "A", "BillingPeriod": "<<PLACEHOLDER:BillingPeriod>>"},
+        "_placeholders": ["BillingPeriod", "Billing_Period"],
+    }
+    assert placeholder_fields(legacy) == ["BillingPeriod", "Billing_Period"]
+    assert list(placeholder_registry(legacy)) == ["billingperiod"]
+    assert resolve_placeholder(legacy, "billing_period") == "Billing_Period"
+    assert "_placeholders" not in legacy, "Duplicates resolved together"
+
+    returned = {
+        "payload": {
+            "Name": "A",
+            "Tiers": [{"Price": "<<PLACEHOLDER:Price (required because X=y)>>"}],
+        }
+    }
+    registry = placeholder_registry(returned)
+    assert registry["price"]["path"] == ["Tiers", "0", "Price"]
+    assert PLACEHOLDER_REGISTRY_KEY not in returned, "Reading does not store"
+    assert resolve_placeholder(returned, "Name") is None
+    assert resolve_placeholder(returned, "Tiers.0.Price", "Price") == "Price"
+    returned["payload"]["Tiers"][0]["Price"] = 10
+    assert placeholder_fields(returned) == []
+    print("✅ Test passed: registry derived when missing")
+
+
+def run_all_tests():
+    """Run all placeholder registry tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING PLACEHOLDER REGISTRY TESTS")
+    print("=" * 70)
+
+    test_generated_placeholders_recorded()
+    test_tools_track_placeholders()
+    test_entries_without_registry()
+
+    print("\n" + "=" * 70)
+    print("ALL PLACEHOLDER REGISTRY TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,95 @@
+"""
+Test cases for the request-scoped sampling profiler.
+Checks that samples are attributed to tools, that threads waiting on other
+threads are skipped, and that collapsed stacks and flamegraphs are written.
+"""
+
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+from agents.profiling import (
+    NO_TOOL,
+    SamplingProfiler,
+    register_tool_code,
+    render_flamegraph,
+    write_profile,
+)
+
+
+def busy_tool(seconds):
+    """Stand-in for a CPU-heavy tool function."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(500))
+
+
+def _profile_tool_thread():
+    """Profile a tool running in a worker thread while this thread waits."""
+    register_tool_code(busy_tool, "busy_tool")
+    profiler = SamplingProfiler(interval_ms=2)
+    profiler.start()
+    worker = threading.Thread(target=busy_tool, args=(0.2,))
+    worker.start()
+    worker.join()  # blocked waiting: should not be sampled
+    return profiler.stop()
+
+
+def test_samples_attributed_to_tools():
+    """Samples inside a registered tool function are grouped under its name."""
+    print("\n🧪 Test: Samples attributed to tools")
+
+    profile = _profile_tool_thread()
+    by_tool = profile.by_tool()
+    assert profile.total_samples > 0
+    assert "busy_tool" in by_tool
+    assert by_tool["busy_tool"]["samples"] >= 0.9 * profile.total_samples
+    assert by_tool["busy_tool"]["top_functions"][0][0] == "test_profiling:busy_tool"
+    assert NO_TOOL not in by_tool, "Waiting thread should be skipped"
+
+    stack, count = profile.collapsed_text().splitlines()[0].rsplit(" ", 1)
+    assert stack.startswith("busy_tool;") and stack.endswith(
+        ";test_profiling:busy_tool"
+    )
+    assert int(count) > 0
+    print(f"✅ Test passed: {profile.total_samples} samples attributed to busy_tool")
+
+
+def test_flamegraph_output():
+    """Collapsed stacks and a well-formed SVG flamegraph are written."""
+    print("\n🧪 Test: Flamegraph output")
+
+    svg = render_flamegraph(
+        {"read;app:invoke;tools:get_payloads": 3, "(agent);app:invoke;html:<fmt>": 1}
+    )
+    root = ET.fromstring(svg)
+    titles = [el.text for el in root.iter("{http://www.w3.org/2000/svg}title")]
+    assert "tools:get_payloads (3 samples, 75.0%)" in titles
+    assert "html:<fmt> (1 samples, 25.0%)" in titles
+
+    profile = _profile_tool_thread()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_profile(profile, tmp, "request")
+        with open(paths["collapsed"], encoding="utf-8") as f:
+            assert f.read() == profile.collapsed_text()
+        ET.parse(paths["flamegraph"])
+    print("✅ Test passed: collapsed stacks and SVG written")
+
+
+def run_all_tests():
+    """Run all profiling tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING PROFILING TESTS")
+    print("=" * 70)
+
+    test_samples_attributed_to_tools()
+    test_flamegraph_output()
+
+    print("\n" + "=" * 70)
+    print("ALL PROFILING TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,95 @@
+"""
+Test cases for per-request token and tool-call accounting.
+Checks that usage is the difference between two snapshots of the agent's
+cumulative event loop metrics.
+"""
+
+from types import SimpleNamespace
+
+from agents.accounting import build_request_accounting, snapshot_agent_metrics
+
+
+def _agent(cycles, input_tokens, output_tokens, cache_read, tools):
+    """Build an object shaped like a strands agent's event loop metrics."""
+    return SimpleNamespace(
+        event_loop_metrics=SimpleNamespace(
+            cycle_count=cycles,
+            accumulated_usage={
+                "inputTokens": input_tokens,
+                "outputTokens": output_tokens,
+                "totalTokens": input_tokens + output_tokens,
+                "cacheReadInputTokens": cache_read,
+            },
+            accumulated_metrics={"latencyMs": cycles * 500},
+            tool_metrics={
+                name: SimpleNamespace(call_count=c, error_count=e, total_time=t)
+                for name, (c, e, t) in tools.items()
+            },
+        )
+    )
+
+
+def test_accounting_is_per_request():
+    """Second request's accounting excludes the first request's usage."""
+    print("\n🧪 Test: Accounting is computed per request")
+
+    before = snapshot_agent_metrics(
+        _agent(2, 3000, 400, 0, {"get_payloads": (1, 0, 0.05)})
+    )
+    after = snapshot_agent_metrics(
+        _agent(
+            5,
+            9000,
+            1000,
+            2500,
+            {"get_payloads": (2, 0, 0.08), "create_product": (1, 1, 1.2)},
+        )
+    )
+    turn = [
+        {
+            "role": "user",
+            "content": [
+                {
+                    "toolResult": {
+                        "toolUseId": "t1",
+                        "status": "success",
+                        "content": [{"text": "é" * 10}],
+                    }
+                }
+            ],
+        }
+    ]
+
+    accounting = build_request_accounting(before, after, turn)
+    assert accounting.model_calls == 3
+    assert accounting.input_tokens == 6000
+    assert accounting.output_tokens == 600
+    assert accounting.cache_read_tokens == 2500
+    assert accounting.model_latency_ms == 1500
+    assert set(accounting.tool_calls) == {"get_payloads", "create_product"}
+    assert accounting.tool_calls["create_product"].errors == 1
+    assert round(accounting.tool_calls["get_payloads"].duration_ms) == 30
+    assert accounting.total_tool_calls == 2
+    assert accounting.tool_output_bytes == 20, "Bytes are UTF-8 encoded size"
+
+    debug = accounting.to_dict()
+    assert debug["total_tool_calls"] == 2
+    assert debug["tool_calls"]["create_product"]["duration_ms"] == 1200.0
+    print("✅ Test passed: deltas, tool stats and output bytes are correct")
+
+
+def run_all_tests():
+    """Run all accounting tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING REQUEST ACCOUNTING TESTS")
+    print("=" * 70)
+
+    test_accounting_is_per_request()
+
+    print("\n" + "=" * 70)
+    print("ALL REQUEST ACCOUNTING TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
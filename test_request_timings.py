@@ -0,0 +1,109 @@
+"""
+Test cases for the per-request timing breakdown.
+Checks phase and component timings, the Server-Timing value and that timings
+recorded in agent/tool threads reach the request.
+"""
+
+import asyncio
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.timings import (
+    TIMING_VALIDATION,
+    TIMING_ZUORA,
+    end_request_timings,
+    get_request_timings,
+    record_timing,
+    start_request_timings,
+    timed,
+)
+
+
+def test_phases_and_server_timing():
+    """Phases and component totals are reported in ms and as Server-Timing."""
+    print("\n🧪 Test: Phases and Server-Timing value")
+
+    token = start_request_timings()
+    try:
+        timings = get_request_timings()
+        with timings.phase("parse"):
+            pass
+        with timings.phase("invoke"):
+            record_timing(TIMING_ZUORA, 120.0)
+            record_timing(TIMING_ZUORA, 80.0)
+        with timed(TIMING_VALIDATION):
+            pass
+        result = timings.to_dict()
+    finally:
+        end_request_timings(token)
+
+    assert list(result["phases"]) == ["parse", "invoke"]
+    assert result["components"]["zuora"] == {"duration_ms": 200.0, "count": 2}
+    assert result["components"]["validation"]["count"] == 1
+    assert result["total_ms"] >= result["phases"]["invoke"]
+
+    header = result["server_timing"]
+    entries = header.split(", ")
+    assert entries[0].startswith("parse;dur=")
+    assert 'zuora;desc="2 calls";dur=200.0' in entries
+    assert entries[-1] == f"total;dur={result['total_ms']:.1f}"
+    assert all(re.fullmatch(r'\w+(;desc="[^"]*")?;dur=\d+\.\d', e) for e in entries)
+    assert get_request_timings() is None
+    print(f"✅ Test passed: {header}")
+
+
+def test_timings_cross_agent_threads():
+    """Time recorded in tool threads is added to the request that started them."""
+    print("\n🧪 Test: Timings recorded from agent and tool threads")
+
+    def tool():
+        record_timing(TIMING_ZUORA, 50.0)
+
+    async def agent_loop():
+        await asyncio.gather(asyncio.to_thread(tool), asyncio.to_thread(tool))
+
+    token = start_request_timings()
+    try:
+        # Same pattern Strands uses to run the agent from a sync call
+        with ThreadPoolExecutor() as executor:
+            context = contextvars.copy_context()
+            executor.submit(context.run, lambda: asyncio.run(agent_loop())).result()
+        timings = get_request_timings()
+    finally:
+        end_request_timings(token)
+
+    assert timings.components[TIMING_ZUORA] == 100.0
+    assert timings.counts[TIMING_ZUORA] == 2
+
+    record_timing(TIMING_ZUORA, 10.0)  # outside a request: ignored
+    assert timings.counts[TIMING_ZUORA] == 2
+
+    # Concurrent tools add to the same request without losing counts
+    def many_calls():
+        for _ in range(20000):
+            timings.add(TIMING_VALIDATION, 0.0)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(many_calls) for _ in range(8)]:
+            future.result()
+    assert timings.counts[TIMING_VALIDATION] == 160000
+    print("✅ Test passed: tool-thread timings reach the request")
+
+
+def run_all_tests():
+    """Run all request timing tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING REQUEST TIMING TESTS")
+    print("=" * 70)
+
+    test_phases_and_server_timing()
+    test_timings_cross_agent_threads()
+
+    print("\n" + "=" * 70)
+    print("ALL REQUEST TIMING TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
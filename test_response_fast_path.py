@@ -0,0 +1,121 @@
+"""
+Test cases for the response fast path.
+Checks batch payload validation against per-payload models, that the JSON
+bytes and dict forms of a response agree, and that the HTTP entry point
+serves the same response body as invoke().
+"""
+
+import json
+
+from starlette.testclient import TestClient
+
+import agentcore_app
+from agents.models import (
+    ChatResponse,
+    Citation,
+    ZuoraApiPayload,
+    chat_response_dict,
+    chat_response_json,
+    trusted_payloads,
+)
+from benchmarks.load_test import (
+    build_seed_payloads,
+    configure_zuora_client,
+    worker_agents,
+)
+from benchmarks.mock_zuora import MockZuoraServer
+from benchmarks.replay_model import ReplayModel
+
+
+def test_trusted_payloads():
+    """Batch validation equals per-payload models, with the same fallback."""
+    print("\n🧪 Test: Trusted payloads")
+
+    entries = build_seed_payloads(5)
+    entries[0]["_placeholders"] = ["Name"]
+    models = trusted_payloads(entries)
+    assert [m.model_dump() for m in models] == [
+        ZuoraApiPayload(**e).model_dump() for e in entries
+    ]
+    assert "_placeholders" not in models[0].model_dump()
+
+    broken = entries[:2] + [{"zuora_api_type": "charge_create", "payload_id": "x"}]
+    models = trusted_payloads(broken)
+    assert len(models) == 3 and models[2].payload == {}, "Falls back per entry"
+    print("✅ Test passed: batch and per-payload models agree")
+
+
+def test_json_matches_dict():
+    """JSON bytes and dict omit the same unset optional fields."""
+    print("\n🧪 Test: JSON bytes match dict")
+
+    response = ChatResponse(
+        conversation_id="c1",
+        answer="<p>Café ✓</p>",
+        citations=[Citation(id="cite-1", title="Guide")],
+        zuora_api_payloads=trusted_payloads(build_seed_payloads(3)),
+        payloads_version="abc",
+    )
+    as_dict = chat_response_dict(response)
+    as_bytes = chat_response_json(response)
+    assert isinstance(as_bytes, bytes)
+    assert json.loads(as_bytes) == as_dict
+    assert "Café ✓".encode() in as_bytes, "UTF-8, not ASCII escapes"
+    assert as_dict["payloads_version"] == "abc"
+    for field in ("debug", "timings", "removed_payload_ids", "payloads_resync"):
+        assert field not in as_dict
+    assert as_dict["citations"][0]["uri"] is None, "Only top-level fields dropped"
+    print("✅ Test passed: same response in both forms")
+
+
+def test_http_entrypoint():
+    """The runtime's /invocations body is the response dict, not a Response repr."""
+    print("\n🧪 Test: HTTP entry point")
+
+    scripts = {"List the charges": [{"text": "Two charges."}]}
+    server = MockZuoraServer(catalog_size=2).start()
+    try:
+        configure_zuora_client(server)
+        with worker_agents(ReplayModel(scripts)):
+            request = {
+                "persona": "ProductManager",
+                "message": "List the charges",
+                "conversation_id": "fast-path-test",
+                "zuora_api_payloads": build_seed_payloads(2),
+            }
+            assert isinstance(agentcore_app.invoke_http(request), dict)
+            with TestClient(agentcore_app.app) as client:
+                reply = client.post("/invocations", json=request)
+            assert reply.status_code == 200
+            assert reply.headers["content-type"].startswith("application/json")
+            body = reply.json()
+            assert isinstance(body, dict), body
+            as_dict = agentcore_app.invoke(request)
+            assert set(body) == set(as_dict)
+            assert body["zuora_api_payloads"] == as_dict["zuora_api_payloads"]
+            assert len(body["zuora_api_payloads"]) == 2
+    finally:
+        server.stop()
+
+    debug = agentcore_app.invoke_http({"debug_action": "nope"})
+    assert isinstance(debug, dict) and "error" in debug
+    print("✅ Test passed: HTTP body is the chat response")
+
+
+def run_all_tests():
+    """Run all response fast path tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING RESPONSE FAST PATH TESTS")
+    print("=" * 70)
+
+    test_trusted_payloads()
+    test_json_matches_dict()
+    test_http_entrypoint()
+
+    print("\n" + "=" * 70)
+    print("ALL RESPONSE FAST PATH TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
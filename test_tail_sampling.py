@@ -0,0 +1,159 @@
+"""
+Test cases for tail-based trace sampling.
+Checks that slow and failed requests keep their full span tree, that other
+requests are sampled, and that kept traces can be written to a JSONL file.
+"""
+
+import json
+import os
+import tempfile
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import Status, StatusCode
+
+from agents.tail_sampling import JsonlSpanExporter, TailSamplingProcessor
+
+MS = 1_000_000  # nanoseconds
+
+
+def _setup(exporter, **kwargs):
+    """Tracer whose spans go through a tail sampler into the exporter."""
+    sampler = TailSamplingProcessor([SimpleSpanProcessor(exporter)], **kwargs)
+    provider = TracerProvider()
+    provider.add_span_processor(sampler)
+    return provider.get_tracer("test"), sampler
+
+
+def _request(tracer, duration_ms, fail=False):
+    """Emit a request trace shaped like agentcore_app.invoke's spans."""
+    start = 1_000 * MS
+    root = tracer.start_span("agentcore.invoke", start_time=start)
+    with trace.use_span(root, end_on_exit=False):
+        with tracer.start_as_current_span("request.parse"):
+            pass
+        with tracer.start_as_current_span("agent.invoke") as span:
+            if fail:
+                span.set_attribute("error", True)
+        with tracer.start_as_current_span("response.build"):
+            pass
+    if fail:
+        root.set_status(Status(StatusCode.ERROR, "failed"))
+    root.end(end_time=start + int(duration_ms * MS))
+    return root.get_span_context().trace_id
+
+
+def test_slow_and_failed_requests_kept():
+    """Slow and failed traces are exported whole; fast ones are dropped."""
+    print("\n🧪 Test: Slow and failed requests are kept")
+
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _setup(exporter, latency_threshold_ms=5000, sample_ratio=0.0)
+
+    _request(tracer, 200)
+    assert exporter.get_finished_spans() == (), "Fast request should be dropped"
+
+    slow_trace = _request(tracer, 40000)
+    failed_trace = _request(tracer, 300, fail=True)
+    spans = exporter.get_finished_spans()
+    by_trace = {}
+    for span in spans:
+        by_trace.setdefault(span.context.trace_id, set()).add(span.name)
+    assert set(by_trace) == {slow_trace, failed_trace}
+    assert "agent.invoke" in by_trace[slow_trace]
+    assert "response.build" in by_trace[failed_trace]
+
+    stats = sampler.stats()
+    assert stats["kept_slow"] == 1 and stats["kept_error"] == 1
+    assert stats["traces_dropped"] == 1
+    assert stats["traces_buffered"] == 0
+    print("✅ Test passed: slow and failed traces kept with their child spans")
+
+
+def test_random_sample_and_late_spans():
+    """Sample ratio keeps ordinary traces; late spans follow the decision."""
+    print("\n🧪 Test: Random sample and late spans")
+
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _setup(exporter, latency_threshold_ms=5000, sample_ratio=1.0)
+
+    root = tracer.start_span("agentcore.invoke")
+    with trace.use_span(root, end_on_exit=False):
+        late = tracer.start_span("conversation.compact")
+    root.end()
+    assert [s.name for s in exporter.get_finished_spans()] == ["agentcore.invoke"]
+
+    late.end()
+    assert len(exporter.get_finished_spans()) == 2
+    assert sampler.stats()["kept_sampled"] == 1
+    print("✅ Test passed: ordinary traces sampled, late span exported")
+
+
+def test_buffer_is_bounded():
+    """Unfinished traces beyond max_traces are evicted."""
+    print("\n🧪 Test: Buffer is bounded")
+
+    exporter = InMemorySpanExporter()
+    tracer, sampler = _setup(exporter, max_traces=2, max_spans_per_trace=2)
+    for _ in range(3):
+        root = tracer.start_span("agentcore.invoke")
+        with trace.use_span(root, end_on_exit=False):
+            for _ in range(3):
+                with tracer.start_as_current_span("tool.get_payloads"):
+                    pass
+
+    stats = sampler.stats()
+    assert stats["traces_buffered"] == 2
+    assert stats["traces_evicted"] == 1
+    assert stats["spans_truncated"] == 3
+    print("✅ Test passed: oldest trace evicted, spans per trace capped")
+
+
+def test_jsonl_exporter():
+    """Kept spans are appended to the file as one JSON object per line."""
+    print("\n🧪 Test: JSONL span exporter")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "slow_traces.jsonl")
+        tracer, _ = _setup(
+            JsonlSpanExporter(path), latency_threshold_ms=1000, sample_ratio=0.0
+        )
+        trace_id = _request(tracer, 2000)
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+    names = {record["name"] for record in records}
+    assert names == {
+        "agentcore.invoke",
+        "request.parse",
+        "agent.invoke",
+        "response.build",
+    }
+    assert all(
+        record["context"]["trace_id"] == f"0x{trace_id:032x}" for record in records
+    )
+    print("✅ Test passed: kept trace written as JSONL")
+
+
+def run_all_tests():
+    """Run all tail sampling tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING TAIL SAMPLING TESTS")
+    print("=" * 70)
+
+    test_slow_and_failed_requests_kept()
+    test_random_sample_and_late_spans()
+    test_buffer_is_bounded()
+    test_jsonl_exporter()
+
+    print("\n" + "=" * 70)
+    print("ALL TAIL SAMPLING TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,137 @@
+"""
+Test cases for the compiled REQUIRED_FIELDS validators.
+Checks validate_payload() on known payloads and compares it with a direct
+interpretation of the schema over thousands of generated payloads.
+"""
+
+import random
+
+from agents.validation_schemas import (
+    REQUIRED_FIELDS,
+    _check_field_exists,
+    get_validator,
+    validate_payload,
+)
+
+
+def _interpret(api_type, payload_data):
+    """Reference: walk the REQUIRED_FIELDS entry for every call."""
+    schema = REQUIRED_FIELDS.get(api_type.lower())
+    if not schema:
+        return (True, [])
+    descriptions = schema.get("descriptions", {})
+    missing = []
+    for field in schema.get("always", []):
+        if not _check_field_exists(payload_data, field):
+            missing.append((field, descriptions.get(field, field)))
+    for parent_field, nested_fields in schema.get("nested", {}).items():
+        parent_data = payload_data.get(parent_field, {})
+        for nested_field in nested_fields:
+            if not parent_data or nested_field not in parent_data:
+                full_path = f"{parent_field}.{nested_field}"
+                missing.append((full_path, descriptions.get(full_path, nested_field)))
+    for condition, conditional_fields in schema.get("conditional", {}).items():
+        met = []
+        for cond_part in condition.split(","):
+            if "=" not in cond_part:
+                break
+            cond_field, cond_value = cond_part.split("=", 1)
+            actual = next(
+                (v for k, v in payload_data.items() if k.lower() == cond_field.lower()),
+                None,
+            )
+            if not actual or str(actual).upper() != cond_value.upper():
+                break
+            met.append(f"{cond_field}={cond_value}")
+        else:
+            for field in conditional_fields:
+                if not _check_field_exists(payload_data, field):
+                    desc = descriptions.get(field, field)
+                    missing.append(
+                        (field, f"{desc} (required because {' and '.join(met)})")
+                    )
+    return (len(missing) == 0, missing)
+
+
+def test_known_payloads():
+    """Flexible key matching, nested parents and compound conditions."""
+    print("\n🧪 Test: Known payloads")
+
+    is_valid, missing = validate_payload(
+        "PRODUCT_CREATE",
+        {"name": "A", "effective_start_date": "2025-01-01", "EffectiveEndDate": "x"},
+    )
+    assert is_valid and missing == [], "Case and underscores are ignored"
+
+    _, missing = validate_payload("account", {"billToContact": {"firstName": "A"}})
+    fields = [field for field, _ in missing]
+    assert "billToContact.lastName" in fields
+    assert "billToContact.firstName" not in fields
+
+    _, missing = validate_payload(
+        "charge_create",
+        {
+            "ChargeType": "recurring",
+            "isprepaid": "TRUE",
+            "PrepaidOperationType": "topup",
+        },
+    )
+    descriptions = dict(missing)
+    assert "BillingPeriod" in descriptions
+    assert "required because IsPrepaid=true and PrepaidOperationType=topup" in (
+        descriptions["PrepaidQuantity"]
+    )
+
+    assert validate_payload("unknown_type", {}) == (True, [])
+    assert get_validator("Charge_Create") is get_validator("charge_create")
+    assert get_validator("unknown_type") is None
+    print("✅ Test passed: known payloads validated")
+
+
+def test_matches_interpreted_schema():
+    """Compiled validators give the same results as interpreting the schema."""
+    print("\n🧪 Test: Compiled validators match the schema")
+
+    rng = random.Random(7)
+    fields = set()
+    for schema in REQUIRED_FIELDS.values():
+        fields.update(schema["always"])
+        for condition, conditional_fields in schema["conditional"].items():
+            fields.update(conditional_fields)
+            fields.update(part.split("=")[0] for part in condition.split(","))
+    fields = sorted(fields)
+    values = ["Recurring", "Usage", "true", "TOPUP", "Tiered Pricing", "TERMED"]
+    values += ["Drawdown", "Specific Months", None, "", 0, 1, {"x": 1}]
+
+    checked = 0
+    for api_type in list(REQUIRED_FIELDS) + ["Charge_Create", "unknown"]:
+        for _ in range(300):
+            payload = {}
+            for field in rng.sample(fields, rng.randint(0, len(fields) // 2)):
+                key = rng.choice([field, field.lower(), field.upper(), "_".join(field)])
+                payload[key] = rng.choice(values)
+            if rng.random() < 0.3:
+                payload["billToContact"] = rng.choice([{}, {"firstName": "A"}, None])
+            assert validate_payload(api_type, payload) == _interpret(
+                api_type, payload
+            ), (api_type, payload)
+            checked += 1
+    print(f"✅ Test passed: {checked} payloads identical")
+
+
+def run_all_tests():
+    """Run all validation schema tests."""
+    print("\n" + "=" * 70)
+    print("RUNNING VALIDATION SCHEMA TESTS")
+    print("=" * 70)
+
+    test_known_payloads()
+    test_matches_interpreted_schema()
+
+    print("\n" + "=" * 70)
+    print("ALL VALIDATION SCHEMA TESTS PASSED")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    run_all_tests()